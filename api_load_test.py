@@ -0,0 +1,95 @@
+"""Concurrent dashboard load test against the in-process API.
+
+Simulates a slow price fetch (the holdings summary's market data call is
+patched to sleep) and, while it is in flight, fires concurrent dashboard
+requests at other endpoints. Reports how long those requests took, i.e.
+whether they queued behind the slow fetch on the event loop.
+
+Runs the ASGI app in-process (no server, lifespan tasks not started) against
+the database configured by DATABASE_PATH (default at_data.sqlite); only
+read endpoints are requested.
+
+Usage (examples):
+  python api_load_test.py
+  python api_load_test.py --slow-seconds 3 --concurrency 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List, Optional
+
+DASHBOARD_PATHS = [
+    "/api/strategies/runs",
+    "/api/instruments",
+    "/api/strategies/latest",
+    "/api/instruments/meta/sectors",
+]
+
+
+async def _timed_get(client, path: str, delay: float, issued_at: float) -> float:
+    """Request ``path`` at ``issued_at + delay``; latency counts from the scheduled issue time."""
+    await asyncio.sleep(delay)
+    response = await client.get(path)
+    response.raise_for_status()
+    return time.perf_counter() - (issued_at + delay)
+
+
+async def _run(slow_seconds: float, concurrency: int) -> int:
+    import httpx
+
+    # Per-request INFO logs would dominate the output
+    logging.disable(logging.INFO)
+
+    from backend.api import holdings as holdings_api
+    from backend.main import app
+
+    market = holdings_api.holdings_service.market_service
+
+    def slow_prices(tickers):
+        time.sleep(slow_seconds)
+        return {}
+
+    market.get_current_prices = slow_prices
+    # Force the summary to rebuild (and fetch prices) on this request
+    holdings_api.holdings_service.invalidate_portfolio_snapshot()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        # Warm up connections and imports outside the measurement
+        for path in DASHBOARD_PATHS:
+            await client.get(path)
+
+        # Dashboard requests are spread over the first half second of the slow fetch
+        issued_at = time.perf_counter()
+        slow = asyncio.create_task(_timed_get(client, "/api/holdings/summary", 0.0, issued_at))
+        fast = [
+            _timed_get(client, DASHBOARD_PATHS[i % len(DASHBOARD_PATHS)], 0.05 + 0.5 * i / concurrency, issued_at)
+            for i in range(concurrency)
+        ]
+        latencies = await asyncio.gather(*fast)
+        slow_latency = await slow
+
+    latencies_ms = sorted(l * 1000 for l in latencies)
+    p95 = latencies_ms[min(len(latencies_ms) - 1, int(round(0.95 * (len(latencies_ms) - 1))))]
+    print(f"Slow summary request: {slow_latency * 1000:.0f} ms (price fetch sleeps {slow_seconds * 1000:.0f} ms)")
+    print(f"{concurrency} concurrent dashboard requests issued while it was in flight:")
+    print(f"  p50 {statistics.median(latencies_ms):.0f} ms   p95 {p95:.0f} ms   max {latencies_ms[-1]:.0f} ms")
+    queued = sum(1 for l in latencies if l >= slow_seconds * 0.5)
+    print(f"  {queued}/{concurrency} waited for the slow fetch")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent dashboard requests behind a slow price fetch")
+    parser.add_argument("--slow-seconds", type=float, default=2.0, help="Simulated price fetch duration")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent dashboard requests")
+    args = parser.parse_args(argv)
+    return asyncio.run(_run(args.slow_seconds, max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Execution model for routes that do blocking work.
+
+Routes in this API use sqlite3 and yfinance, both of which block. Declaring
+such a route ``async def`` and calling them inline stalls the event loop, so
+every other request queues behind one slow price fetch. Blocking routes are
+instead written as plain functions and wrapped with ``blocking_route``, which
+runs them on a dedicated, sized thread pool and bounds each request with a
+per-route timeout (504 when exceeded).
+
+A timed-out call keeps running in its worker thread until it returns; the
+timeout frees the client, not the thread.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+# Worker threads shared by all blocking routes
+BLOCKING_POOL_SIZE = int(os.getenv("API_BLOCKING_POOL_SIZE", "16"))
+
+# Default budget for a blocking route, in seconds
+DEFAULT_ROUTE_TIMEOUT_SECONDS = float(os.getenv("API_ROUTE_TIMEOUT_SECONDS", "30"))
+
+# Budget for routes that fetch quotes or metadata from yfinance
+MARKET_DATA_ROUTE_TIMEOUT_SECONDS = float(os.getenv("API_MARKET_DATA_TIMEOUT_SECONDS", "60"))
+
+_USE_DEFAULT = object()
+
+
+# Global executor instance
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Get or create the thread pool used for blocking route work."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(
+            max_workers=max(1, BLOCKING_POOL_SIZE), thread_name_prefix="api-blocking"
+        )
+    return _blocking_executor
+
+
+def shutdown_blocking_executor():
+    """Stop the pool without waiting for running calls (used on app shutdown)."""
+    global _blocking_executor
+    if _blocking_executor is not None:
+        _blocking_executor.shutdown(wait=False, cancel_futures=True)
+        _blocking_executor = None
+
+
+async def run_blocking(func: Callable[..., Any], *args, timeout: Any = _USE_DEFAULT, **kwargs) -> Any:
+    """
+    Run a blocking callable on the blocking pool and await its result.
+
+    Args:
+        func: Callable to run
+        timeout: Seconds to wait (None waits indefinitely; defaults to
+            DEFAULT_ROUTE_TIMEOUT_SECONDS)
+
+    Returns:
+        The callable's return value (its exceptions propagate)
+
+    Raises:
+        HTTPException: 504 if the call does not finish within the timeout
+    """
+    if timeout is _USE_DEFAULT:
+        timeout = DEFAULT_ROUTE_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_blocking_executor(), functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Request timed out after {timeout:g}s"
+        )
+
+
+def blocking_route(timeout: Any = _USE_DEFAULT):
+    """
+    Decorate a plain route function so it runs on the blocking pool.
+
+    Place it below the router decorator; the wrapper keeps the function's
+    signature, so FastAPI resolves parameters and dependencies as usual.
+
+    Args:
+        timeout: Per-route timeout in seconds (None for no timeout)
+    """
+    def decorator(func: Callable[..., Any]):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run_blocking(func, *args, timeout=timeout, **kwargs)
+        return wrapper
+    return decorator
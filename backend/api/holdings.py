@@ -1,25 +1,32 @@
 """Holdings API endpoints for portfolio and position management."""
 
+import io
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi.responses import Response
 import sqlite3
 
 from ..models.schemas import (
-    PositionsResponse, PortfolioSummaryResponse, ErrorResponse, HoldingsImportResponse
+    PositionsResponse, PositionResponse, PortfolioSummaryResponse, ErrorResponse,
+    HoldingsImportResponse, PortfolioHistoryResponse
 )
-from ..database.connection import get_database_connection, get_db_manager
+from ..database.connection import ThreadLocalDatabaseManager, get_database_connection, get_db_manager
 from ..services.holdings_service import HoldingsService
 from ..services.market_data_service import MarketDataService
+from ..services.portfolio_history_service import get_portfolio_history_service
+from ..services.arrow_export import ARROW_MEDIA_TYPES, ArrowUnavailableError, encode_records, model_schema
+from .blocking import MARKET_DATA_ROUTE_TIMEOUT_SECONDS, blocking_route
 
 router = APIRouter()
 
 # Initialize services
 market_service = MarketDataService()
-holdings_service = HoldingsService(get_db_manager(), market_service)
+holdings_service = HoldingsService(ThreadLocalDatabaseManager(), market_service)
 
 
 @router.get("/holdings/summary", response_model=PortfolioSummaryResponse)
-async def get_portfolio_summary():
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def get_portfolio_summary():
     """Get comprehensive portfolio summary with allocations and top holdings.
     
     Returns portfolio-level metrics including:
@@ -38,11 +45,13 @@ async def get_portfolio_summary():
 
 
 @router.get("/holdings/positions", response_model=PositionsResponse)
-async def get_positions(
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def get_positions(
     account: Optional[str] = Query(None, description="Filter by account name"),
     ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
     limit: int = Query(50, ge=1, le=1000, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip for pagination")
+    offset: int = Query(0, ge=0, description="Number of results to skip for pagination"),
+    format: str = Query("json", description="Response format: json, arrow or parquet")
 ):
     """Get list of portfolio positions with optional filtering.
     
@@ -52,15 +61,35 @@ async def get_positions(
     - Current market data (price, market value, P&L)
     - Portfolio weight calculations
     
-    Supports pagination and filtering by account or ticker.
+    Supports pagination and filtering by account or ticker. With
+    format=arrow or format=parquet the page is returned as a typed table
+    and the total count is sent in the X-Total-Count header.
     """
+    if format != "json" and format not in ARROW_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    
     try:
-        return holdings_service.get_positions(
+        positions = holdings_service.get_positions(
             account=account,
             ticker=ticker,
             limit=limit,
             offset=offset
         )
+        if format == "json":
+            return positions
+        
+        content = encode_records(
+            model_schema(PositionResponse),
+            [p.model_dump() for p in positions.positions],
+            format
+        )
+        return Response(
+            content=content,
+            media_type=ARROW_MEDIA_TYPES[format],
+            headers={"X-Total-Count": str(positions.total_count)}
+        )
+    except ArrowUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -69,7 +98,8 @@ async def get_positions(
 
 
 @router.get("/holdings/accounts")
-async def get_accounts():
+@blocking_route()
+def get_accounts():
     """Get list of all account names with position counts.
     
     Returns summary information about each account including
@@ -184,8 +214,34 @@ async def get_holdings_stats():
         )
 
 
+@router.get("/holdings/history", response_model=PortfolioHistoryResponse)
+@blocking_route()
+def get_portfolio_history(
+    account: Optional[str] = Query(None, description="Account to chart (default: all accounts)"),
+    start: Optional[str] = Query(None, description="First date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="Last date (YYYY-MM-DD)"),
+    max_points: int = Query(500, ge=3, le=10000, description="Maximum points returned (LTTB downsampled)")
+):
+    """Get the portfolio value series from daily snapshots.
+    
+    Snapshots are recorded by the daily snapshot job and the
+    portfolio_backfill.py tool; long ranges are downsampled with
+    Largest-Triangle-Three-Buckets to keep the curve shape.
+    """
+    try:
+        return get_portfolio_history_service().get_series(account, start, end, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve portfolio history: {str(e)}"
+        )
+
+
 @router.get("/holdings/{ticker}")
-async def get_holding_detail(ticker: str):
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def get_holding_detail(ticker: str):
     """Get detailed information for a specific holding across all accounts.
     
     Args:
@@ -238,9 +294,11 @@ async def get_holding_detail(ticker: str):
 
 
 @router.post("/holdings/import", response_model=HoldingsImportResponse)
-async def import_holdings_csv(
+@blocking_route(timeout=None)
+def import_holdings_csv(
     file: UploadFile = File(..., description="CSV file containing holdings data"),
-    replace_existing: bool = Form(True, description="Whether to replace all existing holdings for detected accounts")
+    replace_existing: bool = Form(True, description="Whether to replace all existing holdings for detected accounts"),
+    reconcile: bool = Form(False, description="Apply only the lot inserts, updates and closes needed (overrides replace_existing)")
 ):
     """Import holdings from a CSV file with automatic account detection.
     
@@ -260,11 +318,14 @@ async def import_holdings_csv(
     - Skip pending activity entries
     - Skip disclaimer text at bottom of file
     - Optionally replace all existing holdings for detected accounts
+    - Or reconcile: diff (account, ticker, lot_tag) lots against the database and
+      apply only inserts, updates and closes, returning the change summary
     - Provide detailed import summary and error reporting per account
     
     Args:
         file: CSV file upload
         replace_existing: Whether to replace existing holdings for detected accounts (default: True)
+        reconcile: Whether to apply a keyed diff instead (default: False)
         
     Returns:
         HoldingsImportResponse with detected accounts, import results and summary per account
@@ -277,26 +338,23 @@ async def import_holdings_csv(
                 detail="File must be a CSV file"
             )
         
-        # Read file content
-        content = await file.read()
+        # Stream the upload line by line (utf-8-sig also accepts a BOM)
+        csv_lines = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
         
-        # Decode content as text
+        # Call the holdings service to process the import with automatic account detection
         try:
-            csv_content = content.decode('utf-8')
+            result = holdings_service.import_holdings_from_csv(
+                csv_content=csv_lines,
+                replace_existing=replace_existing,
+                reconcile=reconcile
+            )
         except UnicodeDecodeError:
-            try:
-                csv_content = content.decode('utf-8-sig')  # Try with BOM
-            except UnicodeDecodeError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unable to decode CSV file. Please ensure it's saved as UTF-8."
-                )
-        
-        # Call the holdings service to process the import with automatic account detection
-        result = holdings_service.import_holdings_from_csv(
-            csv_content=csv_content,
-            replace_existing=replace_existing
-        )
+            raise HTTPException(
+                status_code=400,
+                detail="Unable to decode CSV file. Please ensure it's saved as UTF-8."
+            )
+        finally:
+            csv_lines.detach()
         
         return result
         
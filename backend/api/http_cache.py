@@ -0,0 +1,146 @@
+"""Conditional GET support for heavy read endpoints.
+
+``ConditionalGetMiddleware`` adds content-hash ETags to JSON responses on the
+configured paths and answers matching ``If-None-Match`` requests with 304, so
+frontend polls of unchanged data skip the response body. Endpoints that can
+derive a validator without building the response (e.g. completed strategy
+runs) set their own ETag with ``run_etag`` and short-circuit via
+``not_modified``; the middleware leaves such ETags untouched.
+"""
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Paths whose JSON responses get content-hash ETags
+CONDITIONAL_GET_PATHS = (
+    "/api/holdings/summary",
+    "/api/instruments",
+    "/api/strategies/runs",
+)
+
+
+def _weak_etag(digest: str) -> str:
+    # Weak: the validator covers the JSON content, not its (possibly gzipped) encoding
+    return f'W/"{digest}"'
+
+
+def content_etag(body: bytes) -> str:
+    """ETag derived from a response body."""
+    return _weak_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def run_etag(run_id: str, completed_at: Optional[str], request: Request) -> Optional[str]:
+    """
+    ETag for a completed strategy run's views, derived without serialization.
+
+    Results of a completed run no longer change, so run_id plus completion
+    timestamp (and the query string, which selects the page) identifies the
+    response. Runs still in progress get no run-level ETag.
+    """
+    if not completed_at:
+        return None
+    key = f"{run_id}|{completed_at}|{request.url.path}|{request.url.query}"
+    return _weak_etag("run-" + hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """Return a 304 response if the request's If-None-Match matches ``etag``."""
+    if etag and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding ETags and 304 handling to JSON GET responses."""
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str] = CONDITIONAL_GET_PATHS):
+        self.app = app
+        self.paths: Tuple[str, ...] = tuple(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] not in ("GET", "HEAD")
+                or not scope["path"].startswith(self.paths)):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        chunks = []
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                etag = headers.get("etag")
+                if message["status"] == 200 and etag and etag_matches(if_none_match, etag):
+                    # Endpoint supplied its own validator; drop the body
+                    start = _not_modified_start(message, etag)
+                    return
+                if (message["status"] != 200 or etag
+                        or not headers.get("content-type", "").startswith("application/json")):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            if start["status"] == 304:
+                await send(start)
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            body = b"".join(chunks)
+            etag = content_etag(body)
+            if etag_matches(if_none_match, etag):
+                await send(_not_modified_start(start, etag))
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            MutableHeaders(raw=start["headers"])["ETag"] = etag
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _not_modified_start(start: Message, etag: str) -> Message:
+    """Turn a response start message into a bodiless 304 keeping its other headers."""
+    headers = MutableHeaders(raw=list(start["headers"]))
+    for name in ("content-length", "content-type"):
+        if name in headers:
+            del headers[name]
+    headers["ETag"] = etag
+    return {"type": "http.response.start", "status": 304, "headers": headers.raw}
@@ -8,19 +8,21 @@ from ..models.schemas import (
     InstrumentResponse, InstrumentsResponse, MarketPricesResponse,
     MarketPrice, MarketDataQueryParams
 )
-from ..database.connection import get_database_connection, get_db_manager
+from ..database.connection import ThreadLocalDatabaseManager, get_database_connection, get_db_manager
 from ..services.instruments_service import InstrumentsService
 from ..services.market_data_service import MarketDataService
+from .blocking import MARKET_DATA_ROUTE_TIMEOUT_SECONDS, blocking_route
 
 router = APIRouter()
 
 # Initialize services
 market_service = MarketDataService()
-instruments_service = InstrumentsService(get_db_manager(), market_service)
+instruments_service = InstrumentsService(ThreadLocalDatabaseManager(), market_service)
 
 
 @router.get("/instruments", response_model=InstrumentsResponse)
-async def get_instruments(
+@blocking_route()
+def get_instruments(
     instrument_type: Optional[str] = Query(None, description="Filter by instrument type (stock, etf, etc.)"),
     sector: Optional[str] = Query(None, description="Filter by sector"),
     style_category: Optional[str] = Query(None, description="Filter by style category"),
@@ -56,7 +58,8 @@ async def get_instruments(
 
 
 @router.get("/instruments/{ticker}", response_model=InstrumentResponse)
-async def get_instrument(ticker: str):
+@blocking_route()
+def get_instrument(ticker: str):
     """Get detailed information for a specific instrument.
     
     Args:
@@ -88,7 +91,8 @@ async def get_instrument(ticker: str):
 
 
 @router.get("/instruments/{ticker}/market-data")
-async def get_instrument_with_market_data(ticker: str):
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def get_instrument_with_market_data(ticker: str):
     """Get instrument information enriched with current market data.
     
     Args:
@@ -121,7 +125,8 @@ async def get_instrument_with_market_data(ticker: str):
 
 
 @router.get("/instruments/search/{query}")
-async def search_instruments(
+@blocking_route()
+def search_instruments(
     query: str,
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results")
 ):
@@ -161,7 +166,8 @@ async def search_instruments(
 
 
 @router.get("/market/prices", response_model=MarketPricesResponse)
-async def get_market_prices(
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def get_market_prices(
     tickers: str = Query(..., description="Comma-separated list of ticker symbols")
 ):
     """Get current market prices for multiple tickers.
@@ -219,7 +225,8 @@ async def get_market_prices(
 
 
 @router.get("/instruments/meta/sectors")
-async def get_sectors():
+@blocking_route()
+def get_sectors():
     """Get list of all unique sectors in the instruments database.
     
     Returns sorted list of sector names for filtering and categorization.
@@ -238,7 +245,8 @@ async def get_sectors():
 
 
 @router.get("/instruments/meta/industries")
-async def get_industries(
+@blocking_route()
+def get_industries(
     sector: Optional[str] = Query(None, description="Filter industries by sector")
 ):
     """Get list of all unique industries, optionally filtered by sector.
@@ -263,7 +271,8 @@ async def get_industries(
 
 
 @router.get("/instruments/meta/types")
-async def get_instrument_types():
+@blocking_route()
+def get_instrument_types():
     """Get list of all unique instrument types in the database.
     
     Returns sorted list of instrument types (stock, etf, etc.) for filtering.
@@ -282,7 +291,8 @@ async def get_instrument_types():
 
 
 @router.get("/instruments/meta/styles")
-async def get_style_categories():
+@blocking_route()
+def get_style_categories():
     """Get list of all unique style categories in the database.
     
     Returns sorted list of style categories for filtering and categorization.
@@ -301,7 +311,8 @@ async def get_style_categories():
 
 
 @router.get("/instruments/stats")
-async def get_instruments_stats():
+@blocking_route()
+def get_instruments_stats():
     """Get statistical information about the instruments database.
     
     Returns comprehensive statistics including:
@@ -320,7 +331,8 @@ async def get_instruments_stats():
 
 
 @router.post("/instruments/{ticker}/refresh")
-async def refresh_instrument_metadata(ticker: str):
+@blocking_route(timeout=MARKET_DATA_ROUTE_TIMEOUT_SECONDS)
+def refresh_instrument_metadata(ticker: str):
     """Refresh instrument metadata from external market data sources.
     
     Args:
@@ -0,0 +1,20 @@
+"""Response classes shared by the API routers."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..services.serialization import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (NumPy values supported).
+    
+    For endpoints returning plain dicts: returning this response directly
+    skips FastAPI's ``jsonable_encoder`` walk. Endpoints with a
+    ``response_model`` should keep the default response class, which
+    FastAPI serializes with Pydantic's compiled ``dump_json``.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -11,7 +11,7 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from ..models.stock_models import (
     ComprehensiveStockInfo,
@@ -22,10 +22,15 @@ from ..models.stock_models import (
     StockStrategyHistoryResponse,
     StockAnalysisError,
     AddInstrumentRequest,
-    AddInstrumentResponse
+    AddInstrumentResponse,
+    PriceBar,
+    PriceBarsResponse
 )
 from ..services.stock_analysis_service import StockAnalysisService
 from ..services.stock_validation_service import StockValidationService
+from ..services.price_bar_store import get_price_bar_store
+from ..services.avwap_engine import ANCHOR_KINDS
+from ..services.arrow_export import ARROW_MEDIA_TYPES, ArrowUnavailableError, encode_records, model_schema
 from ..database.connection import get_db_manager
 
 logger = logging.getLogger(__name__)
@@ -409,14 +414,21 @@ def get_stock_strategy_history(
 @router.get("/{symbol}/technical", response_model=Dict[str, Any])
 def get_stock_technical_indicators(
     symbol: str,
-    period: Optional[str] = Query("3mo", description="Data period for calculations")
+    period: Optional[str] = Query("3mo", description="Kept for compatibility; indicators use the full stored history"),
+    avwap_anchors: Optional[str] = Query(
+        "breakout,52w_low", description="Comma-separated anchored VWAP anchors (breakout, earnings, 52w_low)"
+    )
 ):
     """
     Get technical indicators for a stock.
     
+    Served from the shared indicator cache, which recomputes the indicators
+    from the stored daily bars only when a new bar arrives.
+    
     Args:
         symbol: Stock ticker symbol
-        period: Data period for calculations
+        period: Kept for compatibility (the full stored history is used)
+        avwap_anchors: Anchored VWAP anchors to include (empty for none)
     
     Returns:
         Technical indicators data
@@ -424,8 +436,13 @@ def get_stock_technical_indicators(
     try:
         logger.info(f"Fetching technical indicators for {symbol}")
         
+        anchors = [a.strip() for a in (avwap_anchors or "").split(",") if a.strip()]
+        unknown = [a for a in anchors if a not in ANCHOR_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown AVWAP anchors: {', '.join(unknown)}")
+        
         service = get_analysis_service()
-        technical_data = service.get_technical_indicators(symbol, period)
+        technical_data = service.get_technical_indicators(symbol, period, anchors)
         
         logger.info(f"Retrieved technical indicators for {symbol}")
         return technical_data or {}
@@ -464,6 +481,70 @@ def get_stock_performance_metrics(
         return handle_stock_error(e, symbol)
 
 
+@router.get("/{symbol}/bars")
+def get_stored_price_bars(
+    symbol: str,
+    start: Optional[str] = Query(None, description="First bar date (inclusive, ISO format)"),
+    end: Optional[str] = Query(None, description="Last bar date (inclusive, ISO format)"),
+    interval: str = Query("1d", description="Bar interval"),
+    format: str = Query("json", description="Response format: json, arrow or parquet")
+):
+    """
+    Get OHLCV bars stored in the local price bar cache.
+    
+    Only bars already persisted by backtests, snapshots or refreshes are
+    returned; nothing is downloaded. With format=arrow or format=parquet the
+    bars are returned as a typed table.
+    
+    Args:
+        symbol: Stock ticker symbol
+        start: Optional first bar date
+        end: Optional last bar date
+        interval: Bar interval
+        format: json, arrow or parquet
+    
+    Returns:
+        Stored bars
+    """
+    try:
+        if format != "json" and format not in ARROW_MEDIA_TYPES:
+            raise ValueError(f"Unsupported format: {format}")
+        
+        ticker = symbol.upper()
+        df = get_price_bar_store().get_bars(ticker, start, end, interval)
+        records = []
+        if df is not None:
+            for ts, o, h, l, c, v in zip(df.index.to_pydatetime(), df["open"], df["high"],
+                                          df["low"], df["close"], df["volume"]):
+                records.append({
+                    "date": ts,
+                    "open": o if o == o else None,
+                    "high": h if h == h else None,
+                    "low": l if l == l else None,
+                    "close": c,
+                    "volume": v if v == v else None,
+                })
+        
+        if format == "json":
+            return PriceBarsResponse(
+                ticker=ticker,
+                interval=interval,
+                bars=[PriceBar(**r) for r in records],
+                count=len(records)
+            )
+        
+        return Response(
+            content=encode_records(model_schema(PriceBar), records, format),
+            media_type=ARROW_MEDIA_TYPES[format]
+        )
+        
+    except ArrowUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching stored bars for {symbol}: {e}")
+        return handle_stock_error(e, symbol)
+
+
 @router.post("/add-instrument", response_model=Dict[str, Any])
 def add_new_instrument(request: Dict[str, Any]):
     """
@@ -1,8 +1,12 @@
 """Strategy API endpoints for strategy runs and results management."""
 
+import csv
+import io
 import json
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 import sqlite3
 
 from ..models.schemas import (
@@ -11,14 +15,41 @@ from ..models.schemas import (
     StrategyMetrics, ErrorResponse
 )
 from ..database.connection import get_database_connection, get_db_manager
+from .http_cache import not_modified, run_etag
+from .blocking import blocking_route
+from ..services.serialization import dumps_bytes, loads as loads_json
+from ..services.arrow_export import (
+    ARROW_MEDIA_TYPES, ArrowUnavailableError, iter_encoded, merge_schemas, model_schema,
+    records_to_columns
+)
 
 router = APIRouter()
 
+# Rows fetched from the export cursor per round trip
+EXPORT_FETCH_SIZE = 500
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    **ARROW_MEDIA_TYPES,
+}
+
+EXPORT_BASE_COLUMNS = [
+    "run_id", "strategy_code", "ticker", "passed", "score", "classification",
+    "reasons", "created_at", "sector", "industry", "instrument_type",
+]
+
+# Typed metrics flattened into CSV/Arrow columns; untyped extras only appear in NDJSON
+EXPORT_METRIC_COLUMNS = [
+    name for name in StrategyMetrics.model_fields
+    if name != "additional_metrics" and name not in EXPORT_BASE_COLUMNS
+]
+
 
 def _parse_metrics_json(metrics_json: str) -> StrategyMetrics:
     """Parse metrics JSON string into StrategyMetrics model."""
     try:
-        metrics_dict = json.loads(metrics_json) if metrics_json else {}
+        metrics_dict = loads_json(metrics_json) if metrics_json else {}
         return StrategyMetrics(**metrics_dict)
     except (json.JSONDecodeError, TypeError, ValueError):
         return StrategyMetrics()
@@ -38,8 +69,156 @@ def _calculate_pass_rate(passed_count: int, total_count: int) -> Optional[float]
     return round((passed_count / total_count) * 100, 2)
 
 
+def _build_results_filter(
+    run_id: str,
+    passed: Optional[bool] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    classification: Optional[str] = None,
+    ticker: Optional[str] = None,
+    sector: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    """Build the WHERE clause and parameters for filtering a run's results."""
+    where_conditions = ["res.run_id = ?"]
+    params: List[Any] = [run_id]
+    
+    if passed is not None:
+        where_conditions.append("res.passed = ?")
+        params.append(1 if passed else 0)
+        
+    if min_score is not None:
+        where_conditions.append("res.score >= ?")
+        params.append(min_score)
+        
+    if max_score is not None:
+        where_conditions.append("res.score <= ?")
+        params.append(max_score)
+        
+    if classification:
+        where_conditions.append("res.classification = ?")
+        params.append(classification)
+        
+    if ticker:
+        where_conditions.append("res.ticker = ?")
+        params.append(ticker.upper())
+        
+    if sector:
+        where_conditions.append("inst.sector = ?")
+        params.append(sector)
+    
+    return "WHERE " + " AND ".join(where_conditions), params
+
+
+def _results_order_clause(order_by: str, order_desc: bool) -> str:
+    """Build a validated ORDER BY clause for run results."""
+    valid_order_fields = ["score", "ticker", "created_at", "classification"]
+    if order_by not in valid_order_fields:
+        order_by = "score"
+    
+    order_direction = "DESC" if order_desc else "ASC"
+    return f"ORDER BY res.{order_by} {order_direction}, res.ticker ASC"
+
+
+def _results_query(where_clause: str, order_clause: str) -> str:
+    """Build the result rows query joined with instrument metadata."""
+    return f"""
+        SELECT res.run_id, res.strategy_code, res.ticker, res.passed, res.score,
+               res.classification, res.reasons, res.metrics_json, res.created_at,
+               inst.sector, inst.industry, inst.instrument_type
+        FROM strategy_result res
+        LEFT JOIN instruments inst ON res.ticker = inst.ticker
+        {where_clause}
+        {order_clause}
+        """
+
+
+def _iter_result_rows(db_path: Optional[str], query: str, params: List[Any]) -> Iterator[sqlite3.Row]:
+    """Iterate query rows in fetchmany batches on a connection owned by the stream."""
+    db_manager = get_db_manager(db_path)
+    try:
+        cursor = db_manager.execute_query(query, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        db_manager.close()
+
+
+def _export_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a result row into a plain dict for export."""
+    try:
+        metrics = loads_json(row[7]) if row[7] else {}
+    except (json.JSONDecodeError, TypeError, ValueError):
+        metrics = {}
+    return {
+        "run_id": row[0],
+        "strategy_code": row[1],
+        "ticker": row[2],
+        "passed": bool(row[3]),
+        "score": row[4],
+        "classification": row[5],
+        "reasons": _parse_reasons(row[6]),
+        "created_at": row[8],
+        "sector": row[9],
+        "industry": row[10],
+        "instrument_type": row[11] or "stock",
+        "metrics": metrics if isinstance(metrics, dict) else {},
+    }
+
+
+def _stream_ndjson(rows: Iterator[sqlite3.Row]) -> Iterator[bytes]:
+    """Serialize result rows as newline-delimited JSON, one row per line."""
+    for row in rows:
+        yield dumps_bytes(_export_record(row)) + b"\n"
+
+
+def _stream_csv(rows: Iterator[sqlite3.Row]) -> Iterator[str]:
+    """Serialize result rows as CSV with the typed metrics flattened into columns."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_BASE_COLUMNS + EXPORT_METRIC_COLUMNS)
+    for row in rows:
+        record = _export_record(row)
+        metrics = record.pop("metrics")
+        record["reasons"] = ";".join(record["reasons"])
+        writer.writerow(
+            [record[c] for c in EXPORT_BASE_COLUMNS]
+            + [metrics.get(c) for c in EXPORT_METRIC_COLUMNS]
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def _results_arrow_schema():
+    """Arrow schema for exported results: result fields followed by the typed metrics."""
+    return merge_schemas(
+        model_schema(StrategyResultDetail, exclude=("metrics", "company_name")),
+        model_schema(StrategyMetrics, exclude=("additional_metrics",)),
+    )
+
+
+def _stream_columnar(rows: Iterator[sqlite3.Row], schema, export_format: str) -> Iterator[bytes]:
+    """Serialize result rows as Arrow IPC or Parquet, one record batch per fetch."""
+    def batches():
+        while True:
+            chunk = list(islice(rows, EXPORT_FETCH_SIZE))
+            if not chunk:
+                break
+            records = []
+            for row in chunk:
+                record = _export_record(row)
+                records.append({**record.pop("metrics"), **record})
+            yield records_to_columns(schema, records)
+    
+    return iter_encoded(schema, batches(), export_format)
+
+
 @router.get("/strategies/runs", response_model=StrategyRunsResponse)
-async def get_strategy_runs(
+@blocking_route()
+def get_strategy_runs(
     strategy_code: Optional[str] = Query(None, description="Filter by strategy code"),
     status: Optional[str] = Query(None, description="Filter by exit status"),
     date_from: Optional[str] = Query(None, description="Filter runs from date (ISO format)"),
@@ -172,11 +351,13 @@ async def get_strategy_runs(
 
 
 @router.get("/strategies/runs/{run_id}", response_model=StrategyRunDetail)
-async def get_strategy_run_detail(run_id: str):
+@blocking_route()
+def get_strategy_run_detail(run_id: str, request: Request, response: Response):
     """Get detailed information for a specific strategy run.
     
     Returns comprehensive run information including performance stats,
-    score distribution, and preview of top results.
+    score distribution, and preview of top results. Completed runs are
+    served with an ETag so unchanged polls get a 304.
     """
     try:
         db_manager = get_db_manager()
@@ -197,6 +378,13 @@ async def get_strategy_run_detail(run_id: str):
                 detail=f"Strategy run not found: {run_id}"
             )
         
+        etag = run_etag(run_id, run_row[6], request)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        if etag:
+            response.headers["ETag"] = etag
+        
         # Get aggregated performance stats
         stats_query = """
         SELECT 
@@ -308,8 +496,11 @@ async def get_strategy_run_detail(run_id: str):
 
 
 @router.get("/strategies/runs/{run_id}/results", response_model=StrategyResultsResponse)
-async def get_strategy_run_results(
+@blocking_route()
+def get_strategy_run_results(
     run_id: str,
+    request: Request,
+    response: Response,
     passed: Optional[bool] = Query(None, description="Filter by pass/fail status"),
     min_score: Optional[float] = Query(None, description="Minimum score threshold"),
     max_score: Optional[float] = Query(None, description="Maximum score threshold"),
@@ -324,13 +515,14 @@ async def get_strategy_run_results(
     """Get paginated results for a specific strategy run.
     
     Returns detailed results with metrics for individual tickers,
-    supporting filtering and pagination.
+    supporting filtering and pagination. Pages of completed runs are
+    served with an ETag so unchanged polls get a 304.
     """
     try:
         db_manager = get_db_manager()
         
         # Verify run exists and get strategy_code
-        run_check_query = "SELECT strategy_code FROM strategy_run WHERE run_id = ?"
+        run_check_query = "SELECT strategy_code, completed_at FROM strategy_run WHERE run_id = ?"
         run_check = db_manager.execute_one(run_check_query, [run_id])
         if not run_check:
             raise HTTPException(
@@ -340,42 +532,17 @@ async def get_strategy_run_results(
         
         strategy_code = run_check[0]
         
-        # Build WHERE clause for filtering
-        where_conditions = ["res.run_id = ?"]
-        params = [run_id]
-        
-        if passed is not None:
-            where_conditions.append("res.passed = ?")
-            params.append(1 if passed else 0)
-            
-        if min_score is not None:
-            where_conditions.append("res.score >= ?")
-            params.append(min_score)
-            
-        if max_score is not None:
-            where_conditions.append("res.score <= ?")
-            params.append(max_score)
-            
-        if classification:
-            where_conditions.append("res.classification = ?")
-            params.append(classification)
-            
-        if ticker:
-            where_conditions.append("res.ticker = ?")
-            params.append(ticker.upper())
-            
-        if sector:
-            where_conditions.append("inst.sector = ?")
-            params.append(sector)
-        
-        where_clause = "WHERE " + " AND ".join(where_conditions)
+        etag = run_etag(run_id, run_check[1], request)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        if etag:
+            response.headers["ETag"] = etag
         
-        # Validate order_by field
-        valid_order_fields = ["score", "ticker", "created_at", "classification"]
-        if order_by not in valid_order_fields:
-            order_by = "score"
-        
-        order_direction = "DESC" if order_desc else "ASC"
+        where_clause, params = _build_results_filter(
+            run_id, passed, min_score, max_score, classification, ticker, sector
+        )
+        order_clause = _results_order_clause(order_by, order_desc)
         
         # Count total and passed/failed results
         count_query = f"""
@@ -393,15 +560,7 @@ async def get_strategy_run_results(
         failed_count = total_count - passed_count
         
         # Get paginated results
-        results_query = f"""
-        SELECT res.run_id, res.strategy_code, res.ticker, res.passed, res.score,
-               res.classification, res.reasons, res.metrics_json, res.created_at,
-               inst.sector, inst.industry, inst.instrument_type
-        FROM strategy_result res
-        LEFT JOIN instruments inst ON res.ticker = inst.ticker
-        {where_clause}
-        ORDER BY res.{order_by} {order_direction}, res.ticker ASC
-        """
+        results_query = _results_query(where_clause, order_clause)
         
         # Only add LIMIT/OFFSET if limit is specified
         if limit is not None:
@@ -465,8 +624,77 @@ async def get_strategy_run_results(
         )
 
 
+@router.get("/strategies/runs/{run_id}/export")
+@blocking_route()
+def export_strategy_run_results(
+    run_id: str,
+    format: str = Query("ndjson", description="Export format: ndjson, csv, arrow or parquet"),
+    passed: Optional[bool] = Query(None, description="Filter by pass/fail status"),
+    min_score: Optional[float] = Query(None, description="Minimum score threshold"),
+    max_score: Optional[float] = Query(None, description="Maximum score threshold"),
+    classification: Optional[str] = Query(None, description="Filter by classification"),
+    ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    sector: Optional[str] = Query(None, description="Filter by sector"),
+    order_by: str = Query("score", description="Sort field"),
+    order_desc: bool = Query(True, description="Sort in descending order")
+):
+    """Stream all results for a strategy run as NDJSON, CSV, Arrow IPC or Parquet.
+    
+    Rows are read from a server-side cursor in batches and serialized one
+    at a time (one record batch per fetch for Arrow/Parquet), so large runs
+    are never materialized in memory and the first bytes are sent as soon as
+    the query starts returning rows. Arrow/Parquet columns are typed from the
+    result and metrics schemas.
+    """
+    export_format = format.lower()
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported export format: {format}. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}"
+        )
+    
+    try:
+        db_manager = get_db_manager()
+        run_check = db_manager.execute_one("SELECT 1 FROM strategy_run WHERE run_id = ?", [run_id])
+        db_manager.close()
+        if not run_check:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Strategy run not found: {run_id}"
+            )
+        
+        where_clause, params = _build_results_filter(
+            run_id, passed, min_score, max_score, classification, ticker, sector
+        )
+        query = _results_query(where_clause, _results_order_clause(order_by, order_desc))
+        rows = _iter_result_rows(db_manager.db_path, query, params)
+        if export_format in ARROW_MEDIA_TYPES:
+            body = _stream_columnar(rows, _results_arrow_schema(), export_format)
+        elif export_format == "csv":
+            body = _stream_csv(rows)
+        else:
+            body = _stream_ndjson(rows)
+        
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{run_id}.{export_format}"'}
+        )
+        
+    except HTTPException:
+        raise
+    except ArrowUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to export strategy results: {str(e)}"
+        )
+
+
 @router.get("/strategies/latest", response_model=StrategyLatestResponse)
-async def get_latest_strategy_runs(
+@blocking_route()
+def get_latest_strategy_runs(
     strategy_codes: Optional[str] = Query(None, description="Comma-separated list of strategy codes"),
     limit: int = Query(10, ge=1, le=50, description="Number of latest runs per strategy")
 ):
@@ -8,13 +8,22 @@ replacing the complex SSE streaming approach with simple HTTP calls and polling.
 import uuid
 import logging
 from typing import Dict, List, Optional, Any
+from dataclasses import asdict
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, Field, root_validator
 
 from ..services.strategy_execution_service import get_strategy_execution_service, reset_strategy_execution_service
+from ..services.parameter_sweep_service import get_parameter_sweep_service
+from ..services.backtest_service import BacktestConfig, DEFAULT_HORIZONS, get_backtest_service
+from ..services.price_bar_store import get_price_bar_store
 from ..database.connection import get_db_connection
+from ..models.schemas import ExecutionCancelResponse, ExecutionOptions
+from ..services.buffett_metrics import get_stored_metrics
+from ..services.buffett_rules import SCREEN_RULES, ScreenerConfig, evaluate, rank_survivors
+from .blocking import blocking_route
+from .responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +46,7 @@ class StrategyExecutionRequest(BaseModel):
     universe: Optional[str] = Field(None, description="Universe source hint (e.g., 'db_instruments')")
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Strategy-specific parameters")
     run_id: Optional[str] = Field(None, description="Optional run ID (generated if not provided)")
+    options: Optional[ExecutionOptions] = Field(None, description="Execution options (priority: low, normal, high)")
 
     @root_validator(pre=True)
     def _normalize(cls, values):  # noqa: D401
@@ -50,6 +60,12 @@ class StrategyExecutionRequest(BaseModel):
             raise HTTPException(status_code=400, detail="Strategy name/code is required")
         return code
 
+    def resolve_parameters(self) -> Dict[str, Any]:
+        """Strategy parameters with ``options.priority`` folded in for the scheduler."""
+        if self.options and "priority" in self.options.model_fields_set:
+            return {**self.parameters, "priority": self.options.priority}
+        return dict(self.parameters)
+
     def resolve_symbols(self, db) -> List[str]:
         sym_list = self.symbols or self.tickers
         if sym_list:
@@ -113,6 +129,54 @@ class StrategyInfoResponse(BaseModel):
     parameter_schema: Dict[str, Any]
 
 
+class StrategySweepRequest(StrategyExecutionRequest):
+    """Request model for a parameter sweep.
+
+    ``parameters`` are shared by every combination; ``grid`` maps each swept
+    parameter to its candidate values.
+    """
+    grid: Dict[str, List[Any]] = Field(..., description="Parameter grid, e.g. {'min_score': [55, 60, 65]}")
+
+
+class StrategySweepResponse(BaseModel):
+    """Response model for starting a parameter sweep."""
+    sweep_id: str
+    status: str
+    message: str
+    strategy_code: str
+    total_tickers: int
+    combination_count: int
+    execution_started_at: str
+
+
+class StrategyBacktestRequest(StrategyExecutionRequest):
+    """Request model for a historical backtest over stored price bars."""
+    start_date: Optional[str] = Field(None, description="First evaluated date (YYYY-MM-DD)")
+    end_date: Optional[str] = Field(None, description="Last evaluated date (YYYY-MM-DD)")
+    horizons: List[int] = Field(default_factory=lambda: list(DEFAULT_HORIZONS), description="Forward return horizons in bars")
+    history_period: str = Field("5y", description="History to download for tickers without stored bars")
+    refresh: bool = Field(True, description="Fetch bars newer than the last stored date before replaying")
+    include_signals: bool = Field(False, description="Include every signal date with its forward returns")
+
+
+class StrategyBacktestResponse(BaseModel):
+    """Response model for starting a backtest."""
+    backtest_id: str
+    status: str
+    message: str
+    strategy_code: str
+    total_tickers: int
+    execution_started_at: str
+
+
+class BuffettScreenRequest(BaseModel):
+    """Request model for re-evaluating the Buffett screen over stored fundamentals."""
+    thresholds: Dict[str, Any] = Field(default_factory=dict, description="ScreenerConfig overrides (e.g. {'min_roe': 12})")
+    symbols: Optional[List[str]] = Field(None, description="Restrict to these tickers (default: all with stored fundamentals)")
+    include_failed: bool = Field(False, description="Include failing tickers with their first and all failed rules")
+    limit: int = Field(100, ge=1, le=5000, description="Maximum survivors (and failures) returned")
+
+
 # Database dependency
 def get_db():
     """Get database connection for dependency injection."""
@@ -136,6 +200,7 @@ async def execute_strategy(
         run_id = request.run_id or str(uuid.uuid4())
         strategy_code = request.resolve_strategy_code()
         symbols = request.resolve_symbols(db)
+        parameters = request.resolve_parameters()
 
         execution_service = get_strategy_execution_service(db)
         strategy_info = execution_service.get_strategy_info(strategy_code)
@@ -143,13 +208,15 @@ async def execute_strategy(
             raise HTTPException(status_code=404, detail=f"Strategy '{strategy_code}' not found")
 
         execution_started_at = datetime.utcnow().isoformat()
+        # Register before queueing so the run can be cancelled while it waits
+        execution_service.register_run(run_id)
 
         def run_strategy():
             try:
                 execution_service.execute_strategy_sync(
                     strategy_code=strategy_code,
                     tickers=symbols,
-                    parameters=request.parameters,
+                    parameters=parameters,
                     run_id=run_id
                 )
             except Exception as e:  # Background execution errors logged only
@@ -254,6 +321,85 @@ async def get_strategy_results(run_id: str, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
 
 
+@router.post("/runs/{run_id}/cancel", response_model=ExecutionCancelResponse)
+async def cancel_strategy_run(run_id: str, db=Depends(get_db)):
+    """
+    Cancel a queued or running strategy execution.
+    
+    Cancellation is cooperative: tickers not yet started are skipped, tickers
+    already being evaluated finish, and the run is finalized as 'cancelled'
+    with the results gathered so far.
+    """
+    try:
+        execution_service = get_strategy_execution_service(db)
+        if execution_service.cancel_run(run_id):
+            return ExecutionCancelResponse(
+                cancelled=True,
+                message=f"Cancellation requested for run {run_id}"
+            )
+        
+        progress = execution_service.get_execution_progress(run_id)
+        if not progress:
+            raise HTTPException(status_code=404, detail=f"Strategy execution '{run_id}' not found")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Run {run_id} cannot be cancelled (status: {progress['status']})"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to cancel run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to cancel run: {str(e)}")
+
+
+@router.post("/runs/{run_id}/resume", response_model=StrategyExecutionResponse)
+async def resume_strategy_run(run_id: str, background_tasks: BackgroundTasks, db=Depends(get_db)):
+    """
+    Resume an interrupted or cancelled strategy execution.
+
+    Tickers already recorded in the run's progress are kept; only the
+    remainder is evaluated (in background) under the same run_id and
+    parameters. Use the progress endpoint to monitor it.
+    """
+    try:
+        execution_service = get_strategy_execution_service(db)
+        try:
+            checkpoint = execution_service.load_checkpoint(run_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if checkpoint is None:
+            raise HTTPException(status_code=404, detail=f"Strategy execution '{run_id}' not found")
+
+        execution_started_at = datetime.utcnow().isoformat()
+        # Register before queueing so the resumed run can be cancelled while it waits
+        execution_service.register_run(run_id)
+
+        def run_strategy():
+            try:
+                execution_service.resume_run(run_id, checkpoint)
+            except Exception as e:  # Background execution errors logged only
+                logger.error(f"Background strategy resume failed: {e}")
+
+        background_tasks.add_task(run_strategy)
+
+        remaining = len(checkpoint.remaining)
+        logger.info(f"Resuming strategy execution: {checkpoint.strategy_code} with {remaining}/{len(checkpoint.tickers)} tickers remaining (run_id: {run_id})")
+
+        return StrategyExecutionResponse(
+            run_id=run_id,
+            status="running",
+            message=f"Strategy '{checkpoint.strategy_code}' resumed with {remaining} of {len(checkpoint.tickers)} tickers remaining",
+            strategy_code=checkpoint.strategy_code,
+            total_tickers=len(checkpoint.tickers),
+            execution_started_at=execution_started_at
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to resume run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to resume run: {str(e)}")
+
+
 @router.get("/list", response_model=StrategyListResponse)
 async def list_available_strategies(db=Depends(get_db)):
     """
@@ -383,6 +529,7 @@ async def execute_strategy_sync(
         run_id = request.run_id or str(uuid.uuid4())
         strategy_code = request.resolve_strategy_code()
         symbols = request.resolve_symbols(db)
+        parameters = request.resolve_parameters()
         execution_service = get_strategy_execution_service(db)
         strategy_info = execution_service.get_strategy_info(strategy_code)
         if not strategy_info:
@@ -395,7 +542,7 @@ async def execute_strategy_sync(
         result = execution_service.execute_strategy_sync(
             strategy_code=strategy_code,
             tickers=symbols,
-            parameters=request.parameters,
+            parameters=parameters,
             run_id=run_id
         )
         
@@ -416,7 +563,7 @@ async def execute_strategy_sync(
         return StrategyResultsResponse(
             run_id=run_id,
             strategy_code=strategy_code,
-            status="completed",
+            status=result.status,
             total_evaluated=result.total_evaluated,
             qualifying_count=result.qualifying_count,
             execution_time_ms=result.execution_time_ms,
@@ -428,4 +575,211 @@ async def execute_strategy_sync(
         raise
     except Exception as e:
         logger.error(f"Failed to execute strategy synchronously: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to execute strategy: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to execute strategy: {str(e)}")
+
+
+@router.post("/sweep", response_model=StrategySweepResponse)
+async def start_parameter_sweep(
+    request: StrategySweepRequest,
+    background_tasks: BackgroundTasks,
+    db=Depends(get_db)
+):
+    """
+    Run a strategy over a grid of parameter combinations (in background).
+
+    Indicators are computed once per ticker and every combination is scored
+    against that shared state. Each combination is stored as a child run of
+    the returned sweep_id; poll /strategies/status/{sweep_id} for progress and
+    /strategies/sweep/{sweep_id} for the per-combination comparison.
+    """
+    try:
+        sweep_id = request.run_id or str(uuid.uuid4())
+        strategy_code = request.resolve_strategy_code()
+        symbols = request.resolve_symbols(db)
+        parameters = request.resolve_parameters()
+
+        # Ensures strategy services are registered
+        get_strategy_execution_service(db)
+        sweep_service = get_parameter_sweep_service(db)
+
+        try:
+            combinations = sweep_service.plan_sweep(strategy_code, request.grid)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        execution_started_at = datetime.utcnow().isoformat()
+
+        def run_sweep():
+            try:
+                sweep_service.run_sweep(
+                    strategy_code=strategy_code,
+                    tickers=symbols,
+                    grid=request.grid,
+                    base_parameters=parameters,
+                    sweep_id=sweep_id
+                )
+            except Exception as e:  # Background execution errors logged only
+                logger.error(f"Background parameter sweep failed: {e}")
+
+        background_tasks.add_task(run_sweep)
+
+        logger.info(f"Started parameter sweep: {strategy_code} with {len(combinations)} combinations x {len(symbols)} tickers (sweep_id: {sweep_id})")
+
+        return StrategySweepResponse(
+            sweep_id=sweep_id,
+            status="running",
+            message=f"Parameter sweep for '{strategy_code}' started",
+            strategy_code=strategy_code,
+            total_tickers=len(symbols),
+            combination_count=len(combinations),
+            execution_started_at=execution_started_at
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to start parameter sweep: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start parameter sweep: {str(e)}")
+
+
+@router.get("/sweep/{sweep_id}")
+async def get_parameter_sweep(sweep_id: str, db=Depends(get_db)):
+    """
+    Get the child runs of a parameter sweep with per-combination pass counts.
+    """
+    try:
+        sweep = get_parameter_sweep_service(db).get_sweep_results(sweep_id)
+        if not sweep:
+            raise HTTPException(status_code=404, detail=f"Parameter sweep '{sweep_id}' not found")
+        return FastJSONResponse(sweep)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get parameter sweep {sweep_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get parameter sweep: {str(e)}")
+
+
+@router.post("/backtest", response_model=StrategyBacktestResponse)
+async def start_backtest(
+    request: StrategyBacktestRequest,
+    background_tasks: BackgroundTasks,
+    db=Depends(get_db)
+):
+    """
+    Replay a strategy over every historical date in a window (in background).
+
+    Poll /strategies/backtest/{backtest_id} for the hit rates and forward
+    returns of signal dates versus all evaluated dates.
+    """
+    try:
+        strategy_code = request.resolve_strategy_code()
+        symbols = request.resolve_symbols(db)
+        parameters = request.resolve_parameters()
+
+        # Ensures strategy services are registered
+        get_strategy_execution_service(db)
+        backtest_service = get_backtest_service(get_price_bar_store(db))
+
+        config = BacktestConfig(
+            strategy_code=strategy_code,
+            tickers=symbols,
+            parameters=parameters,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            horizons=request.horizons,
+            history_period=request.history_period,
+            refresh=request.refresh,
+            max_workers=int(parameters.get("max_workers", 8)),
+            include_signals=request.include_signals
+        )
+        try:
+            backtest_id = backtest_service.start_backtest(config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        execution_started_at = datetime.utcnow().isoformat()
+
+        def run_backtest():
+            try:
+                backtest_service.run_backtest(config, backtest_id=backtest_id)
+            except Exception as e:  # Background execution errors logged only
+                logger.error(f"Background backtest failed: {e}")
+
+        background_tasks.add_task(run_backtest)
+
+        logger.info(f"Started backtest: {strategy_code} with {len(symbols)} tickers (backtest_id: {backtest_id})")
+
+        return StrategyBacktestResponse(
+            backtest_id=backtest_id,
+            status="running",
+            message=f"Backtest for '{strategy_code}' started",
+            strategy_code=strategy_code,
+            total_tickers=len(symbols),
+            execution_started_at=execution_started_at
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to start backtest: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start backtest: {str(e)}")
+
+
+@router.get("/backtest/{backtest_id}")
+async def get_backtest(backtest_id: str):
+    """
+    Get a backtest report (or its running/error status).
+    """
+    report = get_backtest_service().get_backtest(backtest_id)
+    if not report:
+        raise HTTPException(status_code=404, detail=f"Backtest '{backtest_id}' not found")
+    return FastJSONResponse(report)
+
+
+@router.post("/buffett/screen")
+@blocking_route()
+def screen_buffett(request: BuffettScreenRequest):
+    """
+    Re-evaluate the Buffett screen with new thresholds over stored fundamentals.
+
+    Metrics are computed once from the fundamentals store (and recomputed only
+    when it changes); each call only re-runs the vectorized rule engine, so
+    threshold tweaks return immediately. Populate the store with a buffett run
+    or buffett_screener.py first.
+    """
+    try:
+        try:
+            cfg = ScreenerConfig.from_overrides(request.thresholds)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        metrics = get_stored_metrics()
+        if request.symbols:
+            wanted = {s.upper().strip() for s in request.symbols}
+            metrics = metrics[metrics["symbol"].isin(wanted)]
+
+        result = evaluate(metrics, cfg)
+        survivors = rank_survivors(metrics[result.passed]).head(request.limit)
+        response = {
+            "thresholds": asdict(cfg),
+            "total": len(metrics),
+            "passed_count": int(result.passed.sum()),
+            "rules": [rule.label for rule in SCREEN_RULES],
+            "failure_counts": result.failure_counts(),
+            "survivors": survivors.to_dict("records"),
+        }
+        if request.include_failed:
+            failed = metrics.index[~result.passed][:request.limit]
+            response["failed"] = [
+                {
+                    "symbol": metrics.at[i, "symbol"],
+                    "why_failed": result.why_failed[i],
+                    "failed_rules": result.failed_rules(int(result.failure_bits[i])),
+                }
+                for i in failed
+            ]
+        return FastJSONResponse(response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to evaluate Buffett screen: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate Buffett screen: {str(e)}")
+
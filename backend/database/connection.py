@@ -8,6 +8,7 @@ strategy execution system.
 import sqlite3
 import os
 import logging
+import threading
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -60,6 +61,7 @@ def initialize_execution_tables(db_connection: sqlite3.Connection):
                 last_progress_update TEXT,
                 execution_time_ms INTEGER,
                 summary TEXT,
+                tickers_json TEXT,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -100,6 +102,51 @@ def initialize_execution_tables(db_connection: sqlite3.Connection):
         raise
 
 
+def ensure_strategy_run_columns(db_connection: sqlite3.Connection):
+    """
+    Add strategy_run columns introduced after the v4 schema if they are missing.
+    
+    Mirrors the db.py v5 migration so databases created before parameter sweeps
+    can store grouped child runs without running the CLI schema upgrade.
+    
+    Args:
+        db_connection: SQLite database connection
+    """
+    try:
+        columns = [row[1] for row in db_connection.execute("PRAGMA table_info(strategy_run)").fetchall()]
+        if not columns:
+            return
+        if "parent_run_id" not in columns:
+            db_connection.execute("ALTER TABLE strategy_run ADD COLUMN parent_run_id TEXT")
+            logger.info("Added parent_run_id column to strategy_run")
+        db_connection.execute("CREATE INDEX IF NOT EXISTS ix_run_parent ON strategy_run(parent_run_id)")
+        db_connection.commit()
+    except Exception as e:
+        logger.error(f"Failed to ensure strategy_run columns: {e}")
+
+
+def ensure_execution_status_columns(db_connection: sqlite3.Connection):
+    """
+    Add strategy_execution_status columns introduced after the table was created.
+    
+    ``tickers_json`` records a run's ticker universe so an interrupted run can
+    be resumed from its checkpoint (see StrategyExecutionService.resume_run).
+    
+    Args:
+        db_connection: SQLite database connection
+    """
+    try:
+        columns = [row[1] for row in db_connection.execute("PRAGMA table_info(strategy_execution_status)").fetchall()]
+        if not columns:
+            return
+        if "tickers_json" not in columns:
+            db_connection.execute("ALTER TABLE strategy_execution_status ADD COLUMN tickers_json TEXT")
+            logger.info("Added tickers_json column to strategy_execution_status")
+        db_connection.commit()
+    except Exception as e:
+        logger.error(f"Failed to ensure strategy_execution_status columns: {e}")
+
+
 def verify_database_schema(db_connection: sqlite3.Connection) -> bool:
     """
     Verify that required tables exist in the database.
@@ -149,6 +196,9 @@ def setup_database() -> sqlite3.Connection:
             logger.info("Initializing missing database tables...")
             initialize_execution_tables(db)
         
+        ensure_strategy_run_columns(db)
+        ensure_execution_status_columns(db)
+        
         return db
         
     except Exception as e:
@@ -225,6 +275,41 @@ class DatabaseManager:
             self._connection = None
 
 
+class ThreadLocalDatabaseManager(DatabaseManager):
+    """Database manager holding one connection per thread.
+
+    For long-lived services called from the blocking-route thread pool, where a
+    single shared connection would interleave cursors and transactions.
+    """
+
+    def __init__(self, db_path: str = None):
+        """Initialize database manager with optional path."""
+        super().__init__(db_path)
+        self._local = threading.local()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get this thread's database connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+
+    def commit(self):
+        """Commit this thread's transaction."""
+        connection = getattr(self._local, "connection", None)
+        if connection:
+            connection.commit()
+
+    def close(self):
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection:
+            connection.close()
+            self._local.connection = None
+
+
 def get_db_manager(db_path: str = None):
     """
     Get database manager instance for backward compatibility.
@@ -4,6 +4,7 @@ This module sets up the FastAPI application with CORS middleware,
 error handling, and route registration.
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -11,7 +12,9 @@ from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 
 from .api.holdings import router as holdings_router
 from .api.instruments import router as instruments_router
@@ -20,6 +23,8 @@ from .api.strategies import router as strategies_router
 from .api.stocks import router as stocks_router
 # Import working simplified router (renamed for clarity)
 from .api.strategy_execution_simplified import router as strategy_execution_simplified_router
+from .api.http_cache import ConditionalGetMiddleware
+from .api.blocking import shutdown_blocking_executor
 
 
 # Configure logging
@@ -33,6 +38,12 @@ logger = logging.getLogger(__name__)
 DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "at_data.sqlite")
 DB_PATH = os.getenv("DATABASE_PATH", DEFAULT_DB_PATH)
 
+# Responses smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+# Hours between portfolio snapshot jobs (0 disables the job)
+PORTFOLIO_SNAPSHOT_INTERVAL_HOURS = float(os.getenv("PORTFOLIO_SNAPSHOT_INTERVAL_HOURS", "24"))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -57,10 +68,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Database verification during startup failed: {e} - continuing without verification")
     
+    # Daily portfolio value snapshots (reads stored price bars)
+    snapshot_task = None
+    if PORTFOLIO_SNAPSHOT_INTERVAL_HOURS > 0:
+        from .services.portfolio_history_service import run_snapshot_scheduler
+        snapshot_task = asyncio.create_task(run_snapshot_scheduler(PORTFOLIO_SNAPSHOT_INTERVAL_HOURS))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down automated trading API")
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    shutdown_blocking_executor()
 
 
 def create_app() -> FastAPI:
@@ -85,6 +105,15 @@ def create_app() -> FastAPI:
         expose_headers=["*"], # Expose all headers
     )
     
+    # ETags + 304s for polled JSON endpoints; compression wraps it so ETags
+    # are computed on the uncompressed body (Parquet is already compressed)
+    app.add_middleware(ConditionalGetMiddleware)
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=GZIP_MINIMUM_SIZE,
+        exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/vnd.apache.parquet",)
+    )
+    
     # Request logging middleware
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
@@ -158,6 +158,21 @@ class PerformanceResponse(BaseModel):
     performance_metrics: PerformanceMetrics = Field(default_factory=PerformanceMetrics)
 
 
+class PortfolioHistoryPoint(BaseModel):
+    """Portfolio value on one snapshot date."""
+    date: str
+    market_value: float
+    cost_basis: Optional[float] = None
+
+
+class PortfolioHistoryResponse(BaseModel):
+    """Portfolio value series from daily snapshots."""
+    account: Optional[str] = None  # None = all accounts
+    total_points: int = 0  # Snapshots in range before downsampling
+    downsampled: bool = False
+    points: List[PortfolioHistoryPoint] = Field(default_factory=list)
+
+
 class MarketPrice(BaseModel):
     """Market price data for a single ticker."""
     price: Optional[float] = None
@@ -542,10 +557,33 @@ class HoldingsImportSummary(BaseModel):
     account_summaries: List[AccountImportSummary] = Field(default_factory=list)
 
 
+class HoldingChange(BaseModel):
+    """Single lot change applied by a reconciling import."""
+    account_number: str
+    ticker: str
+    lot_tag: Optional[str] = None
+    action: str  # insert, update, close
+    old_quantity: Optional[float] = None
+    new_quantity: Optional[float] = None
+    old_cost_basis: Optional[float] = None
+    new_cost_basis: Optional[float] = None
+
+
+class HoldingsReconciliationSummary(BaseModel):
+    """Keyed diff applied by a reconciling import."""
+    inserted: int = 0
+    updated: int = 0
+    closed: int = 0
+    unchanged: int = 0
+    affected_tickers: List[str] = Field(default_factory=list)
+    changes: List[HoldingChange] = Field(default_factory=list)
+
+
 class HoldingsImportResponse(BaseModel):
     """Response schema for holdings CSV import."""
     detected_accounts: List[DetectedAccount] = Field(default_factory=list)
     import_summary: HoldingsImportSummary
+    reconciliation: Optional[HoldingsReconciliationSummary] = None  # Set in reconcile mode
     imported_records: List[ImportedHoldingRecord] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
     warnings: List[str] = Field(default_factory=list)
@@ -232,4 +232,21 @@ class AddInstrumentResponse(BaseModel):
     message: str = Field(description="Status message")
     added: bool = Field(description="Whether instrument was added")
     metadata_fetched: bool = Field(description="Whether metadata was fetched")
-    existing: bool = Field(description="Whether instrument already existed")
\ No newline at end of file
+    existing: bool = Field(description="Whether instrument already existed")
+
+class PriceBar(BaseModel):
+    """Stored OHLCV bar."""
+    date: datetime = Field(description="Bar timestamp")
+    open: Optional[float] = Field(None, description="Opening price")
+    high: Optional[float] = Field(None, description="High price")
+    low: Optional[float] = Field(None, description="Low price")
+    close: float = Field(description="Closing price")
+    volume: Optional[float] = Field(None, description="Volume")
+
+
+class PriceBarsResponse(BaseModel):
+    """Stored price bars for a stock."""
+    ticker: str = Field(description="Stock ticker symbol")
+    interval: str = Field(description="Bar interval")
+    bars: List[PriceBar] = Field(description="Bars in ascending date order")
+    count: int = Field(description="Number of bars")
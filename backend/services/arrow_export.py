@@ -0,0 +1,215 @@
+"""
+Arrow Export
+
+Encodes API tables as Arrow IPC streams or Parquet files so research clients
+can load strategy results, positions and stored bars straight into
+pandas/polars without rebuilding DataFrames from JSON. Column types are
+derived from the Pydantic response models, so a run's metrics arrive with a
+stable, typed schema. pyarrow is an optional dependency imported on first use.
+"""
+
+import datetime
+import typing
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+# format query value -> media type
+ARROW_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Python annotation -> pyarrow type factory name
+_SCALAR_TYPES = {
+    float: "float64",
+    int: "int64",
+    bool: "bool_",
+    str: "string",
+    datetime.datetime: "timestamp",
+    datetime.date: "date32",
+}
+
+
+class ArrowUnavailableError(RuntimeError):
+    """Raised when an Arrow/Parquet export is requested but pyarrow is not installed."""
+
+
+def _pyarrow():
+    """Import pyarrow lazily so the API runs without it."""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ArrowUnavailableError("pyarrow is not installed; Arrow and Parquet formats are unavailable")
+
+
+def _type_name(annotation) -> Optional[str]:
+    """Map a field annotation to a scalar type name (None if it has no scalar mapping)."""
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if typing.get_origin(annotation) is typing.Union:
+        return _type_name(args[0]) if len(args) == 1 else None
+    return _SCALAR_TYPES.get(annotation)
+
+
+def _arrow_type(pa, annotation):
+    """Map a field annotation to a pyarrow type, or None if it is not tabular."""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _arrow_type(pa, args[0]) if len(args) == 1 else None
+    if typing.get_origin(annotation) in (list, List):
+        item = _type_name(typing.get_args(annotation)[0])
+        return pa.list_(_scalar_type(pa, item)) if item else None
+    name = _type_name(annotation)
+    return _scalar_type(pa, name) if name else None
+
+
+def _scalar_type(pa, name: str):
+    if name == "timestamp":
+        return pa.timestamp("us")
+    return getattr(pa, name)()
+
+
+def model_schema(model: typing.Type[BaseModel], exclude: Sequence[str] = ()):
+    """
+    Build an Arrow schema from a Pydantic model's fields.
+
+    Scalar and list-of-scalar fields become nullable columns in declaration
+    order; nested models and dict fields are skipped.
+
+    Args:
+        model: Pydantic model class
+        exclude: Field names to leave out
+
+    Returns:
+        pyarrow.Schema
+    """
+    pa = _pyarrow()
+    fields = []
+    for name, info in model.model_fields.items():
+        if name in exclude:
+            continue
+        arrow_type = _arrow_type(pa, info.annotation)
+        if arrow_type is not None:
+            fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def merge_schemas(*schemas):
+    """Concatenate schemas, keeping the first field for any repeated name."""
+    pa = _pyarrow()
+    seen = set()
+    fields = []
+    for schema in schemas:
+        for field in schema:
+            if field.name not in seen:
+                seen.add(field.name)
+                fields.append(field)
+    return pa.schema(fields)
+
+
+def _coercer(pa, arrow_type) -> Optional[Callable[[Any], Any]]:
+    """Python constructor used to normalize values for a scalar column type."""
+    if pa.types.is_floating(arrow_type):
+        return float
+    if pa.types.is_integer(arrow_type):
+        return int
+    if pa.types.is_boolean(arrow_type):
+        return bool
+    if pa.types.is_string(arrow_type):
+        return str
+    return None
+
+
+def records_to_columns(schema, records: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Transpose dict records into schema-ordered columns.
+
+    Missing keys become nulls and scalar values are coerced to the column
+    type; values that cannot be coerced (e.g. a string in a numeric metric)
+    become nulls instead of failing the whole export.
+    """
+    pa = _pyarrow()
+    coercers = [(field.name, _coercer(pa, field.type)) for field in schema]
+    columns: Dict[str, List[Any]] = {name: [] for name, _ in coercers}
+    for record in records:
+        for name, coerce in coercers:
+            value = record.get(name)
+            if value is not None and coerce is not None and type(value) is not coerce:
+                try:
+                    value = coerce(value)
+                except (TypeError, ValueError, OverflowError):
+                    value = None
+            columns[name].append(value)
+    return columns
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_encoded(schema, batches: Iterable[Dict[str, List[Any]]], export_format: str) -> Iterator[bytes]:
+    """
+    Encode column batches incrementally as an Arrow IPC stream or Parquet file.
+
+    Each batch is written as one record batch (IPC) or row group (Parquet) and
+    the encoded bytes are yielded immediately, so callers can stream the output.
+
+    Args:
+        schema: pyarrow.Schema of the batches
+        batches: Iterable of {column: values} dicts
+        export_format: "arrow" or "parquet"
+
+    Returns:
+        Iterator of encoded byte chunks
+    """
+    if export_format not in ARROW_MEDIA_TYPES:
+        raise ValueError(f"Unsupported columnar format: {export_format}")
+    pa = _pyarrow()
+    sink = _ChunkSink()
+    stream = pa.PythonFile(sink, mode="w")
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(stream, schema)
+    else:
+        writer = pa.ipc.new_stream(stream, schema)
+    # Setup errors surface here; encoding proceeds lazily as the caller iterates
+    return _write_batches(pa, writer, sink, schema, batches)
+
+
+def _write_batches(pa, writer, sink: _ChunkSink, schema, batches) -> Iterator[bytes]:
+    try:
+        for columns in batches:
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def encode_records(schema, records: Iterable[Dict[str, Any]], export_format: str) -> bytes:
+    """Encode a list of records as a single Arrow IPC stream or Parquet file."""
+    return b"".join(iter_encoded(schema, [records_to_columns(schema, records)], export_format))
@@ -0,0 +1,298 @@
+"""
+Anchored VWAP Engine
+
+Keeps per-ticker prefix sums of typical-price*volume and volume so the VWAP
+anchored at any bar is the difference of two prefix entries (O(1) per anchor)
+instead of a scan over every bar since the anchor. Supported anchors:
+
+- ``breakout``: first close above the prior 126-bar closing high inside the
+  search window (the LEAP rule), else 15 bars back
+- ``earnings``: the most recent earnings date on or before the last bar
+- ``52w_low``: the lowest low of the last 252 bars
+
+Series are immutable; new bars produce an extended copy that only sums the new
+bars, so readers never see a half-updated series. Bars overlapping the end of a
+series (a refreshed partial bar) replace the stored tail. Missing values are
+skipped independently, like ``cumsum``.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANCHOR_KINDS = ("breakout", "earnings", "52w_low")
+
+BREAKOUT_LOOKBACK = 126
+FALLBACK_ANCHOR_BARS = 15
+LOW_52W_BARS = 252
+
+# Bars searched for the breakout anchor (about the LEAP default 2y download)
+BREAKOUT_WINDOW_BARS = 504
+
+# Ticker series kept in memory (least recently used are dropped)
+MAX_SERIES = 512
+
+
+class VWAPSeries:
+    """Prefix sums of one ticker's bars; ``cum_*[i]`` covers the bars before position ``i``."""
+
+    def __init__(self, dates, close, low, cum_tpv, cum_volume):
+        self.dates = dates
+        self.close = close
+        self.low = low
+        self.cum_tpv = cum_tpv
+        self.cum_volume = cum_volume
+
+    @classmethod
+    def from_bars(cls, bars) -> "VWAPSeries":
+        """Build a series from a DataFrame with a DatetimeIndex and high/low/close/volume columns."""
+        import numpy as np
+
+        tpv, volume = _bar_sums(np, bars)
+        return cls(
+            bars.index,
+            bars["close"].to_numpy(dtype=float),
+            bars["low"].to_numpy(dtype=float),
+            np.concatenate(([0.0], np.cumsum(tpv))),
+            np.concatenate(([0.0], np.cumsum(volume))),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if len(self) else None
+
+    def extended(self, bars) -> "VWAPSeries":
+        """
+        Return a series with ``bars`` appended.
+
+        ``bars`` must be contiguous; any stored bars on or after its first date
+        are replaced, so only the new bars are summed.
+        """
+        import numpy as np
+
+        if bars is None or len(bars) == 0:
+            return self
+        keep = int(self.dates.searchsorted(bars.index[0], side="left"))
+        if keep == 0:
+            return VWAPSeries.from_bars(bars)
+        tpv, volume = _bar_sums(np, bars)
+        return VWAPSeries(
+            self.dates[:keep].append(bars.index),
+            np.concatenate((self.close[:keep], bars["close"].to_numpy(dtype=float))),
+            np.concatenate((self.low[:keep], bars["low"].to_numpy(dtype=float))),
+            np.concatenate((self.cum_tpv[:keep + 1], self.cum_tpv[keep] + np.cumsum(tpv))),
+            np.concatenate((self.cum_volume[:keep + 1], self.cum_volume[keep] + np.cumsum(volume))),
+        )
+
+    def vwap(self, start: int, end: Optional[int] = None) -> Optional[float]:
+        """VWAP of the bars ``start`` .. ``end - 1`` (through the last bar by default)."""
+        end = len(self) if end is None else end
+        volume = self.cum_volume[end] - self.cum_volume[start]
+        if volume == 0:
+            return None
+        return float((self.cum_tpv[end] - self.cum_tpv[start]) / volume)
+
+    def position(self, date) -> int:
+        """Position of the first bar on or after ``date``."""
+        return int(self.dates.searchsorted(date, side="left"))
+
+    def breakout_anchor(self, window: int = BREAKOUT_WINDOW_BARS) -> int:
+        """First close above the prior 126-bar closing high in the last ``window`` bars."""
+        import numpy as np
+
+        start = max(len(self) - window, 0)
+        close = self.close[start:]
+        if len(close) > BREAKOUT_LOOKBACK:
+            prior_high = np.lib.stride_tricks.sliding_window_view(close[:-1], BREAKOUT_LOOKBACK).max(axis=1)
+            breakout = close[BREAKOUT_LOOKBACK:] > prior_high
+            if breakout.any():
+                return start + BREAKOUT_LOOKBACK + int(np.argmax(breakout))
+        return max(len(self) - FALLBACK_ANCHOR_BARS, 0)
+
+    def low_anchor(self, bars: int = LOW_52W_BARS) -> Optional[int]:
+        """Bar with the lowest low (close where the low is missing) of the last ``bars`` bars."""
+        import numpy as np
+
+        start = max(len(self) - bars, 0)
+        lows = np.where(np.isnan(self.low[start:]), self.close[start:], self.low[start:])
+        if np.isnan(lows).all():
+            return None
+        return start + int(np.nanargmin(lows))
+
+    def earnings_anchor(self, earnings_dates: Iterable[Any]) -> Optional[int]:
+        """First bar of the most recent earnings date on or before the last bar."""
+        last = self.last_date
+        past = [d for d in earnings_dates if d <= last]
+        if not past:
+            return None
+        position = self.position(max(past))
+        return position if position < len(self) else None
+
+    def summary(self, position: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Anchor date, VWAP and close distance from it for an anchor position."""
+        if position is None:
+            return None
+        vwap = self.vwap(position)
+        close = float(self.close[-1])
+        return {
+            "anchor_date": self.dates[position].strftime("%Y-%m-%d"),
+            "vwap": vwap,
+            "distance_pct": (close - vwap) / vwap * 100.0 if vwap else None,
+        }
+
+
+class AVWAPEngine:
+    """In-memory anchored VWAP series per ticker, extended as new bars arrive."""
+
+    def __init__(self, store=None,
+                 earnings_loader: Optional[Callable[[str], List[Any]]] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            store: PriceBarStore used by ``load`` (defaults to the shared store)
+            earnings_loader: ``loader(ticker)`` returning earnings dates, or None
+                (defaults to yfinance)
+        """
+        self._store = store
+        self._earnings_loader = earnings_loader or _download_earnings_dates
+        self._series: "OrderedDict[Tuple[str, str], VWAPSeries]" = OrderedDict()
+        self._earnings: Dict[str, Tuple[str, List[Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str, interval: str = "1d") -> Optional[VWAPSeries]:
+        """Return the cached series for a ticker, or None."""
+        key = (ticker.upper(), interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+            return series
+
+    def update(self, ticker: str, bars, interval: str = "1d") -> Optional[VWAPSeries]:
+        """Append bars to a ticker's series (creating it if needed) and return the series."""
+        key = (ticker.upper(), interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if bars is None or len(bars) == 0:
+                    return None
+                series = VWAPSeries.from_bars(bars)
+            else:
+                series = series.extended(bars)
+            self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > MAX_SERIES:
+                self._series.popitem(last=False)
+            return series
+
+    def load(self, ticker: str, period: str = "5y", interval: str = "1d",
+             refresh: bool = True) -> Optional[VWAPSeries]:
+        """
+        Series for a ticker from the price bar store.
+
+        Only bars from the cached series' last date on are read, so repeated
+        loads sum just the bars added since.
+        """
+        store = self._store
+        if store is None:
+            from .price_bar_store import get_price_bar_store
+            store = self._store = get_price_bar_store()
+        if refresh:
+            try:
+                store.refresh(ticker, period, interval)
+            except Exception as e:
+                logger.warning(f"Failed to refresh bars for {ticker}: {e}")
+        series = self.get(ticker, interval)
+        start = series.last_date.strftime("%Y-%m-%d") if series is not None else None
+        bars = store.get_bars(ticker, start, None, interval)
+        if bars is None:
+            return series
+        return self.update(ticker, bars, interval)
+
+    def anchored(self, ticker: str, kinds: Iterable[str] = ANCHOR_KINDS,
+                 interval: str = "1d", series: Optional[VWAPSeries] = None) -> Dict[str, Any]:
+        """
+        Anchored VWAP for each requested anchor kind.
+
+        Returns:
+            Dict of kind -> ``{anchor_date, vwap, distance_pct}``, or None for
+            kinds without an anchor (no earnings date, no cached series)
+        """
+        series = series or self.get(ticker, interval)
+        out: Dict[str, Any] = {}
+        for kind in kinds:
+            if kind not in ANCHOR_KINDS:
+                raise ValueError(f"Unknown AVWAP anchor '{kind}' (expected one of {', '.join(ANCHOR_KINDS)})")
+            if series is None or len(series) == 0:
+                out[kind] = None
+            elif kind == "breakout":
+                out[kind] = series.summary(series.breakout_anchor())
+            elif kind == "52w_low":
+                out[kind] = series.summary(series.low_anchor())
+            else:
+                out[kind] = series.summary(series.earnings_anchor(self.earnings_dates(ticker)))
+        return out
+
+    def earnings_dates(self, ticker: str) -> List[Any]:
+        """Earnings dates of a ticker, loaded once per UTC day (failures cache an empty list)."""
+        ticker = ticker.upper()
+        today = datetime.utcnow().date().isoformat()
+        cached = self._earnings.get(ticker)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        try:
+            dates = list(self._earnings_loader(ticker) or [])
+        except Exception as e:
+            logger.warning(f"Failed to load earnings dates for {ticker}: {e}")
+            dates = []
+        self._earnings[ticker] = (today, dates)
+        return dates
+
+    def clear(self):
+        """Drop every cached series and earnings calendar."""
+        with self._lock:
+            self._series.clear()
+            self._earnings.clear()
+
+
+def _bar_sums(np, bars) -> Tuple[Any, Any]:
+    """Typical-price*volume and volume per bar, with missing values as 0."""
+    high = bars["high"].to_numpy(dtype=float)
+    low = bars["low"].to_numpy(dtype=float)
+    close = bars["close"].to_numpy(dtype=float)
+    volume = bars["volume"].to_numpy(dtype=float)
+    tpv = (high + low + close) / 3.0 * volume
+    return np.nan_to_num(tpv, nan=0.0), np.nan_to_num(volume, nan=0.0)
+
+
+def _download_earnings_dates(ticker: str) -> List[Any]:
+    """Past and scheduled earnings dates from yfinance (tz-naive, normalized to the day)."""
+    import yfinance as yf
+
+    frame = yf.Ticker(ticker).get_earnings_dates(limit=12)
+    if frame is None or len(frame) == 0:
+        return []
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return sorted(set(index.normalize()))
+
+
+# Global engine instance
+_avwap_engine: Optional[AVWAPEngine] = None
+
+
+def get_avwap_engine() -> AVWAPEngine:
+    """Get or create global anchored VWAP engine."""
+    global _avwap_engine
+    if _avwap_engine is None:
+        _avwap_engine = AVWAPEngine()
+    return _avwap_engine
@@ -0,0 +1,375 @@
+"""
+Backtest Service
+
+Replays a strategy over every historical bar in a date window using stored
+price bars (see PriceBarStore) and measures forward returns after each date.
+Each ticker's indicators are computed once over its full history and every date
+is scored from that rolling state, so a window costs one indicator pass per
+ticker instead of one full recomputation per date.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .base_strategy_service import BaseStrategyService, ProgressCallback, get_strategy_registry
+from .evaluation_scheduler import get_evaluation_scheduler
+from .price_bar_store import PriceBarStore, get_price_bar_store
+
+logger = logging.getLogger(__name__)
+
+# Forward return horizons in bars
+DEFAULT_HORIZONS = [5, 20, 60]
+MAX_HORIZON = 252
+
+# Benchmark used for relative-strength rules
+BENCHMARK_TICKER = "SPY"
+
+# Number of tickers between progress updates
+PROGRESS_BATCH_SIZE = 10
+
+
+@dataclass
+class BacktestConfig:
+    """Configuration for a historical backtest."""
+    strategy_code: str
+    tickers: List[str]
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    horizons: List[int] = field(default_factory=lambda: list(DEFAULT_HORIZONS))
+    history_period: str = "5y"
+    refresh: bool = True
+    max_workers: int = 8
+    include_signals: bool = False
+
+
+@dataclass
+class BacktestReport:
+    """Hit rates and forward returns of a completed backtest."""
+    backtest_id: str
+    strategy_code: str
+    parameters: Dict[str, Any]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    horizons: List[int]
+    total_tickers: int
+    evaluated_tickers: int
+    samples: int
+    signals: int
+    signal_rate_percent: float
+    signal_returns: Dict[str, Dict[str, Any]]
+    baseline_returns: Dict[str, Dict[str, Any]]
+    by_classification: Dict[str, Dict[str, Any]]
+    tickers: List[Dict[str, Any]]
+    failed_tickers: Dict[str, str]
+    execution_time_ms: int
+    signal_events: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "completed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _return_stats(np, values) -> Dict[str, Any]:
+    """Summarize forward returns (fractions) as percentages, ignoring missing values."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0, "hit_rate_percent": None, "avg_return_percent": None,
+                "median_return_percent": None}
+    return {
+        "count": int(len(values)),
+        "hit_rate_percent": round(float((values > 0).mean()) * 100, 1),
+        "avg_return_percent": round(float(values.mean()) * 100, 2),
+        "median_return_percent": round(float(np.median(values)) * 100, 2),
+    }
+
+
+class BacktestService:
+    """Runs historical replays for strategies that support history (``ReplayableStrategy``)."""
+
+    def __init__(self, bar_store: Optional[PriceBarStore] = None):
+        self._bar_store = bar_store
+        self.registry = get_strategy_registry()
+        self._reports: Dict[str, Dict[str, Any]] = {}
+        self._reports_lock = threading.Lock()
+
+    @property
+    def bar_store(self) -> PriceBarStore:
+        if self._bar_store is None:
+            self._bar_store = get_price_bar_store()
+        return self._bar_store
+
+    def plan_backtest(self, config: BacktestConfig) -> BaseStrategyService:
+        """
+        Validate a backtest configuration.
+
+        Returns:
+            The strategy service to replay
+
+        Raises:
+            ValueError: If the strategy is unknown or cannot be replayed, no tickers
+                        are given, or the horizons/dates are invalid
+        """
+        service = self.registry.get(config.strategy_code)
+        if not service:
+            raise ValueError(f"Strategy '{config.strategy_code}' not found")
+        if not service.supports_history:
+            raise ValueError(f"Strategy '{config.strategy_code}' does not support backtesting")
+        if not config.tickers:
+            raise ValueError("No tickers supplied")
+        if not config.horizons or any(
+            not isinstance(h, int) or h <= 0 or h > MAX_HORIZON for h in config.horizons
+        ):
+            raise ValueError(f"Horizons must be positive integers up to {MAX_HORIZON} bars")
+        for value in (config.start_date, config.end_date):
+            if value:
+                try:
+                    datetime.strptime(value[:10], "%Y-%m-%d")
+                except ValueError:
+                    raise ValueError(f"Invalid date '{value}' (expected YYYY-MM-DD)")
+        if config.start_date and config.end_date and config.start_date > config.end_date:
+            raise ValueError("start_date must not be after end_date")
+        return service
+
+    def start_backtest(self, config: BacktestConfig) -> str:
+        """Validate a backtest and register it as running; returns the backtest ID."""
+        self.plan_backtest(config)
+        backtest_id = str(uuid.uuid4())
+        with self._reports_lock:
+            self._reports[backtest_id] = {
+                "backtest_id": backtest_id,
+                "strategy_code": config.strategy_code,
+                "status": "running",
+                "started_at": datetime.utcnow().isoformat(),
+            }
+        return backtest_id
+
+    def get_backtest(self, backtest_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored report (or running/error status) for a backtest."""
+        with self._reports_lock:
+            return self._reports.get(backtest_id)
+
+    def run_backtest(self, config: BacktestConfig, backtest_id: Optional[str] = None,
+                     progress_callback: Optional[ProgressCallback] = None) -> BacktestReport:
+        """
+        Replay a strategy over the configured window.
+
+        Args:
+            config: Backtest configuration
+            backtest_id: Optional ID from ``start_backtest`` (generated if not provided)
+            progress_callback: Optional progress callback
+
+        Returns:
+            BacktestReport with signal vs. baseline forward returns per horizon
+        """
+        try:
+            report = self._run(config, backtest_id or str(uuid.uuid4()),
+                               progress_callback or ProgressCallback())
+        except Exception as e:
+            if backtest_id:
+                with self._reports_lock:
+                    self._reports[backtest_id] = {
+                        "backtest_id": backtest_id,
+                        "strategy_code": config.strategy_code,
+                        "status": "error",
+                        "error": str(e),
+                    }
+            raise
+        with self._reports_lock:
+            self._reports[report.backtest_id] = report.to_dict()
+        return report
+
+    def _run(self, config: BacktestConfig, backtest_id: str,
+             progress_callback: ProgressCallback) -> BacktestReport:
+        import numpy as np
+
+        start_time = time.time()
+        service = self.plan_backtest(config)
+        tickers = list(dict.fromkeys([t.strip().upper() for t in config.tickers if t and t.strip()]))
+        horizons = sorted(set(config.horizons))
+
+        logger.info(
+            f"Starting backtest {backtest_id}: {config.strategy_code}, {len(tickers)} tickers, "
+            f"{config.start_date or 'start'}..{config.end_date or 'end'}"
+        )
+        progress_callback.report_setup(
+            "Loading price history for backtest",
+            {"total_tickers": len(tickers), "horizons": horizons}
+        )
+
+        benchmark = None
+        benchmark_bars = self.bar_store.load(BENCHMARK_TICKER, config.history_period,
+                                             refresh=config.refresh)
+        if benchmark_bars is not None:
+            benchmark = benchmark_bars["close"]
+
+        def replay(ticker: str) -> Dict[str, Any]:
+            try:
+                bars = (benchmark_bars if ticker == BENCHMARK_TICKER and benchmark_bars is not None
+                        else self.bar_store.load(ticker, config.history_period, refresh=config.refresh))
+                if bars is None or bars.empty:
+                    return {"ticker": ticker, "error": "no_data"}
+                return self._replay_ticker(np, service, ticker, bars, config, horizons, benchmark)
+            except Exception as e:
+                logger.error(f"Backtest replay failed for {ticker}: {e}")
+                return {"ticker": ticker, "error": str(e)}
+
+        outcomes: List[Dict[str, Any]] = []
+        signals_so_far = 0
+        max_workers = max(1, min(config.max_workers, len(tickers)))
+        # Backtests are batch work and default to low scheduler priority
+        priority = config.parameters.get("priority", "low")
+        for outcome in get_evaluation_scheduler().map(replay, tickers, priority, max_workers):
+            outcomes.append(outcome)
+            signals_so_far += int(outcome["passed"].sum()) if "passed" in outcome else 0
+            if len(outcomes) % PROGRESS_BATCH_SIZE == 0 or len(outcomes) == len(tickers):
+                progress_callback.report_overall_progress(
+                    processed=len(outcomes), total=len(tickers), passed_so_far=signals_so_far
+                )
+
+        report = self._build_report(np, backtest_id, config, horizons, tickers, outcomes,
+                                    int((time.time() - start_time) * 1000))
+        progress_callback.report_completion(
+            total_evaluated=report.samples, passed=report.signals,
+            failed=report.samples - report.signals
+        )
+        logger.info(
+            f"Backtest {backtest_id} completed: {report.samples} samples, {report.signals} signals "
+            f"in {report.execution_time_ms}ms"
+        )
+        return report
+
+    def _replay_ticker(self, np, service: BaseStrategyService, ticker: str, bars,
+                       config: BacktestConfig, horizons: List[int], benchmark) -> Dict[str, Any]:
+        """Score every bar in the window and attach forward returns for each signal date."""
+        import pandas as pd
+
+        index = bars.index
+        first = int(index.searchsorted(pd.Timestamp(config.start_date))) if config.start_date else 0
+        last = (int(index.searchsorted(pd.Timestamp(config.end_date), side="right"))
+                if config.end_date else len(index))
+        history = service.evaluate_history(ticker, bars, config.parameters,
+                                           positions=range(first, last), benchmark=benchmark)
+        if not history:
+            return {"ticker": ticker, "error": "insufficient_history"}
+
+        close = bars["close"].to_numpy(dtype=float)
+        positions = index.get_indexer([date for date, _ in history])
+        forward = np.full((len(positions), len(horizons)), np.nan)
+        for j, h in enumerate(horizons):
+            valid = positions + h < len(close)
+            forward[valid, j] = close[positions[valid] + h] / close[positions[valid]] - 1
+
+        results = [result for _, result in history]
+        outcome = {
+            "ticker": ticker,
+            "dates": [date for date, _ in history],
+            "passed": np.array([bool(r.passed) for r in results]),
+            "scores": np.array([float(r.score or 0) for r in results]),
+            "classifications": [r.classification or "unclassified" for r in results],
+            "forward": forward,
+        }
+        return outcome
+
+    def _build_report(self, np, backtest_id: str, config: BacktestConfig, horizons: List[int],
+                      tickers: List[str], outcomes: List[Dict[str, Any]],
+                      execution_time_ms: int) -> BacktestReport:
+        """Aggregate per-ticker replays into signal, baseline and classification statistics."""
+        failed = {o["ticker"]: o["error"] for o in outcomes if "error" in o}
+        replayed = [o for o in outcomes if "error" not in o]
+
+        if replayed:
+            passed = np.concatenate([o["passed"] for o in replayed])
+            forward = np.concatenate([o["forward"] for o in replayed])
+            classifications = np.array([c for o in replayed for c in o["classifications"]])
+        else:
+            passed = np.zeros(0, dtype=bool)
+            forward = np.zeros((0, len(horizons)))
+            classifications = np.array([], dtype=str)
+
+        signal_returns = {str(h): _return_stats(np, forward[passed, j]) for j, h in enumerate(horizons)}
+        baseline_returns = {str(h): _return_stats(np, forward[:, j]) for j, h in enumerate(horizons)}
+        for key, stats in signal_returns.items():
+            base = baseline_returns[key]
+            stats["edge_percent"] = (
+                round(stats["avg_return_percent"] - base["avg_return_percent"], 2)
+                if stats["count"] and base["count"] else None
+            )
+
+        by_classification: Dict[str, Dict[str, Any]] = {}
+        for label in sorted(set(classifications.tolist())):
+            mask = classifications == label
+            by_classification[label] = {
+                "count": int(mask.sum()),
+                "returns": {str(h): _return_stats(np, forward[mask, j]) for j, h in enumerate(horizons)},
+            }
+
+        ticker_summaries = []
+        signal_events: List[Dict[str, Any]] = []
+        for o in replayed:
+            signal_idx = np.flatnonzero(o["passed"])
+            ticker_summaries.append({
+                "ticker": o["ticker"],
+                "samples": len(o["passed"]),
+                "signals": int(len(signal_idx)),
+                "last_signal_date": (o["dates"][signal_idx[-1]].strftime("%Y-%m-%d")
+                                     if len(signal_idx) else None),
+                "avg_signal_return_percent": {
+                    str(h): _return_stats(np, o["forward"][signal_idx, j])["avg_return_percent"]
+                    for j, h in enumerate(horizons)
+                },
+            })
+            if config.include_signals:
+                for i in signal_idx:
+                    signal_events.append({
+                        "ticker": o["ticker"],
+                        "date": o["dates"][i].strftime("%Y-%m-%d"),
+                        "score": float(o["scores"][i]),
+                        "classification": o["classifications"][i],
+                        "forward_returns_percent": {
+                            str(h): (None if np.isnan(o["forward"][i, j])
+                                     else round(float(o["forward"][i, j]) * 100, 2))
+                            for j, h in enumerate(horizons)
+                        },
+                    })
+        ticker_summaries.sort(key=lambda t: t["signals"], reverse=True)
+
+        samples = int(len(passed))
+        signals = int(passed.sum())
+        return BacktestReport(
+            backtest_id=backtest_id,
+            strategy_code=config.strategy_code,
+            parameters=config.parameters,
+            start_date=config.start_date,
+            end_date=config.end_date,
+            horizons=horizons,
+            total_tickers=len(tickers),
+            evaluated_tickers=len(replayed),
+            samples=samples,
+            signals=signals,
+            signal_rate_percent=round(signals / samples * 100, 2) if samples else 0,
+            signal_returns=signal_returns,
+            baseline_returns=baseline_returns,
+            by_classification=by_classification,
+            tickers=ticker_summaries,
+            failed_tickers=failed,
+            execution_time_ms=execution_time_ms,
+            signal_events=signal_events,
+        )
+
+
+# Global service instance
+_backtest_service: Optional[BacktestService] = None
+
+
+def get_backtest_service(bar_store: Optional[PriceBarStore] = None) -> BacktestService:
+    """Get or create global backtest service."""
+    global _backtest_service
+    if _backtest_service is None:
+        _backtest_service = BacktestService(bar_store)
+    return _backtest_service
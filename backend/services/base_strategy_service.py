@@ -6,13 +6,18 @@ directly within FastAPI endpoints, replacing the complex subprocess execution sy
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import concurrent.futures
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Cancellation reason used when a run stops after finding enough qualifying tickers
+EARLY_STOP_REASON = "max_results_reached"
+
 
 @dataclass
 class StrategyResult:
@@ -40,6 +45,47 @@ class StrategyExecutionSummary:
     status: str = "completed"
 
 
+class CancellationToken:
+    """Cooperative cancellation flag shared between a run and its ticker tasks.
+    
+    Tasks check ``is_cancelled`` between tickers; callbacks registered with
+    ``add_callback`` run once on cancellation (e.g. to cancel pending futures).
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the token. Returns False if it was already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {e}")
+        return True
+    
+    def add_callback(self, callback: Callable[[], None]):
+        """Run ``callback`` on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
 class ProgressCallback:
     """Progress callback handler for strategy execution."""
     
@@ -72,6 +118,24 @@ class ProgressCallback:
             metrics=metrics or {}
         )
     
+    def report_ticker_batch(self, results: List[Dict[str, Any]]):
+        """Report many evaluated tickers at once (persisted in one transaction).
+
+        Each result carries the ``evaluation`` fields: ticker, passed, score,
+        classification, sequence_number, reasons and metrics.
+        """
+        self.callback_func(
+            stage="evaluation_batch",
+            results=results
+        )
+
+    def report_result_updates(self, updates: Dict[str, Dict[str, Any]]):
+        """Report metrics added to already reported tickers (ticker -> full metrics)."""
+        self.callback_func(
+            stage="result_update",
+            updates=updates
+        )
+
     def report_overall_progress(self, processed: int, total: int, passed_so_far: int):
         """Report overall evaluation progress."""
         progress_pct = (processed / total * 100) if total > 0 else 0
@@ -113,7 +177,16 @@ class ProgressCallback:
 
 
 class BaseStrategyService(ABC):
-    """Abstract base class for strategy services."""
+    """Abstract base class for strategy services.
+    
+    Optional capabilities (sweeps, historical replay, incremental state) are
+    added by the mixins below; callers check the ``supports_*`` flags before
+    using them.
+    """
+    
+    supports_sweep = False
+    supports_history = False
+    supports_incremental = False
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -135,19 +208,165 @@ class BaseStrategyService(ABC):
     
     @abstractmethod
     def execute(self, tickers: List[str], parameters: Dict[str, Any], 
-                progress_callback: ProgressCallback) -> StrategyExecutionSummary:
-        """Execute strategy on given tickers with progress reporting."""
+                progress_callback: ProgressCallback,
+                cancellation_token: Optional[CancellationToken] = None) -> StrategyExecutionSummary:
+        """Execute strategy on given tickers with progress reporting.
+        
+        Implementations stop starting new tickers once ``cancellation_token``
+        is cancelled and return the tickers evaluated so far.
+        """
         pass
     
     def get_default_parameters(self) -> Dict[str, Any]:
         """Return default parameters for this strategy."""
         return {}
     
+    def _resolve_max_results(self, parameters: Dict[str, Any]) -> Optional[int]:
+        """Return the early-stop limit from ``max_results`` (alias ``top_n``), if any."""
+        value = parameters.get("max_results", parameters.get("top_n"))
+        if value in (None, ""):
+            return None
+        value = int(value)
+        return value if value > 0 else None
+    
+    def _run_ticker_tasks(self, tickers: List[str], evaluate: Callable[[str], Any],
+                          max_workers: int,
+                          cancellation_token: Optional[CancellationToken] = None,
+                          priority: Optional[str] = None) -> List[Any]:
+        """Evaluate tickers on the shared scheduler, honoring cooperative cancellation.
+        
+        At most ``max_workers`` tickers of this run execute at once and the run
+        competes with other runs by ``priority``. Pending tasks are cancelled as
+        soon as the token is cancelled and dequeued tasks check the token before
+        starting, so only in-flight evaluations finish.
+        
+        Returns:
+            Results of the evaluated tickers, in ticker order
+        """
+        from .evaluation_scheduler import get_evaluation_scheduler
+        
+        token = cancellation_token or CancellationToken()
+        
+        def run(ticker: str):
+            if token.is_cancelled:
+                return None
+            return evaluate(ticker)
+        
+        futures = get_evaluation_scheduler().submit(run, tickers, priority, max_workers)
+        token.add_callback(lambda: [future.cancel() for future in futures])
+        
+        results: List[Any] = []
+        try:
+            for future in futures:
+                try:
+                    result = future.result()
+                except concurrent.futures.CancelledError:
+                    continue
+                if result is not None:
+                    results.append(result)
+        finally:
+            # Don't leave queued work behind if a ticker raised
+            for future in futures:
+                future.cancel()
+        return results
+    
+    def _cancellation_summary(self, cancellation_token: Optional[CancellationToken],
+                              total: int, evaluated: int) -> Tuple[str, Dict[str, Any]]:
+        """Return the run status and summary metrics describing an early stop.
+        
+        Returns:
+            Tuple of ("completed" | "cancelled", metrics to merge into summary_metrics)
+        """
+        if cancellation_token is None or not cancellation_token.is_cancelled:
+            return "completed", {}
+        status = "completed" if cancellation_token.reason == EARLY_STOP_REASON else "cancelled"
+        return status, {
+            "early_stop": cancellation_token.reason,
+            "skipped_tickers": total - evaluated
+        }
+    
     def get_parameter_schema(self) -> Dict[str, Any]:
         """Return JSON schema for strategy parameters."""
         return {}
 
 
+class SweepableStrategy(ABC):
+    """Capability mixin: parameter sweeps over state prepared once per ticker.
+    
+    List it before BaseStrategyService in the bases so ``supports_sweep`` is True.
+    """
+    
+    supports_sweep = True
+    
+    @abstractmethod
+    def get_sweepable_parameters(self) -> List[str]:
+        """Return parameters that only affect scoring, not indicator preparation.
+        
+        Parameter sweeps may vary these freely while reusing a single prepared
+        state per ticker.
+        """
+    
+    @abstractmethod
+    def prepare_ticker(self, ticker: str,
+                       parameters: Dict[str, Any]) -> Tuple[Any, Optional[StrategyResult]]:
+        """Download data and compute parameter-independent state for a ticker.
+        
+        Args:
+            ticker: Ticker symbol
+            parameters: Strategy parameters (only data-related keys are used)
+            
+        Returns:
+            Tuple of (prepared state, None) or (None, failed StrategyResult)
+        """
+    
+    @abstractmethod
+    def evaluate_prepared(self, ticker: str, prepared: Any,
+                          parameters: Dict[str, Any]) -> StrategyResult:
+        """Score state returned by ``prepare_ticker`` under the given parameters."""
+
+
+class ReplayableStrategy(ABC):
+    """Capability mixin: historical replay over stored bars (used by backtests)."""
+    
+    supports_history = True
+    
+    @abstractmethod
+    def evaluate_history(self, ticker: str, bars: Any, parameters: Dict[str, Any],
+                         positions: Optional[Iterable[int]] = None,
+                         benchmark: Any = None) -> List[Tuple[Any, StrategyResult]]:
+        """Replay the strategy over stored bars, scoring each date as if it were the latest.
+        
+        Args:
+            ticker: Ticker symbol
+            bars: OHLCV DataFrame (lowercase columns, DatetimeIndex) in date order
+            parameters: Strategy parameters
+            positions: Bar positions to score (default: every bar past the warmup)
+            benchmark: Optional benchmark close series (e.g. SPY) indexed by date
+            
+        Returns:
+            List of (bar date, StrategyResult) tuples in date order
+        """
+
+
+class IncrementalStrategy(ABC):
+    """Capability mixin: scoring from a persisted streaming indicator state."""
+    
+    supports_incremental = True
+    
+    @abstractmethod
+    def evaluate_state(self, ticker: str, state: Any, parameters: Dict[str, Any]) -> StrategyResult:
+        """Score the latest bar from a streaming ``TickerIndicatorState``.
+        
+        Args:
+            ticker: Ticker symbol
+            state: Indicator state advanced through the latest bar
+            parameters: Strategy parameters
+            
+        Returns:
+            StrategyResult for the state's last bar
+        """
+
+
 class StrategyServiceRegistry:
     """Registry for strategy services."""
     
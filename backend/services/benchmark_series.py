@@ -0,0 +1,283 @@
+"""
+Benchmark Series Provider
+
+Loads benchmark close series (SPY, sector ETFs) once per trading day and
+shares them across strategy workers. Relative-strength rules previously
+downloaded SPY inside every ticker evaluation; with the provider a run
+downloads each benchmark once, concurrent workers asking for the same series
+wait for that single download, and the series aligned to a ticker's bar
+dates is cached as a read-only NumPy array so tickers with the same trading
+calendar divide by the same array.
+
+Sector-relative strength maps instruments.sector to a sector ETF
+(``SECTOR_ETFS``), reads the ETFs from one cached closes matrix and computes
+the ratio and its EMAs for every ticker of a sector in one frame operation
+(``relative_strength``).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TICKER = "SPY"
+
+# Sector (instruments.sector, yfinance naming plus GICS aliases) -> SPDR sector ETF
+SECTOR_ETFS: Dict[str, str] = {
+    "Technology": "XLK",
+    "Information Technology": "XLK",
+    "Healthcare": "XLV",
+    "Health Care": "XLV",
+    "Financial Services": "XLF",
+    "Financials": "XLF",
+    "Consumer Cyclical": "XLY",
+    "Consumer Discretionary": "XLY",
+    "Consumer Defensive": "XLP",
+    "Consumer Staples": "XLP",
+    "Energy": "XLE",
+    "Industrials": "XLI",
+    "Basic Materials": "XLB",
+    "Materials": "XLB",
+    "Real Estate": "XLRE",
+    "Utilities": "XLU",
+    "Communication Services": "XLC",
+}
+
+# Intraday benchmarks are reloaded after this long; daily ones once per UTC day
+INTRADAY_MAX_AGE_SECONDS = 15 * 60
+
+# A benchmark that failed to load is retried after this long (not once per ticker)
+FAILURE_RETRY_SECONDS = 5 * 60
+
+_DAILY_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+# Aligned arrays kept per series (one per distinct trading calendar seen)
+MAX_ALIGNED_PER_SERIES = 64
+
+
+class _Entry:
+    """Cached benchmark series with its own load lock (single download per key)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.close = None
+        self.failed_at: Optional[float] = None
+        self.aligned: Dict[str, Any] = {}
+
+
+class BenchmarkProvider:
+    """Per-trading-day cache of benchmark close series shared across workers."""
+
+    def __init__(self, loader: Optional[Callable[[str, str, str], Any]] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            loader: ``loader(ticker, period, interval)`` returning a close Series
+                indexed by tz-naive dates, or None (defaults to yfinance)
+        """
+        self._loader = loader or _download_close
+        self._entries: Dict[Tuple[str, str, str, str], _Entry] = {}
+        self._matrices: Dict[Tuple[Tuple[str, ...], str, str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str = BENCHMARK_TICKER, period: str = "2y",
+            interval: str = "1d"):
+        """
+        Return the benchmark close series, loading it on first use today.
+
+        Download failures are logged and cached as None for
+        ``FAILURE_RETRY_SECONDS`` so a missing benchmark does not trigger one
+        retry per ticker, then the download is tried again.
+        """
+        entry = self._entry(ticker, period, interval)
+        if _needs_load(entry):
+            with entry.lock:
+                if _needs_load(entry):
+                    try:
+                        entry.close = self._loader(ticker.upper(), period, interval)
+                    except Exception as e:
+                        logger.warning(f"Failed to load benchmark {ticker}: {e}")
+                        entry.close = None
+                    entry.failed_at = time.monotonic() if entry.close is None else None
+                    entry.loaded = True
+        return entry.close
+
+    def aligned(self, index, ticker: str = BENCHMARK_TICKER, period: str = "2y",
+                interval: str = "1d"):
+        """
+        Benchmark closes aligned to ``index`` as a float NumPy array.
+
+        Dates missing from the benchmark are NaN. The array is shared between
+        callers with the same index and marked read-only.
+
+        Returns:
+            Array of ``len(index)`` floats, or None if the benchmark is unavailable
+        """
+        import numpy as np
+
+        close = self.get(ticker, period, interval)
+        if close is None:
+            return None
+        entry = self._entry(ticker, period, interval)
+        key = _index_key(np, index)
+        array = entry.aligned.get(key)
+        if array is None:
+            array = close.reindex(index).to_numpy(dtype=float, copy=True)
+            array.setflags(write=False)
+            with entry.lock:
+                if len(entry.aligned) >= MAX_ALIGNED_PER_SERIES:
+                    entry.aligned.clear()
+                array = entry.aligned.setdefault(key, array)
+        return array
+
+    def matrix(self, tickers: Iterable[str], period: str = "2y", interval: str = "1d"):
+        """
+        Closes of several benchmarks as one DataFrame (dates x tickers).
+
+        Built from the cached series and itself cached per trading day.
+        Benchmarks that failed to load are left out (and the frame is not
+        cached, so they are added once a retry succeeds).
+        """
+        import pandas as pd
+
+        tickers = tuple(sorted({t.upper() for t in tickers}))
+        key = (tickers, period, interval, _cache_bucket(interval))
+        frame = self._matrices.get(key)
+        if frame is None:
+            loaded = {t: self.get(t, period, interval) for t in tickers}
+            loaded = {t: close for t, close in loaded.items() if close is not None}
+            frame = pd.DataFrame(loaded, columns=list(loaded))
+            if len(loaded) < len(tickers):
+                return frame
+            with self._lock:
+                for stale in [k for k in self._matrices if k[3] != key[3]]:
+                    del self._matrices[stale]
+                frame = self._matrices.setdefault(key, frame)
+        return frame
+
+    def clear(self):
+        """Drop every cached series."""
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def _entry(self, ticker: str, period: str, interval: str) -> _Entry:
+        key = (ticker.upper(), period, interval, _cache_bucket(interval))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Keep only the current bucket of each series
+                for stale in [k for k in self._entries if k[:3] == key[:3]]:
+                    del self._entries[stale]
+                entry = self._entries[key] = _Entry()
+            return entry
+
+
+def sector_benchmark(sector: Optional[str],
+                     overrides: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """Sector ETF for an instruments.sector value, or None for unmapped sectors."""
+    if not sector:
+        return None
+    if overrides and sector in overrides:
+        return overrides[sector] or None
+    return SECTOR_ETFS.get(sector)
+
+
+def load_ticker_sectors(tickers: Iterable[str], db_connection=None) -> Dict[str, str]:
+    """
+    Sector of each ticker from the instruments table (tickers without one are omitted).
+
+    Args:
+        tickers: Ticker symbols
+        db_connection: SQLite connection (defaults to a short-lived application connection)
+    """
+    tickers = [t.upper() for t in tickers]
+    own_connection = db_connection is None
+    if own_connection:
+        from ..database.connection import get_db_connection
+        db_connection = get_db_connection()
+    try:
+        sectors: Dict[str, str] = {}
+        for start in range(0, len(tickers), 500):
+            chunk = tickers[start:start + 500]
+            rows = db_connection.execute(
+                f"SELECT ticker, sector FROM instruments WHERE ticker IN ({','.join('?' * len(chunk))})"
+                " AND sector IS NOT NULL AND sector != ''",
+                chunk,
+            ).fetchall()
+            sectors.update({row[0].upper(): row[1] for row in rows})
+        return sectors
+    finally:
+        if own_connection:
+            db_connection.close()
+
+
+def relative_strength(closes, benchmark, spans: Tuple[int, ...] = (10, 20)) -> Dict[str, Any]:
+    """
+    Relative strength of many tickers against one benchmark in a single pass.
+
+    Args:
+        closes: DataFrame of closes (dates x tickers)
+        benchmark: Benchmark close Series
+        spans: EMA spans applied to the ratio (``ewm(span, adjust=False)``)
+
+    Returns:
+        Dict with the ``rs`` ratio frame and one ``ema<span>`` frame per span
+    """
+    rs = closes.div(benchmark.reindex(closes.index), axis=0)
+    out = {"rs": rs}
+    for span in spans:
+        out[f"ema{span}"] = rs.ewm(span=span, adjust=False).mean()
+    return out
+
+
+def _needs_load(entry: _Entry) -> bool:
+    """Whether a series was never loaded, or failed long enough ago to retry."""
+    if not entry.loaded:
+        return True
+    return entry.failed_at is not None and time.monotonic() - entry.failed_at >= FAILURE_RETRY_SECONDS
+
+
+def _cache_bucket(interval: str) -> str:
+    """Cache generation: the UTC day for daily bars, a short time slot intraday."""
+    if interval in _DAILY_INTERVALS:
+        return datetime.utcnow().date().isoformat()
+    return str(int(time.time() // INTRADAY_MAX_AGE_SECONDS))
+
+
+def _index_key(np, index) -> str:
+    """Fingerprint of a DatetimeIndex (tickers sharing a calendar share the key)."""
+    values = np.asarray(index.asi8 if hasattr(index, "asi8") else index.to_numpy())
+    return hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).hexdigest()
+
+
+def _download_close(ticker: str, period: str, interval: str):
+    """Download adjusted closes with yfinance (tz-naive dates)."""
+    import pandas as pd
+    import yfinance as yf
+
+    raw = yf.Ticker(ticker).history(period=period, interval=interval, auto_adjust=True)
+    if raw is None or raw.empty or "Close" not in raw.columns:
+        return None
+    close = pd.to_numeric(raw["Close"], errors="coerce").dropna()
+    if getattr(close.index, "tz", None) is not None:
+        close.index = close.index.tz_localize(None)
+    return close if not close.empty else None
+
+
+# Global provider instance
+_benchmark_provider: Optional[BenchmarkProvider] = None
+
+
+def get_benchmark_provider() -> BenchmarkProvider:
+    """Get or create global benchmark provider."""
+    global _benchmark_provider
+    if _benchmark_provider is None:
+        _benchmark_provider = BenchmarkProvider()
+    return _benchmark_provider
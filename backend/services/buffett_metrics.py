@@ -0,0 +1,279 @@
+"""
+Buffett Screen Metrics
+
+Compute stage of the Buffett screener. Derives the screen metrics (revenue
+CAGR, margins, ROE, FCF years, D/E, EV/EBIT, yields, ...) for all tickers at
+once as DataFrame columns, reading statements from the fundamentals store
+without touching the network. The fetch stage (``FundamentalsStore.refresh_many``)
+fills the store first; re-screening reuses the metrics frame.
+"""
+
+from datetime import datetime, timedelta
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .fundamentals_store import DIVIDENDS, INFO, FundamentalsStore, get_fundamentals_store
+
+_REVENUE = ("Total Revenue", "Revenue", "Operating Revenue")
+_NET_INCOME = ("Net Income", "Net Income Applicable To Common Shares", "Net Income Common Stockholders")
+_EQUITY = ("Total Stockholder Equity", "Stockholders Equity", "Common Stock Equity")
+_OCF = ("Total Cash From Operating Activities", "Operating Cash Flow")
+_CAPEX = ("Capital Expenditures", "Capital Expenditure")
+
+# Input field -> (statement, candidate line items in priority order)
+LINE_ITEMS = {
+    "revenue_a": ("income_stmt", _REVENUE),
+    "gross_profit_a": ("income_stmt", ("Gross Profit",)),
+    "total_debt_a": ("balance_sheet", ("Total Debt",)),
+    "equity_a": ("balance_sheet", _EQUITY),
+    "current_assets_a": ("balance_sheet", ("Total Current Assets", "Current Assets")),
+    "current_liabilities_a": ("balance_sheet", ("Total Current Liabilities", "Current Liabilities")),
+    "ocf_a": ("cashflow", _OCF),
+    "capex_a": ("cashflow", _CAPEX),
+    "revenue_q": ("quarterly_income_stmt", _REVENUE),
+    "net_income_q": ("quarterly_income_stmt", _NET_INCOME),
+    "ebit_q": ("quarterly_income_stmt", ("EBIT", "Ebit", "Operating Income")),
+    "interest_q": ("quarterly_income_stmt", ("Interest Expense",)),
+    "equity_q": ("quarterly_balance_sheet", _EQUITY),
+    "ocf_q": ("quarterly_cashflow", _OCF),
+    "capex_q": ("quarterly_cashflow", _CAPEX),
+}
+
+_INFO_NUMERIC = ("currentPrice", "beta", "trailingPE", "forwardPE", "pegRatio", "priceToBook",
+                 "marketCap", "totalDebt", "totalCash", "enterpriseValue")
+_INFO_TEXT = ("shortName", "longName", "sector")
+
+# Output columns, in report order
+METRIC_COLUMNS = [
+    'symbol', 'company_name', 'sector', 'price', 'rev_5y_cagr_pct', 'net_margin_pct', 'roe_pct',
+    'fcf_pos_years_5', 'gross_margin_pct', 'de_ratio', 'current_ratio', 'interest_coverage', 'pe', 'peg',
+    'pb', 'ev_ebit', 'div_yield_pct', 'fcf_ttm', 'fcf_yield_pct', 'debt_to_fcf', 'beta', 'div_growth_years',
+    'pe_discount_pct_vs_5y_median', 'error',
+]
+
+# Dividend gap (days) treated as a break in the payment history (~18 months)
+DIVIDEND_GAP_DAYS = 550
+
+
+def _candidate_map() -> Dict[str, List]:
+    """statement -> [(line item, field, rank), ...]"""
+    mapping: Dict[str, List] = {}
+    for field_name, (statement, candidates) in LINE_ITEMS.items():
+        for rank, name in enumerate(candidates):
+            mapping.setdefault(statement, []).append((name, field_name, rank))
+    return mapping
+
+
+_CANDIDATES = _candidate_map()
+
+
+def load_inputs(store: FundamentalsStore, symbols: Iterable[str]):
+    """
+    Read the compute inputs for many tickers in bulk.
+
+    Returns:
+        Tuple of (line items, dividends, info) frames:
+        - line items: long frame [ticker, field, period_end, value], sorted by period_end
+        - dividends: long frame [ticker, period_end, amount]
+        - info: frame indexed by ticker with the info fields used by the screen
+    """
+    items, dividends, info = [], [], {}
+    statements = list(_CANDIDATES) + [DIVIDENDS, INFO]
+    for ticker, statement, period_end, data in store.iter_records(symbols, statements):
+        if statement == INFO:
+            info[ticker] = data
+        elif statement == DIVIDENDS:
+            dividends.append((ticker, period_end, data.get("amount")))
+        else:
+            for name, field_name, rank in _CANDIDATES[statement]:
+                value = data.get(name)
+                if value is not None:
+                    items.append((ticker, field_name, rank, period_end, value))
+
+    items_df = pd.DataFrame(items, columns=["ticker", "field", "rank", "period_end", "value"])
+    if not items_df.empty:
+        # Like picking one statement row: per ticker and field keep the best-ranked candidate present
+        best = items_df.groupby(["ticker", "field"])["rank"].transform("min")
+        items_df = items_df[items_df["rank"] == best]
+    items_df["period_end"] = pd.to_datetime(items_df["period_end"])
+    items_df["value"] = pd.to_numeric(items_df["value"], errors="coerce")
+    items_df = (items_df.dropna(subset=["value"]).drop(columns="rank")
+                .sort_values(["ticker", "field", "period_end"], kind="stable"))
+
+    dividends_df = pd.DataFrame(dividends, columns=["ticker", "period_end", "amount"])
+    dividends_df["period_end"] = pd.to_datetime(dividends_df["period_end"])
+    dividends_df["amount"] = pd.to_numeric(dividends_df["amount"], errors="coerce")
+
+    info_df = pd.DataFrame.from_dict(info, orient="index")
+    info_df = info_df.reindex(columns=list(_INFO_NUMERIC + _INFO_TEXT))
+    for col in _INFO_NUMERIC:
+        info_df[col] = pd.to_numeric(info_df[col], errors="coerce")
+    return items_df, dividends_df.sort_values(["ticker", "period_end"], kind="stable"), info_df
+
+
+def _field(items: pd.DataFrame, name: str) -> pd.DataFrame:
+    return items[items["field"] == name]
+
+
+def _latest(items: pd.DataFrame, name: str) -> pd.Series:
+    """Most recent value per ticker."""
+    return _field(items, name).groupby("ticker")["value"].last()
+
+
+def _recent(items: pd.DataFrame, name: str, n: int, how: str) -> pd.Series:
+    """Sum/mean of the latest ``n`` periods per ticker (NaN with fewer than ``n``)."""
+    recent = _field(items, name).groupby("ticker").tail(n).groupby("ticker")["value"]
+    return recent.agg(how).where(recent.count() >= n)
+
+
+def _div(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Element-wise a / b with NaN where b is zero or missing."""
+    return a / b.where(b != 0)
+
+
+def _revenue_cagr(items: pd.DataFrame, points: int = 6) -> pd.Series:
+    """Revenue CAGR (%) over the last ``points`` annual observations (5 years)."""
+    rev = _field(items, "revenue_a").groupby("ticker").tail(points)
+    g = rev.assign(year=rev["period_end"].dt.year).groupby("ticker")
+    agg = g.agg(n=("value", "size"), begin=("value", "first"), end=("value", "last"),
+                y0=("year", "first"), y1=("year", "last"))
+    years = (agg["y1"] - agg["y0"]).astype(float)
+    valid = (agg["n"] >= points) & (agg["begin"] > 0) & (agg["end"] > 0) & (years > 0)
+    cagr = ((agg["end"] / agg["begin"]) ** (1.0 / years.where(valid)) - 1.0) * 100.0
+    return cagr.where(valid)
+
+
+def _fcf_positive_years(items: pd.DataFrame, years: int = 5) -> pd.Series:
+    """Count of positive annual FCF (OCF + capex) over the last ``years`` (0 with less history)."""
+    ocf = _field(items, "ocf_a").set_index(["ticker", "period_end"])["value"]
+    capex = _field(items, "capex_a").set_index(["ticker", "period_end"])["value"]
+    fcf = pd.concat([ocf, capex], axis=1, join="inner").sum(axis=1).sort_index()
+    if fcf.empty:
+        return pd.Series(dtype=float)
+    recent = fcf.groupby(level="ticker").tail(years)
+    positive = (recent > 0).groupby(level="ticker")
+    return positive.sum().where(positive.count() >= years, 0)
+
+
+def _dividend_metrics(dividends: pd.DataFrame, price: pd.Series, as_of: datetime):
+    """TTM dividend yield (%) and the rough dividend-history length proxy (years)."""
+    if dividends.empty:
+        return pd.Series(dtype=float), pd.Series(dtype=float)
+    g = dividends.groupby("ticker")
+    cutoff = pd.Timestamp(as_of - timedelta(days=365))
+    ttm = dividends["amount"].where(dividends["period_end"] >= cutoff, 0.0).groupby(dividends["ticker"]).sum()
+    price = price.reindex(ttm.index)
+    div_yield = (ttm / price.where(price != 0)) * 100.0
+
+    first_year = g["period_end"].first().dt.year
+    last_year = g["period_end"].last().dt.year
+    same_ticker = dividends["ticker"].eq(dividends["ticker"].shift())
+    gaps = dividends["period_end"].diff().dt.days.where(same_ticker)
+    max_gap = gaps.groupby(dividends["ticker"]).max().fillna(0)
+    span = last_year - first_year
+    # Recent large gaps: conservative half of the span
+    growth_years = span.where(max_gap <= DIVIDEND_GAP_DAYS, (span // 2).clip(lower=0))
+    return div_yield, growth_years
+
+
+def compute_metrics(store: FundamentalsStore, symbols: Iterable[str],
+                    errors: Optional[Dict[str, str]] = None,
+                    as_of: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Compute screen metrics for many tickers from stored fundamentals.
+
+    Args:
+        store: Fundamentals store (already refreshed by the fetch stage)
+        symbols: Tickers to compute, in output order
+        errors: Fetch-stage errors by ticker, reported in the ``error`` column
+        as_of: Reference time for trailing dividends (default: now)
+
+    Returns:
+        DataFrame with METRIC_COLUMNS, one row per symbol (missing values are NaN)
+    """
+    symbols = [s.upper() for s in symbols]
+    as_of = as_of or datetime.utcnow()
+    items, dividends, info = load_inputs(store, symbols)
+    index = pd.Index(symbols, name="symbol")
+    info = info.reindex(index)
+
+    def col(series: pd.Series) -> pd.Series:
+        return series.reindex(index)
+
+    price = info["currentPrice"]
+    market_cap = info["marketCap"]
+    debt_info = info["totalDebt"].fillna(0)
+    cash = info["totalCash"].fillna(0)
+
+    ni_ttm = col(_recent(items, "net_income_q", 4, "sum"))
+    rev_ttm = col(_recent(items, "revenue_q", 4, "sum"))
+    ebit_ttm = col(_recent(items, "ebit_q", 4, "sum"))
+    int_exp_ttm = col(_recent(items, "interest_q", 4, "sum")).abs()
+    equity_avg = col(_recent(items, "equity_q", 4, "mean"))
+    fcf_ttm = col(_recent(items, "ocf_q", 4, "sum")) + col(_recent(items, "capex_q", 4, "sum"))
+
+    total_debt = info["totalDebt"].fillna(col(_latest(items, "total_debt_a")))
+    ev = info["enterpriseValue"].fillna(market_cap + debt_info - cash)
+    div_yield, div_growth_years = _dividend_metrics(dividends, price, as_of)
+
+    trailing_pe = info["trailingPE"]
+    pe = trailing_pe.where(trailing_pe.notna() & (trailing_pe != 0), info["forwardPE"])
+
+    out = pd.DataFrame({
+        "symbol": symbols,
+        "company_name": info["shortName"].fillna(info["longName"]).values,
+        "sector": info["sector"].values,
+        "price": price.values,
+        "rev_5y_cagr_pct": col(_revenue_cagr(items)).values,
+        "net_margin_pct": (_div(ni_ttm, rev_ttm) * 100.0).values,
+        "roe_pct": (_div(ni_ttm, equity_avg) * 100.0).values,
+        "fcf_pos_years_5": col(_fcf_positive_years(items)).fillna(0).astype(int).values,
+        "gross_margin_pct": (_div(col(_latest(items, "gross_profit_a")), col(_latest(items, "revenue_a"))) * 100.0).values,
+        "de_ratio": _div(total_debt, col(_latest(items, "equity_a"))).values,
+        "current_ratio": _div(col(_latest(items, "current_assets_a")), col(_latest(items, "current_liabilities_a"))).values,
+        "interest_coverage": _div(ebit_ttm, int_exp_ttm).values,
+        "pe": pe.values,
+        "peg": info["pegRatio"].values,
+        "pb": info["priceToBook"].values,
+        "ev_ebit": _div(ev.where(ev != 0), ebit_ttm).values,
+        "div_yield_pct": col(div_yield).values,
+        "fcf_ttm": fcf_ttm.values,
+        "fcf_yield_pct": (_div(fcf_ttm, market_cap) * 100.0).values,
+        "debt_to_fcf": _div(debt_info - cash, fcf_ttm).values,
+        "beta": info["beta"].values,
+        "div_growth_years": col(div_growth_years).fillna(0).values,
+        "pe_discount_pct_vs_5y_median": np.nan,  # no historical multiple series available
+    })
+
+    # Tickers without any stored fundamentals
+    known = set(items["ticker"]) | set(info.dropna(how="all").index)
+    messages = {s: "No fundamentals available" for s in symbols if s not in known}
+    messages.update({s.upper(): e for s, e in (errors or {}).items()})
+    out["error"] = [messages.get(s) for s in symbols]
+    return out[METRIC_COLUMNS]
+
+
+# Metrics of every stored ticker, recomputed only when the store changes
+_stored_metrics = None
+_stored_metrics_lock = threading.Lock()
+
+
+def get_stored_metrics(store: Optional[FundamentalsStore] = None) -> pd.DataFrame:
+    """
+    Metrics frame for all tickers in the fundamentals store (no network access).
+
+    The frame is cached and recomputed only when the store's contents change,
+    so threshold re-evaluations over it (buffett_rules.evaluate) skip the
+    compute stage entirely.
+    """
+    global _stored_metrics
+    store = store or get_fundamentals_store()
+    key = (id(store), store.version())
+    with _stored_metrics_lock:
+        if _stored_metrics is None or _stored_metrics[0] != key:
+            _stored_metrics = (key, compute_metrics(store, store.tickers()))
+        return _stored_metrics[1]
+
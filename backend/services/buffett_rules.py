@@ -0,0 +1,203 @@
+"""
+Buffett Screen Rules
+
+Vectorized rule engine for the Buffett screener. ``ScreenerConfig`` is
+compiled into one boolean failure mask per rule over the whole metrics frame
+(see buffett_metrics.compute_metrics); pass/fail, the first failing rule and
+a bitmask of all failing rules come out of a single pass, so re-evaluating a
+cached frame with new thresholds takes milliseconds.
+
+Missing metrics (NaN) fail required rules and pass optional ones.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ScreenerConfig:
+    # Business quality
+    min_rev_5y_cagr: float = 5.0
+    min_net_margin: float = 10.0
+    min_roe: float = 15.0
+    min_fcf_positive_years: int = 5
+    min_gross_margin: float = 35.0
+
+    # Financial strength
+    max_de: float = 0.5
+    min_current_ratio: float = 1.5
+    min_interest_coverage: float = 5.0
+
+    # Valuation
+    max_pe: float = 20.0
+    max_peg: float = 1.5
+    max_pb: float = 3.0
+    max_ev_ebit: float = 12.0
+    min_div_yield: float = 2.0  # optional
+
+    # Stability proxies
+    max_beta: float = 1.2
+    min_div_growth_years: int = 10
+
+    # Margin-of-safety proxy
+    min_mult_discount_pct: float = 10.0  # current P/E vs 5y median discount
+
+    # Added Buffett-aligned extras
+    min_fcf_yield_pct: float = 5.0
+    max_debt_to_fcf: float = 3.0
+    use_peg_as_hint: bool = True  # don't fail if PEG missing; if present and > max_peg then fail
+
+    @classmethod
+    def from_overrides(cls, overrides: Optional[Mapping[str, Any]] = None) -> "ScreenerConfig":
+        """
+        Build a config from threshold overrides.
+
+        Raises:
+            ValueError: For unknown threshold names or non-numeric values
+        """
+        cfg = cls()
+        known = {f.name: f.type for f in fields(cls)}
+        for name, value in (overrides or {}).items():
+            if name not in known:
+                raise ValueError(f"Unknown screener threshold '{name}'")
+            if value is None:
+                continue
+            try:
+                if known[name] is bool:
+                    value = bool(value)
+                else:
+                    value = float(value)
+                    if known[name] is int and value.is_integer():
+                        value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for '{name}': {value!r}")
+            setattr(cfg, name, value)
+        return cfg
+
+
+@dataclass(frozen=True)
+class ScreenRule:
+    """One threshold check on a metrics column."""
+    label: str
+    column: str
+    threshold: str          # ScreenerConfig attribute
+    op: str                 # "min" (value >= threshold) or "max" (value <= threshold)
+    required: bool          # whether a missing value fails
+    message: str            # e.g. "ROE<{}%"; formatted with the threshold
+    enabled: Optional[Callable[[ScreenerConfig], bool]] = None
+
+
+# Evaluation order; the first failing rule is reported as why_failed
+SCREEN_RULES: List[ScreenRule] = [
+    ScreenRule("Revenue CAGR", "rev_5y_cagr_pct", "min_rev_5y_cagr", "min", True, "CAGR<{}%"),
+    ScreenRule("Net Margin", "net_margin_pct", "min_net_margin", "min", True, "NetMargin<{}%"),
+    ScreenRule("ROE", "roe_pct", "min_roe", "min", True, "ROE<{}%"),
+    ScreenRule("FCF Positive Years (5)", "fcf_pos_years_5", "min_fcf_positive_years", "min", True, "FCFYears<{}"),
+    ScreenRule("Gross Margin", "gross_margin_pct", "min_gross_margin", "min", True, "GrossMargin<{}%"),
+    ScreenRule("Debt/Equity", "de_ratio", "max_de", "max", True, "D/E>{}"),
+    ScreenRule("Current Ratio", "current_ratio", "min_current_ratio", "min", True, "CR<{}"),
+    ScreenRule("Interest Coverage", "interest_coverage", "min_interest_coverage", "min", True, "IC<{}"),
+    ScreenRule("Debt/FCF", "debt_to_fcf", "max_debt_to_fcf", "max", False, "Debt/FCF>{}"),
+    ScreenRule("P/E", "pe", "max_pe", "max", True, "PE>{}"),
+    ScreenRule("PEG", "peg", "max_peg", "max", False, "PEG>{}", enabled=lambda cfg: cfg.use_peg_as_hint),
+    ScreenRule("P/B", "pb", "max_pb", "max", True, "PB>{}"),
+    ScreenRule("EV/EBIT", "ev_ebit", "max_ev_ebit", "max", True, "EV/EBIT>{}"),
+    ScreenRule("Div Yield", "div_yield_pct", "min_div_yield", "min", False, "DivYield<{}%"),
+    ScreenRule("FCF Yield", "fcf_yield_pct", "min_fcf_yield_pct", "min", False, "FCFYield<{}%"),
+    ScreenRule("Beta", "beta", "max_beta", "max", False, "Beta>{}"),
+    ScreenRule("Div Growth Years", "div_growth_years", "min_div_growth_years", "min", False, "DivYears<{}"),
+    ScreenRule("PE discount vs 5y", "pe_discount_pct_vs_5y_median", "min_mult_discount_pct", "min", False, "PEdisc<{}%"),
+]
+
+
+@dataclass
+class ScreenEvaluation:
+    """Result of evaluating SCREEN_RULES over a metrics frame (aligned to its index)."""
+    passed: pd.Series         # bool
+    first_failure: pd.Series  # index into SCREEN_RULES, -1 if passed
+    failure_bits: pd.Series   # int64 bitmask; bit i set when SCREEN_RULES[i] fails
+    why_failed: pd.Series     # "<label>: <message> (got <value>)" or None
+
+    def failed_rules(self, bits: int) -> List[str]:
+        """Decode a failure bitmask into rule labels (in rule order)."""
+        return [rule.label for i, rule in enumerate(SCREEN_RULES) if bits >> i & 1]
+
+    def failure_counts(self) -> Dict[str, int]:
+        """Number of tickers failing each rule (not only as first failure)."""
+        bits = self.failure_bits.to_numpy()
+        return {rule.label: int(((bits >> i) & 1).sum()) for i, rule in enumerate(SCREEN_RULES)}
+
+
+def evaluate(metrics: pd.DataFrame, cfg: Optional[ScreenerConfig] = None) -> ScreenEvaluation:
+    """
+    Evaluate the screen over a metrics frame in one vectorized pass.
+
+    Args:
+        metrics: Frame with the SCREEN_RULES columns (missing columns count as NaN)
+        cfg: Thresholds (defaults to ScreenerConfig())
+
+    Returns:
+        ScreenEvaluation aligned to ``metrics.index``
+    """
+    cfg = cfg or ScreenerConfig()
+    n = len(metrics)
+    bits = np.zeros(n, dtype=np.int64)
+    for i, rule in enumerate(SCREEN_RULES):
+        if rule.enabled is not None and not rule.enabled(cfg):
+            continue
+        if rule.column in metrics.columns:
+            values = pd.to_numeric(metrics[rule.column], errors="coerce").to_numpy(dtype=float)
+        else:
+            values = np.full(n, np.nan)
+        threshold = float(getattr(cfg, rule.threshold))
+        missing = np.isnan(values)
+        with np.errstate(invalid="ignore"):
+            out_of_range = values < threshold if rule.op == "min" else values > threshold
+        fails = np.where(missing, rule.required, out_of_range)
+        bits |= fails.astype(np.int64) << i
+
+    # Lowest set bit = first failing rule
+    lowest = bits & -bits
+    first = np.where(bits > 0, np.log2(np.maximum(lowest, 1)).astype(np.int64), -1)
+
+    # Only the first failure is formatted, one rule at a time
+    why = np.full(n, None, dtype=object)
+    for i in np.unique(first[first >= 0]):
+        rule = SCREEN_RULES[i]
+        rows = np.flatnonzero(first == i)
+        prefix = f"{rule.label}: {rule.message.format(getattr(cfg, rule.threshold))} (got "
+        if rule.column in metrics.columns:
+            values = metrics[rule.column].to_numpy(dtype=object)[rows]
+        else:
+            values = [None] * len(rows)
+        why[rows] = [f"{prefix}{value})" for value in values]
+
+    index = metrics.index
+    return ScreenEvaluation(
+        passed=pd.Series(bits == 0, index=index),
+        first_failure=pd.Series(first, index=index),
+        failure_bits=pd.Series(bits, index=index),
+        why_failed=pd.Series(why, index=index, dtype=object),
+    )
+
+
+def screen(metrics: pd.DataFrame, cfg: Optional[ScreenerConfig] = None):
+    """
+    Annotate a metrics frame and select survivors.
+
+    Returns:
+        Tuple of (annotated frame with ``why_failed``/``failure_bits`` columns,
+        survivors sorted by FCF yield desc, EV/EBIT asc, P/E asc)
+    """
+    result = evaluate(metrics, cfg)
+    annotated = metrics.assign(why_failed=result.why_failed, failure_bits=result.failure_bits)
+    return annotated, rank_survivors(annotated[result.passed])
+
+
+def rank_survivors(survivors: pd.DataFrame) -> pd.DataFrame:
+    """Order survivors: higher FCF yield, then lower EV/EBIT, then lower P/E."""
+    return (survivors.sort_values(['fcf_yield_pct', 'ev_ebit', 'pe'], ascending=[False, True, True])
+            .reset_index(drop=True))
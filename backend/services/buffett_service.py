@@ -0,0 +1,257 @@
+"""
+Buffett Fundamentals Strategy Service
+
+Runs the Buffett fundamentals screen as an in-process strategy service. The
+fetch stage refreshes the fundamentals cache on the shared evaluation
+scheduler (only stale tickers touch the network, so re-running an
+interrupted or cancelled screen resumes where it stopped); the compute and
+rule stages then score every fetched ticker in one vectorized pass and the
+results are persisted as a single batch.
+"""
+
+import time
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .base_strategy_service import (
+    BaseStrategyService, StrategyResult, StrategyExecutionSummary, ProgressCallback,
+    CancellationToken
+)
+from .buffett_rules import SCREEN_RULES, ScreenerConfig, evaluate, rank_survivors
+from .serialization import to_native
+
+
+@dataclass
+class BuffettConfig:
+    """Configuration for the Buffett fundamentals screen."""
+    max_workers: int = 16  # Concurrent fundamentals downloads
+    force_refresh: bool = False  # Refetch fundamentals regardless of staleness
+    thresholds: ScreenerConfig = field(default_factory=ScreenerConfig)
+    max_results: Optional[int] = None  # Keep only the top N survivors (alias top_n)
+    priority: str = "normal"  # Scheduler priority: low, normal, high
+
+
+class BuffettService(BaseStrategyService):
+    """Buffett Fundamentals Screener service for direct FastAPI integration."""
+
+    def __init__(self, store=None):
+        super().__init__()
+        self._store = store
+
+    @property
+    def store(self):
+        """Fundamentals store (the shared application store by default)."""
+        if self._store is None:
+            from .fundamentals_store import get_fundamentals_store
+            self._store = get_fundamentals_store()
+        return self._store
+
+    def get_strategy_code(self) -> str:
+        return "buffett"
+
+    def get_strategy_name(self) -> str:
+        return "Buffett Fundamentals Screener"
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> bool:
+        """Validate strategy parameters (tickers plus known screener thresholds)."""
+        if not isinstance(parameters.get("tickers"), list):
+            return False
+        try:
+            self._build_config(parameters)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def get_default_parameters(self) -> Dict[str, Any]:
+        """Return default parameters (screener thresholds are passed as ``thresholds``)."""
+        return {
+            "max_workers": 16,
+            "force_refresh": False,
+            "thresholds": asdict(ScreenerConfig()),
+            "max_results": None,
+            "priority": "normal"
+        }
+
+    def _build_config(self, parameters: Dict[str, Any]) -> BuffettConfig:
+        """Create configuration from request parameters."""
+        return BuffettConfig(
+            max_workers=int(parameters.get("max_workers", 16)),
+            force_refresh=bool(parameters.get("force_refresh", False)),
+            thresholds=ScreenerConfig.from_overrides(parameters.get("thresholds")),
+            max_results=self._resolve_max_results(parameters),
+            priority=parameters.get("priority", "normal")
+        )
+
+    def execute(self, tickers: List[str], parameters: Dict[str, Any],
+                progress_callback: ProgressCallback,
+                cancellation_token: Optional[CancellationToken] = None) -> StrategyExecutionSummary:
+        """Execute the Buffett screen: fetch stage, then vectorized compute and rules."""
+        from .buffett_metrics import compute_metrics
+
+        start_time = time.time()
+        run_id = parameters.get("run_id", f"buffett_{int(start_time)}")
+        config = self._build_config(parameters)
+
+        # Clean and deduplicate tickers
+        tickers = list(dict.fromkeys([t.strip().upper() for t in tickers if t and t.strip()]))
+        if not tickers:
+            return StrategyExecutionSummary(
+                run_id=run_id,
+                strategy_code=self.get_strategy_code(),
+                total_evaluated=0,
+                qualifying_count=0,
+                execution_time_ms=int((time.time() - start_time) * 1000),
+                qualifying_stocks=[],
+                summary_metrics={}
+            )
+
+        progress_callback.report_setup(
+            "Starting Buffett fundamentals screener",
+            {"total_tickers": len(tickers)}
+        )
+
+        # Stage 1: refresh stale fundamentals (network-bound)
+        token = cancellation_token or CancellationToken()
+        fetch_start = time.time()
+        fetched, errors = self._fetch_fundamentals(tickers, config, progress_callback, token)
+        fetch_ms = int((time.time() - fetch_start) * 1000)
+        status, stop_metrics = self._cancellation_summary(token, len(tickers), len(fetched))
+
+        # Stage 2: compute metrics and apply the rules over all fetched tickers at once
+        compute_start = time.time()
+        metrics = compute_metrics(self.store, fetched, errors)
+        evaluation = evaluate(metrics, config.thresholds)
+        compute_ms = int((time.time() - compute_start) * 1000)
+
+        results = self._to_results(metrics, evaluation, config.thresholds,
+                                   compute_ms // max(1, len(fetched)))
+        progress_callback.report_ticker_batch([
+            {
+                "ticker": r.ticker,
+                "passed": r.passed,
+                "score": r.score,
+                "classification": r.classification,
+                "sequence_number": sequence_number,
+                "reasons": r.reasons,
+                "metrics": r.metrics
+            }
+            for sequence_number, r in enumerate(results, 1)
+        ])
+
+        # Survivors in screener order: FCF yield desc, EV/EBIT asc, P/E asc
+        ranked = rank_survivors(metrics[evaluation.passed.to_numpy()])["symbol"].tolist()
+        by_ticker = {r.ticker: r for r in results}
+        qualifying_stocks = [by_ticker[symbol] for symbol in ranked]
+        if config.max_results:
+            qualifying_stocks = qualifying_stocks[:config.max_results]
+
+        passed_count = int(evaluation.passed.sum())
+        progress_callback.report_completion(
+            total_evaluated=len(results),
+            passed=passed_count,
+            failed=len(results) - passed_count
+        )
+
+        summary_metrics = {
+            "pass_rate_percent": round(passed_count / len(results) * 100, 1) if results else 0,
+            "top_candidates": [
+                {"ticker": r.ticker, "fcf_yield_pct": r.metrics.get("fcf_yield_pct"),
+                 "ev_ebit": r.metrics.get("ev_ebit"), "pe": r.metrics.get("pe")}
+                for r in qualifying_stocks[:5]
+            ],
+            "failure_counts": evaluation.failure_counts(),
+            "fetch_errors": len(errors),
+            "fetch_time_ms": fetch_ms,
+            "compute_time_ms": compute_ms,
+            **stop_metrics
+        }
+
+        return StrategyExecutionSummary(
+            run_id=run_id,
+            strategy_code=self.get_strategy_code(),
+            total_evaluated=len(results),
+            qualifying_count=len(qualifying_stocks),
+            execution_time_ms=int((time.time() - start_time) * 1000),
+            qualifying_stocks=qualifying_stocks,
+            summary_metrics=summary_metrics,
+            status=status
+        )
+
+    def _fetch_fundamentals(self, tickers: List[str], config: BuffettConfig,
+                            progress_callback: ProgressCallback,
+                            cancellation_token: CancellationToken):
+        """Refresh stale fundamentals concurrently, stopping early when cancelled.
+
+        Returns:
+            Tuple of (tickers whose fetch stage finished, error message by ticker)
+        """
+        store = self.store
+        max_workers = max(1, min(config.max_workers, len(tickers)))
+
+        errors: Dict[str, str] = {}
+        processed_count = 0
+        count_lock = threading.Lock()
+
+        def fetch(ticker: str) -> str:
+            nonlocal processed_count
+            error = None
+            try:
+                store.refresh(ticker, force=config.force_refresh)
+            except Exception as e:
+                error = str(e)
+                self.logger.warning(f"Failed to refresh fundamentals for {ticker}: {e}")
+
+            with count_lock:
+                if error is not None:
+                    errors[ticker] = error
+                processed_count += 1
+                processed = processed_count
+
+            # Nothing has been scored during the fetch stage
+            if processed % 25 == 0 or processed == len(tickers):
+                progress_callback.report_overall_progress(
+                    processed=processed,
+                    total=len(tickers),
+                    passed_so_far=0
+                )
+            return ticker
+
+        fetched = self._run_ticker_tasks(tickers, fetch, max_workers, cancellation_token,
+                                         config.priority)
+        return fetched, errors
+
+    def _to_results(self, metrics, evaluation, cfg: ScreenerConfig,
+                    processing_time_ms: int = 0) -> List[StrategyResult]:
+        """Convert the evaluated metrics frame into per-ticker strategy results.
+
+        The score is the percentage of enabled rules a ticker passes.
+        """
+        enabled = sum(1 for rule in SCREEN_RULES if rule.enabled is None or rule.enabled(cfg))
+        processed_at = datetime.utcnow()
+        rows = to_native(metrics.to_dict(orient="records"))
+
+        results = []
+        for row, passed, bits, why in zip(rows, evaluation.passed.tolist(),
+                                          evaluation.failure_bits.tolist(),
+                                          evaluation.why_failed.tolist()):
+            failed_rules = evaluation.failed_rules(bits)
+            if passed:
+                classification = "qualified"
+            elif row.get("error"):
+                classification = "error"
+            else:
+                classification = "rejected"
+            row["why_failed"] = why
+            results.append(StrategyResult(
+                ticker=row["symbol"],
+                passed=bool(passed),
+                score=round(100.0 * (enabled - len(failed_rules)) / enabled, 1) if enabled else 0.0,
+                classification=classification,
+                reasons=failed_rules,
+                metrics=row,
+                processed_at=processed_at,
+                processing_time_ms=processing_time_ms
+            ))
+        return results
@@ -7,13 +7,14 @@ This replaces the complex subprocess execution with in-process strategy executio
 
 import time
 import statistics
-import concurrent.futures
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 
 from .base_strategy_service import (
-    BaseStrategyService, StrategyResult, StrategyExecutionSummary, ProgressCallback
+    BaseStrategyService, StrategyResult, StrategyExecutionSummary, ProgressCallback,
+    CancellationToken, EARLY_STOP_REASON, SweepableStrategy, ReplayableStrategy, IncrementalStrategy
 )
 
 
@@ -26,6 +27,9 @@ class BullishBreakoutConfig:
     max_workers: int = 4
     min_score: int = 5  # Changed from 70 to 5 for 7-point system
     lookup_names: bool = True
+    incremental: bool = False  # Evaluate from persisted indicator state
+    max_results: Optional[int] = None  # Stop once this many tickers qualify (alias top_n)
+    priority: str = "normal"  # Scheduler priority: low, normal, high
 
 
 @dataclass
@@ -37,7 +41,8 @@ class TickerEvaluation:
     metrics: Dict[str, Any]
 
 
-class BullishBreakoutService(BaseStrategyService):
+class BullishBreakoutService(SweepableStrategy, ReplayableStrategy, IncrementalStrategy,
+                              BaseStrategyService):
     """Bullish Breakout Strategy Service for direct FastAPI integration."""
     
     def get_strategy_code(self) -> str:
@@ -66,24 +71,94 @@ class BullishBreakoutService(BaseStrategyService):
             "volume_threshold_multiple": 1.5,
             "max_workers": 4,
             "min_score": 5,
-            "lookup_names": True
+            "lookup_names": True,
+            "incremental": False,
+            "max_results": None,
+            "priority": "normal"
         }
     
-    def execute(self, tickers: List[str], parameters: Dict[str, Any], 
-                progress_callback: ProgressCallback) -> StrategyExecutionSummary:
-        """Execute bullish breakout strategy with progress reporting."""
-        start_time = time.time()
-        run_id = parameters.get("run_id", f"bullish_{int(start_time)}")
-        
-        # Create configuration from parameters
-        config = BullishBreakoutConfig(
+    def get_sweepable_parameters(self) -> List[str]:
+        """Return scoring-only parameters that can be swept over shared indicators."""
+        return ["volume_threshold_multiple", "min_score"]
+    
+    def prepare_ticker(self, ticker: str, parameters: Dict[str, Any]):
+        """Download history and compute indicator columns once for a ticker."""
+        df, failure = self._prepare_frame(ticker, self._build_config(parameters))
+        if failure is not None:
+            return None, self._to_strategy_result(failure)
+        return df, None
+    
+    def evaluate_prepared(self, ticker: str, prepared, parameters: Dict[str, Any]) -> StrategyResult:
+        """Score a prepared indicator frame under the given parameters."""
+        evaluation = self._evaluate_frame(ticker, prepared, self._build_config(parameters))
+        return self._to_strategy_result(evaluation)
+    
+    def evaluate_history(self, ticker: str, bars, parameters: Dict[str, Any],
+                         positions=None, benchmark=None):
+        """Score every requested bar using indicator columns computed once over ``bars``."""
+        import pandas as pd
+        import numpy as np
+        
+        config = self._build_config(parameters)
+        df = bars[["close", "volume"]].astype(float)
+        self._compute_indicators(df, pd, np)
+        
+        sma200 = df["sma200"].to_numpy()
+        rows = df.to_dict("records")
+        history = []
+        for i in (positions if positions is not None else range(199, len(df))):
+            # Same gate as _prepare_frame: 200 bars and a defined SMA200
+            if i < 199 or i >= len(df) or sma200[i] != sma200[i]:
+                continue
+            score, passed, reasons, metrics = self._apply_strategy_rules(
+                df.iloc[:i + 1], rows[i], config, pd, np
+            )
+            evaluation = TickerEvaluation(ticker, passed, reasons, metrics)
+            history.append((df.index[i], self._to_strategy_result(evaluation)))
+        return history
+    
+    def evaluate_state(self, ticker: str, state, parameters: Dict[str, Any]) -> StrategyResult:
+        """Score the latest bar from a streaming indicator state."""
+        return self._to_strategy_result(
+            self._evaluate_state(ticker, state, self._build_config(parameters))
+        )
+    
+    def _build_config(self, parameters: Dict[str, Any]) -> BullishBreakoutConfig:
+        """Create configuration from request parameters."""
+        return BullishBreakoutConfig(
             period=parameters.get("period", "2y"),
             interval=parameters.get("interval", "1d"),
             volume_threshold_multiple=parameters.get("volume_threshold_multiple", 1.5),
             max_workers=parameters.get("max_workers", 4),
             min_score=parameters.get("min_score", 5),
-            lookup_names=parameters.get("lookup_names", True)
+            lookup_names=parameters.get("lookup_names", True),
+            incremental=parameters.get("incremental", False),
+            max_results=self._resolve_max_results(parameters),
+            priority=parameters.get("priority", "normal")
+        )
+    
+    def _to_strategy_result(self, evaluation: TickerEvaluation) -> StrategyResult:
+        """Convert an internal evaluation into a StrategyResult."""
+        return StrategyResult(
+            ticker=evaluation.ticker,
+            passed=evaluation.passed,
+            score=evaluation.metrics.get("score", 0),
+            classification=evaluation.metrics.get("recommendation"),
+            reasons=evaluation.reasons,
+            metrics=evaluation.metrics,
+            processed_at=datetime.utcnow(),
+            processing_time_ms=evaluation.metrics.get("processing_time_ms", 0)
         )
+    
+    def execute(self, tickers: List[str], parameters: Dict[str, Any], 
+                progress_callback: ProgressCallback,
+                cancellation_token: Optional[CancellationToken] = None) -> StrategyExecutionSummary:
+        """Execute bullish breakout strategy with progress reporting."""
+        start_time = time.time()
+        run_id = parameters.get("run_id", f"bullish_{int(start_time)}")
+        
+        # Create configuration from parameters
+        config = self._build_config(parameters)
         
         # Clean and deduplicate tickers
         tickers = list(dict.fromkeys([t.strip().upper() for t in tickers if t and t.strip()]))
@@ -104,10 +179,12 @@ class BullishBreakoutService(BaseStrategyService):
         )
         
         # Execute strategy
-        results = self._evaluate_tickers(tickers, config, progress_callback)
+        token = cancellation_token or CancellationToken()
+        results = self._evaluate_tickers(tickers, config, progress_callback, token)
+        status, stop_metrics = self._cancellation_summary(token, len(tickers), len(results))
         
-        # Enrich with company names if requested
-        if config.lookup_names and results:
+        # Enrich with company names if requested (skipped for cancelled runs)
+        if config.lookup_names and results and status != "cancelled":
             self._enrich_company_names(results, progress_callback)
         
         # Separate passed and failed results
@@ -117,21 +194,12 @@ class BullishBreakoutService(BaseStrategyService):
         # Sort by score
         passed_results.sort(key=lambda r: r.metrics.get("score", 0), reverse=True)
         
+        # Keep only the top N when an early-stop limit was requested
+        if config.max_results:
+            passed_results = passed_results[:config.max_results]
+        
         # Convert to StrategyResult objects
-        qualifying_stocks = []
-        for eval_result in passed_results:
-            processing_time = eval_result.metrics.get("processing_time_ms", 0)
-            strategy_result = StrategyResult(
-                ticker=eval_result.ticker,
-                passed=eval_result.passed,
-                score=eval_result.metrics.get("score", 0),
-                classification=eval_result.metrics.get("recommendation"),
-                reasons=eval_result.reasons,
-                metrics=eval_result.metrics,
-                processed_at=datetime.utcnow(),
-                processing_time_ms=processing_time
-            )
-            qualifying_stocks.append(strategy_result)
+        qualifying_stocks = [self._to_strategy_result(r) for r in passed_results]
         
         # Report completion
         progress_callback.report_completion(
@@ -153,6 +221,7 @@ class BullishBreakoutService(BaseStrategyService):
                 sum(r.metrics.get("score", 0) for r in passed_results) / len(passed_results), 1
             ) if passed_results else 0
         }
+        summary_metrics.update(stop_metrics)
         
         return StrategyExecutionSummary(
             run_id=run_id,
@@ -161,17 +230,20 @@ class BullishBreakoutService(BaseStrategyService):
             qualifying_count=len(passed_results),
             execution_time_ms=execution_time_ms,
             qualifying_stocks=qualifying_stocks,
-            summary_metrics=summary_metrics
+            summary_metrics=summary_metrics,
+            status=status
         )
     
     def _evaluate_tickers(self, tickers: List[str], config: BullishBreakoutConfig, 
-                         progress_callback: ProgressCallback) -> List[TickerEvaluation]:
-        """Evaluate tickers using concurrent execution."""
-        results: List[TickerEvaluation] = []
+                         progress_callback: ProgressCallback,
+                         cancellation_token: Optional[CancellationToken] = None) -> List[TickerEvaluation]:
+        """Evaluate tickers using concurrent execution, stopping early when cancelled."""
+        token = cancellation_token or CancellationToken()
         max_workers = max(1, min(config.max_workers, len(tickers)))
         
         processed_count = 0
         passed_count = 0
+        count_lock = threading.Lock()
         
         def evaluate_with_progress(ticker: str) -> TickerEvaluation:
             nonlocal processed_count, passed_count
@@ -183,9 +255,13 @@ class BullishBreakoutService(BaseStrategyService):
             # Add processing time to metrics
             result.metrics["processing_time_ms"] = processing_time_ms
             
-            processed_count += 1
-            if result.passed:
-                passed_count += 1
+            with count_lock:
+                processed_count += 1
+                if result.passed:
+                    passed_count += 1
+                sequence_number = processed_count
+                if config.max_results and passed_count >= config.max_results:
+                    token.cancel(EARLY_STOP_REASON)
             
             # DEBUG: Log the calculated metrics with SMA values and slope
             self.logger.debug(f"[METRICS_DEBUG] Calculated metrics for {ticker}: {result.metrics}")
@@ -198,46 +274,67 @@ class BullishBreakoutService(BaseStrategyService):
                 passed=result.passed,
                 score=result.metrics.get("score", 0),
                 classification=result.metrics.get("recommendation", "N/A"),
-                sequence_number=processed_count,
+                sequence_number=sequence_number,
                 metrics=result.metrics
             )
             
             # Report overall progress periodically
-            if processed_count % 10 == 0 or processed_count == len(tickers):
+            if sequence_number % 10 == 0 or sequence_number == len(tickers):
                 progress_callback.report_overall_progress(
-                    processed=processed_count,
+                    processed=sequence_number,
                     total=len(tickers),
                     passed_so_far=passed_count
                 )
             
             return result
         
-        # Execute with thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for result in executor.map(evaluate_with_progress, tickers):
-                results.append(result)
-        
-        return results
+        return self._run_ticker_tasks(tickers, evaluate_with_progress, max_workers, token,
+                                      config.priority)
     
     def _evaluate_single_ticker(self, ticker: str, config: BullishBreakoutConfig) -> TickerEvaluation:
         """Evaluate a single ticker. This is the core logic from the original script."""
+        if config.incremental:
+            from .indicator_state import get_indicator_state_service
+            state = get_indicator_state_service().get_state(ticker, config.period, config.interval)
+            return self._evaluate_state(ticker, state, config)
+        
+        df, failure = self._prepare_frame(ticker, config)
+        if failure is not None:
+            return failure
+        return self._evaluate_frame(ticker, df, config)
+    
+    def _prepare_frame(self, ticker: str, config: BullishBreakoutConfig):
+        """Download history and compute indicator columns for a ticker.
+        
+        Only ``config.period`` and ``config.interval`` affect this stage, so the
+        returned frame can be scored repeatedly under different thresholds.
+        
+        Returns:
+            Tuple of (indicator DataFrame, None) or (None, failed TickerEvaluation)
+        """
         try:
             # Import heavy dependencies lazily
             import pandas as pd
             import numpy as np
             import yfinance as yf
         except ImportError:
-            return TickerEvaluation(ticker, False, ["missing_dependencies"], {})
-        
-        reasons: List[str] = []
-        metrics: Dict[str, Any] = {}
+            return None, TickerEvaluation(ticker, False, ["missing_dependencies"], {})
         
         # Download historical data
         df = self._download_history(yf, pd, ticker, config.period, config.interval)
         if df is None or df.empty:
-            return TickerEvaluation(ticker, False, ["no_data"], metrics)
+            return None, TickerEvaluation(ticker, False, ["no_data"], {})
+        
+        self._compute_indicators(df, pd, np)
+        
+        # Need sufficient history for SMA200
+        if len(df) < 200 or pd.isna(df["sma200"].iloc[-1]):
+            return None, TickerEvaluation(ticker, False, ["insufficient_history"], {})
         
-        # Calculate indicators
+        return df, None
+    
+    def _compute_indicators(self, df, pd, np):
+        """Add moving average, MACD, RSI, volume and prior-high columns to ``df`` in place."""
         df["sma10"] = df["close"].rolling(10).mean()
         df["sma50"] = df["close"].rolling(50).mean()
         df["sma200"] = df["close"].rolling(200).mean()
@@ -254,9 +351,15 @@ class BullishBreakoutService(BaseStrategyService):
         df["high_126_prior"] = df["close"].shift(1).rolling(126).max()
         df["high_252_prior"] = df["close"].shift(1).rolling(252).max()
         
-        # Need sufficient history for SMA200
-        if len(df) < 200 or pd.isna(df["sma200"].iloc[-1]):
-            return TickerEvaluation(ticker, False, ["insufficient_history"], metrics)
+        # Rolling signal state so any bar can be scored without rescanning windows
+        df["golden_cross_30d"] = self._golden_cross_within(df["sma50"], df["sma200"], 30)
+        df["ma200_slope_up_10d"] = df["sma200"] > df["sma200"].shift(10)
+        return df
+    
+    def _evaluate_frame(self, ticker: str, df, config: BullishBreakoutConfig) -> TickerEvaluation:
+        """Apply strategy rules to the last bar of a prepared indicator frame."""
+        import pandas as pd
+        import numpy as np
         
         last = df.iloc[-1]
         
@@ -267,6 +370,20 @@ class BullishBreakoutService(BaseStrategyService):
         
         return TickerEvaluation(ticker, passed, reasons, metrics)
     
+    def _evaluate_state(self, ticker: str, state, config: BullishBreakoutConfig) -> TickerEvaluation:
+        """Apply strategy rules to the last-bar row of an indicator state."""
+        import pandas as pd
+        import numpy as np
+        
+        if state is None or not state.is_ready():
+            return TickerEvaluation(ticker, False, ["insufficient_history"], {})
+        
+        last = state.bullish_row()
+        # Only the previous close is read from the frame (for change_pct)
+        tail = pd.DataFrame({"close": [last.pop("prev_close"), last["close"]]})
+        score, passed, reasons, metrics = self._apply_strategy_rules(tail, last, config, pd, np)
+        return TickerEvaluation(ticker, passed, reasons, metrics)
+    
     def _download_history(self, yf, pd, ticker: str, period: str, interval: str):
         """Download historical data with retries."""
         import time
@@ -367,68 +484,21 @@ class BullishBreakoutService(BaseStrategyService):
             return False
         return prev_a <= prev_b and curr_a > curr_b
     
-    def _detect_golden_cross(self, df, lookback_days: int = 30) -> bool:
-        """
-        Detect if 50-day MA recently crossed above 200-day MA (Golden Cross).
-        
-        Args:
-            df: DataFrame with sma50 and sma200 columns
-            lookback_days: How many days back to look for the cross
-            
-        Returns:
-            True if Golden Cross occurred within lookback period
-        """
-        if len(df) < max(50, 200, lookback_days + 1):
-            return False
-            
-        # Check for the cross in the last lookback_days
-        for i in range(1, min(lookback_days + 1, len(df))):
-            prev_idx = -(i + 1)
-            curr_idx = -i
-            
-            if (prev_idx < -len(df) or curr_idx < -len(df)):
-                continue
-                
-            prev_sma50 = df["sma50"].iloc[prev_idx]
-            prev_sma200 = df["sma200"].iloc[prev_idx]
-            curr_sma50 = df["sma50"].iloc[curr_idx]
-            curr_sma200 = df["sma200"].iloc[curr_idx]
-            
-            # Check for NaN values
-            if any(map(lambda x: x != x, [prev_sma50, prev_sma200, curr_sma50, curr_sma200])):
-                continue
-                
-            # Golden Cross: 50-day was below or equal to 200-day, now above
-            if prev_sma50 <= prev_sma200 and curr_sma50 > curr_sma200:
-                return True
-                
-        return False
-    
-    def _detect_ma200_slope_upward(self, df, pd, lookback_days: int = 10) -> bool:
+    def _golden_cross_within(self, sma50, sma200, lookback_days: int = 30):
         """
-        Detect if 200-day MA is trending upward by comparing current to 10 days ago.
+        Whether the 50-day MA crossed above the 200-day MA within the last ``lookback_days`` bars.
         
         Args:
-            df: DataFrame with sma200 column
-            pd: pandas module
-            lookback_days: How many days back to compare (default 10)
+            sma50: 50-day MA Series
+            sma200: 200-day MA Series
+            lookback_days: How many bars back a cross still counts
             
         Returns:
-            True if MA(200) is sloping upward (current > 10 days ago)
+            Boolean Series, True on bars with a Golden Cross inside the lookback
         """
-        if len(df) < max(200, lookback_days + 1):
-            return False
-            
-        # Get current MA(200) and MA(200) from lookback_days ago
-        current_ma200 = df["sma200"].iloc[-1]
-        past_ma200 = df["sma200"].iloc[-(lookback_days + 1)]
-        
-        # Check for NaN values
-        if pd.isna(current_ma200) or pd.isna(past_ma200):
-            return False
-            
-        # MA(200) is sloping upward if current > past
-        return current_ma200 > past_ma200
+        # NaN comparisons are False, so bars without both SMAs never count
+        cross_up = (sma50.shift(1) <= sma200.shift(1)) & (sma50 > sma200)
+        return cross_up.astype(float).rolling(lookback_days, min_periods=1).max() > 0
     
     def _apply_strategy_rules(self, df, last, config: BullishBreakoutConfig, pd, np):
         """Apply new 7-point scoring system."""
@@ -455,7 +525,7 @@ class BullishBreakoutService(BaseStrategyService):
             reasons.append("price_below_200ma")
             
         # +1 if 50-day MA crosses above 200-day MA (Golden Cross)
-        golden_cross = self._detect_golden_cross(df)
+        golden_cross = bool(last["golden_cross_30d"])
         if golden_cross:
             points_ma += 1
         else:
@@ -510,7 +580,7 @@ class BullishBreakoutService(BaseStrategyService):
         points_trend = 0
         
         # +1 if MA(200) is sloping upward (current > 10 days ago)
-        ma200_slope_up = self._detect_ma200_slope_upward(df, pd)
+        ma200_slope_up = bool(last["ma200_slope_up_10d"])
         if ma200_slope_up:
             points_trend = 1
         else:
@@ -0,0 +1,187 @@
+"""
+Evaluation Scheduler
+
+Shared worker pool for per-ticker strategy work. Screens, sweeps and backtests
+submit their ticker tasks here instead of each starting a private thread pool,
+and workers pick the next task by weighted fair queuing across runs: every task
+is tagged with a virtual finish time of max(virtual time, run's last tag) plus
+1/weight, and the lowest tag runs next. A newly submitted run starts at the
+current virtual time, so a single-ticker analysis is dispatched ahead of the
+remaining backlog of a full-universe screen, and concurrent runs share the pool
+in proportion to their priority weights.
+"""
+
+import concurrent.futures
+import itertools
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Share of the pool each priority receives while runs compete (matches ExecutionOptions.priority)
+PRIORITY_WEIGHTS = {"high": 8.0, "normal": 2.0, "low": 1.0}
+DEFAULT_PRIORITY = "normal"
+
+DEFAULT_SCHEDULER_WORKERS = 8
+# Workers kept free of normal/low tasks so interactive (high) runs never wait for a slot
+RESERVED_HIGH_PRIORITY_WORKERS = 1
+
+
+def normalize_priority(priority: Optional[str]) -> str:
+    """Map a requested priority onto a known one (unknown values become 'normal')."""
+    priority = (priority or DEFAULT_PRIORITY).lower()
+    return priority if priority in PRIORITY_WEIGHTS else DEFAULT_PRIORITY
+
+
+@dataclass
+class _RunQueue:
+    """Pending tasks of one submitted batch."""
+    priority: str
+    weight: float
+    max_concurrency: int
+    tasks: Deque[Tuple[float, concurrent.futures.Future, Callable, Any]] = field(default_factory=deque)
+    running: int = 0
+
+    @property
+    def is_background(self) -> bool:
+        return self.priority != "high"
+
+
+class EvaluationScheduler:
+    """Weighted fair queuing over a fixed pool of daemon worker threads."""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 reserved_workers: int = RESERVED_HIGH_PRIORITY_WORKERS):
+        self.max_workers = max(1, max_workers or int(
+            os.environ.get("STRATEGY_SCHEDULER_WORKERS", DEFAULT_SCHEDULER_WORKERS)
+        ))
+        self.reserved_workers = max(0, min(reserved_workers, self.max_workers - 1))
+        self._cond = threading.Condition()
+        self._runs: Dict[int, _RunQueue] = {}
+        self._run_ids = itertools.count()
+        self._virtual_time = 0.0
+        self._background_running = 0
+        self._workers: List[threading.Thread] = []
+
+    def submit(self, fn: Callable[[Any], Any], items: Iterable[Any],
+               priority: Optional[str] = None,
+               max_concurrency: Optional[int] = None) -> List[concurrent.futures.Future]:
+        """Queue ``fn(item)`` for every item as one fairly scheduled run.
+
+        Args:
+            fn: Task function, called with a single item
+            items: Items to evaluate, started in order within the run
+            priority: 'high', 'normal' or 'low'
+            max_concurrency: Most tasks of this run executing at once (default: whole pool)
+
+        Returns:
+            One future per item, in item order
+        """
+        priority = normalize_priority(priority)
+        weight = PRIORITY_WEIGHTS[priority]
+        run = _RunQueue(priority, weight, max(1, max_concurrency or self.max_workers))
+        futures: List[concurrent.futures.Future] = []
+
+        with self._cond:
+            self._ensure_workers()
+            tag = self._virtual_time
+            for item in items:
+                tag += 1.0 / weight
+                future = concurrent.futures.Future()
+                run.tasks.append((tag, future, fn, item))
+                futures.append(future)
+            if run.tasks:
+                self._runs[next(self._run_ids)] = run
+                self._cond.notify_all()
+        return futures
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any],
+            priority: Optional[str] = None,
+            max_concurrency: Optional[int] = None) -> Iterator[Any]:
+        """Like ``Executor.map``: yield results in item order, cancelling the rest on exit."""
+        futures = self.submit(fn, items, priority, max_concurrency)
+
+        def results():
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return results()
+
+    def pending_count(self) -> int:
+        """Number of queued (not yet started) tasks across all runs."""
+        with self._cond:
+            return sum(len(run.tasks) for run in self._runs.values())
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"strategy-eval-{len(self._workers)}", daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_task(self):
+        """Pop the eligible task with the lowest finish tag (caller holds the lock)."""
+        background_full = self._background_running >= self.max_workers - self.reserved_workers
+        best_key, best_run = None, None
+        for key, run in list(self._runs.items()):
+            while run.tasks and run.tasks[0][1].cancelled():
+                run.tasks.popleft()
+            if not run.tasks:
+                if run.running == 0:
+                    del self._runs[key]
+                continue
+            if run.running >= run.max_concurrency or (run.is_background and background_full):
+                continue
+            if best_run is None or run.tasks[0][0] < best_run.tasks[0][0]:
+                best_key, best_run = key, run
+        if best_run is None:
+            return None
+        return best_key, best_run, best_run.tasks.popleft()
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    self._cond.wait()
+                    task = self._next_task()
+                key, run, (tag, future, fn, item) = task
+                run.running += 1
+                if run.is_background:
+                    self._background_running += 1
+                self._virtual_time = max(self._virtual_time, tag)
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(item))
+                except BaseException as e:
+                    future.set_exception(e)
+
+            with self._cond:
+                run.running -= 1
+                if run.is_background:
+                    self._background_running -= 1
+                if not run.tasks and run.running == 0:
+                    self._runs.pop(key, None)
+                self._cond.notify_all()
+
+
+# Global scheduler instance
+_evaluation_scheduler: Optional[EvaluationScheduler] = None
+
+
+def get_evaluation_scheduler() -> EvaluationScheduler:
+    """Get or create the shared evaluation scheduler."""
+    global _evaluation_scheduler
+    if _evaluation_scheduler is None:
+        _evaluation_scheduler = EvaluationScheduler()
+    return _evaluation_scheduler
@@ -0,0 +1,442 @@
+"""
+Fundamentals Store
+
+Persists yfinance fundamentals in the ``fundamentals`` table, one row per
+``(ticker, statement, period_end)``, so fundamental screens read statements
+locally instead of downloading six statements per symbol on every run.
+
+Staleness policy:
+    - Financial statements and dividends are refetched only once the next
+      quarterly filing is due (last reported quarter end + one quarter +
+      filing lag), and then at most every ``recheck_days`` until it appears.
+    - ``info`` (price, multiples, market cap) moves daily; it is refetched
+      when older than ``info_max_age_days``.
+"""
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .serialization import dumps as dumps_json, loads as loads_json
+
+logger = logging.getLogger(__name__)
+
+FUNDAMENTALS_DDL = """
+    CREATE TABLE IF NOT EXISTS fundamentals (
+        ticker     TEXT NOT NULL,
+        statement  TEXT NOT NULL,
+        period_end TEXT NOT NULL,
+        data_json  TEXT NOT NULL,
+        updated_at TEXT,
+        PRIMARY KEY (ticker, statement, period_end)
+    )
+"""
+
+# Statement name -> yfinance.Ticker attribute
+STATEMENTS = {
+    "balance_sheet": "balance_sheet",
+    "income_stmt": "income_stmt",
+    "cashflow": "cashflow",
+    "quarterly_balance_sheet": "quarterly_balance_sheet",
+    "quarterly_income_stmt": "quarterly_income_stmt",
+    "quarterly_cashflow": "quarterly_cashflow",
+}
+INFO = "info"
+DIVIDENDS = "dividends"
+# Marker row recording the last statement download attempt
+CHECKED = "checked"
+
+# Statements whose latest period drives the filing schedule
+_QUARTERLY_STATEMENTS = ("quarterly_income_stmt", "quarterly_balance_sheet", "quarterly_cashflow")
+
+QUARTER_DAYS = 91
+# Days after a quarter end by which the 10-Q/10-K is normally filed
+FILING_LAG_DAYS = 45
+
+
+@dataclass
+class Fundamentals:
+    """Fundamentals of one ticker as yfinance-shaped objects."""
+    ticker: str
+    info: Dict[str, Any] = field(default_factory=dict)
+    statements: Dict[str, Any] = field(default_factory=dict)  # name -> DataFrame (line items x period ends)
+    dividends: Any = None  # Series indexed by ex-date
+
+    def statement(self, name: str):
+        """Return a statement DataFrame (empty if not stored)."""
+        import pandas as pd
+        frame = self.statements.get(name)
+        return frame if frame is not None else pd.DataFrame()
+
+
+class FundamentalsStore:
+    """SQLite-backed cache of statements, dividends and info with filing-aware refresh."""
+
+    def __init__(self, db_connection: Optional[sqlite3.Connection] = None,
+                 info_max_age_days: float = 1.0, recheck_days: float = 7.0):
+        """
+        Initialize the store.
+
+        Args:
+            db_connection: SQLite connection (defaults to the shared application database)
+            info_max_age_days: Maximum age of cached ``info`` before it is refetched
+            recheck_days: Minimum days between statement refetches once a filing is due
+        """
+        if db_connection is None:
+            from ..database.connection import get_db_connection
+            db_connection = get_db_connection()
+        self.db = db_connection
+        self.info_max_age_days = info_max_age_days
+        self.recheck_days = recheck_days
+        # One connection is shared by fetch worker threads; serialize access to it
+        self._lock = threading.Lock()
+        self.ensure_table()
+
+    def ensure_table(self):
+        """Create the fundamentals table if it does not exist (mirrors db.py v9)."""
+        with self._lock:
+            self.db.execute(FUNDAMENTALS_DDL)
+            self.db.commit()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get_statement(self, ticker: str, statement: str):
+        """
+        Load a stored statement.
+
+        Returns:
+            DataFrame shaped like yfinance's (line items as index, period ends as
+            Timestamp columns), or None if nothing is stored
+        """
+        import pandas as pd
+
+        rows = self._rows(ticker, statement)
+        if not rows:
+            return None
+        columns = {pd.Timestamp(period_end): loads_json(data) for period_end, data in rows}
+        return pd.DataFrame(columns).sort_index(axis=1, ascending=False)
+
+    def get_dividends(self, ticker: str):
+        """Load stored dividends as a Series indexed by ex-date (None if not stored)."""
+        import pandas as pd
+
+        rows = self._rows(ticker, DIVIDENDS)
+        if not rows:
+            return None
+        index = pd.DatetimeIndex([pd.Timestamp(period_end) for period_end, _ in rows], name="Date")
+        return pd.Series([loads_json(data)["amount"] for _, data in rows], index=index,
+                         name="Dividends", dtype=float).sort_index()
+
+    def get_info(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Load the latest stored info dict, or None."""
+        rows = self._rows(ticker, INFO)
+        return loads_json(rows[-1][1]) if rows else None
+
+    def get(self, ticker: str) -> Fundamentals:
+        """Load everything stored for a ticker (no network access)."""
+        ticker = ticker.upper()
+        statements = {}
+        for name in STATEMENTS:
+            frame = self.get_statement(ticker, name)
+            if frame is not None:
+                statements[name] = frame
+        return Fundamentals(ticker, self.get_info(ticker) or {}, statements, self.get_dividends(ticker))
+
+    def iter_records(self, tickers: Optional[Iterable[str]] = None,
+                     statements: Optional[Iterable[str]] = None, chunk_size: int = 500):
+        """
+        Bulk read of stored rows for many tickers.
+
+        Args:
+            tickers: Tickers to read (all stored tickers if None)
+            statements: Statement names to read (all if None)
+            chunk_size: Tickers per query
+
+        Yields:
+            ``(ticker, statement, period_end, data)`` with ``data`` decoded
+        """
+        statements = tuple(statements) if statements is not None else None
+        ticker_chunks = [None]
+        if tickers is not None:
+            tickers = [t.upper() for t in tickers]
+            ticker_chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+        for chunk in ticker_chunks:
+            query = "SELECT ticker, statement, period_end, data_json FROM fundamentals WHERE 1=1"
+            params = []
+            if chunk is not None:
+                query += f" AND ticker IN ({','.join('?' for _ in chunk)})"
+                params.extend(chunk)
+            if statements is not None:
+                query += f" AND statement IN ({','.join('?' for _ in statements)})"
+                params.extend(statements)
+            with self._lock:
+                rows = self.db.execute(query, params).fetchall()
+            for ticker, statement, period_end, data in rows:
+                yield ticker, statement, period_end, loads_json(data)
+
+    def tickers(self) -> List[str]:
+        """All tickers with stored fundamentals."""
+        with self._lock:
+            rows = self.db.execute("SELECT DISTINCT ticker FROM fundamentals ORDER BY ticker").fetchall()
+        return [r[0] for r in rows]
+
+    def version(self) -> Tuple[int, Optional[str]]:
+        """Cheap change marker: (row count, latest update)."""
+        with self._lock:
+            row = self.db.execute("SELECT COUNT(*), MAX(updated_at) FROM fundamentals").fetchone()
+        return int(row[0]), row[1]
+
+    def _rows(self, ticker: str, statement: str):
+        with self._lock:
+            return self.db.execute(
+                "SELECT period_end, data_json FROM fundamentals "
+                "WHERE ticker = ? AND statement = ? ORDER BY period_end",
+                (ticker.upper(), statement)
+            ).fetchall()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def save_statement(self, ticker: str, statement: str, frame) -> int:
+        """
+        Upsert a yfinance statement frame (one row per period end column).
+
+        Returns:
+            Number of periods written
+        """
+        if frame is None or getattr(frame, "empty", True):
+            return 0
+        rows = []
+        for period_end in frame.columns:
+            values = frame[period_end]
+            data = {str(item): float(v) for item, v in values.items() if _is_number(v)}
+            if data:
+                rows.append((_period_key(period_end), dumps_json(data)))
+        return self._upsert(ticker, statement, rows)
+
+    def save_dividends(self, ticker: str, dividends) -> int:
+        """Upsert a dividend Series indexed by ex-date."""
+        if dividends is None or len(dividends) == 0:
+            return 0
+        rows = [(_period_key(ts), dumps_json({"amount": float(v)}))
+                for ts, v in dividends.items() if _is_number(v)]
+        return self._upsert(ticker, DIVIDENDS, rows)
+
+    def save_info(self, ticker: str, info: Dict[str, Any]) -> int:
+        """Replace the stored info dict (keyed by the fetch date)."""
+        if not info:
+            return 0
+        ticker = ticker.upper()
+        as_of = datetime.utcnow().date().isoformat()
+        with self._lock:
+            self.db.execute("DELETE FROM fundamentals WHERE ticker = ? AND statement = ? AND period_end <> ?",
+                            (ticker, INFO, as_of))
+        return self._upsert(ticker, INFO, [(as_of, dumps_json(info))])
+
+    def _upsert(self, ticker: str, statement: str, rows) -> int:
+        now = _now_iso()
+        ticker = ticker.upper()
+        with self._lock:
+            self.db.executemany("""
+                INSERT INTO fundamentals (ticker, statement, period_end, data_json, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(ticker, statement, period_end) DO UPDATE SET
+                    data_json = excluded.data_json, updated_at = excluded.updated_at
+            """, [(ticker, statement, period_end, data, now) for period_end, data in rows])
+            self.db.commit()
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Staleness
+    # ------------------------------------------------------------------
+    def last_reported_period(self, ticker: str) -> Optional[str]:
+        """Latest quarter end stored for a ticker (YYYY-MM-DD), or None."""
+        placeholders = ",".join("?" for _ in _QUARTERLY_STATEMENTS)
+        with self._lock:
+            row = self.db.execute(
+                f"SELECT MAX(period_end) FROM fundamentals WHERE ticker = ? AND statement IN ({placeholders})",
+                (ticker.upper(), *_QUARTERLY_STATEMENTS)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def next_filing_due(self, ticker: str) -> Optional[str]:
+        """Date the next quarterly filing is expected (None if nothing is stored)."""
+        last_period = self.last_reported_period(ticker)
+        if not last_period:
+            return None
+        due = datetime.strptime(last_period[:10], "%Y-%m-%d") + timedelta(days=QUARTER_DAYS + FILING_LAG_DAYS)
+        return due.date().isoformat()
+
+    def statements_stale(self, ticker: str, now: Optional[datetime] = None) -> bool:
+        """Whether statements should be refetched under the filing-based policy."""
+        now = now or datetime.utcnow()
+        due = self.next_filing_due(ticker)
+        if due is not None and now.date().isoformat() < due:
+            return False
+        # Filing due (or no statements published, e.g. ETFs): recheck periodically
+        checked_at = self._last_update(ticker, (CHECKED,))
+        return checked_at is None or now - checked_at >= timedelta(days=self.recheck_days)
+
+    def info_stale(self, ticker: str, now: Optional[datetime] = None) -> bool:
+        """Whether the cached info dict is older than ``info_max_age_days``."""
+        now = now or datetime.utcnow()
+        fetched_at = self._last_update(ticker, (INFO,))
+        return fetched_at is None or now - fetched_at >= timedelta(days=self.info_max_age_days)
+
+    def _last_update(self, ticker: str, statements: Iterable[str]) -> Optional[datetime]:
+        statements = tuple(statements)
+        placeholders = ",".join("?" for _ in statements)
+        with self._lock:
+            row = self.db.execute(
+                f"SELECT MAX(updated_at) FROM fundamentals WHERE ticker = ? AND statement IN ({placeholders})",
+                (ticker.upper(), *statements)
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        return datetime.strptime(row[0].rstrip("Z"), "%Y-%m-%dT%H:%M:%S")
+
+    # ------------------------------------------------------------------
+    # Network refresh
+    # ------------------------------------------------------------------
+    def refresh(self, ticker: str, force: bool = False) -> Dict[str, bool]:
+        """
+        Download whatever is stale for a ticker and store it.
+
+        Args:
+            ticker: Ticker symbol
+            force: Refetch everything regardless of staleness
+
+        Returns:
+            Dict with ``statements`` and ``info`` flags telling what was fetched
+
+        Raises:
+            RuntimeError: If every statement download failed
+        """
+        import yfinance as yf
+
+        ticker = ticker.upper()
+        fetch_statements = force or self.statements_stale(ticker)
+        fetch_info = force or self.info_stale(ticker)
+        if not (fetch_statements or fetch_info):
+            return {"statements": False, "info": False}
+
+        t = yf.Ticker(ticker)
+        if fetch_info:
+            self.save_info(ticker, _download_info(t))
+        if fetch_statements:
+            failed = {}
+            for name, attr in STATEMENTS.items():
+                try:
+                    self.save_statement(ticker, name, getattr(t, attr))
+                except Exception as e:
+                    failed[name] = e
+                    logger.warning(f"Failed to fetch {name} for {ticker}: {e}")
+            if len(failed) == len(STATEMENTS):
+                raise RuntimeError(f"Failed to fetch statements for {ticker}: {next(iter(failed.values()))}")
+            try:
+                dividends = t.dividends
+                if dividends is not None and getattr(dividends.index, "tz", None) is not None:
+                    dividends.index = dividends.index.tz_localize(None)
+                self.save_dividends(ticker, dividends)
+            except Exception as e:
+                logger.warning(f"Failed to fetch dividends for {ticker}: {e}")
+            # Record the check even when no new period appeared (delays the next recheck),
+            # but only once the quarterly statements that drive the schedule came through
+            if not failed.keys() & set(_QUARTERLY_STATEMENTS):
+                self._upsert(ticker, CHECKED, [("", "{}")])
+        return {"statements": fetch_statements, "info": fetch_info}
+
+    def refresh_many(self, tickers: Iterable[str], max_workers: int = 16, force: bool = False,
+                     on_done=None) -> Dict[str, str]:
+        """
+        Fetch stage: refresh many tickers concurrently (network-bound).
+
+        Args:
+            tickers: Tickers to refresh
+            max_workers: Concurrent downloads
+            force: Refetch everything regardless of staleness
+            on_done: Optional callback ``(ticker, error)`` after each ticker
+
+        Returns:
+            Error message by ticker for tickers whose refresh failed
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        errors: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self.refresh, t, force): t.upper() for t in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                error = None
+                try:
+                    future.result()
+                except Exception as e:
+                    error = errors[ticker] = str(e)
+                    logger.warning(f"Failed to refresh fundamentals for {ticker}: {e}")
+                if on_done is not None:
+                    on_done(ticker, error)
+        return errors
+
+    def load(self, ticker: str, refresh: bool = True, force: bool = False) -> Fundamentals:
+        """
+        Return stored fundamentals, refreshing stale parts first if requested.
+
+        Download failures are logged and the stored data is returned as-is.
+        """
+        if refresh:
+            try:
+                self.refresh(ticker, force=force)
+            except Exception as e:
+                logger.warning(f"Failed to refresh fundamentals for {ticker}: {e}")
+        return self.get(ticker)
+
+
+def _download_info(t) -> Dict[str, Any]:
+    """yfinance info with the live price folded into ``currentPrice``."""
+    info: Dict[str, Any] = {}
+    try:
+        data = t.get_info() if hasattr(t, "get_info") else t.info
+        if isinstance(data, dict):
+            info = dict(data)
+    except Exception:
+        pass
+    try:
+        price = t.fast_info.get("last_price")
+        if price is not None:
+            info["currentPrice"] = float(price)
+    except Exception:
+        pass
+    return info
+
+
+def _is_number(value) -> bool:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return False
+    return value == value
+
+
+def _period_key(value) -> str:
+    return str(value)[:10]
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+# Global store instance
+_fundamentals_store: Optional[FundamentalsStore] = None
+
+
+def get_fundamentals_store(db_connection: Optional[sqlite3.Connection] = None) -> FundamentalsStore:
+    """Get or create global fundamentals store."""
+    global _fundamentals_store
+    if _fundamentals_store is None:
+        _fundamentals_store = FundamentalsStore(db_connection)
+    return _fundamentals_store
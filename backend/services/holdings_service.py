@@ -7,7 +7,8 @@ data processing for holdings-related API endpoints.
 import logging
 import csv
 import io
-from typing import List, Optional, Dict, Any
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 import sqlite3
 from datetime import datetime
 
@@ -17,12 +18,35 @@ from ..models.schemas import (
     PositionResponse, PortfolioSummaryResponse, AccountSummary,
     SectorAllocation, StyleAllocation, TopHolding, PositionsResponse,
     HoldingsImportResponse, HoldingsImportSummary, ImportedHoldingRecord,
-    DetectedAccount, AccountImportSummary
+    DetectedAccount, AccountImportSummary, HoldingChange, HoldingsReconciliationSummary
 )
 from .market_data_service import MarketDataService
+from .portfolio_aggregation import (
+    GroupTotals, HoldingsColumns, PortfolioAggregates, PortfolioSnapshot
+)
 
 logger = logging.getLogger(__name__)
 
+# Holdings rows written per executemany batch during CSV import
+IMPORT_BATCH_SIZE = 1000
+# Per-row records and errors kept in an import response (counts always cover every row)
+MAX_REPORTED_RECORDS = 1000
+
+HOLDINGS_INSERT = """
+INSERT INTO holdings (account, ticker, quantity, cost_basis, last_update)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# Lot identity used by reconciling imports
+LotKey = Tuple[str, str, Optional[str]]  # (account, ticker, lot_tag)
+
+# Register imported tickers without touching existing instrument metadata
+INSTRUMENTS_UPSERT = """
+INSERT INTO instruments (ticker, instrument_type, updated_at)
+VALUES (?, 'stock', datetime('now'))
+ON CONFLICT(ticker) DO NOTHING
+"""
+
 
 class HoldingsService:
     """Service for managing holdings and portfolio data."""
@@ -30,6 +54,12 @@ class HoldingsService:
     def __init__(self, db_manager: DatabaseManager, market_service: MarketDataService):
         self.db_manager = db_manager
         self.market_service = market_service
+        # Live portfolio aggregates; rebuilt only after holdings change
+        self._snapshot: Optional[PortfolioSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        # Prices of unaffected tickers reused when the snapshot is rebuilt after a partial change
+        self._carried_prices: Dict[str, Optional[float]] = {}
+        self.market_service.add_price_listener(self._on_price_update)
     
     def get_positions(
         self, 
@@ -58,7 +88,7 @@ class HoldingsService:
             i.notes as instrument_notes
         FROM holdings h
         LEFT JOIN instruments i ON h.ticker = i.ticker
-        WHERE 1=1
+        WHERE h.quantity > 0
         """
         
         params = []
@@ -113,79 +143,96 @@ class HoldingsService:
     def get_portfolio_summary(self) -> PortfolioSummaryResponse:
         """Get comprehensive portfolio summary with allocations and top holdings.
         
+        The summary is served from an in-memory portfolio snapshot that applies
+        price updates from the market data service incrementally; it is only
+        rebuilt from the database after holdings are imported.
+        
         Returns:
             PortfolioSummaryResponse with portfolio metrics and allocations
         """
-        # Get all holdings with instrument data
-        query = """
-        SELECT 
-            h.holding_id, h.account, h.subaccount, h.ticker, h.quantity, 
-            h.cost_basis, h.opened_at, h.last_update, h.lot_tag, h.notes as holding_notes,
-            i.instrument_type, i.style_category, i.sector, i.industry, 
-            i.country, i.currency, i.active, i.updated_at as instrument_updated_at, 
-            i.notes as instrument_notes
-        FROM holdings h
-        LEFT JOIN instruments i ON h.ticker = i.ticker
-        WHERE h.quantity > 0
-        ORDER BY h.ticker ASC
-        """
-        
-        rows = self.db_manager.execute_query(query)
+        snapshot = self._get_snapshot()
         
-        if not rows:
+        if snapshot is None:
             return PortfolioSummaryResponse(
                 last_updated=datetime.utcnow()
             )
         
-        # Convert to holdings and get market data
-        holdings = [self._row_to_holding_with_instrument(row) for row in rows]
-        tickers = [h.ticker for h in holdings]
-        market_data = self.market_service.get_current_prices(tickers)
-        
-        # Enrich holdings with market data
-        enriched_holdings = []
-        for holding in holdings:
-            if holding.ticker in market_data:
-                price_data = market_data[holding.ticker]
-                holding.current_price = price_data.get('price')
-                if holding.current_price and holding.quantity:
-                    holding.market_value = holding.current_price * holding.quantity
-                    # cost_basis stored as TOTAL (not per share)
-                    if holding.cost_basis:
-                        total_cost = holding.cost_basis
-                        holding.unrealized_gain_loss = holding.market_value - total_cost
-                        if total_cost > 0:
-                            holding.unrealized_gain_loss_percent = (holding.unrealized_gain_loss / total_cost) * 100
-            enriched_holdings.append(holding)
+        # Refresh expired quotes; fresh prices reach the snapshot through _on_price_update
+        self.market_service.get_current_prices(snapshot.tickers)
+        
+        return snapshot.summary(self._build_portfolio_summary)
+    
+    def invalidate_portfolio_snapshot(self, tickers: Optional[Iterable[str]] = None):
+        """Drop the portfolio snapshot so the next summary reloads holdings.
         
-        # Calculate portfolio metrics
-        total_value = sum((h.market_value or 0) for h in enriched_holdings)
-        # Treat cost_basis as already TOTAL
-        total_cost_basis = sum((h.cost_basis or 0) for h in enriched_holdings if h.cost_basis)
+        Args:
+            tickers: Tickers whose lots changed (default: everything). Nothing is
+                dropped for an empty set, and prices of the other tickers are
+                carried into the rebuilt snapshot instead of being fetched again.
+        """
+        with self._snapshot_lock:
+            if tickers is None:
+                self._carried_prices = {}
+            else:
+                changed = set(tickers)
+                if not changed:
+                    return
+                if self._snapshot is not None:
+                    self._carried_prices = {
+                        ticker: price
+                        for ticker, price in zip(self._snapshot.tickers, self._snapshot.aggregates.ticker_price)
+                        if ticker not in changed
+                    }
+            self._snapshot = None
+    
+    def _get_snapshot(self) -> Optional[PortfolioSnapshot]:
+        """Return the portfolio snapshot, building it from the database if needed."""
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                columns = self._load_holdings_columns()
+                if not len(columns):
+                    return None
+                prices = dict(self._carried_prices)
+                self._carried_prices = {}
+                missing = [ticker for ticker in dict.fromkeys(columns.ticker) if ticker not in prices]
+                market_data = self.market_service.get_current_prices(missing) if missing else {}
+                prices.update({ticker: data.get('price') for ticker, data in market_data.items()})
+                self._snapshot = PortfolioSnapshot(columns, prices)
+            return self._snapshot
+    
+    def _on_price_update(self, market_data: Dict[str, Dict[str, Any]]):
+        """Apply freshly fetched prices to the live snapshot."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            snapshot.apply_prices({ticker: data.get('price') for ticker, data in market_data.items()})
+    
+    def _load_holdings_columns(self) -> HoldingsColumns:
+        """Load all open lots with their instrument classification as columns."""
+        query = """
+        SELECT h.ticker, h.account, h.quantity, h.cost_basis, i.sector, i.style_category
+        FROM holdings h
+        LEFT JOIN instruments i ON h.ticker = i.ticker
+        WHERE h.quantity > 0
+        ORDER BY h.ticker ASC
+        """
+        return HoldingsColumns.from_rows(tuple(row) for row in self.db_manager.execute_query(query))
+    
+    def _build_portfolio_summary(self, aggregates: PortfolioAggregates, top_n: int = 10) -> PortfolioSummaryResponse:
+        """Build the summary response from aggregated columns."""
+        total_value = aggregates.total_value
+        total_cost_basis = aggregates.total_cost_basis
         total_gain_loss = total_value - total_cost_basis if total_cost_basis > 0 else None
         total_gain_loss_percent = ((total_gain_loss / total_cost_basis) * 100) if total_cost_basis > 0 and total_gain_loss else None
-
-        # Calculate account summaries
-        accounts = self._calculate_account_summaries(enriched_holdings)
-
-        # Calculate sector allocations
-        sector_allocations = self._calculate_sector_allocations(enriched_holdings, total_value)
-
-        # Calculate style allocations
-        style_allocations = self._calculate_style_allocations(enriched_holdings, total_value)
-
-        # Get top holdings (by market value)
-        top_holdings = self._get_top_holdings(enriched_holdings, total_value, limit=10)
-
+        
         return PortfolioSummaryResponse(
             total_value=total_value if total_value > 0 else None,
             total_cost_basis=total_cost_basis if total_cost_basis > 0 else None,
             total_gain_loss=total_gain_loss,
             total_gain_loss_percent=total_gain_loss_percent,
-            accounts=accounts,
-            top_holdings=top_holdings,
-            sector_allocation=sector_allocations,
-            style_allocation=style_allocations,
+            accounts=self._account_summaries(aggregates.accounts),
+            top_holdings=self._top_holdings(aggregates, total_value, top_n),
+            sector_allocation=self._allocations(aggregates.sectors, total_value, SectorAllocation, 'sector'),
+            style_allocation=self._allocations(aggregates.styles, total_value, StyleAllocation, 'style_category'),
             last_updated=datetime.utcnow()
         )
     
@@ -249,180 +296,97 @@ class HoldingsService:
                         if total_cost > 0:
                             position.unrealized_gain_loss_percent = (position.unrealized_gain_loss / total_cost) * 100
     
-    def _calculate_account_summaries(self, holdings: List[HoldingWithInstrument]) -> List[AccountSummary]:
-        """Calculate account-level summaries."""
-        account_data = {}
-        
-        for holding in holdings:
-            account = holding.account
-            if account not in account_data:
-                account_data[account] = {
-                    'value': 0.0,
-                    'cost_basis': 0.0,
-                    'count': 0
-                }
-            
-            account_data[account]['value'] += holding.market_value or 0.0
-            if holding.cost_basis:
-                account_data[account]['cost_basis'] += holding.cost_basis  # total cost
-            account_data[account]['count'] += 1
-        
+    def _account_summaries(self, accounts: GroupTotals) -> List[AccountSummary]:
+        """Account-level summaries in first-appearance order."""
         summaries = []
-        for account, data in account_data.items():
-            gain_loss = data['value'] - data['cost_basis'] if data['cost_basis'] > 0 else None
-            gain_loss_percent = ((gain_loss / data['cost_basis']) * 100) if data['cost_basis'] > 0 and gain_loss else None
+        for i, account in enumerate(accounts.keys):
+            value = float(accounts.value[i])
+            cost_basis = float(accounts.cost_basis[i])
+            gain_loss = value - cost_basis if cost_basis > 0 else None
+            gain_loss_percent = ((gain_loss / cost_basis) * 100) if cost_basis > 0 and gain_loss else None
             
             summaries.append(AccountSummary(
                 account=account,
-                value=data['value'] if data['value'] > 0 else None,
-                cost_basis=data['cost_basis'] if data['cost_basis'] > 0 else None,
+                value=value if value > 0 else None,
+                cost_basis=cost_basis if cost_basis > 0 else None,
                 gain_loss=gain_loss,
                 gain_loss_percent=gain_loss_percent,
-                positions_count=data['count']
+                positions_count=int(accounts.count[i])
             ))
         
         return summaries
     
-    def _calculate_sector_allocations(self, holdings: List[HoldingWithInstrument], total_value: float) -> List[SectorAllocation]:
-        """Calculate sector allocation breakdown."""
-        sector_data = {}
-        
-        for holding in holdings:
-            sector = holding.sector or 'Unknown'
-            if sector not in sector_data:
-                sector_data[sector] = {
-                    'value': 0.0,
-                    'count': 0
-                }
-            
-            sector_data[sector]['value'] += holding.market_value or 0.0
-            sector_data[sector]['count'] += 1
-        
-        allocations = []
-        for sector, data in sector_data.items():
-            weight = (data['value'] / total_value * 100) if total_value > 0 else 0.0
-            
-            allocations.append(SectorAllocation(
-                sector=sector,
-                value=data['value'] if data['value'] > 0 else None,
-                weight=weight if weight > 0 else None,
-                positions_count=data['count']
-            ))
-        
-        # Sort by value descending
-        allocations.sort(key=lambda x: x.value or 0, reverse=True)
-        return allocations
-    
-    def _calculate_style_allocations(self, holdings: List[HoldingWithInstrument], total_value: float) -> List[StyleAllocation]:
-        """Calculate style allocation breakdown."""
-        style_data = {}
-        
-        for holding in holdings:
-            style_category = holding.style_category or 'Unknown'
-            if style_category not in style_data:
-                style_data[style_category] = {
-                    'value': 0.0,
-                    'count': 0
-                }
-            
-            style_data[style_category]['value'] += holding.market_value or 0.0
-            style_data[style_category]['count'] += 1
-        
+    def _allocations(self, groups: GroupTotals, total_value: float, model, key_field: str) -> list:
+        """Sector/style allocation breakdown sorted by value descending."""
         allocations = []
-        for style_category, data in style_data.items():
-            weight = (data['value'] / total_value * 100) if total_value > 0 else 0.0
+        for i in groups.ranked():
+            value = float(groups.value[i])
+            weight = (value / total_value * 100) if total_value > 0 else 0.0
             
-            allocations.append(StyleAllocation(
-                style_category=style_category,
-                value=data['value'] if data['value'] > 0 else None,
-                weight=weight if weight > 0 else None,
-                positions_count=data['count']
-            ))
+            allocations.append(model(**{
+                key_field: groups.keys[i],
+                'value': value if value > 0 else None,
+                'weight': weight if weight > 0 else None,
+                'positions_count': int(groups.count[i])
+            }))
         
-        # Sort by value descending
-        allocations.sort(key=lambda x: x.value or 0, reverse=True)
         return allocations
     
-    def _get_top_holdings(self, holdings: List[HoldingWithInstrument], total_value: float, limit: int = 10) -> List[TopHolding]:
-        """Get top holdings by market value, aggregated by ticker across accounts."""
-        from collections import defaultdict
-        
-        # Group holdings by ticker
-        ticker_holdings = defaultdict(list)
-        for holding in holdings:
-            ticker_holdings[holding.ticker].append(holding)
-        
-        # Aggregate holdings by ticker
-        aggregated_holdings = []
-        for ticker, ticker_positions in ticker_holdings.items():
-            # Use the first position for non-aggregatable fields
-            first_position = ticker_positions[0]
-            
-            # Aggregate quantities and values
-            total_quantity = sum(pos.quantity for pos in ticker_positions)
-            total_market_value = sum(pos.market_value or 0 for pos in ticker_positions)
-            total_cost_basis = sum(pos.cost_basis or 0 for pos in ticker_positions if pos.cost_basis)  # cost_basis is already total cost
-            
-            # Calculate weighted average cost basis per share
-            avg_cost_basis_per_share = total_cost_basis / total_quantity if total_quantity > 0 and total_cost_basis > 0 else None
-            
-            # Calculate current price (use first position's price)
-            current_price = first_position.current_price
+    def _top_holdings(self, aggregates: PortfolioAggregates, total_value: float, limit: int = 10) -> List[TopHolding]:
+        """Top holdings by market value, aggregated by ticker across accounts."""
+        tickers = aggregates.tickers
+        top_holdings = []
+        for i in tickers.ranked(limit):
+            market_value = float(tickers.value[i])
+            cost_basis = float(tickers.cost_basis[i])  # Total cost basis across all accounts
             
-            # Calculate gain/loss
             gain_loss = None
             gain_loss_percent = None
-            if total_cost_basis > 0 and total_market_value > 0:
-                gain_loss = total_market_value - total_cost_basis
-                gain_loss_percent = (gain_loss / total_cost_basis) * 100
+            if cost_basis > 0 and market_value > 0:
+                gain_loss = market_value - cost_basis
+                gain_loss_percent = (gain_loss / cost_basis) * 100
             
-            aggregated_holdings.append({
-                'ticker': ticker,
-                'company_name': first_position.company_name,
-                'quantity': total_quantity,
-                'current_price': current_price,
-                'market_value': total_market_value,
-                'cost_basis': total_cost_basis,  # Total cost basis across all accounts
-                'avg_cost_basis_per_share': avg_cost_basis_per_share,
-                'gain_loss': gain_loss,
-                'gain_loss_percent': gain_loss_percent,
-                'sector': first_position.sector,
-                'account_count': len(ticker_positions)  # Track how many accounts have this ticker
-            })
-        
-        # Sort by total market value descending
-        sorted_aggregated = sorted(aggregated_holdings, key=lambda x: x['market_value'] or 0, reverse=True)
-        
-        # Create TopHolding objects for the top holdings
-        top_holdings = []
-        for holding_data in sorted_aggregated[:limit]:
-            weight = ((holding_data['market_value'] or 0) / total_value * 100) if total_value > 0 else 0.0
+            weight = (market_value / total_value * 100) if total_value > 0 else 0.0
             
             top_holdings.append(TopHolding(
-                ticker=holding_data['ticker'],
-                company_name=holding_data['company_name'],
-                quantity=holding_data['quantity'],
-                current_price=holding_data['current_price'],
-                market_value=holding_data['market_value'],
-                cost_basis=holding_data['cost_basis'],  # Use total cost basis (same as original implementation)
-                gain_loss=holding_data['gain_loss'],
-                gain_loss_percent=holding_data['gain_loss_percent'],
+                ticker=tickers.keys[i],
+                company_name=None,
+                quantity=float(aggregates.ticker_quantity[i]),
+                current_price=aggregates.ticker_price[i],
+                market_value=market_value,
+                cost_basis=cost_basis,
+                gain_loss=gain_loss,
+                gain_loss_percent=gain_loss_percent,
                 weight=weight if weight > 0 else None,
-                sector=holding_data['sector']
+                sector=aggregates.ticker_sector[i]
             ))
         
         return top_holdings
     
     def import_holdings_from_csv(
         self,
-        csv_content: str,
-        replace_existing: bool = True
+        csv_content: Union[str, Iterable[str]],
+        replace_existing: bool = True,
+        reconcile: bool = False
     ) -> HoldingsImportResponse:
         """Import holdings from CSV content with automatic account detection.
         
+        Rows are parsed and validated in a single streaming pass and written
+        with batched ``executemany`` inserts inside one transaction. An
+        account's existing holdings are replaced when the account first
+        appears in the file. Per-row records and errors in the response are
+        capped at MAX_REPORTED_RECORDS; counts always cover every row.
+        
+        In reconcile mode nothing is deleted: file positions are keyed by
+        (account, ticker, lot_tag) and diffed against the open lots of the
+        detected accounts, and only the needed inserts, updates and closes
+        (quantity set to 0) are applied, keeping opened_at/lot_tag of
+        continuing lots.
+        
         Args:
-            csv_content: CSV file content as string
+            csv_content: CSV file content as a string or an iterable of lines
             replace_existing: Whether to replace all existing holdings for detected accounts
+            reconcile: Apply a keyed diff instead of replacing or appending
             
         Returns:
             HoldingsImportResponse with import results and summary
@@ -437,15 +401,27 @@ class HoldingsService:
         total_records_skipped = 0
         total_records_failed = 0
         total_existing_holdings_deleted = 0
+        unreported_records = 0
+        reconciliation = None
+        file_positions: Dict[LotKey, List[Optional[float]]] = {}  # reconcile mode: key -> [quantity, cost]
         
         # Account tracking
         detected_accounts = {}  # account_number -> DetectedAccount
         account_summaries = {}  # account_number -> AccountImportSummary
         
+        def report(record: ImportedHoldingRecord, error_msg: Optional[str] = None):
+            nonlocal unreported_records
+            if len(imported_records) < MAX_REPORTED_RECORDS:
+                imported_records.append(record)
+            else:
+                unreported_records += 1
+            if error_msg and len(errors) < MAX_REPORTED_RECORDS:
+                errors.append(error_msg)
+        
         try:
-            # Parse CSV content
-            csv_file = io.StringIO(csv_content)
-            csv_reader = csv.DictReader(csv_file)
+            # Parse CSV content incrementally
+            lines = io.StringIO(csv_content) if isinstance(csv_content, str) else csv_content
+            csv_reader = csv.DictReader(lines)
             
             # Validate CSV headers
             expected_headers = {'Account Number', 'Symbol', 'Quantity', 'Current Value', 'Cost Basis Total', 'Type'}
@@ -453,118 +429,25 @@ class HoldingsService:
                 missing_headers = expected_headers - set(csv_reader.fieldnames or [])
                 raise ValueError(f"Missing required CSV headers: {missing_headers}")
             
-            # First pass: detect accounts and preview data
-            first_pass_rows = []
-            for row_number, row in enumerate(csv_reader, start=2):
-                first_pass_rows.append((row_number, row))
-                
-                # Skip empty rows and disclaimer lines
-                row_values = list(row.values())
-                if not any(value and str(value).strip() for value in row_values):
-                    continue
-                    
-                if any(str(value).strip().startswith('"') for value in row_values if value and str(value).strip()):
-                    continue
-                
-                # Skip pending activity entries
-                description = row.get('Description', '') or ''
-                if 'Pending activity' in str(description):
-                    continue
-                
-                # Skip cash entries
-                entry_type = row.get('Type', '').strip()
-                if entry_type.lower() == 'cash':
-                    continue
-                
-                # Skip options
-                symbol = (row.get('Symbol') or '').strip()
-                if symbol.startswith(' -') or symbol.startswith('-') or not symbol:
-                    continue
-                
-                # Extract account information
-                account_number = (row.get('Account Number') or '').strip()
-                account_name = (row.get('Account Name') or '').strip() or None
-                
-                if account_number:
-                    if account_number not in detected_accounts:
-                        detected_accounts[account_number] = DetectedAccount(
-                            account_number=account_number,
-                            account_name=account_name,
-                            record_count=0,
-                            sample_tickers=[]
-                        )
-                    
-                    detected_accounts[account_number].record_count += 1
-                    if len(detected_accounts[account_number].sample_tickers) < 3:
-                        detected_accounts[account_number].sample_tickers.append(symbol.upper())
-            
-            if not detected_accounts:
-                raise ValueError("No valid account data found in CSV file")
-            
-            logger.info(f"Detected {len(detected_accounts)} accounts: {list(detected_accounts.keys())}")
-            
-            # Start database transaction
-            with self.db_manager.get_connection() as conn:
+            # Single transaction: committed on success, rolled back on any failure
+            conn = self.db_manager.get_connection()
+            with conn:
                 cursor = conn.cursor()
+                holdings_batch = []
                 
-                # Initialize account summaries
-                for account_number, account_info in detected_accounts.items():
-                    account_summaries[account_number] = AccountImportSummary(
-                        account_number=account_number,
-                        account_name=account_info.account_name,
-                        total_rows_processed=0,
-                        records_imported=0,
-                        records_skipped=0,
-                        records_failed=0,
-                        existing_holdings_deleted=0,
-                        import_successful=False
-                    )
+                def flush():
+                    if holdings_batch:
+                        cursor.executemany(HOLDINGS_INSERT, holdings_batch)
+                        cursor.executemany(INSTRUMENTS_UPSERT, [(row[1],) for row in holdings_batch])
+                        holdings_batch.clear()
                 
-                # Replace existing holdings for detected accounts if requested
-                if replace_existing:
-                    for account_number in detected_accounts.keys():
-                        delete_query = "DELETE FROM holdings WHERE account = ?"
-                        cursor.execute(delete_query, (account_number,))
-                        deleted_count = cursor.rowcount
-                        account_summaries[account_number].existing_holdings_deleted = deleted_count
-                        total_existing_holdings_deleted += deleted_count
-                        logger.info(f"Deleted {deleted_count} existing holdings for account {account_number}")
-                
-                # Second pass: process and import data
-                for row_number, row in first_pass_rows:
+                for row_number, row in enumerate(csv_reader, start=2):
                     total_rows_processed += 1
                     
                     try:
-                        # Skip disclaimer lines and empty rows
-                        row_values = list(row.values())
-                        if not any(value and str(value).strip() for value in row_values):
-                            total_records_skipped += 1
-                            continue
-                        
-                        if any(str(value).strip().startswith('"') for value in row_values if value and str(value).strip()):
-                            total_records_skipped += 1
-                            continue
-                        
-                        # Skip pending activity entries
-                        description = row.get('Description', '') or ''
-                        if 'Pending activity' in str(description):
-                            total_records_skipped += 1
-                            continue
-                        
-                        # Skip cash entries
-                        entry_type = row.get('Type', '').strip()
-                        if entry_type.lower() == 'cash':
-                            total_records_skipped += 1
-                            continue
-                        
-                        # Skip options
-                        symbol = (row.get('Symbol') or '').strip()
-                        if symbol.startswith(' -') or symbol.startswith('-'):
-                            total_records_skipped += 1
-                            continue
-                        
-                        # Skip empty symbols
-                        if not symbol:
+                        symbol = self._import_row_symbol(row)
+                        if symbol is None:
+                            # Empty, disclaimer, pending activity, cash, option or symbol-less rows
                             total_records_skipped += 1
                             continue
                         
@@ -575,9 +458,38 @@ class HoldingsService:
                         current_value_str = (row.get('Current Value') or '').strip()
                         cost_basis_str = (row.get('Cost Basis Total') or '').strip()
                         
-                        # Update account processing count
-                        if account_number in account_summaries:
-                            account_summaries[account_number].total_rows_processed += 1
+                        # Detect account on first appearance (replacing its holdings if requested)
+                        if account_number and account_number not in detected_accounts:
+                            detected_accounts[account_number] = DetectedAccount(
+                                account_number=account_number,
+                                account_name=account_name,
+                                record_count=0,
+                                sample_tickers=[]
+                            )
+                            account_summaries[account_number] = AccountImportSummary(
+                                account_number=account_number,
+                                account_name=account_name,
+                                total_rows_processed=0,
+                                records_imported=0,
+                                records_skipped=0,
+                                records_failed=0,
+                                existing_holdings_deleted=0,
+                                import_successful=False
+                            )
+                            if replace_existing and not reconcile:
+                                cursor.execute("DELETE FROM holdings WHERE account = ?", (account_number,))
+                                deleted_count = cursor.rowcount
+                                account_summaries[account_number].existing_holdings_deleted = deleted_count
+                                total_existing_holdings_deleted += deleted_count
+                                logger.info(f"Deleted {deleted_count} existing holdings for account {account_number}")
+                        
+                        summary = account_summaries.get(account_number)
+                        if summary is not None:
+                            detected = detected_accounts[account_number]
+                            detected.record_count += 1
+                            if len(detected.sample_tickers) < 3:
+                                detected.sample_tickers.append(symbol.upper())
+                            summary.total_rows_processed += 1
                         
                         # Parse numeric values
                         try:
@@ -586,46 +498,49 @@ class HoldingsService:
                             cost_basis = float(cost_basis_str.replace(',', '').replace('$', '')) if cost_basis_str else None
                         except ValueError as e:
                             error_msg = f"Row {row_number}: Invalid numeric data - {str(e)}"
-                            errors.append(error_msg)
-                            imported_records.append(ImportedHoldingRecord(
+                            report(ImportedHoldingRecord(
                                 ticker=symbol,
                                 account_number=account_number,
                                 account_name=account_name,
                                 quantity=0.0,
                                 cost_basis=0.0,
-                                current_value=current_value,
+                                current_value=None,
                                 row_number=row_number,
                                 status="error",
                                 error_message=error_msg
-                            ))
+                            ), error_msg)
                             total_records_failed += 1
-                            if account_number in account_summaries:
-                                account_summaries[account_number].records_failed += 1
+                            if summary is not None:
+                                summary.records_failed += 1
                             continue
                         
                         # Skip zero quantity holdings
                         if quantity <= 0:
                             total_records_skipped += 1
-                            if account_number in account_summaries:
-                                account_summaries[account_number].records_skipped += 1
+                            if summary is not None:
+                                summary.records_skipped += 1
                             continue
                         
-                        # Insert holding into database
-                        insert_query = """
-                        INSERT INTO holdings (account, ticker, quantity, cost_basis, last_update)
-                        VALUES (?, ?, ?, ?, ?)
-                        """
-                        
-                        cursor.execute(insert_query, (
-                            account_number,
-                            symbol.upper(),
-                            quantity,
-                            cost_basis,
-                            datetime.utcnow().isoformat()
-                        ))
+                        if reconcile:
+                            # Same lot listed on several rows: positions add up
+                            key = (account_number, symbol.upper(), (row.get('Lot Tag') or '').strip() or None)
+                            position = file_positions.setdefault(key, [0.0, None])
+                            position[0] += quantity
+                            if cost_basis is not None:
+                                position[1] = (position[1] or 0.0) + cost_basis
+                        else:
+                            holdings_batch.append((
+                                account_number,
+                                symbol.upper(),
+                                quantity,
+                                cost_basis,
+                                datetime.utcnow().isoformat()
+                            ))
+                            if len(holdings_batch) >= IMPORT_BATCH_SIZE:
+                                flush()
                         
                         # Record successful import
-                        imported_records.append(ImportedHoldingRecord(
+                        report(ImportedHoldingRecord(
                             ticker=symbol.upper(),
                             account_number=account_number,
                             account_name=account_name,
@@ -636,13 +551,16 @@ class HoldingsService:
                             status="success"
                         ))
                         total_records_imported += 1
-                        if account_number in account_summaries:
-                            account_summaries[account_number].records_imported += 1
+                        if summary is not None:
+                            summary.records_imported += 1
                         
+                    except sqlite3.Error:
+                        raise
                     except Exception as e:
                         error_msg = f"Row {row_number}: {str(e)}"
                         logger.error(f"Error processing row {row_number}: {e}")
-                        errors.append(error_msg)
+                        if len(errors) < MAX_REPORTED_RECORDS:
+                            errors.append(error_msg)
                         total_records_failed += 1
                         
                         # Extract account for error tracking
@@ -650,10 +568,20 @@ class HoldingsService:
                         if account_number in account_summaries:
                             account_summaries[account_number].records_failed += 1
                 
-                # Commit transaction
-                conn.commit()
-                logger.info(f"CSV import completed: {total_records_imported} imported, {total_records_skipped} skipped, {total_records_failed} failed")
+                if not detected_accounts:
+                    raise ValueError("No valid account data found in CSV file")
+                
+                flush()
+                if reconcile:
+                    reconciliation = self._reconcile_holdings(cursor, file_positions, detected_accounts.keys())
+            
+            logger.info(f"Detected {len(detected_accounts)} accounts: {list(detected_accounts.keys())}")
+            logger.info(f"CSV import completed: {total_records_imported} imported, {total_records_skipped} skipped, {total_records_failed} failed")
+            self.invalidate_portfolio_snapshot(reconciliation.affected_tickers if reconciliation else None)
         
+        except UnicodeDecodeError:
+            # Undecodable uploads are a client error, surfaced by the API layer
+            raise
         except Exception as e:
             logger.error(f"CSV import failed: {e}")
             errors.append(f"Import failed: {str(e)}")
@@ -697,10 +625,137 @@ class HoldingsService:
         if total_records_failed > 0:
             warnings.append(f"Failed to import {total_records_failed} records due to data errors")
         
+        if unreported_records > 0:
+            warnings.append(f"Per-row details omitted for {unreported_records} records (limit {MAX_REPORTED_RECORDS})")
+        
         return HoldingsImportResponse(
             detected_accounts=list(detected_accounts.values()),
             import_summary=import_summary,
+            reconciliation=reconciliation,
             imported_records=imported_records,
             errors=errors,
             warnings=warnings
-        )
\ No newline at end of file
+        )
+    
+    def _reconcile_holdings(
+        self,
+        cursor: sqlite3.Cursor,
+        file_positions: Dict[LotKey, List[Optional[float]]],
+        accounts: Iterable[str]
+    ) -> HoldingsReconciliationSummary:
+        """Apply the keyed diff between file positions and the accounts' open lots.
+        
+        Args:
+            cursor: Cursor inside the import transaction
+            file_positions: (account, ticker, lot_tag) -> [quantity, total cost basis]
+            accounts: Accounts present in the file (lots of other accounts are untouched)
+            
+        Returns:
+            HoldingsReconciliationSummary with counts and (capped) per-lot changes
+        """
+        accounts = list(accounts)
+        placeholders = ",".join("?" for _ in accounts)
+        rows = cursor.execute(f"""
+            SELECT holding_id, account, ticker, lot_tag, quantity, cost_basis
+            FROM holdings
+            WHERE quantity > 0 AND account IN ({placeholders})
+            ORDER BY holding_id
+        """, accounts).fetchall()
+        
+        existing: Dict[LotKey, Tuple[int, float, Optional[float]]] = {}
+        duplicates = []  # Extra open rows of an already matched key are closed
+        for holding_id, account, ticker, lot_tag, quantity, cost_basis in rows:
+            key = (account, ticker, lot_tag)
+            if key in existing:
+                duplicates.append((key, holding_id, quantity, cost_basis))
+            else:
+                existing[key] = (holding_id, quantity, cost_basis)
+        
+        now = datetime.utcnow().isoformat()
+        inserts, updates, closes = [], [], []
+        changes: List[HoldingChange] = []
+        affected: Set[str] = set()
+        unchanged = 0
+        
+        def record(key: LotKey, action: str, old=(None, None), new=(None, None)):
+            affected.add(key[1])
+            if len(changes) < MAX_REPORTED_RECORDS:
+                changes.append(HoldingChange(
+                    account_number=key[0], ticker=key[1], lot_tag=key[2], action=action,
+                    old_quantity=old[0], old_cost_basis=old[1],
+                    new_quantity=new[0], new_cost_basis=new[1]
+                ))
+        
+        for key, (quantity, cost_basis) in file_positions.items():
+            match = existing.pop(key, None)
+            if match is None:
+                inserts.append((key[0], key[1], quantity, cost_basis, key[2], now[:10], now))
+                record(key, "insert", new=(quantity, cost_basis))
+                continue
+            holding_id, old_quantity, old_cost = match
+            if _same_amount(old_quantity, quantity) and _same_amount(old_cost, cost_basis):
+                unchanged += 1
+                continue
+            updates.append((quantity, cost_basis, now, holding_id))
+            record(key, "update", (old_quantity, old_cost), (quantity, cost_basis))
+        
+        for key, (holding_id, old_quantity, old_cost) in existing.items():
+            closes.append((now, holding_id))
+            record(key, "close", (old_quantity, old_cost), (0.0, old_cost))
+        for key, holding_id, old_quantity, old_cost in duplicates:
+            closes.append((now, holding_id))
+            record(key, "close", (old_quantity, old_cost), (0.0, old_cost))
+        
+        cursor.executemany("""
+            INSERT INTO holdings (account, ticker, quantity, cost_basis, lot_tag, opened_at, last_update)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, inserts)
+        cursor.executemany("UPDATE holdings SET quantity = ?, cost_basis = ?, last_update = ? WHERE holding_id = ?", updates)
+        cursor.executemany("UPDATE holdings SET quantity = 0, last_update = ? WHERE holding_id = ?", closes)
+        cursor.executemany(INSTRUMENTS_UPSERT, [(row[1],) for row in inserts])
+        
+        logger.info(f"Reconciled holdings: {len(inserts)} inserted, {len(updates)} updated, "
+                    f"{len(closes)} closed, {unchanged} unchanged")
+        return HoldingsReconciliationSummary(
+            inserted=len(inserts),
+            updated=len(updates),
+            closed=len(closes),
+            unchanged=unchanged,
+            affected_tickers=sorted(affected),
+            changes=changes
+        )
+    
+    @staticmethod
+    def _import_row_symbol(row: Dict[str, Any]) -> Optional[str]:
+        """Return the row's symbol, or None for rows the import skips."""
+        # Skip disclaimer lines and empty rows
+        row_values = list(row.values())
+        if not any(value and str(value).strip() for value in row_values):
+            return None
+        
+        if any(str(value).strip().startswith('"') for value in row_values if value and str(value).strip()):
+            return None
+        
+        # Skip pending activity entries
+        description = row.get('Description', '') or ''
+        if 'Pending activity' in str(description):
+            return None
+        
+        # Skip cash entries
+        entry_type = (row.get('Type') or '').strip()
+        if entry_type.lower() == 'cash':
+            return None
+        
+        # Skip options and empty symbols
+        symbol = (row.get('Symbol') or '').strip()
+        if symbol.startswith(' -') or symbol.startswith('-') or not symbol:
+            return None
+        
+        return symbol
+
+
+def _same_amount(old: Optional[float], new: Optional[float]) -> bool:
+    """Compare stored and imported amounts, treating float noise as equal."""
+    if old is None or new is None:
+        return old is None and new is None
+    return abs(old - new) <= 1e-9 * max(1.0, abs(old), abs(new))
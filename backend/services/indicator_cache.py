@@ -0,0 +1,137 @@
+"""
+Indicator Cache
+
+Shares computed indicator sets between requests. Entries are keyed by
+``(ticker, interval, last bar date, fetch time of that bar)`` and computed from
+the full stored history in PriceBarStore, so a value is recomputed only once
+the store is refreshed (a new bar, or a re-adjusted history). The last bar of
+each ticker is remembered as well: once it was fetched after the latest session
+became final, repeated requests are answered from memory without touching the
+store or the network.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Download window when a ticker has no stored bars (long enough for SMA200)
+HISTORY_PERIOD = "5y"
+
+# Cached indicator sets and bar frames (least recently used are dropped)
+MAX_ENTRIES = 1024
+MAX_BAR_FRAMES = 64
+
+
+class IndicatorCache:
+    """In-memory indicator sets per (ticker, interval, last stored bar), backed by stored bars."""
+
+    def __init__(self, store=None, history_period: str = HISTORY_PERIOD):
+        """
+        Initialize the cache.
+
+        Args:
+            store: PriceBarStore to read bars from (defaults to the shared store)
+            history_period: Download window for tickers without stored bars
+        """
+        self._store = store
+        self.history_period = history_period
+        self._values: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._bars: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._last_dates: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from .price_bar_store import get_price_bar_store
+            self._store = get_price_bar_store()
+        return self._store
+
+    def get(self, ticker: str, name: str, compute: Callable[[Any], Any],
+            interval: str = "1d") -> Optional[Any]:
+        """
+        Return ``compute(bars)`` for the ticker's stored bars, computed once per new bar.
+
+        Args:
+            ticker: Ticker symbol
+            name: Name of the indicator set (callers sharing a name share values)
+            compute: Function of the full bar DataFrame
+            interval: Bar interval
+
+        Returns:
+            The computed value, or None when no bars are stored
+        """
+        ticker = ticker.upper()
+        last_date = self.last_bar_date(ticker, interval)
+        if last_date is None:
+            return None
+        key = (ticker, interval) + self._last_dates[(ticker, interval)] + (name,)
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+
+        bars = self.bars(ticker, interval)
+        value = compute(bars) if bars is not None else None
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > MAX_ENTRIES:
+                self._values.popitem(last=False)
+        return value
+
+    def bars(self, ticker: str, interval: str = "1d"):
+        """Full stored history of a ticker up to its last bar (shared between indicator sets)."""
+        ticker = ticker.upper()
+        last_date = self.last_bar_date(ticker, interval)
+        if last_date is None:
+            return None
+        key = (ticker, interval) + self._last_dates[(ticker, interval)]
+        with self._lock:
+            if key in self._bars:
+                self._bars.move_to_end(key)
+                return self._bars[key]
+
+        bars = self.store.get_bars(ticker, None, last_date, interval)
+        with self._lock:
+            self._bars[key] = bars
+            while len(self._bars) > MAX_BAR_FRAMES:
+                self._bars.popitem(last=False)
+        return bars
+
+    def last_bar_date(self, ticker: str, interval: str = "1d") -> Optional[str]:
+        """Latest stored bar date, refreshing the store unless it was fetched after the last session."""
+        from .price_bar_store import is_current
+
+        ticker = ticker.upper()
+        last_date, checked_at = self._last_dates.get((ticker, interval), (None, None))
+        if is_current(checked_at, interval):
+            return last_date
+        try:
+            self.store.refresh(ticker, self.history_period, interval)
+        except Exception as e:
+            logger.warning(f"Failed to refresh bars for {ticker}: {e}")
+        last_date, checked_at = self.store.get_last_update(ticker, interval)
+        self._last_dates[(ticker, interval)] = (last_date, checked_at)
+        return last_date
+
+    def clear(self):
+        """Drop every cached value, bar frame and last bar date."""
+        with self._lock:
+            self._values.clear()
+            self._bars.clear()
+            self._last_dates.clear()
+
+
+# Global cache instance
+_indicator_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Get or create global indicator cache."""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache()
+    return _indicator_cache
@@ -0,0 +1,523 @@
+"""
+Incremental Indicator State
+
+Keeps per-ticker streaming indicator state so a daily update costs one bar of
+work instead of recomputing 200-day windows from scratch:
+
+- running sums for the 10/50/150/200-day SMAs, 20-day volume and 14-day ATR
+- last EMA values for MACD (12/26) and its signal line (9)
+- Wilder-smoothed average gain/loss for RSI(14)
+- monotonic deques for the prior 126/252-day closing highs
+- short bounded windows for the LEAP accumulation, HV contraction, swing-low
+  and anchored VWAP rules
+
+Each update mirrors the pandas formulas used by the strategy services
+(``rolling().mean()``, ``ewm(adjust=False)``), so evaluating from the state gives
+the same result as evaluating the last bar of a freshly downloaded frame:
+rolling sums are NaN while a missing volume/high/low sits in their window and
+recover once it leaves, and the AVWAP anchor is searched only inside the
+strategy's download ``period`` even when the state holds more history.
+States are persisted as JSON in the ``indicator_state`` table and advanced from
+bars stored by PriceBarStore.
+"""
+
+import calendar
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDICATOR_STATE_DDL = """
+    CREATE TABLE IF NOT EXISTS indicator_state (
+        ticker        TEXT NOT NULL,
+        interval      TEXT NOT NULL DEFAULT '1d',
+        last_bar_date TEXT NOT NULL,
+        bar_count     INTEGER NOT NULL,
+        state_json    TEXT NOT NULL,
+        updated_at    TEXT,
+        PRIMARY KEY (ticker, interval)
+    )
+"""
+
+# Bumped whenever the serialized layout changes; older states are rebuilt
+STATE_VERSION = 2
+
+SMA_WINDOWS = (10, 50, 150, 200)
+CLOSE_HISTORY = 252
+
+# Breakouts older than this are dropped; it bounds the longest supported ``period``
+MAX_ANCHOR_HISTORY_DAYS = 5 * 366 + 7
+
+BENCHMARK_TICKER = "SPY"
+
+NAN = float("nan")
+
+
+def _ema_step(previous: Optional[float], value: float, alpha: float) -> float:
+    """One step of ``ewm(alpha=alpha, adjust=False).mean()``."""
+    return value if previous is None else alpha * value + (1 - alpha) * previous
+
+
+def _sample_std(values: List[float]) -> float:
+    """Sample standard deviation (ddof=1), NaN for fewer than two values."""
+    if len(values) < 2:
+        return NAN
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def _num(value: Optional[float]) -> float:
+    return NAN if value is None else value
+
+
+def _finite(value: Optional[float]) -> bool:
+    return value is not None and math.isfinite(value)
+
+
+def _roll_sum(total: float, window: deque, value: float, length: int) -> float:
+    """Advance a sum over the last ``length`` values of ``window`` by ``value``.
+
+    Call before appending ``value``. Like ``rolling(length).sum()`` the result is
+    NaN while a non-finite value is inside the window; it is recomputed from the
+    bounded history whenever one enters or leaves, so a single bad bar cannot
+    poison the running sum for good.
+    """
+    leaving = window[-length] if len(window) >= length else 0.0
+    if _finite(total) and _finite(value) and _finite(leaving):
+        return total + value - leaving
+    kept = list(window)[-(length - 1):] if length > 1 else []
+    return sum(kept) + value
+
+
+def _period_start(last_date: str, period: Optional[str]) -> Optional[str]:
+    """First date covered by a yfinance-style ``period`` ending at ``last_date`` (None = unbounded)."""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", (period or "").strip().lower())
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    end = datetime.strptime(last_date[:10], "%Y-%m-%d")
+    if unit in ("d", "wk"):
+        start = end - timedelta(days=count * (7 if unit == "wk" else 1))
+    else:
+        months = count * (12 if unit == "y" else 1)
+        year, month = divmod(end.year * 12 + end.month - 1 - months, 12)
+        month += 1
+        start = end.replace(year=year, month=month,
+                            day=min(end.day, calendar.monthrange(year, month)[1]))
+    return start.strftime("%Y-%m-%d")
+
+
+class TickerIndicatorState:
+    """Streaming indicator state for one ticker, updated one bar at a time."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker.upper()
+        self.last_date: Optional[str] = None
+        self.bar_count = 0
+
+        self.closes: deque = deque(maxlen=CLOSE_HISTORY)
+        self.volumes: deque = deque(maxlen=20)
+        self.close_sums: Dict[int, float] = {n: 0.0 for n in SMA_WINDOWS}
+        self.volume_sum = 0.0
+
+        self.ema12: Optional[float] = None
+        self.ema26: Optional[float] = None
+        self.macd_signal: Optional[float] = None
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+
+        # Monotonic (position, close) deques for prior-high windows
+        self.max126: deque = deque()
+        self.max252: deque = deque()
+        self.high_126_prior: Optional[float] = None
+        self.high_252_prior: Optional[float] = None
+
+        self.true_ranges: deque = deque(maxlen=14)
+        self.true_range_sum = 0.0
+
+        self.sma200_history: deque = deque(maxlen=21)
+        self.prev_sma50: Optional[float] = None
+        self.prev_sma200: Optional[float] = None
+        self.bars_since_cross: Optional[int] = None
+
+        self.rsi_history: deque = deque(maxlen=6)
+        self.returns: deque = deque(maxlen=40)
+
+        # Anchored VWAP: cumulative typical-price*volume and volume, plus every
+        # breakout as (date, first date of its 126-bar lookback, sums before it)
+        self.dates: deque = deque(maxlen=127)
+        self.cum_tpv = 0.0
+        self.cum_volume = 0.0
+        self.breakouts: deque = deque()
+        self.recent_vwap: deque = deque(maxlen=15)
+
+        self.rs_ema10: Optional[float] = None
+        self.rs_ema20: Optional[float] = None
+
+    # ------------------------------------------------------------------ update
+
+    def update(self, date: str, open_: float, high: float, low: float, close: float,
+               volume: float, benchmark_close: Optional[float] = None):
+        """
+        Advance the state by one bar.
+
+        Args:
+            date: Bar date (YYYY-MM-DD); bars must arrive in date order
+            open_, high, low, close, volume: Bar values
+            benchmark_close: Benchmark (SPY) close for the same date, if known
+        """
+        if not _finite(close):
+            # PriceBarStore drops such bars as well; nothing sensible can be derived
+            logger.debug(f"Skipping {self.ticker} bar {date} without a close")
+            return
+
+        position = self.bar_count
+        prev_close = self.closes[-1] if self.closes else None
+        self.dates.append(date)
+
+        # Prior highs exclude the current bar
+        self.high_126_prior = self._push_window_max(self.max126, position, close, 126)
+        self.high_252_prior = self._push_window_max(self.max252, position, close, 252)
+
+        # Running sums (drop the value leaving each window before appending)
+        for n in SMA_WINDOWS:
+            self.close_sums[n] = _roll_sum(self.close_sums[n], self.closes, close, n)
+        self.closes.append(close)
+        self.volume_sum = _roll_sum(self.volume_sum, self.volumes, volume, 20)
+        self.volumes.append(volume)
+
+        # MACD and signal
+        self.ema12 = _ema_step(self.ema12, close, 2 / 13)
+        self.ema26 = _ema_step(self.ema26, close, 2 / 27)
+        self.macd_signal = _ema_step(self.macd_signal, self.ema12 - self.ema26, 2 / 10)
+
+        # Wilder RSI (first delta is undefined, smoothing starts on the second bar)
+        if prev_close is not None:
+            delta = close - prev_close
+            self.avg_gain = _ema_step(self.avg_gain, max(delta, 0.0), 1 / 14)
+            self.avg_loss = _ema_step(self.avg_loss, max(-delta, 0.0), 1 / 14)
+            self.returns.append(close / prev_close - 1 if prev_close else NAN)
+        self.rsi_history.append(self.rsi14)
+
+        # True range / ATR (row-wise max skips missing parts, like DataFrame.max(axis=1))
+        parts = [abs(high - low)]
+        if prev_close is not None:
+            parts += [abs(high - prev_close), abs(low - prev_close)]
+        parts = [p for p in parts if _finite(p)]
+        true_range = max(parts) if parts else NAN
+        self.true_range_sum = _roll_sum(self.true_range_sum, self.true_ranges, true_range, 14)
+        self.true_ranges.append(true_range)
+
+        # Golden cross recency and SMA200 history
+        sma50, sma200 = self.sma(50), self.sma(200)
+        if (None not in (self.prev_sma50, self.prev_sma200, sma50, sma200)
+                and self.prev_sma50 <= self.prev_sma200 and sma50 > sma200):
+            self.bars_since_cross = 0
+        elif self.bars_since_cross is not None:
+            self.bars_since_cross += 1
+        self.prev_sma50, self.prev_sma200 = sma50, sma200
+        self.sma200_history.append(_num(sma200))
+
+        # Anchored VWAP (missing values are skipped independently, like cumsum)
+        tpv = (high + low + close) / 3.0 * volume
+        tpv = tpv if _finite(tpv) else 0.0
+        volume = volume if _finite(volume) else 0.0
+        self.recent_vwap.append((date, tpv, volume))
+        if self.high_126_prior is not None and close > self.high_126_prior:
+            # dates[0] is the first bar of this breakout's prior-high lookback
+            self.breakouts.append((date, self.dates[0], self.cum_tpv, self.cum_volume))
+        self.cum_tpv += tpv
+        self.cum_volume += volume
+        cutoff = (datetime.strptime(date[:10], "%Y-%m-%d")
+                  - timedelta(days=MAX_ANCHOR_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        while self.breakouts and self.breakouts[0][1] < cutoff:
+            self.breakouts.popleft()
+
+        # Relative strength vs benchmark
+        if benchmark_close and not math.isnan(benchmark_close):
+            rs = close / benchmark_close
+            self.rs_ema10 = _ema_step(self.rs_ema10, rs, 2 / 11)
+            self.rs_ema20 = _ema_step(self.rs_ema20, rs, 2 / 21)
+
+        self.last_date = date
+        self.bar_count += 1
+
+    @staticmethod
+    def _push_window_max(window: deque, position: int, close: float, length: int) -> Optional[float]:
+        """Return the max of the ``length`` closes before ``position``, then add this close."""
+        while window and window[0][0] < position - length:
+            window.popleft()
+        prior_max = window[0][1] if position >= length and window else None
+        while window and window[-1][1] <= close:
+            window.pop()
+        window.append((position, close))
+        return prior_max
+
+    # --------------------------------------------------------------- readouts
+
+    def sma(self, n: int) -> Optional[float]:
+        return self.close_sums[n] / n if len(self.closes) >= n else None
+
+    @property
+    def rsi14(self) -> float:
+        if self.avg_gain is None or not self.avg_loss:
+            return 50.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+    @property
+    def atr14(self) -> Optional[float]:
+        return self.true_range_sum / 14 if len(self.true_ranges) == 14 else None
+
+    def is_ready(self, min_bars: int = 200) -> bool:
+        """True once the SMA200 (and ``min_bars`` of history) is available."""
+        return self.bar_count >= max(min_bars, 200)
+
+    def bullish_row(self) -> Dict[str, Any]:
+        """Last-bar indicator row in the column layout used by the bullish breakout rules."""
+        macd = self.ema12 - self.ema26
+        sma200_past = self.sma200_history[-11] if len(self.sma200_history) >= 11 else NAN
+        sma200 = _num(self.sma(200))
+        return {
+            "close": self.closes[-1],
+            "prev_close": self.closes[-2] if len(self.closes) >= 2 else None,
+            "volume": self.volumes[-1],
+            "sma10": _num(self.sma(10)),
+            "sma50": _num(self.sma(50)),
+            "sma200": sma200,
+            "macd": macd,
+            "macd_signal": self.macd_signal,
+            "macd_hist": macd - self.macd_signal,
+            "rsi14": self.rsi14,
+            "vol_avg20": self.volume_sum / 20 if len(self.volumes) == 20 else NAN,
+            "high_126_prior": _num(self.high_126_prior),
+            "high_252_prior": _num(self.high_252_prior),
+            "golden_cross_30d": self.bars_since_cross is not None and self.bars_since_cross < 30,
+            "ma200_slope_up_10d": sma200 > sma200_past,
+        }
+
+    def _anchor(self, period: Optional[str]) -> Tuple[str, float, float]:
+        """Return (anchor date, tpv sum, volume sum) for the anchored VWAP.
+
+        The download path anchors at the first close above the prior 126-bar
+        high inside the downloaded ``period``, where that prior high is computed
+        from bars of the same download. Only breakouts whose whole lookback lies
+        inside the period therefore qualify; without one, the last 15 bars are used.
+        """
+        window_start = _period_start(self.last_date, period) or ""
+        for date, lookback_start, tpv_before, volume_before in self.breakouts:
+            if lookback_start >= window_start:
+                return date, self.cum_tpv - tpv_before, self.cum_volume - volume_before
+        window = list(self.recent_vwap)
+        return window[0][0], sum(w[1] for w in window), sum(w[2] for w in window)
+
+    def leap_inputs(self, period: Optional[str] = None) -> Dict[str, Any]:
+        """Keyword arguments for ``leap_entry_strategy._assemble_features``.
+
+        Args:
+            period: Download period the batch path would use (e.g. '2y'); bounds
+                the AVWAP anchor search. None searches all retained history.
+        """
+        closes = list(self.closes)
+        volumes = list(self.volumes)
+
+        # Least-squares slope of the last 20 SMA200 values (same formula as _slope)
+        ys = list(self.sma200_history)[-20:]
+        slope_200 = None
+        if len(ys) == 20:
+            y_mean = sum(ys) / 20
+            slope_200 = sum((x - 9.5) * (y - y_mean) for x, y in enumerate(ys)) / 665.0
+
+        acc_days = 0
+        vol_up = 0.0
+        vol_down = 0.0
+        for i in range(1, 11):
+            if closes[-i] > closes[-(i + 1)]:
+                vol_up += volumes[-i]
+                if volumes[-i] > volumes[-(i + 1)]:
+                    acc_days += 1
+            else:
+                vol_down += volumes[-i]
+
+        returns = list(self.returns)
+        anchor_date, tpv, vol = self._anchor(period)
+
+        rs_ok = False
+        if self.rs_ema10 is not None and self.rs_ema20 is not None:
+            rs_ok = self.rs_ema10 and self.rs_ema20 and self.rs_ema10 > self.rs_ema20
+
+        return {
+            "last": {
+                "close": closes[-1],
+                "sma50": _num(self.sma(50)),
+                "sma150": _num(self.sma(150)),
+                "sma200": _num(self.sma(200)),
+                "rsi14": self.rsi14,
+                "atr14": _num(self.atr14),
+            },
+            "slope_200": slope_200,
+            "recent_rsi_min": min(list(self.rsi_history)[-6:-1]),
+            "acc_days": acc_days,
+            "vol_up": vol_up,
+            "vol_down": vol_down,
+            "hv1": _sample_std(returns[-20:]),
+            "hv2": _sample_std(returns[-40:-20]),
+            "rs_ok": rs_ok,
+            "anchored_vwap": tpv / vol if vol != 0 else None,
+            "anchor_date": datetime.strptime(anchor_date[:10], "%Y-%m-%d"),
+            "swing_low": min(closes[-8:]),
+        }
+
+    # ---------------------------------------------------------- serialization
+
+    _DEQUE_FIELDS = ("closes", "volumes", "max126", "max252", "true_ranges", "sma200_history",
+                     "rsi_history", "returns", "dates", "breakouts", "recent_vwap")
+    _SCALAR_FIELDS = ("last_date", "bar_count", "volume_sum", "ema12", "ema26", "macd_signal",
+                      "avg_gain", "avg_loss", "high_126_prior", "high_252_prior", "true_range_sum",
+                      "prev_sma50", "prev_sma200", "bars_since_cross", "cum_tpv", "cum_volume",
+                      "rs_ema10", "rs_ema20")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"version": STATE_VERSION, "ticker": self.ticker,
+                "close_sums": {str(n): s for n, s in self.close_sums.items()}}
+        for name in self._SCALAR_FIELDS:
+            data[name] = getattr(self, name)
+        for name in self._DEQUE_FIELDS:
+            data[name] = [list(v) if isinstance(v, tuple) else v for v in getattr(self, name)]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["TickerIndicatorState"]:
+        """Restore a state, or None if it was written by an incompatible version."""
+        if data.get("version") != STATE_VERSION:
+            return None
+        state = cls(data["ticker"])
+        state.close_sums = {int(n): s for n, s in data["close_sums"].items()}
+        for name in cls._SCALAR_FIELDS:
+            setattr(state, name, data[name])
+        for name in cls._DEQUE_FIELDS:
+            target = getattr(state, name)
+            target.extend(tuple(v) if isinstance(v, list) else v for v in data[name])
+        return state
+
+
+class IndicatorStateService:
+    """Loads, advances and persists indicator states from stored price bars."""
+
+    def __init__(self, db_connection: Optional[sqlite3.Connection] = None, bar_store=None):
+        if db_connection is None:
+            from ..database.connection import get_db_connection
+            db_connection = get_db_connection()
+        self.db = db_connection
+        self._bar_store = bar_store
+        self._lock = threading.Lock()
+        with self._lock:
+            self.db.execute(INDICATOR_STATE_DDL)
+            self.db.commit()
+
+    @property
+    def bar_store(self):
+        if self._bar_store is None:
+            from .price_bar_store import get_price_bar_store
+            self._bar_store = get_price_bar_store()
+        return self._bar_store
+
+    def load_state(self, ticker: str, interval: str = "1d") -> Optional[TickerIndicatorState]:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT state_json FROM indicator_state WHERE ticker = ? AND interval = ?",
+                (ticker.upper(), interval)
+            ).fetchone()
+        return TickerIndicatorState.from_dict(json.loads(row[0])) if row else None
+
+    def save_state(self, state: TickerIndicatorState, interval: str = "1d"):
+        now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        with self._lock:
+            self.db.execute("""
+                INSERT INTO indicator_state (ticker, interval, last_bar_date, bar_count, state_json, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ticker, interval) DO UPDATE SET
+                    last_bar_date = excluded.last_bar_date, bar_count = excluded.bar_count,
+                    state_json = excluded.state_json, updated_at = excluded.updated_at
+            """, (state.ticker, interval, state.last_date, state.bar_count,
+                  json.dumps(state.to_dict()), now))
+            self.db.commit()
+
+    def get_state(self, ticker: str, period: str = "2y", interval: str = "1d",
+                  refresh: bool = True) -> Optional[TickerIndicatorState]:
+        """
+        Return the up-to-date indicator state for a ticker.
+
+        Only bars newer than the stored state are applied. The state is rebuilt
+        from all stored bars when none exists or when the stored close of its last
+        bar changed (split/dividend re-adjustment).
+
+        Args:
+            ticker: Ticker symbol
+            period: History to download when the ticker has no stored bars
+            interval: Bar interval
+            refresh: Fetch new bars into the bar store first
+
+        Returns:
+            TickerIndicatorState or None if no bars are available
+        """
+        ticker = ticker.upper()
+        if refresh:
+            for symbol in (ticker, BENCHMARK_TICKER):
+                try:
+                    self.bar_store.refresh(symbol, period, interval)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh bars for {symbol}: {e}")
+
+        state = self.load_state(ticker, interval)
+        start = None
+        if state is not None and state.last_date:
+            anchor_bar = self.bar_store.get_bars(ticker, state.last_date, state.last_date, interval)
+            if anchor_bar is None or not math.isclose(float(anchor_bar["close"].iloc[-1]),
+                                                      state.closes[-1], rel_tol=1e-6):
+                logger.info(f"Rebuilding indicator state for {ticker} (history re-adjusted)")
+                state = None
+            else:
+                start = state.last_date
+
+        bars = self.bar_store.get_bars(ticker, start, None, interval)
+        if bars is None:
+            return state
+        state = state or TickerIndicatorState(ticker)
+        new_bars = bars[bars.index.strftime("%Y-%m-%d") > (state.last_date or "")]
+        if new_bars.empty:
+            return state
+
+        benchmark = self.bar_store.get_bars(BENCHMARK_TICKER, new_bars.index[0], None, interval)
+        benchmark_close = benchmark["close"].to_dict() if benchmark is not None else {}
+        apply_bars(state, new_bars, benchmark_close)
+        self.save_state(state, interval)
+        return state
+
+
+def apply_bars(state: TickerIndicatorState, bars, benchmark_close: Optional[Dict[Any, float]] = None):
+    """Feed OHLCV rows of ``bars`` (DatetimeIndex) into ``state`` in order."""
+    benchmark_close = benchmark_close or {}
+    for date, o, h, l, c, v in zip(bars.index, bars["open"], bars["high"], bars["low"],
+                                   bars["close"], bars["volume"]):
+        state.update(date.strftime("%Y-%m-%d"), float(o), float(h), float(l), float(c),
+                     float(v), benchmark_close.get(date))
+
+
+# Global service instance
+_indicator_state_service: Optional[IndicatorStateService] = None
+
+
+def get_indicator_state_service(db_connection: Optional[sqlite3.Connection] = None,
+                                bar_store=None) -> IndicatorStateService:
+    """Get or create global indicator state service."""
+    global _indicator_state_service
+    if _indicator_state_service is None:
+        _indicator_state_service = IndicatorStateService(db_connection, bar_store)
+    return _indicator_state_service
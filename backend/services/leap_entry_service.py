@@ -6,13 +6,14 @@ This wraps the existing leap_entry_strategy functionality in the BaseStrategySer
 """
 
 import time
-import concurrent.futures
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 
 from .base_strategy_service import (
-    BaseStrategyService, StrategyResult, StrategyExecutionSummary, ProgressCallback
+    BaseStrategyService, StrategyResult, StrategyExecutionSummary, ProgressCallback,
+    CancellationToken, EARLY_STOP_REASON, SweepableStrategy, ReplayableStrategy, IncrementalStrategy
 )
 
 
@@ -30,6 +31,12 @@ class LeapEntryConfig:
     avwap_soft_max: float = 8.0
     avwap_penalty_threshold: float = 15.0
     avwap_penalty_points: int = 5
+    incremental: bool = False  # Evaluate from persisted indicator state
+    max_results: Optional[int] = None  # Stop once this many tickers qualify (alias top_n)
+    priority: str = "normal"  # Scheduler priority: low, normal, high
+    sector_strength: bool = True  # Add relative strength vs the ticker's sector ETF
+    sector_benchmarks: Optional[Dict[str, str]] = None  # Sector -> ETF overrides
+    avwap_anchors: Optional[List[str]] = None  # Extra AVWAP anchors: "earnings", "52w_low"
 
 
 @dataclass
@@ -41,9 +48,11 @@ class LeapTickerEvaluation:
     classification: str
     reasons: List[str]
     metrics: Dict[str, Any]
+    closes: Optional[Any] = None  # Close series kept for the sector strength pass
 
 
-class LeapEntryService(BaseStrategyService):
+class LeapEntryService(SweepableStrategy, ReplayableStrategy, IncrementalStrategy,
+                       BaseStrategyService):
     """LEAP Entry Strategy Service for direct FastAPI integration."""
     
     def get_strategy_code(self) -> str:
@@ -61,7 +70,13 @@ class LeapEntryService(BaseStrategyService):
         
         if not isinstance(parameters.get("tickers"), list):
             return False
-            
+
+        anchors = parameters.get("avwap_anchors")
+        if anchors is not None:
+            from .avwap_engine import ANCHOR_KINDS
+            if not isinstance(anchors, list) or any(a not in ANCHOR_KINDS for a in anchors):
+                return False
+
         return True
     
     def get_default_parameters(self) -> Dict[str, Any]:
@@ -77,17 +92,69 @@ class LeapEntryService(BaseStrategyService):
             "avwap_ideal_max": 5.0,
             "avwap_soft_max": 8.0,
             "avwap_penalty_threshold": 15.0,
-            "avwap_penalty_points": 5
+            "avwap_penalty_points": 5,
+            "incremental": False,
+            "max_results": None,
+            "priority": "normal",
+            "sector_strength": True,
+            "sector_benchmarks": None,
+            "avwap_anchors": None
         }
     
-    def execute(self, tickers: List[str], parameters: Dict[str, Any], 
-                progress_callback: ProgressCallback) -> StrategyExecutionSummary:
-        """Execute LEAP entry strategy with progress reporting."""
-        start_time = time.time()
-        run_id = parameters.get("run_id", f"leap_{int(start_time)}")
+    def get_sweepable_parameters(self) -> List[str]:
+        """Return scoring-only parameters that can be swept over shared features."""
+        return [
+            "min_score", "rsi_lower", "rsi_upper", "avwap_ideal_max",
+            "avwap_soft_max", "avwap_penalty_threshold", "avwap_penalty_points"
+        ]
+    
+    def prepare_ticker(self, ticker: str, parameters: Dict[str, Any]):
+        """Download history and compute the parameter-independent LEAP features."""
+        from leap_entry_strategy import _prepare_ticker
         
-        # Create configuration from parameters
-        config = LeapEntryConfig(
+        features, failure = _prepare_ticker(ticker, self._to_leap_config(self._build_config(parameters)))
+        if failure is not None:
+            return None, self._to_strategy_result(failure)
+        return features, None
+    
+    def evaluate_prepared(self, ticker: str, prepared, parameters: Dict[str, Any]) -> StrategyResult:
+        """Score prepared LEAP features under the given thresholds."""
+        from leap_entry_strategy import _score_features
+        
+        result = _score_features(ticker, prepared, self._to_leap_config(self._build_config(parameters)))
+        return self._to_strategy_result(result)
+    
+    def evaluate_history(self, ticker: str, bars, parameters: Dict[str, Any],
+                         positions=None, benchmark=None):
+        """Score every requested bar from LEAP features computed in a single pass."""
+        import pandas as pd
+        import numpy as np
+        from leap_entry_strategy import _compute_feature_history, _score_features
+        
+        cfg = self._to_leap_config(self._build_config(parameters))
+        df = bars[["open", "high", "low", "close", "volume"]].astype(float)
+        return [
+            (date, self._to_strategy_result(_score_features(ticker, features, cfg)))
+            for date, features in _compute_feature_history(pd, np, df, benchmark, positions, cfg.period)
+        ]
+    
+    def evaluate_state(self, ticker: str, state, parameters: Dict[str, Any]) -> StrategyResult:
+        """Score the latest bar from a streaming indicator state."""
+        leap_config = self._to_leap_config(self._build_config(parameters))
+        return self._to_strategy_result(self._evaluate_state(ticker, state, leap_config))
+    
+    def _evaluate_state(self, ticker: str, state, leap_config):
+        """Score LEAP features assembled from an indicator state."""
+        from leap_entry_strategy import LeapResult, _assemble_features, _score_features
+        
+        # Same 220-bar minimum as the download path
+        if state is None or not state.is_ready(220):
+            return LeapResult(ticker, 0, "insufficient", False, {}, ["insufficient_history"])
+        return _score_features(ticker, _assemble_features(**state.leap_inputs(leap_config.period)), leap_config)
+    
+    def _build_config(self, parameters: Dict[str, Any]) -> LeapEntryConfig:
+        """Create configuration from request parameters."""
+        return LeapEntryConfig(
             period=parameters.get("period", "2y"),
             interval=parameters.get("interval", "1d"),
             min_score=parameters.get("min_score", 60),
@@ -98,8 +165,54 @@ class LeapEntryService(BaseStrategyService):
             avwap_ideal_max=parameters.get("avwap_ideal_max", 5.0),
             avwap_soft_max=parameters.get("avwap_soft_max", 8.0),
             avwap_penalty_threshold=parameters.get("avwap_penalty_threshold", 15.0),
-            avwap_penalty_points=parameters.get("avwap_penalty_points", 5)
+            avwap_penalty_points=parameters.get("avwap_penalty_points", 5),
+            incremental=parameters.get("incremental", False),
+            max_results=self._resolve_max_results(parameters),
+            priority=parameters.get("priority", "normal"),
+            sector_strength=parameters.get("sector_strength", True),
+            sector_benchmarks=parameters.get("sector_benchmarks"),
+            avwap_anchors=parameters.get("avwap_anchors")
         )
+    
+    def _to_leap_config(self, config: LeapEntryConfig):
+        """Convert our config to the original LeapConfig."""
+        from leap_entry_strategy import LeapConfig
+        
+        return LeapConfig(
+            period=config.period,
+            interval=config.interval,
+            min_score=config.min_score,
+            max_workers=config.max_workers,
+            rsi_lower=config.rsi_lower,
+            rsi_upper=config.rsi_upper,
+            avwap_ideal_max=config.avwap_ideal_max,
+            avwap_soft_max=config.avwap_soft_max,
+            avwap_penalty_threshold=config.avwap_penalty_threshold,
+            avwap_penalty_points=config.avwap_penalty_points
+        )
+    
+    def _to_strategy_result(self, result) -> StrategyResult:
+        """Convert a LeapResult or LeapTickerEvaluation into a StrategyResult."""
+        return StrategyResult(
+            ticker=result.ticker,
+            passed=result.passed,
+            score=result.score,
+            classification=result.classification,
+            reasons=result.reasons,
+            metrics=result.metrics,
+            processed_at=datetime.utcnow(),
+            processing_time_ms=result.metrics.get("processing_time_ms", 0)
+        )
+    
+    def execute(self, tickers: List[str], parameters: Dict[str, Any], 
+                progress_callback: ProgressCallback,
+                cancellation_token: Optional[CancellationToken] = None) -> StrategyExecutionSummary:
+        """Execute LEAP entry strategy with progress reporting."""
+        start_time = time.time()
+        run_id = parameters.get("run_id", f"leap_{int(start_time)}")
+        
+        # Create configuration from parameters
+        config = self._build_config(parameters)
         
         # Clean and deduplicate tickers
         tickers = list(dict.fromkeys([t.strip().upper() for t in tickers if t and t.strip()]))
@@ -120,10 +233,16 @@ class LeapEntryService(BaseStrategyService):
         )
         
         # Execute strategy
-        results = self._evaluate_tickers(tickers, config, progress_callback)
+        token = cancellation_token or CancellationToken()
+        results = self._evaluate_tickers(tickers, config, progress_callback, token)
+        status, stop_metrics = self._cancellation_summary(token, len(tickers), len(results))
+        
+        # Relative strength vs sector ETFs, one vectorized pass per sector
+        if config.sector_strength and results:
+            self._apply_sector_strength(results, config, progress_callback)
         
-        # Enrich with company names if requested
-        if config.lookup_names and results:
+        # Enrich with company names if requested (skipped for cancelled runs)
+        if config.lookup_names and results and status != "cancelled":
             self._enrich_company_names(results, progress_callback)
         
         # Separate passed and failed results
@@ -133,21 +252,12 @@ class LeapEntryService(BaseStrategyService):
         # Sort by score
         passed_results.sort(key=lambda r: r.score, reverse=True)
         
+        # Keep only the top N when an early-stop limit was requested
+        if config.max_results:
+            passed_results = passed_results[:config.max_results]
+        
         # Convert to StrategyResult objects
-        qualifying_stocks = []
-        for eval_result in passed_results:
-            processing_time = eval_result.metrics.get("processing_time_ms", 0)
-            strategy_result = StrategyResult(
-                ticker=eval_result.ticker,
-                passed=eval_result.passed,
-                score=eval_result.score,
-                classification=eval_result.classification,
-                reasons=eval_result.reasons,
-                metrics=eval_result.metrics,
-                processed_at=datetime.utcnow(),
-                processing_time_ms=processing_time
-            )
-            qualifying_stocks.append(strategy_result)
+        qualifying_stocks = [self._to_strategy_result(r) for r in passed_results]
         
         # Report completion
         progress_callback.report_completion(
@@ -179,17 +289,20 @@ class LeapEntryService(BaseStrategyService):
             qualifying_count=len(passed_results),
             execution_time_ms=execution_time_ms,
             qualifying_stocks=qualifying_stocks,
-            summary_metrics=summary_metrics
+            summary_metrics=summary_metrics,
+            status=status
         )
     
     def _evaluate_tickers(self, tickers: List[str], config: LeapEntryConfig, 
-                         progress_callback: ProgressCallback) -> List[LeapTickerEvaluation]:
-        """Evaluate tickers using concurrent execution."""
-        results: List[LeapTickerEvaluation] = []
+                         progress_callback: ProgressCallback,
+                         cancellation_token: Optional[CancellationToken] = None) -> List[LeapTickerEvaluation]:
+        """Evaluate tickers using concurrent execution, stopping early when cancelled."""
+        token = cancellation_token or CancellationToken()
         max_workers = max(1, min(config.max_workers, len(tickers)))
         
         processed_count = 0
         passed_count = 0
+        count_lock = threading.Lock()
         
         def evaluate_with_progress(ticker: str) -> LeapTickerEvaluation:
             nonlocal processed_count, passed_count
@@ -201,9 +314,13 @@ class LeapEntryService(BaseStrategyService):
             # Add processing time to metrics
             result.metrics["processing_time_ms"] = processing_time_ms
             
-            processed_count += 1
-            if result.passed:
-                passed_count += 1
+            with count_lock:
+                processed_count += 1
+                if result.passed:
+                    passed_count += 1
+                sequence_number = processed_count
+                if config.max_results and passed_count >= config.max_results:
+                    token.cancel(EARLY_STOP_REASON)
             
             # Report ticker progress with additional context
             progress_callback.report_ticker_progress(
@@ -211,7 +328,7 @@ class LeapEntryService(BaseStrategyService):
                 passed=result.passed,
                 score=result.score,
                 classification=result.classification,
-                sequence_number=processed_count
+                sequence_number=sequence_number
             )
             
             # Enhanced progress callback to pass reasons and metrics for database storage
@@ -222,50 +339,55 @@ class LeapEntryService(BaseStrategyService):
                     passed=result.passed,
                     score=result.score,
                     classification=result.classification,
-                    sequence_number=processed_count,
+                    sequence_number=sequence_number,
                     reasons=result.reasons,
                     metrics=result.metrics
                 )
             
             # Report overall progress periodically
-            if processed_count % 10 == 0 or processed_count == len(tickers):
+            if sequence_number % 10 == 0 or sequence_number == len(tickers):
                 progress_callback.report_overall_progress(
-                    processed=processed_count,
+                    processed=sequence_number,
                     total=len(tickers),
                     passed_so_far=passed_count
                 )
             
             return result
         
-        # Execute with thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for result in executor.map(evaluate_with_progress, tickers):
-                results.append(result)
-        
-        return results
+        return self._run_ticker_tasks(tickers, evaluate_with_progress, max_workers, token,
+                                      config.priority)
     
     def _evaluate_single_ticker(self, ticker: str, config: LeapEntryConfig) -> LeapTickerEvaluation:
         """Evaluate a single ticker using the original LEAP entry logic."""
         try:
             # Import the original LEAP evaluation function
-            from leap_entry_strategy import _evaluate_ticker, LeapConfig, LeapResult
+            from leap_entry_strategy import (
+                _evaluate_ticker, _load_history, _prepare_history, _score_features, LeapResult
+            )
             
             # Convert our config to the original LeapConfig
-            leap_config = LeapConfig(
-                period=config.period,
-                interval=config.interval,
-                min_score=config.min_score,
-                max_workers=config.max_workers,
-                rsi_lower=config.rsi_lower,
-                rsi_upper=config.rsi_upper,
-                avwap_ideal_max=config.avwap_ideal_max,
-                avwap_soft_max=config.avwap_soft_max,
-                avwap_penalty_threshold=config.avwap_penalty_threshold,
-                avwap_penalty_points=config.avwap_penalty_points
-            )
+            leap_config = self._to_leap_config(config)
             
-            # Call the original evaluation function
-            result: LeapResult = _evaluate_ticker(ticker, leap_config)
+            # Call the original evaluation function (or score the persisted indicator state)
+            closes = None
+            if config.incremental:
+                from .indicator_state import get_indicator_state_service
+                state = get_indicator_state_service().get_state(ticker, config.period, config.interval)
+                result: LeapResult = self._evaluate_state(ticker, state, leap_config)
+            elif config.sector_strength or config.avwap_anchors:
+                # Same steps as _evaluate_ticker, keeping the history for the
+                # sector pass and the extra AVWAP anchors
+                df, result = _load_history(ticker, leap_config)
+                if result is None:
+                    features, result = _prepare_history(ticker, df, leap_config)
+                    if result is None:
+                        if config.sector_strength:
+                            closes = df["close"]
+                        result = _score_features(ticker, features, leap_config)
+                        if config.avwap_anchors:
+                            result.metrics.update(self._anchored_vwap_metrics(ticker, df, config))
+            else:
+                result: LeapResult = _evaluate_ticker(ticker, leap_config)
             
             # Convert to our internal format
             return LeapTickerEvaluation(
@@ -274,7 +396,8 @@ class LeapEntryService(BaseStrategyService):
                 score=result.score,
                 classification=result.classification,
                 reasons=result.reasons,
-                metrics=result.metrics
+                metrics=result.metrics,
+                closes=closes
             )
             
         except ImportError:
@@ -297,6 +420,73 @@ class LeapEntryService(BaseStrategyService):
                 metrics={"error": str(e)}
             )
     
+    def _anchored_vwap_metrics(self, ticker: str, df, config: LeapEntryConfig) -> Dict[str, Any]:
+        """AVWAP metrics for the configured extra anchors from the shared AVWAP engine."""
+        from .avwap_engine import get_avwap_engine
+        
+        engine = get_avwap_engine()
+        series = engine.update(ticker, df, config.interval)
+        metrics: Dict[str, Any] = {}
+        for kind, anchored in engine.anchored(ticker, config.avwap_anchors, config.interval, series).items():
+            anchored = anchored or {}
+            metrics[f"avwap_{kind}"] = anchored.get("vwap")
+            metrics[f"avwap_{kind}_distance_pct"] = anchored.get("distance_pct")
+            metrics[f"avwap_{kind}_date"] = anchored.get("anchor_date")
+        return metrics
+    
+    def _apply_sector_strength(self, results: List[LeapTickerEvaluation], config: LeapEntryConfig,
+                               progress_callback: ProgressCallback):
+        """Add relative strength vs each ticker's sector ETF to the results' metrics.
+        
+        Tickers are grouped by sector ETF (instruments.sector mapped through
+        SECTOR_ETFS); each group's ratio and EMA10/EMA20 are computed in one
+        frame operation against the shared, daily cached ETF closes matrix.
+        Already reported results are then updated in one batch.
+        """
+        import pandas as pd
+        from .benchmark_series import (
+            get_benchmark_provider, load_ticker_sectors, relative_strength, sector_benchmark
+        )
+        
+        evaluated = [r for r in results if r.closes is not None]
+        if not evaluated:
+            return
+        try:
+            sectors = load_ticker_sectors([r.ticker for r in evaluated])
+        except Exception as e:
+            self.logger.warning(f"Sector lookup failed, skipping sector strength: {e}")
+            sectors = {}
+        
+        groups: Dict[str, List[LeapTickerEvaluation]] = {}
+        for r in evaluated:
+            etf = sector_benchmark(sectors.get(r.ticker), config.sector_benchmarks)
+            if etf and etf != r.ticker:
+                groups.setdefault(etf, []).append(r)
+        
+        updates: Dict[str, Dict[str, Any]] = {}
+        if groups:
+            benchmarks = get_benchmark_provider().matrix(groups, config.period, config.interval)
+            for etf, members in groups.items():
+                if etf not in benchmarks.columns:
+                    continue
+                closes = pd.DataFrame({r.ticker: r.closes for r in members})
+                rs = relative_strength(closes, benchmarks[etf])
+                last_rs = rs["rs"].ffill().iloc[-1]
+                ema10 = rs["ema10"].ffill().iloc[-1]
+                ema20 = rs["ema20"].ffill().iloc[-1]
+                for r in members:
+                    value = last_rs[r.ticker]
+                    r.metrics["sector"] = sectors.get(r.ticker)
+                    r.metrics["sector_etf"] = etf
+                    r.metrics["sector_rs"] = round(float(value), 4) if pd.notna(value) else None
+                    r.metrics["sector_rs_ok"] = bool(ema10[r.ticker] > ema20[r.ticker])
+                    updates[r.ticker] = r.metrics
+        
+        for r in evaluated:
+            r.closes = None
+        if updates:
+            progress_callback.report_result_updates(updates)
+    
     def _enrich_company_names(self, results: List[LeapTickerEvaluation], progress_callback: ProgressCallback):
         """Enrich results with company names for qualifying stocks."""
         qualifying_results = [r for r in results if r.passed]
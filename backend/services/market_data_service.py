@@ -5,7 +5,7 @@ the existing yfinance dependency and caching mechanisms.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import time
 
@@ -27,6 +27,29 @@ class MarketDataService:
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
         self._price_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_timestamps: Dict[str, datetime] = {}
+        self._price_listeners: List[Callable[[Dict[str, Dict[str, Any]]], None]] = []
+    
+    def add_price_listener(self, listener: Callable[[Dict[str, Dict[str, Any]]], None]):
+        """Subscribe to freshly fetched prices.
+        
+        Args:
+            listener: Called with {ticker: price_data} whenever prices are fetched
+        """
+        if listener not in self._price_listeners:
+            self._price_listeners.append(listener)
+    
+    def remove_price_listener(self, listener: Callable[[Dict[str, Dict[str, Any]]], None]):
+        """Unsubscribe a price listener."""
+        if listener in self._price_listeners:
+            self._price_listeners.remove(listener)
+    
+    def _notify_price_listeners(self, price_data: Dict[str, Dict[str, Any]]):
+        """Deliver a price update to every listener; listener errors are logged."""
+        for listener in list(self._price_listeners):
+            try:
+                listener(price_data)
+            except Exception as e:
+                logger.error(f"Price listener failed: {e}")
     
     def get_current_prices(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
         """Get current prices for a list of tickers.
@@ -62,6 +85,9 @@ class MarketDataService:
             for ticker, data in fresh_data.items():
                 self._price_cache[ticker] = data
                 self._cache_timestamps[ticker] = now
+            
+            if fresh_data:
+                self._notify_price_listeners(fresh_data)
         
         return result
     
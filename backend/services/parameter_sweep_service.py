@@ -0,0 +1,446 @@
+"""
+Parameter Sweep Service
+
+Evaluates a strategy over a grid of parameter combinations. Indicator state is
+prepared once per ticker and every combination is scored against that shared
+state, so a sweep costs one download and one indicator pass per ticker no matter
+how many combinations are requested. Each combination is persisted as a child
+run (strategy_run.parent_run_id) of the sweep's parent run.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_strategy_service import ProgressCallback, StrategyResult, get_strategy_registry
+from .evaluation_scheduler import get_evaluation_scheduler
+from .serialization import dumps as dumps_json
+from ..database.connection import ensure_strategy_run_columns
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on grid size; each combination becomes its own child run
+MAX_SWEEP_COMBINATIONS = 500
+
+# Number of tickers evaluated between commits / progress updates
+COMMIT_BATCH_SIZE = 25
+
+
+def expand_parameter_grid(grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into the list of all combinations.
+
+    Args:
+        grid: Mapping of parameter name to a list of candidate values
+              (scalars are treated as single-value lists)
+
+    Returns:
+        List of parameter dicts in deterministic (sorted key) order
+    """
+    keys = sorted(grid)
+    values = [grid[k] if isinstance(grid[k], (list, tuple)) else [grid[k]] for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+@dataclass
+class SweepCombination:
+    """Running aggregate for one parameter combination (one child run)."""
+    run_id: str
+    parameters: Dict[str, Any]
+    evaluated: int = 0
+    passed: int = 0
+    passed_score_total: float = 0.0
+    top_results: List[Tuple[float, str]] = field(default_factory=list)
+
+    def record(self, result: StrategyResult):
+        self.evaluated += 1
+        if result.passed:
+            self.passed += 1
+            self.passed_score_total += float(result.score or 0)
+            self.top_results.append((float(result.score or 0), result.ticker))
+
+    def to_summary(self) -> Dict[str, Any]:
+        top = sorted(self.top_results, reverse=True)[:5]
+        return {
+            "run_id": self.run_id,
+            "parameters": self.parameters,
+            "total_evaluated": self.evaluated,
+            "qualifying_count": self.passed,
+            "pass_rate_percent": round(self.passed / self.evaluated * 100, 1) if self.evaluated else 0,
+            "average_score": round(self.passed_score_total / self.passed, 1) if self.passed else 0,
+            "top_scores": [{"ticker": t, "score": s} for s, t in top]
+        }
+
+
+@dataclass
+class ParameterSweepSummary:
+    """Summary of a completed parameter sweep."""
+    sweep_id: str
+    strategy_code: str
+    total_tickers: int
+    prepared_tickers: int
+    execution_time_ms: int
+    combinations: List[Dict[str, Any]]
+    status: str = "completed"
+
+
+class ParameterSweepService:
+    """Runs parameter grids for strategies that support prepared evaluation."""
+
+    def __init__(self, db_connection=None):
+        self.db = db_connection
+        self.registry = get_strategy_registry()
+
+    def plan_sweep(self, strategy_code: str, grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Validate a grid against the strategy and expand it.
+
+        Args:
+            strategy_code: Strategy identifier
+            grid: Parameter grid (name -> list of values)
+
+        Returns:
+            Expanded list of parameter combinations
+
+        Raises:
+            ValueError: If the strategy is unknown, does not support sweeps,
+                        the grid varies non-sweepable parameters or is too large
+        """
+        service = self.registry.get(strategy_code)
+        if not service:
+            raise ValueError(f"Strategy '{strategy_code}' not found")
+
+        if not service.supports_sweep:
+            raise ValueError(f"Strategy '{strategy_code}' does not support parameter sweeps")
+        sweepable = set(service.get_sweepable_parameters())
+        if not grid:
+            raise ValueError("Parameter grid is empty")
+
+        invalid = sorted(set(grid) - sweepable)
+        if invalid:
+            raise ValueError(
+                f"Parameters {invalid} cannot be swept for '{strategy_code}'; "
+                f"sweepable parameters: {sorted(sweepable)}"
+            )
+
+        combinations = expand_parameter_grid(grid)
+        if len(combinations) > MAX_SWEEP_COMBINATIONS:
+            raise ValueError(
+                f"Grid expands to {len(combinations)} combinations (max {MAX_SWEEP_COMBINATIONS})"
+            )
+        return combinations
+
+    def run_sweep(self, strategy_code: str, tickers: List[str], grid: Dict[str, Any],
+                  base_parameters: Optional[Dict[str, Any]] = None,
+                  sweep_id: Optional[str] = None,
+                  progress_callback: Optional[ProgressCallback] = None) -> ParameterSweepSummary:
+        """
+        Execute a parameter sweep.
+
+        Args:
+            strategy_code: Strategy identifier (e.g., 'leap_entry')
+            tickers: List of ticker symbols to evaluate
+            grid: Parameter grid (name -> list of values)
+            base_parameters: Parameters shared by all combinations
+            sweep_id: Optional parent run ID (generated if not provided)
+            progress_callback: Optional progress callback
+
+        Returns:
+            ParameterSweepSummary with one entry per combination
+        """
+        start_time = time.time()
+        sweep_id = sweep_id or str(uuid.uuid4())
+        base_parameters = dict(base_parameters or {})
+        progress_callback = progress_callback or ProgressCallback()
+
+        service = self.registry.get(strategy_code)
+        combinations = [
+            SweepCombination(run_id=str(uuid.uuid4()), parameters={**base_parameters, **params})
+            for params in self.plan_sweep(strategy_code, grid)
+        ]
+        tickers = list(dict.fromkeys([t.strip().upper() for t in tickers if t and t.strip()]))
+
+        logger.info(
+            f"Starting parameter sweep {sweep_id}: {strategy_code}, "
+            f"{len(combinations)} combinations x {len(tickers)} tickers"
+        )
+
+        if self.db:
+            ensure_strategy_run_columns(self.db)
+            self._create_sweep_records(sweep_id, strategy_code, base_parameters, grid,
+                                       combinations, len(tickers))
+
+        progress_callback.report_setup(
+            "Starting parameter sweep",
+            {"total_tickers": len(tickers), "combinations": len(combinations)}
+        )
+
+        def prepare_and_score(ticker: str) -> Tuple[bool, List[StrategyResult]]:
+            try:
+                prepared, failure = service.prepare_ticker(ticker, base_parameters)
+                if failure is not None:
+                    return False, [failure] * len(combinations)
+                return True, [
+                    service.evaluate_prepared(ticker, prepared, combo.parameters)
+                    for combo in combinations
+                ]
+            except Exception as e:
+                logger.error(f"Sweep evaluation failed for {ticker}: {e}")
+                failure = StrategyResult(
+                    ticker=ticker, passed=False, score=0, classification="error",
+                    reasons=["evaluation_error"], metrics={"error": str(e)},
+                    processed_at=datetime.utcnow(), processing_time_ms=0
+                )
+                return False, [failure] * len(combinations)
+
+        processed = 0
+        prepared_count = 0
+        pending_rows: List[tuple] = []
+        max_workers = max(1, min(int(base_parameters.get("max_workers", 4)), len(tickers) or 1))
+
+        try:
+            # Results are consumed on this thread so all sqlite writes stay single-threaded;
+            # sweeps are batch work and default to low scheduler priority
+            outcomes = get_evaluation_scheduler().map(
+                prepare_and_score, tickers, base_parameters.get("priority", "low"), max_workers
+            )
+            try:
+                for ticker, (prepared_ok, results) in zip(tickers, outcomes):
+                    processed += 1
+                    if prepared_ok:
+                        prepared_count += 1
+                    for combo, result in zip(combinations, results):
+                        combo.record(result)
+                        pending_rows.append(self._result_row(combo.run_id, strategy_code, result))
+
+                    if processed % COMMIT_BATCH_SIZE == 0 or processed == len(tickers):
+                        self._flush(sweep_id, pending_rows, ticker, processed, len(tickers))
+                        pending_rows = []
+                        progress_callback.report_overall_progress(
+                            processed=processed,
+                            total=len(tickers),
+                            passed_so_far=max((c.passed for c in combinations), default=0)
+                        )
+            finally:
+                # Cancels queued tasks on the shared pool if the sweep fails
+                outcomes.close()
+        except Exception as e:
+            execution_time_ms = int((time.time() - start_time) * 1000)
+            if self.db:
+                self._finalize_sweep_records(sweep_id, combinations, "error", execution_time_ms)
+            logger.error(f"Parameter sweep {sweep_id} failed: {e}")
+            raise
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        if self.db:
+            self._finalize_sweep_records(sweep_id, combinations, "completed", execution_time_ms)
+
+        summaries = [c.to_summary() for c in combinations]
+        progress_callback.report_completion(
+            total_evaluated=processed,
+            passed=max((s["qualifying_count"] for s in summaries), default=0),
+            failed=processed - max((s["qualifying_count"] for s in summaries), default=0)
+        )
+        logger.info(f"Parameter sweep {sweep_id} completed in {execution_time_ms}ms")
+
+        return ParameterSweepSummary(
+            sweep_id=sweep_id,
+            strategy_code=strategy_code,
+            total_tickers=len(tickers),
+            prepared_tickers=prepared_count,
+            execution_time_ms=execution_time_ms,
+            combinations=summaries
+        )
+
+    def get_sweep_results(self, sweep_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a sweep and its child runs from the database.
+
+        Args:
+            sweep_id: Parent run identifier
+
+        Returns:
+            Sweep information with per-combination counts, or None if not found
+        """
+        if not self.db:
+            return None
+
+        try:
+            parent = self.db.execute("""
+                SELECT strategy_code, params_json, started_at, completed_at, exit_status, duration_ms, universe_size
+                FROM strategy_run WHERE run_id = ?
+            """, (sweep_id,)).fetchone()
+            if not parent:
+                return None
+
+            rows = self.db.execute("""
+                SELECT sr.run_id, sr.params_json, sr.exit_status,
+                       COUNT(r.ticker) AS evaluated,
+                       COALESCE(SUM(r.passed), 0) AS passed,
+                       AVG(CASE WHEN r.passed = 1 THEN r.score END) AS avg_score
+                FROM strategy_run sr
+                LEFT JOIN strategy_result r ON r.run_id = sr.run_id
+                WHERE sr.parent_run_id = ?
+                GROUP BY sr.run_id, sr.params_json, sr.exit_status
+                ORDER BY passed DESC, avg_score DESC
+            """, (sweep_id,)).fetchall()
+
+            combinations = []
+            for row in rows:
+                evaluated = row[3] or 0
+                passed = row[4] or 0
+                combinations.append({
+                    "run_id": row[0],
+                    "parameters": json.loads(row[1]) if row[1] else {},
+                    "exit_status": row[2],
+                    "total_evaluated": evaluated,
+                    "qualifying_count": passed,
+                    "pass_rate_percent": round(passed / evaluated * 100, 1) if evaluated else 0,
+                    "average_score": round(row[5], 1) if row[5] is not None else 0
+                })
+
+            return {
+                "sweep_id": sweep_id,
+                "strategy_code": parent[0],
+                "parameters": json.loads(parent[1]) if parent[1] else {},
+                "started_at": parent[2],
+                "completed_at": parent[3],
+                "exit_status": parent[4],
+                "duration_ms": parent[5],
+                "total_tickers": parent[6] or 0,
+                "combinations": combinations
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get sweep results for {sweep_id}: {e}")
+            return None
+
+    def _result_row(self, run_id: str, strategy_code: str, result: StrategyResult) -> tuple:
+        """Build a strategy_result row tuple for bulk insert."""
+        return (
+            run_id,
+            strategy_code,
+            result.ticker,
+            1 if result.passed else 0,
+            result.score,
+            result.classification,
+            '' if result.passed else ';'.join(result.reasons or []),
+            dumps_json(result.metrics) if result.metrics else '{}',
+            datetime.utcnow().isoformat()
+        )
+
+    def _flush(self, sweep_id: str, rows: List[tuple], current_ticker: str,
+               processed: int, total: int):
+        """Persist buffered result rows and parent progress in one transaction."""
+        if not self.db:
+            return
+        try:
+            self.db.executemany("""
+                INSERT OR REPLACE INTO strategy_result
+                (run_id, strategy_code, ticker, passed, score, classification,
+                 reasons, metrics_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.db.execute("""
+                UPDATE strategy_execution_status
+                SET execution_status = ?,
+                    current_ticker = ?,
+                    progress_percent = ?,
+                    processed_count = ?,
+                    last_progress_update = ?
+                WHERE run_id = ?
+            """, (
+                'running', current_ticker, round(processed / total * 100, 1) if total else 100.0,
+                processed, datetime.utcnow().isoformat(), sweep_id
+            ))
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Failed to persist sweep results for {sweep_id}: {e}")
+
+    def _create_sweep_records(self, sweep_id: str, strategy_code: str,
+                              base_parameters: Dict[str, Any], grid: Dict[str, Any],
+                              combinations: List[SweepCombination], total_count: int):
+        """Create the parent run, its status row and one child run per combination."""
+        now = datetime.now().isoformat()
+
+        def run_row(run_id, params, parent_run_id, universe_source):
+            params_json = json.dumps(params, sort_keys=True, default=str)
+            params_hash = hashlib.md5(params_json.encode()).hexdigest()[:16]
+            return (
+                run_id, strategy_code, "1.0", params_hash, params_json, now,
+                universe_source, total_count, params.get("min_score"), parent_run_id
+            )
+
+        try:
+            rows = [run_row(sweep_id, {**base_parameters, "grid": grid}, None, "sweep")]
+            rows.extend(run_row(c.run_id, c.parameters, sweep_id, "sweep_child") for c in combinations)
+            self.db.executemany("""
+                INSERT INTO strategy_run
+                (run_id, strategy_code, version, params_hash, params_json,
+                 started_at, universe_source, universe_size, min_score, parent_run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            self.db.execute("""
+                INSERT INTO strategy_execution_status
+                (run_id, strategy_code, execution_status, total_count,
+                 processed_count, qualifying_count, current_ticker,
+                 progress_percent, execution_started_at, last_progress_update)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (sweep_id, strategy_code, "queued", total_count, 0, 0, None, 0.0, now, now))
+
+            self.db.commit()
+            logger.info(f"Created sweep records for {sweep_id} ({len(combinations)} child runs)")
+
+        except Exception as e:
+            logger.error(f"Failed to create sweep records for {sweep_id}: {e}")
+            raise
+
+    def _finalize_sweep_records(self, sweep_id: str, combinations: List[SweepCombination],
+                                exit_status: str, duration_ms: int):
+        """Mark the parent and child runs complete and store the sweep summary."""
+        try:
+            completed_at = datetime.now().isoformat()
+            run_ids = [sweep_id] + [c.run_id for c in combinations]
+            self.db.executemany("""
+                UPDATE strategy_run
+                SET completed_at = ?, exit_status = ?, duration_ms = ?
+                WHERE run_id = ?
+            """, [(completed_at, exit_status, duration_ms, run_id) for run_id in run_ids])
+
+            best = max(combinations, key=lambda c: c.passed, default=None)
+            summary = {"combinations": [c.to_summary() for c in combinations]}
+            self.db.execute("""
+                UPDATE strategy_execution_status
+                SET execution_status = ?,
+                    last_progress_update = ?,
+                    execution_time_ms = ?,
+                    qualifying_count = ?,
+                    summary = ?
+                WHERE run_id = ?
+            """, (
+                exit_status, datetime.utcnow().isoformat(), duration_ms,
+                best.passed if best else 0, dumps_json(summary), sweep_id
+            ))
+            self.db.commit()
+
+        except Exception as e:
+            logger.error(f"Failed to finalize sweep {sweep_id}: {e}")
+
+
+# Global service instance
+_sweep_service: Optional[ParameterSweepService] = None
+
+
+def get_parameter_sweep_service(db_connection=None) -> ParameterSweepService:
+    """Get or create global parameter sweep service."""
+    global _sweep_service
+    if _sweep_service is None:
+        _sweep_service = ParameterSweepService(db_connection)
+    return _sweep_service
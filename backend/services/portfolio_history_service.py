@@ -0,0 +1,341 @@
+"""
+Portfolio History Service
+
+Records daily portfolio value per account in the ``portfolio_snapshot`` table so
+equity curves are read from one indexed table instead of fetching history for
+every holding on each request. Snapshots value the current holdings at the
+closes stored in ``price_bars``: a lot counts from its ``opened_at`` date on (or
+always when it has none), and a ticker's last stored close is carried over days
+without a bar. Series are downsampled with Largest-Triangle-Three-Buckets for
+charting.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .price_bar_store import PRICE_BARS_DDL
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIO_SNAPSHOT_DDL = """
+    CREATE TABLE IF NOT EXISTS portfolio_snapshot (
+        account         TEXT NOT NULL,
+        snapshot_date   TEXT NOT NULL,
+        market_value    REAL NOT NULL,
+        cost_basis      REAL,
+        positions_count INTEGER NOT NULL,
+        priced_count    INTEGER NOT NULL,
+        updated_at      TEXT,
+        PRIMARY KEY (account, snapshot_date)
+    )
+"""
+
+PORTFOLIO_SNAPSHOT_INDEX = (
+    "CREATE INDEX IF NOT EXISTS ix_portfolio_snapshot_date ON portfolio_snapshot(snapshot_date)"
+)
+
+# Days before a range start whose closes seed the carry-forward of missing bars
+CLOSE_LOOKBACK_DAYS = 10
+# Snapshots recomputed before the last stored one on the daily job (bars may be re-adjusted)
+SNAPSHOT_OVERLAP_DAYS = 5
+# Dates valued per matrix pass, bounding memory for large books over long ranges
+SNAPSHOT_CHUNK_DAYS = 256
+DEFAULT_MAX_POINTS = 500
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Args:
+        x: Monotonic x values
+        y: Values to preserve the visual shape of
+        threshold: Number of points to keep
+
+    Returns:
+        Indices of the kept points (always including the first and last)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+class PortfolioHistoryService:
+    """Builds and serves daily portfolio value snapshots."""
+
+    def __init__(self, db_connection: Optional[sqlite3.Connection] = None, bar_store=None):
+        """
+        Initialize the service.
+
+        Args:
+            db_connection: SQLite connection (defaults to the shared application database)
+            bar_store: PriceBarStore used to refresh bars (defaults to the global store)
+        """
+        if db_connection is None:
+            from ..database.connection import get_db_connection
+            db_connection = get_db_connection()
+        self.db = db_connection
+        self._bar_store = bar_store
+        self._lock = threading.Lock()
+        with self._lock:
+            self.db.execute(PRICE_BARS_DDL)
+            self.db.execute(PORTFOLIO_SNAPSHOT_DDL)
+            self.db.execute(PORTFOLIO_SNAPSHOT_INDEX)
+            self.db.commit()
+
+    @property
+    def bar_store(self):
+        if self._bar_store is None:
+            from .price_bar_store import get_price_bar_store
+            self._bar_store = get_price_bar_store()
+        return self._bar_store
+
+    def held_tickers(self) -> List[str]:
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT DISTINCT ticker FROM holdings WHERE quantity > 0 ORDER BY ticker"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def last_snapshot_date(self) -> Optional[str]:
+        with self._lock:
+            row = self.db.execute("SELECT MAX(snapshot_date) FROM portfolio_snapshot").fetchone()
+        return row[0] if row else None
+
+    def refresh_bars(self, period: str = "5y") -> int:
+        """Fetch new bars for every held ticker into the bar store (failures are logged)."""
+        written = 0
+        for ticker in self.held_tickers():
+            try:
+                written += self.bar_store.refresh(ticker, period)
+            except Exception as e:
+                logger.warning(f"Failed to refresh bars for {ticker}: {e}")
+        return written
+
+    def snapshot(self, start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """
+        Compute and store snapshots for every trading date in [start, end].
+
+        Trading dates are the dates with a stored bar for any held ticker.
+
+        Args:
+            start: First date (YYYY-MM-DD, default: earliest stored bar)
+            end: Last date (YYYY-MM-DD, default: today)
+
+        Returns:
+            Number of snapshot rows written
+        """
+        with self._lock:
+            lots = self.db.execute(
+                "SELECT account, ticker, quantity, cost_basis, opened_at FROM holdings WHERE quantity > 0"
+            ).fetchall()
+        if not lots:
+            return 0
+
+        accounts_col, tickers_col, quantity, cost_basis, opened_at = zip(*lots)
+        tickers = sorted(set(tickers_col))
+        end = end or date.today().isoformat()
+        closes, dates = self._load_closes(tickers, start, end)
+        if not dates:
+            return 0
+
+        account_keys = sorted(set(accounts_col))
+        account_pos = {a: i for i, a in enumerate(account_keys)}
+        ticker_pos = {t: i for i, t in enumerate(tickers)}
+        lot_ticker = np.array([ticker_pos[t] for t in tickers_col], dtype=np.intp)
+        # lots x accounts membership, so per-account sums are one matrix product
+        membership = np.zeros((len(lots), len(account_keys)))
+        membership[np.arange(len(lots)), [account_pos[a] for a in accounts_col]] = 1.0
+        quantity = np.array(quantity, dtype=float)
+        cost = np.array([c or 0.0 for c in cost_basis], dtype=float)
+        opened = np.array([(o or "")[:10] for o in opened_at], dtype="U10")
+
+        now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        written = 0
+        for offset in range(0, len(dates), SNAPSHOT_CHUNK_DAYS):
+            chunk = dates[offset:offset + SNAPSHOT_CHUNK_DAYS]
+            lot_close = closes[offset:offset + len(chunk)][:, lot_ticker]
+            active = (opened <= np.array(chunk, dtype="U10")[:, None]).astype(float)
+            priced = ~np.isnan(lot_close) * active
+            values = (np.nan_to_num(lot_close) * quantity * active) @ membership
+            costs = (cost * active) @ membership
+            positions = active @ membership
+            priced_counts = priced @ membership
+
+            rows = [
+                (account, d, float(values[i, j]), float(costs[i, j]) or None,
+                 int(positions[i, j]), int(priced_counts[i, j]), now)
+                for i, d in enumerate(chunk)
+                for j, account in enumerate(account_keys)
+                if positions[i, j] > 0
+            ]
+            with self._lock:
+                self.db.executemany("""
+                    INSERT INTO portfolio_snapshot
+                        (account, snapshot_date, market_value, cost_basis, positions_count, priced_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(account, snapshot_date) DO UPDATE SET
+                        market_value = excluded.market_value, cost_basis = excluded.cost_basis,
+                        positions_count = excluded.positions_count, priced_count = excluded.priced_count,
+                        updated_at = excluded.updated_at
+                """, rows)
+                self.db.commit()
+            written += len(rows)
+        return written
+
+    def backfill(self, start: Optional[str] = None, end: Optional[str] = None,
+                 refresh: bool = False, period: str = "5y") -> int:
+        """
+        Rebuild snapshots over a range, optionally downloading missing bars first.
+
+        Args:
+            start: First date (default: earliest stored bar)
+            end: Last date (default: today)
+            refresh: Refresh bars of held tickers before snapshotting
+            period: History to download for tickers without stored bars
+
+        Returns:
+            Number of snapshot rows written
+        """
+        if refresh:
+            self.refresh_bars(period)
+        return self.snapshot(start, end)
+
+    def run_daily_job(self) -> int:
+        """Refresh bars and snapshot every date since the last stored snapshot."""
+        self.refresh_bars()
+        last = self.last_snapshot_date()
+        start = None
+        if last:
+            start = (datetime.strptime(last, "%Y-%m-%d") - timedelta(days=SNAPSHOT_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+        written = self.snapshot(start)
+        logger.info(f"Portfolio snapshot job wrote {written} rows")
+        return written
+
+    def get_series(self, account: Optional[str] = None, start: Optional[str] = None,
+                   end: Optional[str] = None, max_points: Optional[int] = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+        """
+        Return a portfolio value series, downsampled for charting.
+
+        Args:
+            account: Account to chart (default: all accounts summed)
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            max_points: Most points returned (LTTB downsampling); None for all
+
+        Returns:
+            Dictionary with account, total_points, downsampled and points
+        """
+        if max_points is not None and max_points < 3:
+            raise ValueError("max_points must be at least 3")
+
+        query = ("SELECT snapshot_date, SUM(market_value), SUM(cost_basis) "
+                 "FROM portfolio_snapshot WHERE 1=1")
+        params: List[Any] = []
+        if account:
+            query += " AND account = ?"
+            params.append(account)
+        if start:
+            query += " AND snapshot_date >= ?"
+            params.append(str(start)[:10])
+        if end:
+            query += " AND snapshot_date <= ?"
+            params.append(str(end)[:10])
+        query += " GROUP BY snapshot_date ORDER BY snapshot_date"
+
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+
+        kept = range(len(rows))
+        if max_points is not None and len(rows) > max_points:
+            x = np.array([date.fromisoformat(r[0]).toordinal() for r in rows], dtype=float)
+            y = np.array([r[1] for r in rows], dtype=float)
+            kept = lttb_indices(x, y, max_points)
+
+        return {
+            "account": account,
+            "total_points": len(rows),
+            "downsampled": len(kept) < len(rows),
+            "points": [
+                {"date": rows[i][0], "market_value": rows[i][1], "cost_basis": rows[i][2]}
+                for i in kept
+            ],
+        }
+
+    def _load_closes(self, tickers: List[str], start: Optional[str], end: str):
+        """Closes as a (dates x tickers) matrix over the trading dates in range, carried forward."""
+        query_start = None
+        if start:
+            query_start = (datetime.strptime(start[:10], "%Y-%m-%d")
+                           - timedelta(days=CLOSE_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+        placeholders = ",".join("?" for _ in tickers)
+        query = (f"SELECT substr(bar_date, 1, 10), ticker, close FROM price_bars "
+                 f"WHERE interval = '1d' AND ticker IN ({placeholders}) AND substr(bar_date, 1, 10) <= ?")
+        params: List[Any] = [*tickers, end[:10]]
+        if query_start:
+            query += " AND bar_date >= ?"
+            params.append(query_start)
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+        if not rows:
+            return np.empty((0, len(tickers))), []
+
+        all_dates = sorted({r[0] for r in rows})
+        date_pos = {d: i for i, d in enumerate(all_dates)}
+        ticker_pos = {t: i for i, t in enumerate(tickers)}
+        closes = np.full((len(all_dates), len(tickers)), np.nan)
+        for d, ticker, close in rows:
+            closes[date_pos[d], ticker_pos[ticker]] = close
+
+        # Carry each ticker's last close over dates without a bar
+        filled = np.where(np.isnan(closes), 0, np.arange(len(all_dates))[:, None])
+        np.maximum.accumulate(filled, axis=0, out=filled)
+        closes = closes[filled, np.arange(len(tickers))]
+
+        first = next((i for i, d in enumerate(all_dates) if not start or d >= start[:10]), len(all_dates))
+        return closes[first:], all_dates[first:]
+
+
+async def run_snapshot_scheduler(interval_hours: float):
+    """Run the daily snapshot job every ``interval_hours`` until cancelled."""
+    while True:
+        try:
+            await asyncio.to_thread(get_portfolio_history_service().run_daily_job)
+        except Exception as e:
+            logger.error(f"Portfolio snapshot job failed: {e}")
+        await asyncio.sleep(interval_hours * 3600)
+
+
+# Global service instance
+_portfolio_history_service: Optional[PortfolioHistoryService] = None
+
+
+def get_portfolio_history_service(db_connection: Optional[sqlite3.Connection] = None,
+                                  bar_store=None) -> PortfolioHistoryService:
+    """Get or create global portfolio history service."""
+    global _portfolio_history_service
+    if _portfolio_history_service is None:
+        _portfolio_history_service = PortfolioHistoryService(db_connection, bar_store)
+    return _portfolio_history_service
@@ -0,0 +1,307 @@
+"""
+Price Bar Store
+
+Persists OHLCV history in the ``price_bars`` table so backtests and other
+historical analyses read bars locally instead of downloading full windows on
+every run. Refreshing a ticker only fetches the bars after its last stored date.
+
+Only completed sessions are stored: a daily bar of the session still trading
+in New York is dropped until the close. A refresh whose overlap closes differ
+from the stored ones (a split or dividend re-adjusted the history) replaces the
+ticker's whole series instead of upserting the tail, so stored bars never mix
+adjustment bases.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+PRICE_BARS_DDL = """
+    CREATE TABLE IF NOT EXISTS price_bars (
+        ticker     TEXT NOT NULL,
+        interval   TEXT NOT NULL DEFAULT '1d',
+        bar_date   TEXT NOT NULL,
+        open       REAL,
+        high       REAL,
+        low        REAL,
+        close      REAL NOT NULL,
+        volume     REAL,
+        updated_at TEXT,
+        PRIMARY KEY (ticker, interval, bar_date)
+    )
+"""
+
+# Bars re-fetched before the last stored date on refresh (the latest bar may have been partial)
+REFRESH_OVERLAP_DAYS = 5
+
+# Relative close difference in the overlap treated as a re-adjusted history
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Daily bars count as final after the regular close plus a settlement margin
+MARKET_TZ = ZoneInfo("America/New_York")
+SESSION_FINAL_TIME = time(16, 30)
+
+_DAILY_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+
+class PriceBarStore:
+    """SQLite-backed cache of OHLCV bars with incremental refresh."""
+
+    def __init__(self, db_connection: Optional[sqlite3.Connection] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_connection: SQLite connection (defaults to the shared application database)
+        """
+        if db_connection is None:
+            from ..database.connection import get_db_connection
+            db_connection = get_db_connection()
+        self.db = db_connection
+        # One connection is shared by download worker threads; serialize access to it
+        self._lock = threading.Lock()
+        self.ensure_table()
+
+    def ensure_table(self):
+        """Create the price_bars table if it does not exist (mirrors db.py v6)."""
+        with self._lock:
+            self.db.execute(PRICE_BARS_DDL)
+            self.db.commit()
+
+    def get_last_date(self, ticker: str, interval: str = "1d") -> Optional[str]:
+        """Return the most recent stored bar date for a ticker, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT MAX(bar_date) FROM price_bars WHERE ticker = ? AND interval = ?",
+                (ticker.upper(), interval)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_last_update(self, ticker: str, interval: str = "1d") -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(last bar date, updated_at of that bar)`` for a ticker, or ``(None, None)``."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT bar_date, updated_at FROM price_bars WHERE ticker = ? AND interval = ? "
+                "ORDER BY bar_date DESC LIMIT 1",
+                (ticker.upper(), interval)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def get_bars(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None,
+                 interval: str = "1d"):
+        """
+        Load stored bars for a ticker.
+
+        Args:
+            ticker: Ticker symbol
+            start: Optional first bar date (inclusive, ISO format)
+            end: Optional last bar date (inclusive, ISO format)
+            interval: Bar interval
+
+        Returns:
+            DataFrame with open/high/low/close/volume columns and a DatetimeIndex,
+            or None if no bars are stored
+        """
+        import pandas as pd
+
+        query = ("SELECT bar_date, open, high, low, close, volume FROM price_bars "
+                 "WHERE ticker = ? AND interval = ?")
+        params = [ticker.upper(), interval]
+        if start:
+            query += " AND bar_date >= ?"
+            params.append(str(start)[:10])
+        if end:
+            query += " AND substr(bar_date, 1, 10) <= ?"
+            params.append(str(end)[:10])
+        query += " ORDER BY bar_date"
+
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+        if not rows:
+            return None
+
+        df = pd.DataFrame([tuple(r) for r in rows],
+                          columns=["bar_date", "open", "high", "low", "close", "volume"])
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("bar_date")), name="date")
+        return df
+
+    def save_bars(self, ticker: str, bars, interval: str = "1d", replace: bool = False) -> int:
+        """
+        Upsert bars for a ticker.
+
+        Args:
+            ticker: Ticker symbol
+            bars: DataFrame with a DatetimeIndex and open/high/low/close/volume columns
+            interval: Bar interval
+            replace: Delete the ticker's other stored bars in the same transaction
+
+        Returns:
+            Number of bars written
+        """
+        if bars is None or len(bars) == 0:
+            return 0
+
+        date_format = "%Y-%m-%d" if interval in _DAILY_INTERVALS else "%Y-%m-%dT%H:%M:%S"
+        now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        ticker = ticker.upper()
+        rows = [
+            (ticker, interval, ts.strftime(date_format), _float_or_none(o), _float_or_none(h),
+             _float_or_none(l), float(c), _float_or_none(v), now)
+            for ts, o, h, l, c, v in zip(
+                bars.index, bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"]
+            )
+            if c == c
+        ]
+        with self._lock:
+            if replace:
+                self.db.execute("DELETE FROM price_bars WHERE ticker = ? AND interval = ?", (ticker, interval))
+            self.db.executemany("""
+                INSERT INTO price_bars (ticker, interval, bar_date, open, high, low, close, volume, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ticker, interval, bar_date) DO UPDATE SET
+                    open = excluded.open, high = excluded.high, low = excluded.low,
+                    close = excluded.close, volume = excluded.volume, updated_at = excluded.updated_at
+            """, rows)
+            self.db.commit()
+        return len(rows)
+
+    def refresh(self, ticker: str, period: str = "5y", interval: str = "1d") -> int:
+        """
+        Download bars newer than the last stored date (or ``period`` if none are stored).
+
+        Skipped when the last bar was fetched after the latest session became
+        final. When the re-fetched overlap no longer matches the stored closes,
+        the ticker's whole stored range is downloaded again and replaces it.
+
+        Args:
+            ticker: Ticker symbol
+            period: History window for the initial download
+            interval: Bar interval
+
+        Returns:
+            Number of bars written
+        """
+        last_date, updated_at = self.get_last_update(ticker, interval)
+        if is_current(updated_at, interval):
+            return 0
+
+        start = None
+        if last_date:
+            start = (datetime.strptime(last_date[:10], "%Y-%m-%d")
+                     - timedelta(days=REFRESH_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+        bars = _completed_bars(self._download(ticker, period, interval, start), interval)
+        if start and bars is not None and self._overlap_adjusted(ticker, bars, last_date, interval):
+            with self._lock:
+                first_date = self.db.execute(
+                    "SELECT MIN(bar_date) FROM price_bars WHERE ticker = ? AND interval = ?",
+                    (ticker.upper(), interval)
+                ).fetchone()[0]
+            logger.info(f"Stored bars for {ticker} were re-adjusted; reloading since {first_date[:10]}")
+            bars = _completed_bars(self._download(ticker, period, interval, first_date[:10]), interval)
+            return self.save_bars(ticker, bars, interval, replace=True)
+        return self.save_bars(ticker, bars, interval)
+
+    def _overlap_adjusted(self, ticker: str, bars, last_date: str, interval: str) -> bool:
+        """True when downloaded closes of already stored dates differ from the stored closes."""
+        stored = self.get_bars(ticker, bars.index[0], last_date, interval)
+        if stored is None:
+            return False
+        common = stored.index.intersection(bars.index)
+        if len(common) == 0:
+            return False
+        # The last stored bar alone may be a revised final print; a split or
+        # dividend shifts every earlier bar as well
+        if len(common) > 1:
+            common = common[:-1]
+        old = stored.loc[common, "close"].to_numpy(dtype=float)
+        new = bars.loc[common, "close"].to_numpy(dtype=float)
+        return bool((abs(new - old) > ADJUSTMENT_TOLERANCE * abs(old)).any())
+
+    def load(self, ticker: str, period: str = "5y", interval: str = "1d",
+             refresh: bool = True, start: Optional[str] = None, end: Optional[str] = None):
+        """
+        Return stored bars for a ticker, refreshing the tail first if requested.
+
+        Download failures are logged and the stored bars are returned as-is.
+        """
+        if refresh:
+            try:
+                self.refresh(ticker, period, interval)
+            except Exception as e:
+                logger.warning(f"Failed to refresh bars for {ticker}: {e}")
+        return self.get_bars(ticker, start, end, interval)
+
+    def _download(self, ticker: str, period: str, interval: str, start: Optional[str] = None):
+        """Download adjusted OHLCV bars with yfinance and normalize them."""
+        import pandas as pd
+        import yfinance as yf
+
+        if start:
+            raw = yf.Ticker(ticker).history(start=start, interval=interval, auto_adjust=True)
+        else:
+            raw = yf.Ticker(ticker).history(period=period, interval=interval, auto_adjust=True)
+        if raw is None or raw.empty:
+            return None
+
+        raw.columns = [str(c).lower() for c in raw.columns]
+        if not {"open", "high", "low", "close", "volume"}.issubset(raw.columns):
+            return None
+        bars = raw[["open", "high", "low", "close", "volume"]].apply(pd.to_numeric, errors="coerce")
+        if getattr(bars.index, "tz", None) is not None:
+            bars.index = bars.index.tz_localize(None)
+        return bars.dropna(subset=["close"])
+
+
+def is_current(checked_at: Optional[str], interval: str = "1d") -> bool:
+    """True when daily bars were fetched (``updated_at``) after the most recent session became final."""
+    return bool(checked_at) and interval in _DAILY_INTERVALS and checked_at >= _last_session_final()
+
+
+def _float_or_none(value) -> Optional[float]:
+    return float(value) if value == value and value is not None else None
+
+
+def _last_session_final() -> str:
+    """UTC time (``updated_at`` format) at which the most recent weekday session became final."""
+    now = datetime.now(MARKET_TZ)
+    day = now.date()
+    final = datetime.combine(day, SESSION_FINAL_TIME, MARKET_TZ)
+    while day.weekday() >= 5 or final > now:
+        day -= timedelta(days=1)
+        final = datetime.combine(day, SESSION_FINAL_TIME, MARKET_TZ)
+    return final.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _unfinished_session_date():
+    """New York date of the session still trading (or not yet final), or None."""
+    now = datetime.now(MARKET_TZ)
+    if now.weekday() < 5 and now.time() < SESSION_FINAL_TIME:
+        return now.date()
+    return None
+
+
+def _completed_bars(bars, interval: str):
+    """Drop the daily bar of the unfinished session (its values change until the close)."""
+    if bars is None or interval != "1d":
+        return bars
+    unfinished = _unfinished_session_date()
+    if unfinished is None:
+        return bars
+    return bars[bars.index.date < unfinished]
+
+
+# Global store instance
+_price_bar_store: Optional[PriceBarStore] = None
+
+
+def get_price_bar_store(db_connection: Optional[sqlite3.Connection] = None) -> PriceBarStore:
+    """Get or create global price bar store."""
+    global _price_bar_store
+    if _price_bar_store is None:
+        _price_bar_store = PriceBarStore(db_connection)
+    return _price_bar_store
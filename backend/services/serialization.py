@@ -0,0 +1,124 @@
+"""
+JSON Serialization
+
+Fast JSON encoding for strategy metrics, stored summaries and dict API
+payloads. orjson (when installed) encodes NumPy scalars/arrays natively, so
+metrics produced by pandas/numpy code no longer need a conversion walk before
+``json.dumps``. Without orjson, ``to_native`` converts the payload in a
+single iterative pass and the stdlib encoder is used.
+
+Float NaN (and pandas NA/NaT) encode as null in both paths.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Values of these exact types are already JSON-native
+_NATIVE_TYPES = frozenset((str, int, bool, type(None)))
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _is_missing(value: Any) -> bool:
+    """pandas-style missing check for scalars that are not plain floats."""
+    try:
+        import pandas as pd
+        return pd.isna(value) is True
+    except (TypeError, ValueError, ImportError):
+        return False
+
+
+def _convert_scalar(value: Any) -> Any:
+    """Convert a non-container, non-native value."""
+    if isinstance(value, float):
+        return value if value == value else None
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        value = float(value)
+        return value if value == value else None
+    if _is_missing(value):
+        return None
+    return value
+
+
+def to_native(obj: Any) -> Any:
+    """
+    Convert NumPy/pandas values nested in dicts, lists and tuples to native
+    Python values in a single pass.
+
+    Containers are walked with an explicit stack and values are dispatched on
+    their exact type, so native values (the common case) cost one set lookup.
+    NumPy arrays become lists and missing values (NaN, NA, NaT) become None.
+
+    Args:
+        obj: Value to convert
+
+    Returns:
+        JSON-serializable copy of ``obj``
+    """
+    if type(obj) in _NATIVE_TYPES:
+        return obj
+
+    result = [None]
+    stack = [([obj], result)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            value_type = type(value)
+            if value_type in _NATIVE_TYPES:
+                target[key] = value
+                continue
+            if value_type is np.ndarray:
+                value = value.tolist()
+                value_type = list
+            if isinstance(value, dict):
+                converted = {}
+                stack.append((value, converted))
+            elif value_type is list or value_type is tuple:
+                converted = [None] * len(value)
+                stack.append((value, converted))
+            else:
+                converted = _convert_scalar(value)
+            target[key] = converted
+    return result[0]
+
+
+def _orjson_default(value: Any) -> Any:
+    """Fallback for types orjson does not encode natively."""
+    if _is_missing(value):
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes (NumPy values supported)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS)
+    return json.dumps(to_native(obj), separators=(",", ":"), default=_orjson_default).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as a compact JSON string (NumPy values supported)."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data) -> Any:
+    """Decode a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
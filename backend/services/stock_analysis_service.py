@@ -4,6 +4,7 @@ This service provides comprehensive stock analysis capabilities by integrating
 real-time market data, technical indicators, and company information.
 """
 
+import copy
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -14,6 +15,8 @@ import pandas as pd
 import numpy as np
 
 from .market_data_service import MarketDataService
+from .avwap_engine import ANCHOR_KINDS, get_avwap_engine
+from .indicator_cache import get_indicator_cache
 
 logger = logging.getLogger(__name__)
 
@@ -91,61 +94,39 @@ class StockAnalysisService:
             logger.error(f"Failed to get comprehensive stock info for {ticker}: {e}")
             return None
     
-    def get_technical_indicators(self, ticker: str, period: str = "3mo") -> Optional[Dict[str, Any]]:
+    def get_technical_indicators(self, ticker: str, period: str = "3mo",
+                                 avwap_anchors: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Calculate technical indicators for a stock.
         
+        Indicators are computed from the full stored daily history (so SMA200 is
+        always available) and shared through the indicator cache, which only
+        recomputes them when a new bar is stored. Callers get their own copy and
+        may modify it.
+        
         Args:
             ticker: Stock ticker symbol
-            period: Historical data period
+            period: Kept for compatibility; the full stored history is used
+            avwap_anchors: Anchored VWAP anchors to add (see ``get_anchored_vwap``)
             
         Returns:
             Dictionary with technical indicators or None if failed
         """
         try:
-            # Get historical data
-            historical_data = self.market_service.get_historical_data(ticker, period=period, interval="1d")
-            if historical_data is None or historical_data.empty:
+            ticker = ticker.upper()
+            cache = get_indicator_cache()
+            cached = cache.get(ticker, "technical", self._calculate_technical_indicators)
+            if cached is None:
                 logger.warning(f"No historical data available for {ticker}")
                 return None
+            indicators = copy.deepcopy(cached)
             
-            indicators = {}
-            
-            # Moving averages
-            indicators['sma_10'] = float(historical_data['Close'].rolling(window=10).mean().iloc[-1])
-            indicators['sma_20'] = float(historical_data['Close'].rolling(window=20).mean().iloc[-1])
-            indicators['sma_50'] = float(historical_data['Close'].rolling(window=50).mean().iloc[-1])
-            indicators['sma_200'] = float(historical_data['Close'].rolling(window=200).mean().iloc[-1]) if len(historical_data) >= 200 else None
-            
-            # Exponential moving averages
-            indicators['ema_12'] = float(historical_data['Close'].ewm(span=12).mean().iloc[-1])
-            indicators['ema_26'] = float(historical_data['Close'].ewm(span=26).mean().iloc[-1])
-            
-            # RSI (14-day)
-            indicators['rsi_14'] = float(self._calculate_rsi(historical_data['Close'], 14))
-            
-            # MACD
-            macd_data = self._calculate_macd(historical_data['Close'])
-            indicators.update(macd_data)
-            
-            # Bollinger Bands
-            bb_data = self._calculate_bollinger_bands(historical_data['Close'])
-            indicators.update(bb_data)
-            
-            # Volume indicators
-            if 'Volume' in historical_data.columns:
-                indicators['volume_sma_20'] = float(historical_data['Volume'].rolling(window=20).mean().iloc[-1])
-                indicators['volume_ratio'] = float(historical_data['Volume'].iloc[-1] / indicators['volume_sma_20'])
-            
-            # Price position indicators
-            current_price = float(historical_data['Close'].iloc[-1])
-            indicators['price_vs_sma10'] = (current_price / indicators['sma_10'] - 1) * 100
-            indicators['price_vs_sma20'] = (current_price / indicators['sma_20'] - 1) * 100
-            indicators['price_vs_sma50'] = (current_price / indicators['sma_50'] - 1) * 100
-            if indicators['sma_200']:
-                indicators['price_vs_sma200'] = (current_price / indicators['sma_200'] - 1) * 100
-            
-            # ATR (Average True Range)
-            indicators['atr_14'] = float(self._calculate_atr(historical_data, 14))
+            # Anchored VWAP (same stored bars, shared prefix sums)
+            if avwap_anchors:
+                anchors = tuple(avwap_anchors)
+                indicators['anchored_vwap'] = copy.deepcopy(cache.get(
+                    ticker, "anchored_vwap:" + ",".join(anchors),
+                    lambda bars: self._anchored_vwap_from_bars(ticker, bars, anchors)
+                ))
             
             return indicators
             
@@ -153,6 +134,76 @@ class StockAnalysisService:
             logger.error(f"Failed to calculate technical indicators for {ticker}: {e}")
             return None
     
+    def _calculate_technical_indicators(self, bars: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Indicator values at the last bar of a stored history (lowercase OHLCV columns)."""
+        if bars is None or bars.empty:
+            return None
+        close = bars['close']
+        
+        indicators = {}
+        
+        # Moving averages
+        indicators['sma_10'] = float(close.rolling(window=10).mean().iloc[-1])
+        indicators['sma_20'] = float(close.rolling(window=20).mean().iloc[-1])
+        indicators['sma_50'] = float(close.rolling(window=50).mean().iloc[-1])
+        indicators['sma_200'] = float(close.rolling(window=200).mean().iloc[-1]) if len(bars) >= 200 else None
+        
+        # Exponential moving averages
+        indicators['ema_12'] = float(close.ewm(span=12).mean().iloc[-1])
+        indicators['ema_26'] = float(close.ewm(span=26).mean().iloc[-1])
+        
+        # RSI (14-day)
+        indicators['rsi_14'] = float(self._calculate_rsi(close, 14))
+        
+        # MACD
+        indicators.update(self._calculate_macd(close))
+        
+        # Bollinger Bands
+        indicators.update(self._calculate_bollinger_bands(close))
+        
+        # Volume indicators
+        indicators['volume_sma_20'] = float(bars['volume'].rolling(window=20).mean().iloc[-1])
+        indicators['volume_ratio'] = float(bars['volume'].iloc[-1] / indicators['volume_sma_20'])
+        
+        # Price position indicators
+        current_price = float(close.iloc[-1])
+        indicators['price_vs_sma10'] = (current_price / indicators['sma_10'] - 1) * 100
+        indicators['price_vs_sma20'] = (current_price / indicators['sma_20'] - 1) * 100
+        indicators['price_vs_sma50'] = (current_price / indicators['sma_50'] - 1) * 100
+        if indicators['sma_200']:
+            indicators['price_vs_sma200'] = (current_price / indicators['sma_200'] - 1) * 100
+        
+        # ATR (Average True Range)
+        indicators['atr_14'] = float(self._calculate_atr(bars, 14))
+        
+        indicators['last_bar_date'] = bars.index[-1].strftime('%Y-%m-%d')
+        indicators['history_bars'] = len(bars)
+        return indicators
+    
+    def _anchored_vwap_from_bars(self, ticker: str, bars: pd.DataFrame, anchors) -> Optional[Dict[str, Any]]:
+        """Anchored VWAP from an already loaded stored history."""
+        engine = get_avwap_engine()
+        series = engine.update(ticker, bars)
+        if series is None:
+            return None
+        return engine.anchored(ticker, anchors, series=series)
+    
+    def get_anchored_vwap(self, ticker: str, anchors: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Anchored VWAP of a stock from its stored daily bars.
+        
+        Args:
+            ticker: Stock ticker symbol
+            anchors: Anchor kinds (breakout, earnings, 52w_low); all by default
+            
+        Returns:
+            Dictionary of anchor kind -> anchor date, VWAP and distance, or None
+        """
+        engine = get_avwap_engine()
+        series = engine.load(ticker.upper())
+        if series is None:
+            return None
+        return engine.anchored(ticker.upper(), anchors or ANCHOR_KINDS, series=series)
+    
     def get_performance_metrics(self, ticker: str, period: str = "1y") -> Optional[Dict[str, Any]]:
         """Calculate performance metrics for a stock.
         
@@ -322,10 +373,10 @@ class StockAnalysisService:
         }
     
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
-        """Calculate Average True Range."""
-        high_low = data['High'] - data['Low']
-        high_close = np.abs(data['High'] - data['Close'].shift())
-        low_close = np.abs(data['Low'] - data['Close'].shift())
+        """Calculate Average True Range (lowercase high/low/close columns)."""
+        high_low = data['high'] - data['low']
+        high_close = np.abs(data['high'] - data['close'].shift())
+        low_close = np.abs(data['low'] - data['close'].shift())
         
         true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
         atr = true_range.rolling(window=period).mean()
@@ -9,49 +9,67 @@ import uuid
 import time
 import logging
 import json
-import numpy as np
-import pandas as pd
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 
 from .base_strategy_service import (
-    BaseStrategyService, StrategyExecutionSummary, ProgressCallback, get_strategy_registry
+    BaseStrategyService, StrategyExecutionSummary, ProgressCallback, CancellationToken,
+    get_strategy_registry
 )
 from .bullish_breakout_service import BullishBreakoutService
 from .leap_entry_service import LeapEntryService  # Leap Entry Strategy Service
+from .buffett_service import BuffettService
+from .serialization import dumps as dumps_json, to_native
 
 logger = logging.getLogger(__name__)
 
+# Runs with at most this many tickers (UI single-ticker analysis) default to high priority
+INTERACTIVE_TICKER_LIMIT = 1
 
-def convert_numpy_types(obj):
-    """Convert numpy types to native Python types for JSON serialization."""
-    if isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(v) for v in obj]
-    elif isinstance(obj, (np.bool_, np.bool)):
-        return bool(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif pd.isna(obj):
-        return None
-    else:
-        return obj
+
+# Kept for existing imports; the single-pass converter lives in serialization
+convert_numpy_types = to_native
+
+
+@dataclass
+class RunCheckpoint:
+    """Persisted state of an interrupted run, used to resume it."""
+    run_id: str
+    strategy_code: str
+    parameters: Dict[str, Any]
+    tickers: List[str]  # Full universe, in submission order
+    completed: Dict[str, bool] = field(default_factory=dict)  # Finished ticker -> passed
+    last_sequence: int = 0
+    
+    @property
+    def passed_count(self) -> int:
+        return sum(1 for passed in self.completed.values() if passed)
+    
+    @property
+    def remaining(self) -> List[str]:
+        """Tickers still to evaluate."""
+        return [t for t in self.tickers if t not in self.completed]
 
 
 class DatabaseProgressTracker:
     """Database-centric progress tracking for strategy execution."""
     
-    def __init__(self, db_connection, run_id: str, strategy_code: str, total_tickers: int):
+    def __init__(self, db_connection, run_id: str, strategy_code: str, total_tickers: int,
+                 checkpoint: Optional[RunCheckpoint] = None):
         self.db = db_connection
         self.run_id = run_id
         self.strategy_code = strategy_code
         self.total_tickers = total_tickers
         self.processed_count = 0
         self.passed_count = 0
+        # Resumed runs continue the counters and sequence numbers of the checkpoint
+        self.sequence_offset = 0
+        if checkpoint is not None:
+            self.processed_count = len(checkpoint.completed)
+            self.passed_count = checkpoint.passed_count
+            self.sequence_offset = checkpoint.last_sequence
         self.current_ticker = None
         self.start_time = datetime.utcnow()
         
@@ -74,8 +92,8 @@ class DatabaseProgressTracker:
             """, (
                 'running',
                 None,
-                0.0,
-                0,
+                round(self.processed_count / self.total_tickers * 100, 1) if self.total_tickers else 0.0,
+                self.processed_count,
                 self.total_tickers,
                 datetime.utcnow().isoformat(),
                 self.run_id
@@ -109,7 +127,7 @@ class DatabaseProgressTracker:
             """, (
                 self.run_id,
                 ticker,
-                sequence_number,
+                sequence_number + self.sequence_offset,
                 created_at,
                 passed,
                 score,
@@ -120,7 +138,7 @@ class DatabaseProgressTracker:
             
             # Also insert into strategy_result table for API compatibility
             reasons_str = ';'.join(reasons) if reasons else ''
-            metrics_json = json.dumps(convert_numpy_types(metrics)) if metrics else '{}'
+            metrics_json = dumps_json(metrics) if metrics else '{}'
             
             self.db.execute("""
                 INSERT OR REPLACE INTO strategy_result
@@ -159,7 +177,81 @@ class DatabaseProgressTracker:
             
         except Exception as e:
             logger.error(f"Failed to update ticker progress for {ticker}: {e}")
-    
+
+    def update_ticker_batch(self, results: List[Dict[str, Any]], processing_time_ms: int = 0):
+        """Persist many ticker results with executemany in a single commit."""
+        if not results:
+            return
+        try:
+            created_at = datetime.utcnow().isoformat()
+            progress_rows = []
+            result_rows = []
+            for r in results:
+                self.processed_count += 1
+                if r.get('passed'):
+                    self.passed_count += 1
+                reasons = r.get('reasons') or []
+                metrics = r.get('metrics') or {}
+                progress_rows.append((
+                    self.run_id, r['ticker'], self.sequence_offset + r.get('sequence_number', len(progress_rows) + 1),
+                    created_at,
+                    r.get('passed', False), r.get('score', 0), r.get('classification', 'N/A'),
+                    r.get('error_message'), processing_time_ms
+                ))
+                result_rows.append((
+                    self.run_id, self.strategy_code, r['ticker'], r.get('passed', False),
+                    r.get('score', 0), r.get('classification', 'N/A'), ';'.join(reasons),
+                    dumps_json(metrics) if metrics else '{}', created_at
+                ))
+            self.current_ticker = results[-1]['ticker']
+            progress_percent = (self.processed_count / self.total_tickers) * 100 if self.total_tickers else 100.0
+
+            self.db.executemany("""
+                INSERT OR REPLACE INTO strategy_execution_progress
+                (run_id, ticker, sequence_number, processed_at, passed, score,
+                 classification, error_message, processing_time_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, progress_rows)
+            self.db.executemany("""
+                INSERT OR REPLACE INTO strategy_result
+                (run_id, strategy_code, ticker, passed, score, classification,
+                 reasons, metrics_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, result_rows)
+            self.db.execute("""
+                UPDATE strategy_execution_status
+                SET current_ticker = ?,
+                    progress_percent = ?,
+                    processed_count = ?,
+                    last_progress_update = ?
+                WHERE run_id = ?
+            """, (
+                self.current_ticker,
+                round(min(progress_percent, 100.0), 1),
+                self.processed_count,
+                created_at,
+                self.run_id
+            ))
+
+            self.db.commit()
+
+        except Exception as e:
+            logger.error(f"Failed to persist batch of {len(results)} ticker results: {e}")
+
+    def update_result_metrics(self, updates: Dict[str, Dict[str, Any]]):
+        """Replace the stored metrics of already persisted tickers in one commit."""
+        if not updates:
+            return
+        try:
+            self.db.executemany("""
+                UPDATE strategy_result
+                SET metrics_json = ?
+                WHERE run_id = ? AND ticker = ?
+            """, [(dumps_json(metrics), self.run_id, ticker) for ticker, metrics in updates.items()])
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Failed to update metrics of {len(updates)} tickers: {e}")
+
     def finalize_execution(self, status: str, execution_time_ms: int, 
                           qualifying_count: int, summary_metrics: Dict[str, Any]):
         """Finalize execution with results."""
@@ -203,6 +295,10 @@ class StrategyExecutionService:
         self.db = db_connection
         self.registry = get_strategy_registry()
         
+        # Cancellation tokens of runs registered or executing in this process
+        self._active_runs: Dict[str, CancellationToken] = {}
+        self._active_runs_lock = threading.Lock()
+        
         # Register available services
         self._register_services()
         
@@ -219,15 +315,122 @@ class StrategyExecutionService:
             leap_service = LeapEntryService()
             self.registry.register(leap_service)
             
+            # Register Buffett fundamentals screener
+            buffett_service = BuffettService()
+            self.registry.register(buffett_service)
+            
             registered_strategies = self.registry.list_strategies()
             logger.info(f"Registered {len(registered_strategies)} strategy services: {[s['code'] for s in registered_strategies]}")
             
         except Exception as e:
             logger.error(f"Failed to register strategy services: {e}")
     
+    def register_run(self, run_id: str) -> CancellationToken:
+        """Return the cancellation token for a run, creating it if needed.
+        
+        Registering a run before it starts lets it be cancelled while still
+        waiting in the background task queue.
+        """
+        with self._active_runs_lock:
+            token = self._active_runs.get(run_id)
+            if token is None:
+                token = CancellationToken()
+                self._active_runs[run_id] = token
+            return token
+    
+    def cancel_run(self, run_id: str) -> bool:
+        """Request cooperative cancellation of a registered or executing run.
+        
+        Returns:
+            True if the run was active and is now cancelling, False otherwise
+        """
+        with self._active_runs_lock:
+            token = self._active_runs.get(run_id)
+        if token is None:
+            return False
+        cancelled = token.cancel("cancelled")
+        if cancelled:
+            logger.info(f"Cancellation requested for run {run_id}")
+        return cancelled
+
+    def load_checkpoint(self, run_id: str) -> Optional[RunCheckpoint]:
+        """
+        Load the checkpoint of an interrupted run from the database.
+
+        Completed tickers come from strategy_execution_progress, the universe
+        from strategy_execution_status.tickers_json and the parameters from
+        strategy_run.
+
+        Returns:
+            RunCheckpoint, or None if the run is unknown
+
+        Raises:
+            ValueError: If the run cannot be resumed (completed, still active
+                in this process, or recorded without its ticker universe)
+        """
+        if not self.db:
+            raise ValueError("Resuming runs requires a database connection")
+
+        row = self.db.execute("""
+            SELECT s.strategy_code, s.execution_status, s.tickers_json, r.params_json
+            FROM strategy_execution_status s
+            LEFT JOIN strategy_run r ON r.run_id = s.run_id
+            WHERE s.run_id = ?
+        """, (run_id,)).fetchone()
+        if not row:
+            return None
+        strategy_code, status, tickers_json, params_json = row
+
+        with self._active_runs_lock:
+            active = run_id in self._active_runs
+        if active:
+            raise ValueError(f"Run {run_id} is still active")
+        if status == 'completed':
+            raise ValueError(f"Run {run_id} already completed")
+        if not tickers_json:
+            raise ValueError(f"Run {run_id} has no recorded ticker universe and cannot be resumed")
+
+        parameters = json.loads(params_json) if params_json else {}
+        parameters.pop('run_id', None)
+        tickers = list(dict.fromkeys(t.strip().upper() for t in json.loads(tickers_json) if t and t.strip()))
+
+        checkpoint = RunCheckpoint(run_id, strategy_code, parameters, tickers)
+        for ticker, passed, sequence_number in self.db.execute("""
+            SELECT ticker, passed, sequence_number
+            FROM strategy_execution_progress
+            WHERE run_id = ?
+        """, (run_id,)).fetchall():
+            checkpoint.completed[ticker] = bool(passed)
+            checkpoint.last_sequence = max(checkpoint.last_sequence, sequence_number or 0)
+        return checkpoint
+
+    def resume_run(self, run_id: str,
+                   checkpoint: Optional[RunCheckpoint] = None) -> StrategyExecutionSummary:
+        """
+        Resume an interrupted run, evaluating only the tickers it had not finished.
+
+        Args:
+            run_id: Run to resume
+            checkpoint: Previously loaded checkpoint (loaded from the database if omitted)
+
+        Returns:
+            StrategyExecutionSummary of the resumed portion
+
+        Raises:
+            ValueError: If the run is unknown or cannot be resumed
+        """
+        checkpoint = checkpoint or self.load_checkpoint(run_id)
+        if checkpoint is None:
+            raise ValueError(f"Run '{run_id}' not found")
+        return self.execute_strategy_sync(
+            checkpoint.strategy_code, checkpoint.tickers, checkpoint.parameters,
+            run_id=run_id, checkpoint=checkpoint
+        )
+
     def execute_strategy_sync(self, strategy_code: str, tickers: List[str], 
                             parameters: Dict[str, Any], 
-                            run_id: Optional[str] = None) -> StrategyExecutionSummary:
+                            run_id: Optional[str] = None,
+                            checkpoint: Optional[RunCheckpoint] = None) -> StrategyExecutionSummary:
         """
         Execute strategy synchronously with database progress tracking.
         
@@ -236,6 +439,8 @@ class StrategyExecutionService:
             tickers: List of ticker symbols to evaluate
             parameters: Strategy parameters
             run_id: Optional run ID (generated if not provided)
+            checkpoint: Resume an existing run: only tickers not yet completed
+                are evaluated and the run record is reused
             
         Returns:
             StrategyExecutionSummary with complete results
@@ -251,8 +456,11 @@ class StrategyExecutionService:
         # Add run_id to parameters for service
         parameters = parameters.copy()
         parameters['run_id'] = run_id
+        if not parameters.get('priority'):
+            parameters['priority'] = 'high' if len(tickers) <= INTERACTIVE_TICKER_LIMIT else 'normal'
         
         start_time = time.time()
+        cancellation_token = self.register_run(run_id)
         
         try:
             # Validate strategy exists
@@ -263,18 +471,26 @@ class StrategyExecutionService:
             # Validate parameters
             if not service.validate_parameters({'tickers': tickers, **parameters}):
                 raise ValueError(f"Invalid parameters for strategy '{strategy_code}'")
-            
-            logger.info(f"Starting synchronous execution: {strategy_code} with {len(tickers)} tickers (run_id: {run_id})")
-            
-            # Create run record in database
-            if self.db:
-                self._create_run_record(run_id, strategy_code, parameters, len(tickers))
+            if parameters.get('incremental') and not service.supports_incremental:
+                raise ValueError(f"Strategy '{strategy_code}' does not support incremental evaluation")
+            
+            # Create run record in database (resumed runs keep theirs)
+            pending = tickers
+            if checkpoint is not None:
+                pending = checkpoint.remaining
+                logger.info(f"Resuming execution: {strategy_code} with {len(pending)}/{len(tickers)} tickers remaining (run_id: {run_id})")
+                if self.db:
+                    self._reopen_run_record(run_id)
+            else:
+                logger.info(f"Starting synchronous execution: {strategy_code} with {len(tickers)} tickers (run_id: {run_id})")
+                if self.db:
+                    self._create_run_record(run_id, strategy_code, parameters, tickers)
             
             # Initialize database progress tracking
             progress_tracker = None
             if self.db:
                 progress_tracker = DatabaseProgressTracker(
-                    self.db, run_id, strategy_code, len(tickers)
+                    self.db, run_id, strategy_code, len(tickers), checkpoint
                 )
             
             # Create progress callback for database updates
@@ -305,27 +521,40 @@ class StrategyExecutionService:
                         )
                         
                         logger.debug(f"Ticker progress: {ticker} - {'PASS' if passed else 'FAIL'} (Score: {score})")
+
+                    elif stage == 'evaluation_batch':
+                        # Results computed together (vectorized strategies)
+                        results = kwargs.get('results', [])
+                        processing_time_ms = int((time.time() - start_time) * 1000 / max(1, len(results)))
+                        progress_tracker.update_ticker_batch(results, processing_time_ms)
+
+                    elif stage == 'result_update':
+                        progress_tracker.update_result_metrics(kwargs.get('updates', {}))
             
             # Execute strategy with progress callback
             progress_callback = ProgressCallback(database_progress_callback)
-            result = service.execute(tickers, parameters, progress_callback)
+            result = service.execute(
+                pending, parameters, progress_callback, cancellation_token=cancellation_token
+            )
+            if checkpoint is not None:
+                result.summary_metrics["resumed_tickers"] = len(checkpoint.completed)
             
             execution_time_ms = int((time.time() - start_time) * 1000)
             
-            # Finalize database tracking
+            # Finalize database tracking ('completed' or 'cancelled')
             if progress_tracker:
                 progress_tracker.finalize_execution(
-                    status='completed',
+                    status=result.status,
                     execution_time_ms=execution_time_ms,
-                    qualifying_count=result.qualifying_count,
+                    qualifying_count=result.qualifying_count + (checkpoint.passed_count if checkpoint else 0),
                     summary_metrics=result.summary_metrics
                 )
             
             # Update strategy_run table with completion data
             if self.db:
-                self._update_run_completion(run_id, 'completed', execution_time_ms)
+                self._update_run_completion(run_id, result.status, execution_time_ms)
             
-            logger.info(f"Strategy execution completed: {strategy_code} - {result.qualifying_count}/{result.total_evaluated} passed in {execution_time_ms}ms")
+            logger.info(f"Strategy execution {result.status}: {strategy_code} - {result.qualifying_count}/{result.total_evaluated} passed in {execution_time_ms}ms")
             
             return result
             
@@ -356,8 +585,12 @@ class StrategyExecutionService:
             
             logger.error(f"Strategy execution failed: {strategy_code} - {str(e)}")
             raise
+        finally:
+            with self._active_runs_lock:
+                self._active_runs.pop(run_id, None)
+    
     def _create_run_record(self, run_id: str, strategy_code: str, 
-                          parameters: Dict[str, Any], total_count: int):
+                          parameters: Dict[str, Any], tickers: List[str]):
         """Create initial run record in both tables."""
         try:
             import json
@@ -376,7 +609,7 @@ class StrategyExecutionService:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 run_id, strategy_code, version, params_hash, params_json,
-                datetime.now().isoformat(), "api", total_count, 
+                datetime.now().isoformat(), "api", len(tickers), 
                 parameters.get("min_score", 70)
             ))
             
@@ -385,12 +618,13 @@ class StrategyExecutionService:
                 INSERT INTO strategy_execution_status 
                 (run_id, strategy_code, execution_status, total_count, 
                  processed_count, qualifying_count, current_ticker, 
-                 progress_percent, execution_started_at, last_progress_update)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 progress_percent, execution_started_at, last_progress_update,
+                 tickers_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                run_id, strategy_code, "queued", total_count, 
+                run_id, strategy_code, "queued", len(tickers), 
                 0, 0, None, 0.0, datetime.now().isoformat(), 
-                datetime.now().isoformat()
+                datetime.now().isoformat(), json.dumps(tickers)
             ))
             
             self.db.commit()
@@ -400,6 +634,26 @@ class StrategyExecutionService:
             logger.error(f"Failed to create run record for {run_id}: {e}")
             raise
     
+    def _reopen_run_record(self, run_id: str):
+        """Mark a resumed run as running again so it no longer reads as completed."""
+        try:
+            self.db.execute("""
+                UPDATE strategy_run
+                SET completed_at = NULL, exit_status = NULL, duration_ms = NULL
+                WHERE run_id = ?
+            """, (run_id,))
+            self.db.execute("""
+                UPDATE strategy_execution_status
+                SET execution_status = ?, last_progress_update = ?
+                WHERE run_id = ?
+            """, ('running', datetime.utcnow().isoformat(), run_id))
+            self.db.commit()
+            logger.info(f"Reopened run record for {run_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to reopen run record for {run_id}: {e}")
+            raise
+    
     def _update_run_completion(self, run_id: str, exit_status: str, duration_ms: int):
         """Update strategy_run table with completion information."""
         try:
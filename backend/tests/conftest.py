@@ -0,0 +1,34 @@
+"""Shared fixtures for backend tests."""
+
+import pytest
+
+from backend.api import strategies as strategies_api
+from backend.database.connection import DatabaseManager
+from db import Database
+
+
+@pytest.fixture
+def run_id(tmp_path, monkeypatch):
+    """Completed strategy run with three results in a temporary database served by the strategies API."""
+    path = str(tmp_path / "results.sqlite")
+    with Database(path) as db:
+        run_id = db.start_run("bullish_breakout", "1", {}, "test", 3, 0)
+        db.log_result(run_id, "bullish_breakout", "AAA", True, 80.0, "strong", [], {"close": 10.5, "rsi14": 61.0})
+        db.log_result(run_id, "bullish_breakout", "BBB", False, 40.0, "weak",
+                      ["low volume", "below sma50"], {"close": 3.0, "custom": "x"})
+        db.log_result(run_id, "bullish_breakout", "CCC", True, 90.0, "strong", [], {})
+        db.finalize_run(run_id)
+        db.conn.execute("INSERT INTO instruments (ticker, sector) VALUES ('AAA', 'Technology')")
+    monkeypatch.setattr(strategies_api, "get_db_manager", lambda db_path=None: DatabaseManager(db_path or path))
+    monkeypatch.setattr(strategies_api, "EXPORT_FETCH_SIZE", 2)
+    return run_id
+
+
+@pytest.fixture
+def strategy_registry(monkeypatch):
+    """Fresh process-global strategy registry, discarded after the test."""
+    from backend.services import base_strategy_service
+
+    registry = base_strategy_service.StrategyServiceRegistry()
+    monkeypatch.setattr(base_strategy_service, "_strategy_registry", registry)
+    return registry
@@ -0,0 +1,76 @@
+"""Tests for Arrow IPC / Parquet exports."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import stocks as stocks_api
+from backend.main import app
+from backend.models.schemas import PositionResponse, StrategyMetrics
+from backend.services.arrow_export import encode_records, model_schema
+from backend.services.price_bar_store import PriceBarStore
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+client = TestClient(app)
+
+
+class TestModelSchema:
+    """Test cases for schemas derived from the response models."""
+
+    def test_metric_types(self):
+        schema = model_schema(StrategyMetrics)
+        assert schema.field("rsi14").type == pa.float64()
+        assert schema.field("volume").type == pa.int64()
+        assert schema.field("sma50_above").type == pa.bool_()
+        assert schema.field("recommendation").type == pa.string()
+        assert "additional_metrics" not in schema.names
+
+    def test_bad_values_become_null(self):
+        schema = model_schema(PositionResponse)
+        data = encode_records(schema, [
+            {"account": "IRA", "ticker": "AAA", "quantity": "10", "weight": "n/a"},
+        ], "arrow")
+        table = pa.ipc.open_stream(data).read_all()
+        assert table.schema == schema
+        assert table.column("quantity").to_pylist() == [10.0]
+        assert table.column("weight").to_pylist() == [None]
+
+
+class TestColumnarEndpoints:
+    """Test cases for format=arrow/parquet on the API."""
+
+    def test_strategy_results_arrow_stream(self, run_id):
+        response = client.get(f"/api/strategies/runs/{run_id}/export?format=arrow")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("ticker").to_pylist() == ["CCC", "AAA", "BBB"]
+        assert table.schema.field("rsi14").type == pa.float64()
+        assert table.column("rsi14").to_pylist() == [None, 61.0, None]
+        assert table.column("reasons").to_pylist()[2] == ["low volume", "below sma50"]
+
+    def test_strategy_results_parquet(self, run_id):
+        response = client.get(f"/api/strategies/runs/{run_id}/export?format=parquet&passed=true")
+        table = pq.read_table(pa.BufferReader(response.content))
+        assert table.column("ticker").to_pylist() == ["CCC", "AAA"]
+        assert table.column("passed").to_pylist() == [True, True]
+
+    def test_stored_bars(self, monkeypatch):
+        store = PriceBarStore(sqlite3.connect(":memory:", check_same_thread=False))
+        index = pd.bdate_range("2024-01-01", periods=3)
+        store.save_bars("XYZ", pd.DataFrame({"open": [1.0, 2.0, 3.0], "high": 3.0, "low": 1.0,
+                                             "close": [1.5, 2.5, 3.5], "volume": 100.0}, index=index))
+        monkeypatch.setattr(stocks_api, "get_price_bar_store", lambda: store)
+
+        table = pq.read_table(pa.BufferReader(client.get("/api/stocks/xyz/bars?format=parquet").content))
+        assert table.column("close").to_pylist() == [1.5, 2.5, 3.5]
+        assert table.schema.field("date").type == pa.timestamp("us")
+
+        data = client.get("/api/stocks/XYZ/bars?start=2024-01-02").json()
+        assert data["count"] == 2
+        assert client.get("/api/stocks/XYZ/bars?format=xml").status_code == 400
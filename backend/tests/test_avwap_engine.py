@@ -0,0 +1,93 @@
+"""Tests for the anchored VWAP engine."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import leap_entry_strategy
+from backend.services.avwap_engine import AVWAPEngine, VWAPSeries
+from backend.services.price_bar_store import PriceBarStore
+
+
+def make_bars(seed, n=400):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.02, n)))
+    index = pd.date_range("2021-01-04", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.98, "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+
+
+def scan_vwap(bars, start):
+    """Reference: cumulative sums scanned from the anchor."""
+    sub = bars.iloc[start:]
+    tpv = (sub["high"] + sub["low"] + sub["close"]) / 3.0 * sub["volume"]
+    return tpv.cumsum().iloc[-1] / sub["volume"].cumsum().iloc[-1]
+
+
+class TestVWAPSeries:
+    """Test cases for VWAPSeries."""
+
+    def test_prefix_difference_matches_scan(self):
+        bars = make_bars(1)
+        bars.iloc[50, bars.columns.get_loc("volume")] = np.nan
+        series = VWAPSeries.from_bars(bars)
+        for start in (0, 49, 50, 200, 399):
+            assert series.vwap(start) == pytest.approx(scan_vwap(bars, start), rel=1e-12)
+
+    def test_extended_matches_full_build(self):
+        bars = make_bars(2)
+        revised = bars.iloc[299:].copy()
+        revised.iloc[0, revised.columns.get_loc("close")] *= 1.05
+        incremental = VWAPSeries.from_bars(bars.iloc[:300]).extended(revised)
+        full = VWAPSeries.from_bars(pd.concat([bars.iloc[:299], revised]))
+
+        assert len(incremental) == 400
+        assert incremental.dates.equals(full.dates)
+        np.testing.assert_allclose(incremental.cum_tpv, full.cum_tpv, rtol=1e-12)
+        np.testing.assert_allclose(incremental.cum_volume, full.cum_volume, rtol=1e-12)
+
+    def test_anchors(self):
+        bars = make_bars(3)
+        series = VWAPSeries.from_bars(bars)
+
+        features = leap_entry_strategy._compute_features(pd, np, bars.copy())
+        assert bars.index[series.breakout_anchor()] == features["anchor_date"]
+        assert series.vwap(series.breakout_anchor()) == pytest.approx(features["anchored_vwap"], rel=1e-12)
+
+        assert series.low_anchor() == 148 + int(np.argmin(bars["low"].to_numpy()[148:]))
+        earnings = [pd.Timestamp("2022-03-05"), pd.Timestamp("2099-01-01")]
+        assert series.dates[series.earnings_anchor(earnings)] == pd.Timestamp("2022-03-07")
+        assert series.earnings_anchor([pd.Timestamp("2099-01-01")]) is None
+
+
+class TestAVWAPEngine:
+    """Test cases for AVWAPEngine."""
+
+    def test_load_reads_only_new_bars(self):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        store = PriceBarStore(conn)
+        bars = make_bars(4)
+        store.save_bars("AAPL", bars.iloc[:300])
+        reads = []
+        get_bars = store.get_bars
+        store.get_bars = lambda *args: reads.append(args[1]) or get_bars(*args)
+        engine = AVWAPEngine(store, earnings_loader=lambda ticker: [pd.Timestamp("2022-03-05")])
+
+        engine.load("aapl", refresh=False)
+        store.save_bars("AAPL", bars.iloc[300:])
+        series = engine.load("AAPL", refresh=False)
+
+        assert reads == [None, bars.index[299].strftime("%Y-%m-%d")]
+        assert series.vwap(0) == pytest.approx(scan_vwap(bars, 0), rel=1e-9)
+
+        anchored = engine.anchored("AAPL")
+        assert anchored["earnings"]["anchor_date"] == "2022-03-07"
+        assert anchored["52w_low"]["vwap"] == pytest.approx(series.vwap(series.low_anchor()))
+        with pytest.raises(ValueError):
+            engine.anchored("AAPL", ["ipo"])
+        assert engine.anchored("MSFT", ["breakout"]) == {"breakout": None}
+        conn.close()
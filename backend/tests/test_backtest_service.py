@@ -0,0 +1,186 @@
+"""Tests for the historical backtest engine and price bar store."""
+
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import leap_entry_strategy
+from backend.services.backtest_service import BacktestConfig, BacktestService
+from backend.services.base_strategy_service import (
+    BaseStrategyService, ReplayableStrategy, StrategyResult
+)
+from backend.services.bullish_breakout_service import BullishBreakoutService
+from backend.services import price_bar_store
+from backend.services.price_bar_store import PriceBarStore
+
+
+def make_bars(seed, n=400):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.date_range("2021-01-04", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+
+
+class EveryTenthBarService(ReplayableStrategy, BaseStrategyService):
+    """Signals on every tenth bar so forward returns can be checked by hand."""
+
+    def get_strategy_code(self):
+        return "every_tenth"
+
+    def get_strategy_name(self):
+        return "Every Tenth Bar"
+
+    def validate_parameters(self, parameters):
+        return True
+
+    def execute(self, tickers, parameters, progress_callback):
+        raise NotImplementedError
+
+    def evaluate_history(self, ticker, bars, parameters, positions=None, benchmark=None):
+        return [
+            (bars.index[i], StrategyResult(ticker, i % 10 == 0, 1, "hit" if i % 10 == 0 else "miss",
+                                           [], {}, datetime.utcnow(), 0))
+            for i in positions
+        ]
+
+
+@pytest.fixture
+def bar_store():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    yield PriceBarStore(conn)
+    conn.close()
+
+
+class TestPriceBarStore:
+    """Test cases for stored bars."""
+
+    def test_round_trip_and_upsert(self, bar_store):
+        bars = make_bars(1, 30)
+        assert bar_store.save_bars("aapl", bars) == 30
+        changed = bars.iloc[-2:].copy()
+        changed["close"] = 1.0
+        bar_store.save_bars("AAPL", changed)
+
+        loaded = bar_store.get_bars("AAPL")
+        assert len(loaded) == 30
+        assert list(loaded["close"].iloc[-2:]) == [1.0, 1.0]
+        assert bar_store.get_last_date("AAPL") == bars.index[-1].strftime("%Y-%m-%d")
+        window = bar_store.get_bars("AAPL", start="2021-01-05", end="2021-01-07")
+        assert len(window) == 3
+
+    def fake_download(self, bar_store, source):
+        starts = []
+
+        def download(ticker, period, interval, start=None):
+            starts.append(start)
+            return source.loc[start:] if start else source
+
+        bar_store._download = download
+        return starts
+
+    def test_refresh_replaces_readjusted_history(self, bar_store, monkeypatch):
+        monkeypatch.setattr(price_bar_store, "_last_session_final", lambda: "9999-12-31T00:00:00Z")
+        bars = make_bars(1, 40)
+        bar_store.save_bars("AAPL", bars.iloc[:30])
+
+        starts = self.fake_download(bar_store, bars)
+        bar_store.refresh("AAPL")
+        assert starts == ["2021-02-07"]
+        assert len(bar_store.get_bars("AAPL")) == 40
+
+        split = bars.copy()
+        split[["open", "high", "low", "close"]] /= 10
+        starts = self.fake_download(bar_store, split)
+        bar_store.refresh("AAPL")
+        assert starts == ["2021-02-21", "2021-01-04"]
+        np.testing.assert_allclose(bar_store.get_bars("AAPL")["close"], split["close"])
+
+    def test_refresh_skips_unfinished_session_and_current_series(self, bar_store, monkeypatch):
+        bars = make_bars(2, 40)
+        bar_store.save_bars("AAPL", bars.iloc[:30])
+        monkeypatch.setattr(price_bar_store, "_unfinished_session_date", lambda: bars.index[-1].date())
+        monkeypatch.setattr(price_bar_store, "_last_session_final", lambda: "2000-01-01T00:00:00Z")
+        bar_store.db.execute("UPDATE price_bars SET updated_at = '1999-01-01T00:00:00Z'")
+
+        starts = self.fake_download(bar_store, bars)
+        bar_store.refresh("AAPL")
+        assert bar_store.get_last_date("AAPL") == bars.index[-2].strftime("%Y-%m-%d")
+        # Fetched after the last final session (e.g. the day after a holiday): no new download
+        assert bar_store.refresh("AAPL") == 0
+        assert len(starts) == 1
+
+
+class TestIncrementalSignals:
+    """Rolling signal state must match the per-bar implementations."""
+
+    def test_leap_feature_history_matches_last_bar_features(self):
+        bars = make_bars(7)
+        spy = make_bars(8)["close"]
+        history = dict(leap_entry_strategy._compute_feature_history(pd, np, bars.copy(), spy))
+        for date in (bars.index[250], bars.index[-1]):
+            expected = leap_entry_strategy._compute_features(pd, np, bars.loc[:date].copy(), spy)
+            actual = history[date]
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    assert actual[key] == pytest.approx(value, rel=1e-9, nan_ok=True), key
+                else:
+                    assert actual[key] == value, key
+
+    def test_leap_feature_history_anchors_inside_period(self):
+        bars = make_bars(9, 700)
+        bounded = dict(leap_entry_strategy._compute_feature_history(pd, np, bars.copy(), period="1y"))
+        unbounded = dict(leap_entry_strategy._compute_feature_history(pd, np, bars.copy()))
+        differs = False
+        for date in bars.index[[450, 550, -1]]:
+            download = bars.loc[date - pd.DateOffset(years=1):date].copy()
+            expected = leap_entry_strategy._compute_features(pd, np, download)
+            assert bounded[date]["anchor_date"] == expected["anchor_date"]
+            assert bounded[date]["anchored_vwap"] == pytest.approx(expected["anchored_vwap"], rel=1e-9)
+            assert bounded[date]["avwap_distance_pct"] == pytest.approx(expected["avwap_distance_pct"], rel=1e-9)
+            differs |= unbounded[date]["anchor_date"] != expected["anchor_date"]
+        assert differs
+
+
+class TestBacktestService:
+    """Test cases for replay and forward-return reporting."""
+
+    def test_forward_returns_and_window(self, bar_store, strategy_registry):
+        strategy_registry.register(EveryTenthBarService())
+        bars = make_bars(5, 100)
+        bar_store.save_bars("XYZ", bars)
+
+        report = BacktestService(bar_store).run_backtest(BacktestConfig(
+            strategy_code="every_tenth", tickers=["xyz", "MISSING"],
+            start_date=bars.index[20].strftime("%Y-%m-%d"), horizons=[5],
+            refresh=False, include_signals=True
+        ))
+
+        assert report.samples == 80
+        assert report.signals == 8
+        assert report.failed_tickers == {"MISSING": "no_data"}
+        close = bars["close"].to_numpy()
+        expected = [close[i + 5] / close[i] - 1 for i in range(20, 100, 10) if i + 5 < 100]
+        assert report.signal_returns["5"]["count"] == len(expected)
+        assert report.signal_returns["5"]["avg_return_percent"] == round(np.mean(expected) * 100, 2)
+        assert report.by_classification["hit"]["count"] == 8
+        assert report.signal_events[0]["date"] == bars.index[20].strftime("%Y-%m-%d")
+
+    def test_rejects_strategy_without_replay(self, bar_store, strategy_registry):
+        class ScreenOnlyService(BaseStrategyService):
+            get_strategy_code = lambda self: "screen_only"
+            get_strategy_name = lambda self: "Screen Only"
+            validate_parameters = lambda self, parameters: True
+            execute = EveryTenthBarService.execute
+
+        strategy_registry.register(ScreenOnlyService())
+        service = BacktestService(bar_store)
+        for code in ("unknown_strategy", "screen_only"):
+            with pytest.raises(ValueError):
+                service.plan_backtest(BacktestConfig(code, ["AAPL"]))
+        assert BullishBreakoutService().supports_history
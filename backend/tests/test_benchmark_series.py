@@ -0,0 +1,141 @@
+"""Tests for the shared benchmark series provider."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import leap_entry_strategy
+from backend.services import benchmark_series
+from backend.services.benchmark_series import BenchmarkProvider
+
+DATES = pd.bdate_range("2024-01-01", periods=300)
+
+
+class CountingLoader:
+    """Benchmark loader stand-in counting (slow) downloads."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, ticker, period, interval):
+        self.calls += 1
+        time.sleep(0.05)
+        return pd.Series(np.linspace(100.0, 130.0, len(DATES)), index=DATES)
+
+
+class TestBenchmarkProvider:
+    """Test cases for BenchmarkProvider."""
+
+    def test_single_download_for_concurrent_workers(self):
+        loader = CountingLoader()
+        provider = BenchmarkProvider(loader)
+        arrays = []
+        workers = [threading.Thread(target=lambda: arrays.append(provider.aligned(DATES[10:])))
+                   for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert loader.calls == 1
+        assert all(array is arrays[0] for array in arrays)
+        assert not arrays[0].flags.writeable
+        assert arrays[0][0] == pytest.approx(100.0 + 30.0 * 10 / 299)
+
+    def test_missing_dates_are_nan_and_day_rolls_over(self, monkeypatch):
+        loader = CountingLoader()
+        provider = BenchmarkProvider(loader)
+        index = DATES[:3].append(pd.DatetimeIndex(["2030-01-01"]))
+        assert np.isnan(provider.aligned(index)[-1])
+
+        monkeypatch.setattr(benchmark_series, "_cache_bucket", lambda interval: "tomorrow")
+        provider.get()
+        assert loader.calls == 2
+
+    def test_failed_load_is_retried_after_backoff(self):
+        calls = []
+        offline = [True]
+
+        def flaky(ticker, period, interval):
+            calls.append(ticker)
+            if offline[0]:
+                raise RuntimeError("offline")
+            return pd.Series(1.0, index=DATES)
+
+        provider = BenchmarkProvider(flaky)
+        assert provider.aligned(DATES) is None
+        assert provider.get() is None
+        assert list(provider.matrix(["SPY"]).columns) == []
+        assert calls == ["SPY"]
+
+        offline[0] = False
+        provider._entry("SPY", "2y", "1d").failed_at -= benchmark_series.FAILURE_RETRY_SECONDS
+        assert provider.aligned(DATES)[0] == 1.0
+        assert list(provider.matrix(["SPY"]).columns) == ["SPY"]
+        assert calls == ["SPY", "SPY"]
+
+
+class TestLeapRelativeStrength:
+    """Test cases for relative strength against the aligned benchmark array."""
+
+    def test_array_matches_series(self):
+        rng = np.random.default_rng(0)
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, len(DATES))))
+        frame = pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                              "close": close, "volume": 1e6}, index=DATES)
+        spy = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(DATES)))), index=DATES).iloc[5:]
+
+        from_series = leap_entry_strategy._add_indicator_columns(pd, frame.copy(), spy)
+        aligned = BenchmarkProvider(lambda *args: spy).aligned(DATES)
+        from_array = leap_entry_strategy._add_indicator_columns(pd, frame.copy(), aligned)
+
+        assert from_array["rs"].isna().sum() == 5
+        pd.testing.assert_series_equal(from_array["rs_ema20"], from_series["rs_ema20"])
+
+
+class TestSectorStrength:
+    """Test cases for sector ETF relative strength."""
+
+    def test_sector_mapping(self):
+        assert benchmark_series.sector_benchmark("Technology") == "XLK"
+        assert benchmark_series.sector_benchmark("Health Care") == "XLV"
+        assert benchmark_series.sector_benchmark("Unknown") is None
+        assert benchmark_series.sector_benchmark("Technology", {"Technology": "SMH"}) == "SMH"
+
+    def test_matrix_cached(self):
+        loader = CountingLoader()
+        provider = BenchmarkProvider(loader)
+        frame = provider.matrix(["xlk", "XLE"])
+        assert list(frame.columns) == ["XLE", "XLK"]
+        assert provider.matrix(["XLE", "XLK"]) is frame
+        assert loader.calls == 2
+
+    def test_grouped_matches_per_ticker(self, monkeypatch):
+        from backend.services.base_strategy_service import ProgressCallback
+        from backend.services.leap_entry_service import LeapEntryConfig, LeapEntryService, LeapTickerEvaluation
+
+        rng = np.random.default_rng(1)
+        etf = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(DATES)))), index=DATES)
+        closes = {t: pd.Series(50 * np.exp(np.cumsum(rng.normal(0, 0.01, len(DATES)))), index=DATES)
+                  for t in ("AAA", "BBB", "CCC")}
+        monkeypatch.setattr(benchmark_series, "get_benchmark_provider",
+                            lambda: BenchmarkProvider(lambda *args: etf))
+        monkeypatch.setattr(benchmark_series, "load_ticker_sectors",
+                            lambda tickers: {"AAA": "Technology", "BBB": "Technology", "CCC": "Unknown"})
+
+        results = [LeapTickerEvaluation(t, False, 0, "reject", [], {}, closes=c) for t, c in closes.items()]
+        updates = []
+        LeapEntryService()._apply_sector_strength(
+            results, LeapEntryConfig(), ProgressCallback(lambda **kw: updates.append(kw["updates"])))
+
+        aaa = leap_entry_strategy._add_indicator_columns(
+            pd, pd.DataFrame({"close": closes["AAA"], "high": closes["AAA"], "low": closes["AAA"]}), etf)
+        assert results[0].metrics["sector_etf"] == "XLK"
+        assert results[0].metrics["sector_rs"] == round(aaa["rs"].iloc[-1], 4)
+        assert results[0].metrics["sector_rs_ok"] == bool(aaa["rs_ema10"].iloc[-1] > aaa["rs_ema20"].iloc[-1])
+        assert "sector_etf" not in results[2].metrics
+        assert sorted(updates[0]) == ["AAA", "BBB"]
+        assert all(r.closes is None for r in results)
@@ -0,0 +1,105 @@
+"""Tests for running blocking routes on the sized thread pool."""
+
+import asyncio
+import threading
+import time
+
+from fastapi import APIRouter, FastAPI, Query
+from fastapi.testclient import TestClient
+
+from backend.api.blocking import blocking_route, run_blocking
+from backend.database.connection import ThreadLocalDatabaseManager
+
+
+def make_app(release: threading.Event):
+    router = APIRouter()
+
+    @router.get("/slow")
+    @blocking_route(timeout=5)
+    def slow():
+        release.wait(5)
+        return {"route": "slow"}
+
+    @router.get("/fast")
+    @blocking_route()
+    def fast(limit: int = Query(10, ge=1)):
+        return {"route": "fast", "limit": limit}
+
+    @router.get("/stuck")
+    @blocking_route(timeout=0.05)
+    def stuck():
+        time.sleep(0.5)
+        return {"route": "stuck"}
+
+    demo = FastAPI()
+    demo.include_router(router)
+    return demo
+
+
+class TestBlockingRoutes:
+    """Test cases for blocking_route and run_blocking."""
+
+    def test_signature_is_preserved(self):
+        demo = TestClient(make_app(threading.Event()))
+        assert demo.get("/fast", params={"limit": 3}).json() == {"route": "fast", "limit": 3}
+        assert demo.get("/fast", params={"limit": 0}).status_code == 422
+
+    def test_timeout_returns_504(self):
+        demo = TestClient(make_app(threading.Event()))
+        response = demo.get("/stuck")
+        assert response.status_code == 504
+        assert "timed out" in response.json()["detail"]
+
+    def test_fast_route_not_blocked_by_slow_route(self):
+        release = threading.Event()
+        demo = make_app(release)
+
+        async def scenario():
+            import httpx
+
+            transport = httpx.ASGITransport(app=demo)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                slow = asyncio.create_task(client.get("/slow"))
+                await asyncio.sleep(0.05)
+                fast = await asyncio.wait_for(client.get("/fast"), timeout=2)
+                assert not slow.done()
+                release.set()
+                return fast, await slow
+
+        fast, slow = asyncio.run(scenario())
+        assert fast.json()["route"] == "fast"
+        assert slow.json()["route"] == "slow"
+
+    def test_run_blocking_propagates_errors(self):
+        def fail():
+            raise ValueError("bad input")
+
+        async def scenario():
+            try:
+                await run_blocking(fail)
+            except ValueError as e:
+                return str(e)
+
+        assert asyncio.run(scenario()) == "bad input"
+
+
+class TestThreadLocalDatabaseManager:
+    """Test cases for ThreadLocalDatabaseManager."""
+
+    def test_connection_per_thread(self, tmp_path):
+        manager = ThreadLocalDatabaseManager(str(tmp_path / "routes.sqlite"))
+        main = manager.get_connection()
+        assert manager.get_connection() is main
+
+        others = []
+        worker = threading.Thread(target=lambda: others.append(manager.get_connection()))
+        worker.start()
+        worker.join()
+        assert others[0] is not main
+
+        manager.execute_query("CREATE TABLE t (x INTEGER)")
+        manager.execute_query("INSERT INTO t VALUES (1)")
+        manager.commit()
+        assert manager.execute_one("SELECT x FROM t")[0] == 1
+        manager.close()
+        assert manager.get_connection() is not main
@@ -0,0 +1,78 @@
+"""Tests for the vectorized Buffett screen metrics."""
+
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from backend.services.buffett_metrics import METRIC_COLUMNS, compute_metrics
+from backend.services.fundamentals_store import FundamentalsStore
+
+ANNUAL = pd.to_datetime(["2018-12-31", "2019-12-31", "2020-12-31", "2021-12-31", "2022-12-31", "2023-12-31"])
+QUARTERS = pd.to_datetime(["2023-06-30", "2023-09-30", "2023-12-31", "2024-03-31"])
+
+
+def frame(rows, periods):
+    return pd.DataFrame(rows, index=periods).T
+
+
+@pytest.fixture
+def store():
+    store = FundamentalsStore(sqlite3.connect(":memory:", check_same_thread=False))
+    store.save_statement("AAA", "income_stmt", frame({
+        "Total Revenue": [100.0, 110.0, 120.0, 130.0, 140.0, 161.051],
+        "Gross Profit": [50.0] * 5 + [80.5255],
+    }, ANNUAL))
+    store.save_statement("AAA", "balance_sheet", frame({
+        "Stockholders Equity": [200.0] * 6, "Total Debt": [50.0] * 6,
+        "Current Assets": [300.0] * 6, "Current Liabilities": [150.0] * 6,
+    }, ANNUAL))
+    store.save_statement("AAA", "cashflow", frame({
+        "Operating Cash Flow": [30.0, 30.0, 5.0, 30.0, 30.0, 30.0],
+        "Capital Expenditure": [-10.0] * 6,
+    }, ANNUAL))
+    store.save_statement("AAA", "quarterly_income_stmt", frame({
+        "Total Revenue": [40.0] * 4, "Net Income": [5.0] * 4, "EBIT": [10.0] * 4, "Interest Expense": [-1.0] * 4,
+    }, QUARTERS))
+    store.save_statement("AAA", "quarterly_balance_sheet", frame({"Stockholders Equity": [100.0, 100.0, 100.0, 100.0]}, QUARTERS))
+    store.save_statement("AAA", "quarterly_cashflow", frame({
+        "Operating Cash Flow": [10.0] * 4, "Capital Expenditure": [-5.0] * 4,
+    }, QUARTERS))
+    store.save_dividends("AAA", pd.Series([1.0, 1.0, 1.0], index=pd.to_datetime(["2010-05-01", "2023-11-01", "2024-02-01"])))
+    store.save_info("AAA", {"currentPrice": 50.0, "marketCap": 400.0, "totalDebt": 60.0, "totalCash": 20.0,
+                            "trailingPE": None, "forwardPE": 12.0, "shortName": "Aaa Corp", "sector": "Tech"})
+    return store
+
+
+class TestComputeMetrics:
+    """Test cases for compute_metrics."""
+
+    def test_metrics(self, store):
+        df = compute_metrics(store, ["aaa", "ZZZ"], errors={"ZZZ": "timeout"}, as_of=datetime(2024, 4, 15))
+        assert list(df.columns) == METRIC_COLUMNS
+        row = df.iloc[0]
+        assert row["symbol"] == "AAA" and row["company_name"] == "Aaa Corp"
+        assert row["rev_5y_cagr_pct"] == pytest.approx(10.0)
+        assert row["net_margin_pct"] == pytest.approx(12.5)
+        assert row["roe_pct"] == pytest.approx(20.0)
+        assert row["fcf_pos_years_5"] == 4
+        assert row["gross_margin_pct"] == pytest.approx(50.0)
+        assert row["de_ratio"] == pytest.approx(0.3)  # info totalDebt preferred over the balance sheet
+        assert row["current_ratio"] == pytest.approx(2.0)
+        assert row["interest_coverage"] == pytest.approx(10.0)
+        assert row["pe"] == 12.0
+        assert row["ev_ebit"] == pytest.approx(440.0 / 40.0)
+        assert row["div_yield_pct"] == pytest.approx(4.0)
+        assert row["div_growth_years"] == 7  # 14-year span halved: the history has a long gap
+        assert row["fcf_ttm"] == 20.0
+        assert row["fcf_yield_pct"] == pytest.approx(5.0)
+        assert row["debt_to_fcf"] == pytest.approx(2.0)
+        assert pd.isna(row["error"])
+        assert df.iloc[1]["error"] == "timeout"
+
+    def test_missing_fundamentals(self, store):
+        row = compute_metrics(store, ["NOPE"]).iloc[0]
+        assert row["error"] == "No fundamentals available"
+        assert row["fcf_pos_years_5"] == 0
+        assert pd.isna(row["roe_pct"])
@@ -0,0 +1,83 @@
+"""Tests for the vectorized Buffett screen rule engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import strategy_execution_simplified as execution_api
+from backend.main import app
+from backend.services.buffett_rules import SCREEN_RULES, ScreenerConfig, evaluate
+
+client = TestClient(app)
+
+GOOD = {
+    "rev_5y_cagr_pct": 8.0, "net_margin_pct": 20.0, "roe_pct": 25.0, "fcf_pos_years_5": 5,
+    "gross_margin_pct": 50.0, "de_ratio": 0.2, "current_ratio": 2.0, "interest_coverage": 20.0,
+    "debt_to_fcf": 1.0, "pe": 15.0, "peg": 1.0, "pb": 2.0, "ev_ebit": 10.0, "div_yield_pct": 3.0,
+    "fcf_yield_pct": 6.0, "beta": 0.8, "div_growth_years": 20, "pe_discount_pct_vs_5y_median": np.nan,
+}
+
+
+def metrics_frame():
+    rows = [
+        dict(GOOD, symbol="PASS"),
+        dict(GOOD, symbol="ROE", roe_pct=10.0, pb=5.0),
+        dict(GOOD, symbol="NOPE", rev_5y_cagr_pct=np.nan),
+        dict(GOOD, symbol="PEG", peg=3.0, div_yield_pct=np.nan, beta=np.nan),
+    ]
+    return pd.DataFrame(rows)
+
+
+def rule_index(label):
+    return next(i for i, rule in enumerate(SCREEN_RULES) if rule.label == label)
+
+
+class TestEvaluate:
+    """Test cases for evaluate."""
+
+    def test_pass_fail_and_attribution(self):
+        result = evaluate(metrics_frame())
+        assert result.passed.tolist() == [True, False, False, False]
+
+        roe_bits = int(result.failure_bits[1])
+        assert result.failed_rules(roe_bits) == ["ROE", "P/B"]
+        assert result.first_failure[1] == rule_index("ROE")
+        assert result.why_failed[1] == "ROE: ROE<15.0% (got 10.0)"
+
+        # Missing required metric fails; missing optional metrics pass
+        assert result.why_failed[2].startswith("Revenue CAGR")
+        assert result.failed_rules(int(result.failure_bits[3])) == ["PEG"]
+        assert result.first_failure[0] == -1 and result.why_failed[0] is None
+        assert result.failure_counts()["ROE"] == 1
+
+    def test_thresholds_change_outcome(self):
+        cfg = ScreenerConfig.from_overrides({"min_roe": 8, "max_pb": 6, "use_peg_as_hint": False})
+        assert evaluate(metrics_frame(), cfg).passed.tolist() == [True, True, False, True]
+
+    def test_invalid_overrides(self):
+        with pytest.raises(ValueError):
+            ScreenerConfig.from_overrides({"min_moat": 1})
+        with pytest.raises(ValueError):
+            ScreenerConfig.from_overrides({"min_roe": "high"})
+        assert ScreenerConfig.from_overrides({"min_fcf_positive_years": 4.0}).min_fcf_positive_years == 4
+
+
+class TestScreenEndpoint:
+    """Test cases for POST /strategies/buffett/screen."""
+
+    def test_rescreen(self, monkeypatch):
+        monkeypatch.setattr(execution_api, "get_stored_metrics", metrics_frame)
+        response = client.post("/api/strategies/buffett/screen",
+                               json={"thresholds": {"min_roe": 8, "max_pb": 6}, "include_failed": True})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["passed_count"] == 2
+        assert [s["symbol"] for s in data["survivors"]] == ["PASS", "ROE"]
+        assert data["survivors"][0]["pe_discount_pct_vs_5y_median"] is None
+        assert {f["symbol"]: f["failed_rules"] for f in data["failed"]} == {"NOPE": ["Revenue CAGR"], "PEG": ["PEG"]}
+
+    def test_unknown_threshold(self, monkeypatch):
+        monkeypatch.setattr(execution_api, "get_stored_metrics", metrics_frame)
+        response = client.post("/api/strategies/buffett/screen", json={"thresholds": {"min_moat": 1}})
+        assert response.status_code == 400
@@ -0,0 +1,118 @@
+"""Tests for the Buffett fundamentals strategy service."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.database.connection import initialize_execution_tables
+from backend.services import buffett_metrics
+from backend.services.base_strategy_service import CancellationToken, ProgressCallback
+from backend.services.buffett_service import BuffettService
+from backend.services.strategy_execution_service import DatabaseProgressTracker, StrategyExecutionService
+from backend.tests.test_buffett_rules import GOOD
+
+
+class FakeStore:
+    """Fundamentals store stand-in recording refreshes."""
+
+    def __init__(self):
+        self.refreshed = []
+
+    def refresh(self, ticker, force=False):
+        self.refreshed.append((ticker, force))
+        if ticker == "BAD":
+            raise RuntimeError("timeout")
+        return {"statements": False, "info": False}
+
+
+def fake_compute(store, symbols, errors=None, as_of=None):
+    rows = {
+        "PASS": dict(GOOD, fcf_yield_pct=6.0),
+        "BEST": dict(GOOD, fcf_yield_pct=9.0),
+        "ROE": dict(GOOD, roe_pct=10.0),
+        "BAD": dict(GOOD, rev_5y_cagr_pct=np.nan),
+    }
+    frame = pd.DataFrame([dict(rows[s], symbol=s) for s in symbols])
+    frame["error"] = [(errors or {}).get(s) for s in symbols]
+    return frame
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(buffett_metrics, "compute_metrics", fake_compute)
+    return BuffettService(FakeStore())
+
+
+class TestBuffettService:
+    """Test cases for BuffettService.execute."""
+
+    def test_fetch_then_batch_results(self, service):
+        events = []
+        summary = service.execute(["pass", "BEST", "ROE", "BAD", "PASS"],
+                                  {"force_refresh": True, "thresholds": {"min_fcf_yield_pct": 5}},
+                                  ProgressCallback(lambda **kw: events.append(kw)))
+
+        assert sorted(service.store.refreshed) == [("BAD", True), ("BEST", True), ("PASS", True), ("ROE", True)]
+        assert summary.status == "completed"
+        assert summary.total_evaluated == 4
+        assert [r.ticker for r in summary.qualifying_stocks] == ["BEST", "PASS"]
+        assert summary.summary_metrics["fetch_errors"] == 1
+        assert summary.summary_metrics["failure_counts"]["ROE"] == 1
+
+        batches = [e["results"] for e in events if e["stage"] == "evaluation_batch"]
+        assert len(batches) == 1
+        results = {r["ticker"]: r for r in batches[0]}
+        assert results["ROE"]["classification"] == "rejected"
+        assert results["ROE"]["reasons"] == ["ROE"]
+        assert results["BAD"]["classification"] == "error"
+        assert results["BAD"]["metrics"]["error"] == "timeout"
+        assert results["PASS"]["score"] == 100.0
+        assert results["PASS"]["metrics"]["pe_discount_pct_vs_5y_median"] is None
+
+    def test_cancelled_run_scores_fetched_tickers(self, service):
+        token = CancellationToken()
+        original = service.store.refresh
+
+        def refresh_then_cancel(ticker, force=False):
+            original(ticker, force)
+            token.cancel()
+
+        service.store.refresh = refresh_then_cancel
+        summary = service.execute(["PASS", "BEST", "ROE"], {"max_workers": 1}, ProgressCallback(),
+                                  cancellation_token=token)
+        assert summary.status == "cancelled"
+        assert summary.total_evaluated == 1
+        assert summary.summary_metrics["skipped_tickers"] == 2
+
+    def test_invalid_thresholds(self, service):
+        assert service.validate_parameters({"tickers": ["KO"], "thresholds": {"min_roe": 12}})
+        assert not service.validate_parameters({"tickers": ["KO"], "thresholds": {"min_moat": 1}})
+
+    def test_registered(self):
+        assert StrategyExecutionService(None).registry.is_registered("buffett")
+
+
+class TestDatabaseProgressTrackerBatch:
+    """Test cases for batched result persistence."""
+
+    def test_update_ticker_batch(self):
+        db = sqlite3.connect(":memory:")
+        initialize_execution_tables(db)
+        db.execute("""CREATE TABLE strategy_result (run_id TEXT, strategy_code TEXT, ticker TEXT, passed INTEGER,
+                      score REAL, classification TEXT, reasons TEXT, metrics_json TEXT, created_at TEXT,
+                      PRIMARY KEY (run_id, ticker))""")
+        db.execute("INSERT INTO strategy_execution_status (run_id, strategy_code) VALUES ('r1', 'buffett')")
+        tracker = DatabaseProgressTracker(db, "r1", "buffett", 2)
+
+        tracker.update_ticker_batch([
+            {"ticker": "KO", "passed": True, "score": 100.0, "classification": "qualified",
+             "sequence_number": 1, "reasons": [], "metrics": {"pe": 18.0}},
+            {"ticker": "XOM", "passed": False, "score": 80.0, "classification": "rejected",
+             "sequence_number": 2, "reasons": ["P/E", "Beta"], "metrics": {"pe": None}},
+        ])
+
+        assert db.execute("SELECT processed_count, progress_percent FROM strategy_execution_status").fetchone() == (2, 100.0)
+        rows = db.execute("SELECT ticker, reasons, metrics_json FROM strategy_result ORDER BY ticker").fetchall()
+        assert rows == [("KO", "", '{"pe":18.0}'), ("XOM", "P/E;Beta", '{"pe":null}')]
@@ -0,0 +1,85 @@
+"""Tests for cooperative cancellation and early stop of strategy runs."""
+
+import pytest
+
+from backend.services.base_strategy_service import CancellationToken, ProgressCallback
+from backend.services.bullish_breakout_service import BullishBreakoutService, TickerEvaluation
+from backend.services.strategy_execution_service import StrategyExecutionService
+
+
+TICKERS = [f"T{i:02d}" for i in range(40)]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Bullish service whose tickers all pass with a score equal to their index."""
+    service = BullishBreakoutService()
+    evaluated = []
+
+    def fake_evaluate(ticker, config):
+        evaluated.append(ticker)
+        return TickerEvaluation(ticker, True, [], {"score": int(ticker[1:])})
+
+    monkeypatch.setattr(service, "_evaluate_single_ticker", fake_evaluate)
+    service.evaluated = evaluated
+    return service
+
+
+class TestCancellationToken:
+    """Test cases for the token itself."""
+
+    def test_callbacks_run_once(self):
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append("early"))
+        assert token.cancel("stop")
+        assert not token.cancel("again")
+        token.add_callback(lambda: calls.append("late"))
+        assert calls == ["early", "late"]
+        assert token.reason == "stop"
+
+
+class TestEarlyStop:
+    """Test cases for max_results / top_n and user cancellation."""
+
+    def test_max_results_stops_scheduling(self, service):
+        summary = service.execute(TICKERS, {"max_workers": 1, "lookup_names": False, "top_n": 3},
+                                  ProgressCallback())
+        assert summary.status == "completed"
+        assert summary.qualifying_count == 3
+        assert len(service.evaluated) < len(TICKERS)
+        assert summary.summary_metrics["early_stop"] == "max_results_reached"
+        assert summary.summary_metrics["skipped_tickers"] == len(TICKERS) - summary.total_evaluated
+
+    def test_user_cancel_keeps_partial_results(self, service):
+        token = CancellationToken()
+
+        def on_progress(**kwargs):
+            if kwargs.get("stage") == "evaluation" and kwargs["sequence_number"] == 5:
+                token.cancel()
+
+        summary = service.execute(TICKERS, {"max_workers": 1, "lookup_names": False},
+                                  ProgressCallback(on_progress), cancellation_token=token)
+        assert summary.status == "cancelled"
+        assert summary.total_evaluated == 5
+        assert summary.summary_metrics["skipped_tickers"] == len(TICKERS) - 5
+
+
+class TestStrategyExecutionServiceCancel:
+    """Test cases for run registration and cancellation."""
+
+    def test_cancel_before_start(self):
+        execution_service = StrategyExecutionService(None)
+        assert not execution_service.cancel_run("unknown")
+
+        execution_service.register_run("run-1")
+        assert execution_service.cancel_run("run-1")
+        assert not execution_service.cancel_run("run-1")
+
+        summary = execution_service.execute_strategy_sync(
+            "bullish_breakout", ["AAPL", "MSFT"], {"lookup_names": False}, run_id="run-1"
+        )
+        assert summary.status == "cancelled"
+        assert summary.total_evaluated == 0
+        # The finished run is no longer cancellable
+        assert not execution_service.cancel_run("run-1")
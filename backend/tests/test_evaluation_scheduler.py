@@ -0,0 +1,91 @@
+"""Tests for the shared weighted-fair evaluation scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from backend.services.evaluation_scheduler import EvaluationScheduler, normalize_priority
+
+
+def blocked_scheduler(max_workers=1, reserved_workers=0):
+    """Scheduler whose workers are all held by a gate task until released.
+
+    The gate run is high priority so it may occupy the reserved workers too.
+    """
+    scheduler = EvaluationScheduler(max_workers=max_workers, reserved_workers=reserved_workers)
+    gate = threading.Event()
+    started = threading.Barrier(max_workers + 1, timeout=5)
+
+    def hold(_):
+        started.wait()
+        gate.wait(timeout=10)
+
+    scheduler.submit(hold, range(max_workers), "high")
+    started.wait()
+    return scheduler, gate
+
+
+class TestEvaluationScheduler:
+    """Test cases for fair ordering and interactive latency."""
+
+    def test_weighted_fair_order(self):
+        scheduler, gate = blocked_scheduler()
+        order = []
+        low = scheduler.submit(lambda i: order.append(f"low{i}"), range(4), "low")
+        high = scheduler.submit(lambda i: order.append(f"high{i}"), range(4), "high")
+        gate.set()
+        for future in low + high:
+            future.result(timeout=5)
+        # High tags advance by 1/8 per task and low tags by 1, so the later
+        # high run is served entirely before the earlier low run
+        assert order == ["high0", "high1", "high2", "high3", "low0", "low1", "low2", "low3"]
+
+    def test_high_priority_uses_reserved_worker(self):
+        scheduler = EvaluationScheduler(max_workers=2, reserved_workers=1)
+        gate = threading.Event()
+        started = threading.Event()
+
+        def hold(_):
+            started.set()
+            gate.wait(timeout=10)
+
+        # The only background slot is busy; a single high-priority ticker still runs now
+        scheduler.submit(hold, [0], "low")
+        assert started.wait(timeout=5)
+        start = time.time()
+        [future] = scheduler.submit(lambda item: item * 2, [21], "high")
+        assert future.result(timeout=1) == 42
+        assert time.time() - start < 0.5
+        normal = scheduler.submit(lambda item: item, [1], "normal")
+        time.sleep(0.05)
+        assert not normal[0].done()
+        gate.set()
+        assert normal[0].result(timeout=5) == 1
+
+    def test_map_preserves_order_and_limits_concurrency(self):
+        scheduler = EvaluationScheduler(max_workers=4)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(item):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return item
+
+        assert list(scheduler.map(work, range(12), "normal", max_concurrency=2)) == list(range(12))
+        assert peak[0] <= 2
+
+    def test_exceptions_propagate(self):
+        scheduler = EvaluationScheduler(max_workers=2)
+
+        def fail(item):
+            raise ValueError(item)
+
+        with pytest.raises(ValueError):
+            list(scheduler.map(fail, [1]))
+        assert normalize_priority("URGENT") == "normal"
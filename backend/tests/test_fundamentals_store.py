@@ -0,0 +1,111 @@
+"""Tests for the fundamentals cache and its filing-based staleness policy."""
+
+import sqlite3
+import sys
+import types
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from backend.services.fundamentals_store import FundamentalsStore
+
+QUARTERS = [pd.Timestamp("2024-03-31"), pd.Timestamp("2024-06-30")]
+
+
+def statement(items, periods=QUARTERS):
+    return pd.DataFrame({p: {k: v * (i + 1) for k, v in items.items()} for i, p in enumerate(periods)})
+
+
+class FakeTicker:
+    """yfinance.Ticker stand-in counting downloads."""
+    calls = 0
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        FakeTicker.calls += 1
+        frame = statement({"Total Revenue": 100.0, "Net Income": 10.0})
+        self.balance_sheet = self.income_stmt = self.cashflow = frame
+        self.quarterly_balance_sheet = self.quarterly_income_stmt = self.quarterly_cashflow = frame
+        self.dividends = pd.Series([0.5, 0.5], index=pd.DatetimeIndex(["2024-02-01", "2024-05-01"], tz="UTC"))
+        self.fast_info = {"last_price": 42.0}
+
+    def get_info(self):
+        return {"trailingPE": 15.0, "sector": "Tech"}
+
+
+class FailingTicker(FakeTicker):
+    """Ticker whose statement downloads fail (all of them, or only the listed ones)."""
+    failing = None
+
+    def __getattribute__(self, name):
+        failing = FailingTicker.failing
+        if name.endswith(("balance_sheet", "income_stmt", "cashflow")) and (failing is None or name in failing):
+            raise ConnectionError(f"{name} unavailable")
+        return super().__getattribute__(name)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(Ticker=FakeTicker))
+    FakeTicker.calls = 0
+    return FundamentalsStore(sqlite3.connect(":memory:", check_same_thread=False))
+
+
+class TestFundamentalsStore:
+    """Test cases for FundamentalsStore."""
+
+    def test_round_trip(self, store):
+        store.save_statement("aaa", "quarterly_income_stmt", statement({"Total Revenue": 100.0, "EBIT": float("nan")}))
+        frame = store.get_statement("AAA", "quarterly_income_stmt")
+        assert list(frame.columns) == sorted(QUARTERS, reverse=True)
+        assert frame.loc["Total Revenue", QUARTERS[1]] == 200.0
+        assert "EBIT" not in frame.index
+        assert store.last_reported_period("AAA") == "2024-06-30"
+        assert store.get_statement("AAA", "cashflow") is None
+
+    def test_load_downloads_then_reads_locally(self, store):
+        first = store.load("AAA")
+        assert FakeTicker.calls == 1
+        assert first.info["currentPrice"] == 42.0
+        assert first.statement("income_stmt").loc["Net Income", QUARTERS[0]] == 10.0
+        assert first.dividends.sum() == 1.0
+
+        second = store.load("AAA")
+        assert FakeTicker.calls == 1
+        assert second.info == first.info
+
+    def test_statements_refetched_once_filing_is_due(self, store):
+        store.refresh("AAA")
+        # Next filing: 2024-06-30 + 91 + 45 days = 2024-11-13
+        assert store.next_filing_due("AAA") == "2024-11-13"
+        assert not store.statements_stale("AAA", now=datetime(2024, 10, 1))
+        store.db.execute("UPDATE fundamentals SET updated_at = '2024-10-01T00:00:00Z'")
+        assert store.statements_stale("AAA", now=datetime(2024, 11, 20))
+        # Filing overdue but checked recently: wait recheck_days before trying again
+        store.db.execute("UPDATE fundamentals SET updated_at = '2024-11-18T00:00:00Z'")
+        assert not store.statements_stale("AAA", now=datetime(2024, 11, 20))
+
+    def test_info_expires_by_age(self, store):
+        store.refresh("AAA")
+        assert not store.info_stale("AAA")
+        store.db.execute("UPDATE fundamentals SET updated_at = '2020-01-01T00:00:00Z' WHERE statement = 'info'")
+        assert store.info_stale("AAA")
+        assert store.refresh("AAA") == {"statements": False, "info": True}
+
+    def test_failed_statements_are_rechecked(self, store, monkeypatch):
+        monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(Ticker=FailingTicker))
+        FailingTicker.failing = None
+        with pytest.raises(RuntimeError):
+            store.refresh("AAA")
+        assert store.statements_stale("AAA")
+        assert store.load("AAA").info["trailingPE"] == 15.0
+
+        FailingTicker.failing = ("quarterly_cashflow",)
+        store.refresh("AAA")
+        assert store.get_statement("AAA", "quarterly_income_stmt") is not None
+        assert store.statements_stale("AAA")
+
+        FailingTicker.failing = ()
+        store.refresh("AAA")
+        assert not store.statements_stale("AAA")
@@ -0,0 +1,129 @@
+"""Tests for the streaming holdings CSV import."""
+
+import pytest
+
+from backend.database.connection import DatabaseManager
+from backend.services import holdings_service as holdings_module
+from backend.services.holdings_service import HoldingsService
+from backend.services.market_data_service import MarketDataService
+from db import Database
+
+HEADER = "Account Number,Account Name,Symbol,Description,Quantity,Current Value,Cost Basis Total,Type\n"
+
+
+@pytest.fixture
+def service(tmp_path):
+    path = str(tmp_path / "holdings.sqlite")
+    with Database(path) as db:
+        db.conn.execute("INSERT INTO holdings (account, ticker, quantity) VALUES ('X1', 'OLD', 1)")
+        db.conn.execute("INSERT INTO holdings (account, ticker, quantity) VALUES ('KEEP', 'IBM', 3)")
+    service = HoldingsService(DatabaseManager(path), MarketDataService())
+    yield service
+    service.db_manager.close()
+
+
+def holdings(service):
+    rows = service.db_manager.execute_query("SELECT account, ticker, quantity, cost_basis FROM holdings ORDER BY account, ticker")
+    return [tuple(r) for r in rows]
+
+
+class TestStreamingImport:
+    """Test cases for single-pass, batched CSV import."""
+
+    def test_streams_lines_in_batches(self, service, monkeypatch):
+        monkeypatch.setattr(holdings_module, "IMPORT_BATCH_SIZE", 2)
+        lines = iter([
+            HEADER,
+            "X1,Brokerage,AAPL,Apple,10,\"1,500.00\",$1000.00,Margin\n",
+            "X1,Brokerage,SPAXX**,Money market,5,5,,Cash\n",
+            "X1,Brokerage,-AAPL250620C200,Call,1,10,5,Margin\n",
+            "X2,IRA,MSFT,Microsoft,4,1600,1200,Cash Account\n",
+            "X2,IRA,BAD,Bad row,abc,1,1,Margin\n",
+            "X2,IRA,KO,Coca-Cola,20,1200,,Margin\n",
+            "\"The data and information in this spreadsheet is provided to you solely for your use\"\n",
+        ])
+
+        result = service.import_holdings_from_csv(lines)
+
+        summary = result.import_summary
+        assert summary.import_successful
+        assert (summary.total_records_imported, summary.total_records_skipped, summary.total_records_failed) == (3, 3, 1)
+        assert summary.total_existing_holdings_deleted == 1
+        assert [a.account_number for a in result.detected_accounts] == ["X1", "X2"]
+        assert result.detected_accounts[1].sample_tickers == ["MSFT", "BAD", "KO"]
+        assert result.errors[0].startswith("Row 6: Invalid numeric data")
+        assert holdings(service) == [
+            ("KEEP", "IBM", 3.0, None),
+            ("X1", "AAPL", 10.0, 1000.0),
+            ("X2", "KO", 20.0, None),
+            ("X2", "MSFT", 4.0, 1200.0),
+        ]
+        instruments = [r[0] for r in service.db_manager.execute_query("SELECT ticker FROM instruments ORDER BY ticker")]
+        assert instruments == ["AAPL", "KO", "MSFT"]
+
+    def test_records_capped(self, service, monkeypatch):
+        monkeypatch.setattr(holdings_module, "MAX_REPORTED_RECORDS", 2)
+        rows = "".join(f"X1,Brokerage,T{i},Stock,1,1,1,Margin\n" for i in range(5))
+        result = service.import_holdings_from_csv(HEADER + rows)
+        assert result.import_summary.total_records_imported == 5
+        assert len(result.imported_records) == 2
+        assert any("omitted for 3 records" in w for w in result.warnings)
+
+    def test_no_accounts_rolls_back(self, service):
+        result = service.import_holdings_from_csv(HEADER + ",,,,,,,\n")
+        assert not result.import_summary.import_successful
+        assert "No valid account data" in result.errors[0]
+        assert len(holdings(service)) == 2
+
+    def test_missing_headers(self, service):
+        result = service.import_holdings_from_csv("Symbol,Quantity\nAAPL,1\n")
+        assert "Missing required CSV headers" in result.errors[0]
+
+
+class TestReconcileImport:
+    """Test cases for diff-based reconciliation."""
+
+    def test_applies_only_needed_changes(self, service):
+        service.db_manager.execute_query(
+            "UPDATE holdings SET opened_at = '2020-01-01' WHERE ticker = 'OLD'")
+        service.db_manager.execute_query(
+            "INSERT INTO holdings (account, ticker, quantity, cost_basis, opened_at) VALUES ('X1', 'AAPL', 10, 1000, '2019-05-01')")
+        service.db_manager.execute_query(
+            "INSERT INTO holdings (account, ticker, quantity, cost_basis, opened_at) VALUES ('X1', 'MSFT', 2, 500, '2018-01-01')")
+        service.db_manager.commit()
+
+        csv_text = HEADER + (
+            "X1,Brokerage,AAPL,Apple,10,1500,1000,Margin\n"
+            "X1,Brokerage,MSFT,Microsoft,3,1200,800,Margin\n"
+            "X1,Brokerage,KO,Coca-Cola,20,1200,1000,Margin\n"
+        )
+        result = service.import_holdings_from_csv(csv_text, reconcile=True)
+
+        summary = result.reconciliation
+        assert (summary.inserted, summary.updated, summary.closed, summary.unchanged) == (1, 1, 1, 1)
+        assert summary.affected_tickers == ["KO", "MSFT", "OLD"]
+        assert result.import_summary.total_existing_holdings_deleted == 0
+
+        rows = {r[0]: tuple(r)[1:] for r in service.db_manager.execute_query(
+            "SELECT ticker, quantity, cost_basis, opened_at FROM holdings WHERE account = 'X1'")}
+        assert rows["AAPL"] == (10.0, 1000.0, "2019-05-01")
+        # Updated lot keeps its opened_at; the missing lot is closed, not deleted
+        assert rows["MSFT"] == (3.0, 800.0, "2018-01-01")
+        assert rows["OLD"] == (0.0, None, "2020-01-01")
+        assert rows["KO"][0] == 20.0
+
+        # Re-importing the same file changes nothing
+        again = service.import_holdings_from_csv(csv_text, reconcile=True).reconciliation
+        assert (again.inserted, again.updated, again.closed, again.unchanged) == (0, 0, 0, 3)
+
+    def test_partial_invalidation_keeps_unaffected_prices(self, service):
+        service.market_service._fetch_prices_batch = lambda tickers: {t: {"price": 10.0} for t in tickers}
+        snapshot = service._get_snapshot()
+        assert set(snapshot.tickers) == {"IBM", "OLD"}
+
+        service.invalidate_portfolio_snapshot([])
+        assert service._snapshot is snapshot
+
+        service.invalidate_portfolio_snapshot(["OLD"])
+        assert service._snapshot is None
+        assert service._carried_prices == {"IBM": 10.0}
@@ -0,0 +1,75 @@
+"""Tests for ETag / 304 handling and response compression."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.http_cache import ConditionalGetMiddleware, etag_matches
+from backend.main import app
+
+client = TestClient(app)
+
+
+def make_app():
+    state = {"items": [1, 2, 3]}
+    demo = FastAPI()
+    demo.add_middleware(ConditionalGetMiddleware)
+
+    @demo.get("/api/instruments")
+    async def instruments():
+        return {"items": state["items"]}
+
+    @demo.get("/api/other")
+    async def other():
+        return {"items": state["items"]}
+
+    return TestClient(demo), state
+
+
+class TestConditionalGet:
+    """Test cases for content-hash ETags."""
+
+    def test_etag_and_not_modified(self):
+        demo, state = make_app()
+        first = demo.get("/api/instruments")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        cached = demo.get("/api/instruments", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        state["items"].append(4)
+        changed = demo.get("/api/instruments", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_only_configured_paths(self):
+        demo, _ = make_app()
+        assert "etag" not in demo.get("/api/other").headers
+
+    def test_weak_comparison(self):
+        assert etag_matches('"abc", W/"def"', 'W/"def"')
+        assert etag_matches('abc, "x"', '"x"')
+        assert etag_matches("*", 'W/"x"')
+        assert not etag_matches(None, 'W/"x"')
+
+
+class TestRunETags:
+    """Test cases for run-derived ETags on completed runs."""
+
+    def test_results_page_not_modified(self, run_id):
+        url = f"/api/strategies/runs/{run_id}/results"
+        first = client.get(url)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"run-')
+        assert first.headers["content-encoding"] == "gzip"
+
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        other_page = client.get(url + "?passed=true", headers={"If-None-Match": etag})
+        assert other_page.status_code == 200
+
+    def test_run_detail_not_modified(self, run_id):
+        url = f"/api/strategies/runs/{run_id}"
+        etag = client.get(url).headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
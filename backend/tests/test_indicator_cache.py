@@ -0,0 +1,87 @@
+"""Tests for the shared indicator cache and the technical indicators it serves."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import indicator_cache, price_bar_store
+from backend.services.indicator_cache import IndicatorCache
+from backend.services.price_bar_store import PriceBarStore
+from backend.services.stock_analysis_service import StockAnalysisService
+
+
+def make_bars(seed, n=300):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.date_range("2021-01-04", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+
+
+@pytest.fixture
+def store():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    store = PriceBarStore(conn)
+    store.refreshes = []
+    store.refresh = lambda ticker, period, interval: store.refreshes.append(ticker) or 0
+    yield store
+    conn.close()
+
+
+class TestIndicatorCache:
+    """Test cases for IndicatorCache."""
+
+    def test_recomputed_only_for_new_bars(self, store, monkeypatch):
+        monkeypatch.setattr(price_bar_store, "_last_session_final", lambda: "9999-12-31T00:00:00Z")
+        bars = make_bars(1)
+        store.save_bars("AAPL", bars.iloc[:-1])
+        cache = IndicatorCache(store)
+        computed = []
+
+        def compute(frame):
+            computed.append(len(frame))
+            return frame["close"].iloc[-1]
+
+        assert cache.get("aapl", "last", compute) == bars["close"].iloc[-2]
+        assert cache.get("AAPL", "last", compute) == bars["close"].iloc[-2]
+        store.save_bars("AAPL", bars.iloc[-1:])
+        assert cache.get("AAPL", "last", compute) == bars["close"].iloc[-1]
+        assert computed == [299, 300]
+        assert cache.get("MSFT", "last", compute) is None
+
+    def test_current_ticker_served_from_memory(self, store, monkeypatch):
+        bars = make_bars(2)
+        store.save_bars("AAPL", bars)
+        monkeypatch.setattr(price_bar_store, "_last_session_final", lambda: "2000-01-01T00:00:00Z")
+        cache = IndicatorCache(store)
+        cache.get("AAPL", "last", lambda frame: 1)
+        store.get_last_update = None  # any further store access would fail
+        assert cache.get("AAPL", "last", lambda frame: 2) == 1
+        assert store.refreshes == ["AAPL"]
+
+
+class TestTechnicalIndicators:
+    """Test cases for StockAnalysisService.get_technical_indicators."""
+
+    def test_full_history_indicators(self, store, monkeypatch):
+        bars = make_bars(3)
+        store.save_bars("AAPL", bars)
+        monkeypatch.setattr(indicator_cache, "_indicator_cache", IndicatorCache(store))
+        service = StockAnalysisService(market_data_service=object())
+
+        indicators = service.get_technical_indicators("aapl", avwap_anchors=["breakout", "52w_low"])
+        assert indicators["sma_200"] == pytest.approx(bars["close"].iloc[-200:].mean())
+        assert indicators["history_bars"] == 300
+        assert indicators["last_bar_date"] == bars.index[-1].strftime("%Y-%m-%d")
+        assert sorted(indicators["anchored_vwap"]) == ["52w_low", "breakout"]
+
+        indicators["sma_200"] = None
+        indicators["anchored_vwap"]["breakout"]["vwap"] = None
+        again = service.get_technical_indicators("AAPL", avwap_anchors=["breakout", "52w_low"])
+        assert again["sma_200"] is not None
+        assert again["anchored_vwap"]["breakout"]["vwap"] is not None
+        assert service.get_technical_indicators("MSFT") is None
@@ -0,0 +1,129 @@
+"""Tests for streaming indicator state."""
+
+import json
+import math
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import leap_entry_strategy
+from backend.services.bullish_breakout_service import BullishBreakoutConfig, BullishBreakoutService
+from backend.services.indicator_state import (
+    IndicatorStateService, TickerIndicatorState, _period_start, apply_bars
+)
+from backend.services.price_bar_store import PriceBarStore
+
+
+def make_bars(seed, n=450):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.date_range("2021-01-04", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+
+
+def assert_same(expected, actual):
+    for key, value in expected.items():
+        other = actual[key]
+        if isinstance(value, (float, np.floating)) and not isinstance(value, bool):
+            assert math.isclose(value, other, rel_tol=1e-8) or (math.isnan(value) and math.isnan(other)), key
+        else:
+            assert value == other, key
+
+
+@pytest.fixture
+def streamed():
+    bars = make_bars(11)
+    spy = make_bars(12)["close"]
+    state = TickerIndicatorState("abc")
+    apply_bars(state, bars.iloc[:300], spy.to_dict())
+    # Round-trip through JSON halfway to cover persistence
+    state = TickerIndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    apply_bars(state, bars.iloc[300:], spy.to_dict())
+    return bars, spy, state
+
+
+class TestTickerIndicatorState:
+    """Streaming updates must reproduce the batch indicator calculations."""
+
+    def test_bullish_matches_full_recompute(self, streamed):
+        bars, _, state = streamed
+        service = BullishBreakoutService()
+        frame = service._compute_indicators(bars[["close", "volume"]].copy(), pd, np)
+        expected = service._evaluate_frame("ABC", frame, BullishBreakoutConfig())
+        actual = service._evaluate_state("ABC", state, BullishBreakoutConfig())
+        assert_same(expected.metrics, actual.metrics)
+
+    def test_leap_matches_full_recompute(self, streamed):
+        bars, spy, state = streamed
+        expected = leap_entry_strategy._compute_features(pd, np, bars.copy(), spy)
+        actual = leap_entry_strategy._assemble_features(**state.leap_inputs())
+        actual["anchor_date"] = pd.Timestamp(actual["anchor_date"])
+        assert_same(expected, actual)
+
+    def test_missing_values_leave_rolling_windows(self):
+        bars = make_bars(21)
+        bars.iloc[-25, bars.columns.get_loc("volume")] = np.nan
+        bars.iloc[-30, [bars.columns.get_loc("high"), bars.columns.get_loc("low")]] = np.nan
+        state = TickerIndicatorState("ABC")
+        apply_bars(state, bars.iloc[:-22])
+        # While the bad bar is inside the 20-day window the average is undefined, as in pandas
+        assert math.isnan(state.bullish_row()["vol_avg20"])
+        state = TickerIndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        apply_bars(state, bars.iloc[-22:])
+
+        assert state.bullish_row()["vol_avg20"] == pytest.approx(bars["volume"].rolling(20).mean().iloc[-1])
+        expected = leap_entry_strategy._compute_features(pd, np, bars.copy())
+        actual = leap_entry_strategy._assemble_features(**state.leap_inputs())
+        actual["anchor_date"] = pd.Timestamp(actual["anchor_date"])
+        assert_same(expected, actual)
+
+    def test_avwap_anchor_bounded_by_period(self):
+        bars = make_bars(11, 700)
+        state = TickerIndicatorState("ABC")
+        apply_bars(state, bars)
+        start = _period_start(state.last_date, "1y")
+        window = bars[bars.index >= start].copy()
+
+        expected = leap_entry_strategy._compute_features(pd, np, window)
+        actual = leap_entry_strategy._assemble_features(**state.leap_inputs("1y"))
+        actual["anchor_date"] = pd.Timestamp(actual["anchor_date"])
+        assert expected["anchor_date"] != pd.Timestamp(state.leap_inputs()["anchor_date"])
+        for key in ("anchor_date", "anchored_vwap", "avwap_distance_pct"):
+            assert_same({key: expected[key]}, actual)
+
+    def test_not_ready_before_sma200(self):
+        state = TickerIndicatorState("ABC")
+        apply_bars(state, make_bars(1, 150))
+        assert not state.is_ready()
+        result = BullishBreakoutService().evaluate_state("ABC", state, {})
+        assert result.reasons == ["insufficient_history"]
+
+
+class TestIndicatorStateService:
+    """Test cases for persisted, incrementally advanced state."""
+
+    def test_applies_only_new_bars_and_rebuilds_on_readjustment(self):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        store = PriceBarStore(conn)
+        service = IndicatorStateService(conn, store)
+        bars = make_bars(4, 260)
+        store.save_bars("ABC", bars.iloc[:259])
+
+        assert service.get_state("ABC", refresh=False).bar_count == 259
+        store.save_bars("ABC", bars.iloc[259:])
+        state = service.get_state("ABC", refresh=False)
+        assert state.bar_count == 260
+        assert state.last_date == bars.index[-1].strftime("%Y-%m-%d")
+
+        adjusted = bars.copy()
+        adjusted["close"] = adjusted["close"] / 2
+        store.save_bars("ABC", adjusted)
+        rebuilt = service.get_state("ABC", refresh=False)
+        assert rebuilt.bar_count == 260
+        assert rebuilt.closes[-1] == pytest.approx(adjusted["close"].iloc[-1])
+        conn.close()
@@ -0,0 +1,117 @@
+"""Tests for the parameter sweep service."""
+
+from datetime import datetime
+
+import pytest
+
+from db import Database
+from backend.database.connection import initialize_execution_tables
+from backend.services.base_strategy_service import (
+    BaseStrategyService, StrategyResult, SweepableStrategy
+)
+from backend.services.parameter_sweep_service import (
+    ParameterSweepService, expand_parameter_grid
+)
+
+
+class FakeThresholdService(SweepableStrategy, BaseStrategyService):
+    """Scores each ticker by its length; passes when score >= min_score."""
+
+    def __init__(self):
+        super().__init__()
+        self.prepare_calls = []
+
+    def get_strategy_code(self):
+        return "fake_threshold"
+
+    def get_strategy_name(self):
+        return "Fake Threshold"
+
+    def validate_parameters(self, parameters):
+        return True
+
+    def execute(self, tickers, parameters, progress_callback):
+        raise NotImplementedError
+
+    def get_sweepable_parameters(self):
+        return ["min_score"]
+
+    def prepare_ticker(self, ticker, parameters):
+        self.prepare_calls.append(ticker)
+        if ticker == "BAD":
+            return None, self._result(ticker, False, 0, ["no_data"])
+        return len(ticker), None
+
+    def evaluate_prepared(self, ticker, prepared, parameters):
+        passed = prepared >= parameters["min_score"]
+        return self._result(ticker, passed, prepared, [] if passed else ["below_min"])
+
+    def _result(self, ticker, passed, score, reasons):
+        return StrategyResult(ticker, passed, score, "ok", reasons, {"score": score},
+                              datetime.utcnow(), 0)
+
+
+@pytest.fixture
+def db_conn():
+    db = Database(":memory:")
+    db.connect()
+    initialize_execution_tables(db.conn)
+    yield db.conn
+    db.conn.close()
+
+
+@pytest.fixture
+def fake_service(strategy_registry):
+    service = FakeThresholdService()
+    strategy_registry.register(service)
+    return service
+
+
+class TestExpandParameterGrid:
+    """Test cases for grid expansion."""
+
+    def test_cartesian_product(self):
+        combos = expand_parameter_grid({"b": [1, 2], "a": ["x", "y", "z"]})
+        assert len(combos) == 6
+        assert combos[0] == {"a": "x", "b": 1}
+
+    def test_scalar_values(self):
+        assert expand_parameter_grid({"a": 5}) == [{"a": 5}]
+
+
+class TestParameterSweepService:
+    """Test cases for sweep execution and persistence."""
+
+    def test_rejects_non_sweepable_parameter(self, fake_service):
+        with pytest.raises(ValueError):
+            ParameterSweepService().plan_sweep("fake_threshold", {"period": ["1y", "2y"]})
+
+    def test_prepares_each_ticker_once(self, fake_service):
+        summary = ParameterSweepService().run_sweep(
+            "fake_threshold", ["AA", "AAPL", "MSFT", "bad"], {"min_score": [2, 4, 5]}
+        )
+        assert sorted(fake_service.prepare_calls) == ["AA", "AAPL", "BAD", "MSFT"]
+        assert summary.prepared_tickers == 3
+        passed = {c["parameters"]["min_score"]: c["qualifying_count"] for c in summary.combinations}
+        assert passed == {2: 3, 4: 2, 5: 0}
+
+    def test_persists_child_runs(self, db_conn, fake_service):
+        service = ParameterSweepService(db_conn)
+        summary = service.run_sweep("fake_threshold", ["AA", "AAPL"], {"min_score": [2, 4]},
+                                    sweep_id="sweep-1")
+
+        children = db_conn.execute(
+            "SELECT run_id FROM strategy_run WHERE parent_run_id = ?", ("sweep-1",)
+        ).fetchall()
+        assert len(children) == 2
+        result_count = db_conn.execute("SELECT COUNT(*) FROM strategy_result").fetchone()[0]
+        assert result_count == 4
+
+        stored = service.get_sweep_results("sweep-1")
+        assert stored["exit_status"] == "completed"
+        assert {c["run_id"] for c in stored["combinations"]} == {c["run_id"] for c in summary.combinations}
+        status = db_conn.execute(
+            "SELECT execution_status, processed_count FROM strategy_execution_status WHERE run_id = ?",
+            ("sweep-1",)
+        ).fetchone()
+        assert tuple(status) == ("completed", 2)
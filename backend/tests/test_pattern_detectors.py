@@ -0,0 +1,54 @@
+"""Tests for the vectorized LEAP and bullish breakout pattern detectors."""
+
+import numpy as np
+import pandas as pd
+
+import leap_entry_strategy
+import pattern_benchmark
+from backend.services.bullish_breakout_service import BullishBreakoutService
+
+
+def make_bars(seed, n=400):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.date_range("2021-01-04", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+
+
+class TestAccumulation:
+    """Test cases for leap_entry_strategy._accumulation_stats."""
+
+    def test_matches_loop(self):
+        frame = make_bars(2, 60)
+        acc_days, vol_up, vol_down = leap_entry_strategy._accumulation_stats(np, frame["close"], frame["volume"])
+        assert (acc_days, vol_up, vol_down) == pattern_benchmark.legacy_accumulation(frame)
+
+    def test_batched_matches_per_ticker(self):
+        frames = [make_bars(seed, 60) for seed in range(5)]
+        closes = np.vstack([f["close"].to_numpy() for f in frames])
+        volumes = np.vstack([f["volume"].to_numpy() for f in frames])
+        acc_days, vol_up, vol_down = leap_entry_strategy._accumulation_stats(np, closes, volumes)
+        for row, frame in enumerate(frames):
+            single = leap_entry_strategy._accumulation_stats(np, frame["close"], frame["volume"])
+            assert (acc_days[row], vol_up[row], vol_down[row]) == single
+            assert vol_up[row] + vol_down[row] == frame["volume"].iloc[-10:].sum()
+
+
+class TestBullishSignalColumns:
+    """Test cases for the rolling golden cross and SMA200 slope columns."""
+
+    def test_columns_match_loops(self):
+        service = BullishBreakoutService()
+        df = make_bars(5, 500)[["close", "volume"]].copy()
+        service._compute_indicators(df, pd, np)
+        sma200 = df["sma200"].to_numpy()
+        crosses = 0
+        for i in range(199, len(df)):
+            expected = pattern_benchmark.legacy_golden_cross(df.iloc[:i + 1])
+            crosses += expected
+            assert bool(df["golden_cross_30d"].iloc[i]) == expected
+            assert bool(df["ma200_slope_up_10d"].iloc[i]) == bool(i >= 209 and sma200[i] > sma200[i - 10])
+        assert crosses
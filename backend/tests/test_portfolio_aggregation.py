@@ -0,0 +1,125 @@
+"""Tests for the columnar portfolio aggregation engine."""
+
+import pytest
+
+from backend.services.holdings_service import HoldingsService
+from backend.services.market_data_service import MarketDataService
+from backend.services.portfolio_aggregation import (
+    HoldingsColumns, PortfolioSnapshot, aggregate_portfolio
+)
+
+
+# (ticker, account, quantity, cost_basis, sector, style_category), ordered by ticker
+ROWS = [
+    ("AAPL", "IRA", 10.0, 1000.0, "Technology", "Growth"),
+    ("AAPL", "TAXABLE", 5.0, None, "Technology", "Growth"),
+    ("KO", "TAXABLE", 20.0, 1500.0, "Consumer Staples", None),
+    ("MSFT", "IRA", 4.0, 1200.0, None, "Growth"),
+    ("ZZZ", "ROTH", 7.0, 0.0, "Technology", "Value"),
+]
+
+PRICES = {"AAPL": 150.0, "KO": 60.0, "MSFT": 400.0, "ZZZ": None}
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    def execute_query(self, query, params=()):
+        self.loads += 1
+        return iter(self.rows)
+
+
+class FakeMarket(MarketDataService):
+    def __init__(self):
+        super().__init__()
+        self.prices = dict(PRICES)
+
+    def _fetch_prices_batch(self, tickers):
+        return {t: {"price": self.prices[t]} for t in tickers if t in self.prices}
+
+
+class TestAggregatePortfolio:
+    """Test cases for the vectorized group-bys."""
+
+    def test_groups_in_first_appearance_order(self):
+        aggregates = aggregate_portfolio(HoldingsColumns.from_rows(ROWS), PRICES)
+        assert list(aggregates.accounts.keys) == ["IRA", "TAXABLE", "ROTH"]
+        assert list(aggregates.accounts.value) == [1500.0 + 1600.0, 750.0 + 1200.0, 0.0]
+        assert list(aggregates.accounts.cost_basis) == [2200.0, 1500.0, 0.0]
+        assert list(aggregates.accounts.count) == [2, 2, 1]
+        assert list(aggregates.sectors.keys) == ["Technology", "Consumer Staples", "Unknown"]
+        assert aggregates.total_value == 5050.0
+        assert aggregates.total_cost_basis == 3700.0
+
+    def test_empty(self):
+        aggregates = aggregate_portfolio(HoldingsColumns.from_rows([]), {})
+        assert aggregates.total_value == 0.0
+        assert len(aggregates.tickers.keys) == 0
+
+
+class TestPortfolioSummary:
+    """Test cases for the summary built from the aggregates."""
+
+    def test_summary_matches_per_lot_semantics(self):
+        summary = HoldingsService(FakeDB(ROWS), FakeMarket()).get_portfolio_summary()
+
+        assert summary.total_value == 5050.0
+        assert summary.total_cost_basis == 3700.0
+        assert summary.total_gain_loss == 1350.0
+
+        roth = summary.accounts[2]
+        assert (roth.account, roth.value, roth.cost_basis, roth.gain_loss) == ("ROTH", None, None, None)
+
+        assert [h.ticker for h in summary.top_holdings] == ["AAPL", "MSFT", "KO", "ZZZ"]
+        aapl = summary.top_holdings[0]
+        assert aapl.quantity == 15.0
+        assert aapl.market_value == 2250.0
+        assert aapl.cost_basis == 1000.0
+        assert aapl.gain_loss == 1250.0
+        assert aapl.weight == pytest.approx(2250.0 / 5050.0 * 100)
+        zzz = summary.top_holdings[-1]
+        assert (zzz.current_price, zzz.gain_loss, zzz.weight) == (None, None, None)
+
+        assert [s.sector for s in summary.sector_allocation] == ["Technology", "Unknown", "Consumer Staples"]
+        assert summary.sector_allocation[0].positions_count == 3
+        assert [s.style_category for s in summary.style_allocation] == ["Growth", "Unknown", "Value"]
+
+
+class TestPortfolioSnapshot:
+    """Test cases for incremental updates on price ticks."""
+
+    def test_tick_matches_full_recompute(self):
+        columns = HoldingsColumns.from_rows(ROWS)
+        snapshot = PortfolioSnapshot(columns, PRICES)
+        ticked = dict(PRICES, AAPL=None, ZZZ=10.0)
+
+        assert snapshot.apply_prices({"AAPL": None, "ZZZ": 10.0, "NOT_HELD": 1.0})
+        assert not snapshot.apply_prices({"ZZZ": 10.0})
+
+        expected = aggregate_portfolio(columns, ticked)
+        assert snapshot.aggregates.total_value == pytest.approx(expected.total_value)
+        for name in ("accounts", "sectors", "styles", "tickers"):
+            assert list(getattr(snapshot.aggregates, name).value) == \
+                pytest.approx(list(getattr(expected, name).value))
+        assert snapshot.aggregates.ticker_price == expected.ticker_price
+
+    def test_summary_served_from_snapshot_until_import(self):
+        db, market = FakeDB(ROWS), FakeMarket()
+        service = HoldingsService(db, market)
+
+        first = service.get_portfolio_summary()
+        assert service.get_portfolio_summary() is first
+        assert db.loads == 1
+
+        # A fresh quote is pushed through the market data listener
+        market.prices["KO"] = 70.0
+        market.clear_cache()
+        ticked = service.get_portfolio_summary()
+        assert ticked.total_value == pytest.approx(5050.0 + 200.0)
+        assert db.loads == 1
+
+        service.invalidate_portfolio_snapshot()
+        service.get_portfolio_summary()
+        assert db.loads == 2
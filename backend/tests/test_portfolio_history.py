@@ -0,0 +1,78 @@
+"""Tests for daily portfolio snapshots and downsampled history series."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.portfolio_history_service import PortfolioHistoryService, lttb_indices
+from backend.services.price_bar_store import PriceBarStore
+
+
+def bars(closes, start="2024-01-01"):
+    index = pd.bdate_range(start, periods=len(closes))
+    return pd.DataFrame({"open": closes, "high": closes, "low": closes,
+                         "close": closes, "volume": 1000.0}, index=index)
+
+
+@pytest.fixture
+def service():
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute("""
+        CREATE TABLE holdings (holding_id INTEGER PRIMARY KEY, account TEXT NOT NULL, ticker TEXT NOT NULL,
+                               quantity REAL NOT NULL, cost_basis REAL, opened_at TEXT)
+    """)
+    db.executemany("INSERT INTO holdings (account, ticker, quantity, cost_basis, opened_at) VALUES (?, ?, ?, ?, ?)", [
+        ("IRA", "AAA", 10.0, 50.0, None),
+        ("IRA", "BBB", 2.0, None, "2024-01-03"),
+        ("ROTH", "AAA", 1.0, 9.0, None),
+    ])
+    store = PriceBarStore(db)
+    store.save_bars("AAA", bars([10.0, 11.0, 12.0, 13.0, 14.0]))
+    # BBB has no bar on 2024-01-04; its previous close is carried forward
+    store.save_bars("BBB", bars([100.0, 101.0, 102.0, 103.0, 104.0]).drop(pd.Timestamp("2024-01-04")))
+    return PortfolioHistoryService(db, store)
+
+
+class TestSnapshots:
+    """Test cases for snapshot computation."""
+
+    def test_snapshot_values_per_account(self, service):
+        assert service.snapshot() == 10
+        series = service.get_series("IRA", max_points=None)
+        values = [p["market_value"] for p in series["points"]]
+        # BBB counts from its opened_at date (2024-01-03) on
+        assert values == [100.0, 110.0, 120.0 + 204.0, 130.0 + 204.0, 140.0 + 208.0]
+        assert series["points"][0]["cost_basis"] == 50.0
+
+        total = service.get_series(max_points=None)
+        assert total["points"][0]["market_value"] == 110.0
+        assert service.last_snapshot_date() == "2024-01-05"
+
+    def test_snapshot_range_is_upserted(self, service):
+        service.snapshot()
+        assert service.snapshot("2024-01-04", "2024-01-05") == 4
+        assert service.get_series("ROTH", start="2024-01-04")["total_points"] == 2
+
+
+class TestDownsampling:
+    """Test cases for LTTB downsampling."""
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 50.0)
+        y[437] = 10.0
+        kept = lttb_indices(x, y, 50)
+        assert len(kept) == 50
+        assert kept[0] == 0 and kept[-1] == 999
+        assert 437 in kept
+        assert np.all(np.diff(kept) > 0)
+
+    def test_series_downsampled(self, service):
+        service.snapshot()
+        series = service.get_series("IRA", max_points=3)
+        assert series["downsampled"] and series["total_points"] == 5
+        assert [p["date"] for p in series["points"]][::2] == ["2024-01-01", "2024-01-05"]
+        with pytest.raises(ValueError):
+            service.get_series(max_points=2)
@@ -0,0 +1,160 @@
+"""Tests for resuming interrupted strategy runs from their checkpoint."""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from db import Database
+from backend.api import strategies as strategies_api
+from backend.database.connection import DatabaseManager, get_db, initialize_execution_tables
+from backend.main import app
+from backend.services.bullish_breakout_service import BullishBreakoutService, TickerEvaluation
+from backend.services.strategy_execution_service import StrategyExecutionService
+
+TICKERS = [f"T{i:02d}" for i in range(12)]
+
+
+@pytest.fixture
+def db_conn():
+    db = Database(":memory:")
+    # Progress is written from scheduler worker threads, as with the app connection
+    db.conn = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+    db.ensure_schema()
+    initialize_execution_tables(db.conn)
+    yield db.conn
+    db.conn.close()
+
+
+@pytest.fixture
+def execution_service(db_conn, strategy_registry, monkeypatch):
+    """Execution service whose bullish tickers pass when their index is even."""
+    service = StrategyExecutionService(db_conn)
+    bullish = BullishBreakoutService()
+    bullish.evaluated = []
+
+    def fake_evaluate(ticker, config):
+        bullish.evaluated.append(ticker)
+        index = int(ticker[1:])
+        return TickerEvaluation(ticker, index % 2 == 0, [], {"score": index})
+
+    monkeypatch.setattr(bullish, "_evaluate_single_ticker", fake_evaluate)
+    strategy_registry.register(bullish)
+    service.bullish = bullish
+    return service
+
+
+def interrupted_run(execution_service, run_id="run-1"):
+    """Run, then roll the database back to a restart after the first 5 tickers."""
+    execution_service.execute_strategy_sync(
+        "bullish_breakout", TICKERS, {"max_workers": 1, "lookup_names": False}, run_id=run_id
+    )
+    db = execution_service.db
+    for table in ("strategy_execution_progress", "strategy_result"):
+        db.execute(f"DELETE FROM {table} WHERE run_id = ? AND ticker >= 'T05'", (run_id,))
+    db.execute("""
+        UPDATE strategy_execution_status SET execution_status = 'running', processed_count = 5
+        WHERE run_id = ?
+    """, (run_id,))
+    execution_service.bullish.evaluated.clear()
+
+
+class TestResumeRun:
+    """Test cases for StrategyExecutionService.resume_run."""
+
+    def test_resume_evaluates_only_remaining(self, execution_service, db_conn):
+        interrupted_run(execution_service)
+
+        checkpoint = execution_service.load_checkpoint("run-1")
+        assert sorted(checkpoint.completed) == TICKERS[:5]
+        assert checkpoint.passed_count == 3
+        assert checkpoint.parameters["lookup_names"] is False
+
+        summary = execution_service.resume_run("run-1")
+        assert execution_service.bullish.evaluated == TICKERS[5:]
+        assert summary.summary_metrics["resumed_tickers"] == 5
+
+        status = db_conn.execute("""
+            SELECT execution_status, processed_count, total_count, qualifying_count, progress_percent
+            FROM strategy_execution_status WHERE run_id = 'run-1'
+        """).fetchone()
+        assert status == ("completed", 12, 12, 6, 100.0)
+        sequences = [row[0] for row in db_conn.execute("""
+            SELECT ticker FROM strategy_execution_progress WHERE run_id = 'run-1' ORDER BY sequence_number
+        """)]
+        assert sequences == TICKERS
+
+    def test_not_resumable(self, execution_service, db_conn):
+        assert execution_service.load_checkpoint("missing") is None
+
+        interrupted_run(execution_service)
+        execution_service.resume_run("run-1")
+        with pytest.raises(ValueError, match="already completed"):
+            execution_service.load_checkpoint("run-1")
+
+        interrupted_run(execution_service, "run-2")
+        execution_service.register_run("run-2")
+        with pytest.raises(ValueError, match="still active"):
+            execution_service.load_checkpoint("run-2")
+
+        db_conn.execute("UPDATE strategy_execution_status SET tickers_json = NULL WHERE run_id = 'run-2'")
+        execution_service._active_runs.clear()
+        with pytest.raises(ValueError, match="ticker universe"):
+            execution_service.load_checkpoint("run-2")
+
+
+class TestResumeEndpoint:
+    """Test cases for POST /strategies/runs/{run_id}/resume."""
+
+    def test_resume_endpoint(self, execution_service, db_conn, monkeypatch):
+        from backend.api import strategy_execution_simplified as execution_api
+
+        monkeypatch.setattr(execution_api, "get_strategy_execution_service", lambda db=None: execution_service)
+        app.dependency_overrides[get_db] = lambda: db_conn
+        try:
+            client = TestClient(app)
+            assert client.post("/api/strategies/runs/unknown/resume").status_code == 404
+
+            interrupted_run(execution_service)
+            response = client.post("/api/strategies/runs/run-1/resume")
+            assert response.status_code == 200
+            assert response.json()["total_tickers"] == 12
+            assert execution_service.bullish.evaluated == TICKERS[5:]
+
+            assert client.post("/api/strategies/runs/run-1/resume").status_code == 400
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+    def test_run_etag_changes_across_resume(self, execution_service, db_conn, monkeypatch):
+        manager = DatabaseManager(":memory:")
+        manager._connection = db_conn
+        monkeypatch.setattr(strategies_api, "get_db_manager", lambda db_path=None: manager)
+        client = TestClient(app)
+        url = "/api/strategies/runs/run-1"
+
+        interrupted_run(execution_service)
+        first = client.get(url)
+        stale_etag = first.headers["etag"]
+
+        during = []
+        evaluate = execution_service.bullish._evaluate_single_ticker
+
+        def evaluate_and_poll(ticker, config):
+            if not during:
+                during.append(client.get(url, headers={"If-None-Match": stale_etag}))
+            return evaluate(ticker, config)
+
+        monkeypatch.setattr(execution_service.bullish, "_evaluate_single_ticker", evaluate_and_poll)
+        execution_service.resume_run("run-1")
+
+        # While resuming the run no longer reads as completed and has no run-level ETag
+        assert during[0].status_code == 200
+        assert during[0].json()["completed_at"] is None
+        assert during[0].json()["exit_status"] is None
+        assert not during[0].headers["etag"].startswith('W/"run-')
+
+        final = client.get(url, headers={"If-None-Match": stale_etag})
+        assert final.status_code == 200
+        assert final.headers["etag"] != stale_etag
+        assert final.json()["exit_status"] == first.json()["exit_status"]
+        assert final.json()["completed_at"] != first.json()["completed_at"]
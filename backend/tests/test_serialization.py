@@ -0,0 +1,50 @@
+"""Tests for the NumPy-aware JSON serialization helpers."""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from backend.api.responses import FastJSONResponse
+from backend.services import serialization
+from backend.services.serialization import dumps, to_native
+
+METRICS = {
+    "close": np.float64(101.5),
+    "volume": np.int64(1200),
+    "sma200": np.float64("nan"),
+    "above": np.bool_(True),
+    "history": [np.float32(1.5), {"n": np.int32(2), "na": pd.NA}],
+    "pair": (1, np.int64(2)),
+    "closes": np.array([1.0, np.nan]),
+    "label": "BUY",
+}
+
+EXPECTED = {
+    "close": 101.5, "volume": 1200, "sma200": None, "above": True,
+    "history": [1.5, {"n": 2, "na": None}], "pair": [1, 2],
+    "closes": [1.0, None], "label": "BUY",
+}
+
+
+class TestSerialization:
+    """Test cases for to_native and dumps."""
+
+    def test_to_native_single_pass(self):
+        converted = to_native(METRICS)
+        assert converted == EXPECTED
+        assert type(converted["volume"]) is int
+        assert type(converted["above"]) is bool
+        assert to_native(np.int64(3)) == 3 and to_native("x") == "x"
+
+    def test_dumps_matches_native(self):
+        assert json.loads(dumps(METRICS)) == EXPECTED
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert json.loads(dumps(METRICS)) == EXPECTED
+
+    def test_fast_json_response(self):
+        response = FastJSONResponse({"score": np.float64(2.5), "at": pd.Timestamp("2024-01-02")})
+        assert json.loads(response.body) == {"score": 2.5, "at": "2024-01-02T00:00:00"}
+        assert response.media_type == "application/json"
@@ -0,0 +1,59 @@
+"""Tests for streaming strategy result exports."""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+import bullish_strategy
+from backend.main import app
+
+client = TestClient(app)
+
+
+class TestStrategyExport:
+    """Test cases for the NDJSON/CSV export endpoint."""
+
+    def test_ndjson_streams_all_rows(self, run_id):
+        response = client.get(f"/api/strategies/runs/{run_id}/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["ticker"] for r in records] == ["CCC", "AAA", "BBB"]
+        assert records[1]["sector"] == "Technology"
+        assert records[2]["reasons"] == ["low volume", "below sma50"]
+        assert records[2]["metrics"] == {"close": 3.0, "custom": "x"}
+
+    def test_csv_flattens_typed_metrics_with_filters(self, run_id):
+        response = client.get(f"/api/strategies/runs/{run_id}/export?format=csv&passed=false")
+        assert response.status_code == 200
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["ticker"] == "BBB"
+        assert rows[0]["reasons"] == "low volume;below sma50"
+        assert rows[0]["close"] == "3.0"
+        assert "custom" not in rows[0]
+
+    def test_unknown_run_and_format(self, run_id):
+        assert client.get("/api/strategies/runs/missing/export").status_code == 404
+        assert client.get(f"/api/strategies/runs/{run_id}/export?format=xml").status_code == 400
+
+
+class TestDetailsCsv:
+    """Test cases for the bullish screener details file."""
+
+    def test_rows_written_with_union_header(self, tmp_path):
+        path = tmp_path / "details.csv"
+        results = [
+            bullish_strategy.TickerResult("AAA", True, [], {"close": 1.0}),
+            bullish_strategy.TickerResult("BBB", False, ["a", "b"], {"company_name": "Bee", "rsi14": 50.0}),
+        ]
+        bullish_strategy._write_details_csv(results, str(path))
+
+        rows = list(csv.DictReader(path.open()))
+        assert list(rows[0]) == ["ticker", "company_name", "passed", "reason", "close", "rsi14"]
+        assert rows[0]["rsi14"] == ""
+        assert (rows[1]["company_name"], rows[1]["reason"], rows[1]["passed"]) == ("Bee", "a;b", "False")
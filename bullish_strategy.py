@@ -17,6 +17,7 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import csv
 import os
 import sys
 import math
@@ -486,7 +487,7 @@ def _write_results_txt(passed: List[TickerResult], output_file: str) -> None:
             f.write("\n")
 
 
-def _write_details_csv(pd, results: List[TickerResult], path: str) -> None:
+def _write_details_csv(results: List[TickerResult], path: str) -> None:
     if not results:
         # create empty with header
         cols = [
@@ -533,21 +534,28 @@ def _write_details_csv(pd, results: List[TickerResult], path: str) -> None:
             "suggested_stop",
             "extra_score",
         ]
-        pd.DataFrame(columns=cols).to_csv(path, index=False)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(cols)
         return
-    rows = []
+    # Header is the union of metric keys in first-seen order (as a DataFrame
+    # would build it); rows are then written one at a time.
+    cols = {"ticker": None, "company_name": None, "passed": None, "reason": None}
     for r in results:
-        m = r.metrics
-        rows.append(
-            {
-                "ticker": r.ticker,
-                "company_name": m.get("company_name"),
-                "passed": r.passed,
-                "reason": "" if r.passed else ";".join(r.reasons),
-                **m,
-            }
-        )
-    pd.DataFrame(rows).to_csv(path, index=False)
+        cols.update(dict.fromkeys(r.metrics))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(cols), restval="")
+        writer.writeheader()
+        for r in results:
+            m = r.metrics
+            writer.writerow(
+                {
+                    "ticker": r.ticker,
+                    "company_name": m.get("company_name"),
+                    "passed": r.passed,
+                    "reason": "" if r.passed else ";".join(r.reasons),
+                    **m,
+                }
+            )
 
 
 def run_screener(tickers: List[str], cfg: ScreenerConfig, db_path: Optional[str] = None, cli_args: Optional[argparse.Namespace] = None) -> Tuple[List[TickerResult], List[TickerResult]]:
@@ -800,13 +808,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     # Write outputs
     _write_results_txt(passed, cfg.output_file)
-    try:
-        pd, _, _ = _lazy_imports()
-        if cfg.details_file:
-            _write_details_csv(pd, passed + failed, cfg.details_file)
-    except Exception:
-        # If pandas not installed, silently skip details
-        pass
+    if cfg.details_file:
+        _write_details_csv(passed + failed, cfg.details_file)
 
     print(f"Evaluated {len(tickers)} tickers. Passed: {len(passed)}. Details -> {cfg.details_file or 'skipped'}")
     return 0
@@ -5,13 +5,22 @@ v1: Base tables (holdings had instrument_type, style_category, currency; separat
 v2: Added strategy_code to strategy_result
 v3: Added params_json to strategy_run (merged former strategy_params)
 v4: Introduced instruments table; moved instrument_type, style_category, currency from holdings to instruments
+v5: Added parent_run_id to strategy_run (parameter sweep child runs)
+v6: Added price_bars (stored OHLCV history for backtests)
+v7: Added indicator_state (persisted streaming indicator state per ticker)
+v8: Added portfolio_snapshot (daily portfolio value per account)
+v9: Added fundamentals (cached financial statements, dividends and info per ticker)
 
-Current (v4):
+Current (v9):
  - schema_meta(key,value)
  - instruments(ticker PK, instrument_type, style_category, sector, industry, country, currency, active, updated_at, notes)
  - holdings(holding_id PK, account, subaccount, ticker, quantity, cost_basis, opened_at, last_update, lot_tag, notes)
- - strategy_run(run_id PK, strategy_code, version, params_hash, params_json, started_at, completed_at, universe_source, universe_size, min_score, exit_status, duration_ms)
+ - strategy_run(run_id PK, strategy_code, version, params_hash, params_json, started_at, completed_at, universe_source, universe_size, min_score, exit_status, duration_ms, parent_run_id)
  - strategy_result(run_id+ticker PK, strategy_code, ticker, passed, score, classification, reasons, metrics_json, created_at)
+ - price_bars(ticker+interval+bar_date PK, open, high, low, close, volume, updated_at)
+ - indicator_state(ticker+interval PK, last_bar_date, bar_count, state_json, updated_at)
+ - portfolio_snapshot(account+snapshot_date PK, market_value, cost_basis, positions_count, priced_count, updated_at)
+ - fundamentals(ticker+statement+period_end PK, data_json, updated_at)
 
 Usage pattern:
     from db import Database
@@ -26,7 +35,7 @@ from __future__ import annotations
 import sqlite3, json, uuid, hashlib, os, datetime
 from typing import Dict, Any, Optional
 
-SCHEMA_VERSION = "4"
+SCHEMA_VERSION = "9"
 
 DDL_STATEMENTS = [
         # schema_meta
@@ -84,7 +93,8 @@ DDL_STATEMENTS = [
                 universe_size   INTEGER,
                 min_score       INTEGER,
                 exit_status     TEXT,
-                duration_ms     INTEGER
+                duration_ms     INTEGER,
+                parent_run_id   TEXT
         );
         """,
         "CREATE INDEX IF NOT EXISTS ix_run_strategy_started ON strategy_run(strategy_code, started_at);",
@@ -108,6 +118,58 @@ DDL_STATEMENTS = [
         "CREATE INDEX IF NOT EXISTS ix_result_score ON strategy_result(score);",
         "CREATE INDEX IF NOT EXISTS ix_result_class ON strategy_result(classification);",
         "CREATE INDEX IF NOT EXISTS ix_result_strategy ON strategy_result(strategy_code);",
+        # price_bars (new in v6)
+        """
+        CREATE TABLE IF NOT EXISTS price_bars (
+                ticker     TEXT NOT NULL,
+                interval   TEXT NOT NULL DEFAULT '1d',
+                bar_date   TEXT NOT NULL,
+                open       REAL,
+                high       REAL,
+                low        REAL,
+                close      REAL NOT NULL,
+                volume     REAL,
+                updated_at TEXT,
+                PRIMARY KEY (ticker, interval, bar_date)
+        );
+        """,
+        # indicator_state (new in v7)
+        """
+        CREATE TABLE IF NOT EXISTS indicator_state (
+                ticker        TEXT NOT NULL,
+                interval      TEXT NOT NULL DEFAULT '1d',
+                last_bar_date TEXT NOT NULL,
+                bar_count     INTEGER NOT NULL,
+                state_json    TEXT NOT NULL,
+                updated_at    TEXT,
+                PRIMARY KEY (ticker, interval)
+        );
+        """,
+        # portfolio_snapshot (new in v8)
+        """
+        CREATE TABLE IF NOT EXISTS portfolio_snapshot (
+                account         TEXT NOT NULL,
+                snapshot_date   TEXT NOT NULL,
+                market_value    REAL NOT NULL,
+                cost_basis      REAL,
+                positions_count INTEGER NOT NULL,
+                priced_count    INTEGER NOT NULL,
+                updated_at      TEXT,
+                PRIMARY KEY (account, snapshot_date)
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_portfolio_snapshot_date ON portfolio_snapshot(snapshot_date);",
+        # fundamentals (new in v9)
+        """
+        CREATE TABLE IF NOT EXISTS fundamentals (
+                ticker     TEXT NOT NULL,
+                statement  TEXT NOT NULL,
+                period_end TEXT NOT NULL,
+                data_json  TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (ticker, statement, period_end)
+        );
+        """,
 ]
 
 class Database:
@@ -258,6 +320,35 @@ class Database:
                     print(f"[DB] v3->v4 rebuild holdings failed: {e}")
             current_version = "4"
 
+        # v4 -> v5 (parameter sweeps group child runs under a parent run)
+        if current_version == "4":
+            if not column_exists("strategy_run", "parent_run_id"):
+                try:
+                    cur.execute("ALTER TABLE strategy_run ADD COLUMN parent_run_id TEXT")
+                except Exception as e:
+                    print(f"[DB] v4->v5 add parent_run_id failed: {e}")
+            try:
+                cur.execute("CREATE INDEX IF NOT EXISTS ix_run_parent ON strategy_run(parent_run_id)")
+            except Exception:
+                pass
+            current_version = "5"
+
+        # v5 -> v6 (price_bars is created by DDL_STATEMENTS above)
+        if current_version == "5":
+            current_version = "6"
+
+        # v6 -> v7 (indicator_state is created by DDL_STATEMENTS above)
+        if current_version == "6":
+            current_version = "7"
+
+        # v7 -> v8 (portfolio_snapshot is created by DDL_STATEMENTS above)
+        if current_version == "7":
+            current_version = "8"
+
+        # v8 -> v9 (fundamentals is created by DDL_STATEMENTS above)
+        if current_version == "8":
+            current_version = "9"
+
         cur.execute("""
             INSERT INTO schema_meta(key,value) VALUES('schema_version',?)
             ON CONFLICT(key) DO UPDATE SET value=excluded.value
@@ -7,6 +7,8 @@ Features:
 - Upsert instruments (do not overwrite existing style_category)
 - Insert holdings rows (optionally merge or skip duplicates per account+ticker)
 - Compute per-share cost if total cost provided (flag --cost-is-total)
+- Streams the CSV and writes instruments/holdings with batched executemany
+  upserts in one transaction, so large exports import at constant memory
 
 Usage (PowerShell examples):
   python .\import_holdings.py --db at_data.sqlite --csv "C:\\Users\\rohitg\\Downloads\\Portfolio_Positions_Sep-14-2025.csv"
@@ -17,7 +19,7 @@ Optional flags see --help.
 """
 from __future__ import annotations
 import argparse, csv, datetime, os, re, sqlite3, sys
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 
 OPTION_PATTERNS = [
     # OCC style text lines containing date + strike + C/P
@@ -29,6 +31,16 @@ OPTION_PATTERNS = [
 ]
 TYPE_HINT_COLUMNS = ["Type", "AssetType", "Asset Class", "SecurityType", "Security Type", "InstrumentType"]
 
+# Rows buffered before each executemany flush
+BATCH_SIZE = 1000
+
+INSTRUMENT_UPSERT = """INSERT INTO instruments(ticker,instrument_type,updated_at) VALUES(?,?,datetime('now'))
+    ON CONFLICT(ticker) DO UPDATE SET instrument_type=COALESCE(instruments.instrument_type, excluded.instrument_type)"""
+HOLDING_INSERT = """INSERT INTO holdings(account,subaccount,ticker,quantity,cost_basis,opened_at,last_update,lot_tag,notes)
+    VALUES(?,NULL,?,?,?,?,datetime('now'),NULL,NULL)"""
+HOLDING_MERGE = "UPDATE holdings SET quantity=?, cost_basis=?, last_update=datetime('now') WHERE account=? AND ticker=?"
+HOLDING_REPLACE = "UPDATE holdings SET quantity=?, cost_basis=?, opened_at=?, last_update=datetime('now') WHERE account=? AND ticker=?"
+
 # ---------- Helpers ----------
 
 def detect_column(header: List[str], candidates: List[str]) -> Optional[str]:
@@ -133,11 +145,11 @@ def parse_args():
     ap.add_argument("--verbose", action="store_true")
     return ap.parse_args()
 
-def load_csv(path: str) -> Tuple[List[Dict[str,str]], List[str]]:
-    with open(path, newline="", encoding="utf-8-sig") as f:
-        rdr = csv.DictReader(f)
-        rows = list(rdr)
-    return rows, (list(rows[0].keys()) if rows else [])
+def open_csv(path: str) -> Tuple[Iterator[Dict[str,str]], List[str], TextIO]:
+    """Open the CSV for streaming; returns (row iterator, header, file handle)."""
+    f = open(path, newline="", encoding="utf-8-sig")
+    rdr = csv.DictReader(f)
+    return rdr, list(rdr.fieldnames or []), f
 
 def ensure_tables(cur: sqlite3.Cursor):
     # Minimal existence check (schema already established by db.py)
@@ -153,8 +165,9 @@ def main():
     if not os.path.exists(args.csv):
         print(f"CSV not found: {args.csv}", file=sys.stderr)
         return 2
-    rows, header = load_csv(args.csv)
-    if not rows:
+    rows, header, csv_file = open_csv(args.csv)
+    if not header:
+        csv_file.close()
         print("CSV empty")
         return 1
 
@@ -175,6 +188,7 @@ def main():
     etf_col = args.etf_col or detect_column(header, ["AssetType", "Type", "Asset Class", "SecurityType"])
 
     if not symbol_col or not qty_col:
+        csv_file.close()
         print("Missing required symbol or Quantity column (must be named 'Quantity').")
         return 1
 
@@ -191,11 +205,28 @@ def main():
     for acct, tic, qty, cb in cur.execute("SELECT account,ticker,quantity,cost_basis FROM holdings"):
         existing[(acct, tic)] = (qty, cb)
 
+    known_instruments = {t for (t,) in cur.execute("SELECT ticker FROM instruments")}
+
     inserted_instruments = 0
     holdings_updates = 0
     skipped_options = 0
     skipped_existing = 0
 
+    # Pending writes; inserts flush before updates so an update can target a row inserted in the same batch
+    instrument_batch: List[Tuple[str, str]] = []
+    insert_batch: List[tuple] = []
+    merge_batch: List[tuple] = []
+    replace_batch: List[tuple] = []
+
+    def flush():
+        if not args.dry_run:
+            cur.executemany(INSTRUMENT_UPSERT, instrument_batch)
+            cur.executemany(HOLDING_INSERT, insert_batch)
+            cur.executemany(HOLDING_MERGE, merge_batch)
+            cur.executemany(HOLDING_REPLACE, replace_batch)
+        for batch in (instrument_batch, insert_batch, merge_batch, replace_batch):
+            batch.clear()
+
     for i, row in enumerate(rows, 1):
         raw_sym = (row.get(symbol_col) or '').strip()
         if not raw_sym:
@@ -251,14 +282,12 @@ def main():
             inst_type = 'etf'
 
         # Upsert instrument (don't overwrite existing style)
-        cur.execute("SELECT ticker FROM instruments WHERE ticker=?", (sym,))
-        if not cur.fetchone():
-            if not args.dry_run:
-                cur.execute("INSERT INTO instruments(ticker,instrument_type,updated_at) VALUES(?,?,datetime('now'))", (sym, inst_type))
+        if sym not in known_instruments:
+            known_instruments.add(sym)
             inserted_instruments += 1
-        else:
-            if not args.dry_run:
-                cur.execute("UPDATE instruments SET instrument_type=COALESCE(instrument_type, ?) WHERE ticker=?", (inst_type, sym))
+        instrument_batch.append((sym, inst_type))
+        if len(instrument_batch) >= BATCH_SIZE:
+            flush()
 
         key = (account, sym)
         if key in existing:
@@ -276,37 +305,26 @@ def main():
                         pass
                 elif cost_basis is not None and prev_cb is None:
                     new_cb = cost_basis
-                if not args.dry_run:
-                    cur.execute(
-                        "UPDATE holdings SET quantity=?, cost_basis=?, last_update=datetime('now') WHERE account=? AND ticker=?",
-                        (new_qty, new_cb, account, sym),
-                    )
+                merge_batch.append((new_qty, new_cb, account, sym))
                 existing[key] = (new_qty, new_cb)
                 holdings_updates += 1
                 continue
             else:
                 # Replace existing position with CSV value (no accumulation)
-                if not args.dry_run:
-                    cur.execute(
-                        "UPDATE holdings SET quantity=?, cost_basis=?, opened_at=?, last_update=datetime('now') WHERE account=? AND ticker=?",
-                        (qty_val, cost_basis, opened_at, account, sym),
-                    )
+                replace_batch.append((qty_val, cost_basis, opened_at, account, sym))
                 existing[key] = (qty_val, cost_basis)
                 holdings_updates += 1
                 continue
 
-        if not args.dry_run:
-            cur.execute(
-                """INSERT INTO holdings(account,subaccount,ticker,quantity,cost_basis,opened_at,last_update,lot_tag,notes)
-                    VALUES(?,?,?,?,?,?,datetime('now'),NULL,NULL)""",
-                (account, None, sym, qty_val, cost_basis, opened_at),
-            )
+        insert_batch.append((account, sym, qty_val, cost_basis, opened_at))
         existing[key] = (qty_val, cost_basis)
         holdings_updates += 1
 
         if args.verbose and i % 50 == 0:
             print(f"Processed {i} rows...")
 
+    csv_file.close()
+    flush()
     if not args.dry_run:
         con.commit()
 
@@ -13,7 +13,6 @@ Core Concepts Implemented:
 - Accumulation: At least 2 accumulation days (up close with higher volume) last 10 sessions & balanced volume.
 - Volatility Contraction: 20-day HV contracting vs prior window; ATR% acceptable.
 - Relative Strength Turn: Stock/SPY ratio short EMA > long EMA.
-- Bullish Divergence (optional bonus): Price lower low vs prior swing with higher RSI.
 - AVWAP Distance: Anchored VWAP from initial breakout; distance influences score (bonus if controlled, penalty if extended).
 - Suggested Stop: Structural (recent swing low) & ATR blend.
 
@@ -25,7 +24,6 @@ Scoring (max 100 after capping):
  Accumulation + volume balance.......10
  Volatility contraction..............10
  Relative strength improving.........10
- Bullish divergence....................5
  ATR% acceptable......................8
  Value zone & RSI synergy.............7
  AVWAP distance (0-5%:+5,5-8%:+2,>15%:-5)
@@ -46,6 +44,7 @@ import argparse
 import os
 import sys
 import math
+import re
 import statistics
 import time
 import concurrent.futures
@@ -67,6 +66,13 @@ except ImportError:
         def report_ticker_progress(self, *args, **kwargs): pass
         def report_error(self, *args, **kwargs): pass
 
+# Shared benchmark series (one SPY download per trading day instead of per ticker)
+try:
+    from backend.services.benchmark_series import BENCHMARK_TICKER, get_benchmark_provider
+except ImportError:
+    BENCHMARK_TICKER = "SPY"
+    get_benchmark_provider = None
+
 # ------------------------------- Data Classes -------------------------------
 
 @dataclass
@@ -174,22 +180,64 @@ def _download_history(yf, pd, ticker: str, period: str, interval: str):
 
 # ---------------------------- Core Evaluation -------------------------------
 
-def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
+def _prepare_ticker(ticker: str, cfg: LeapConfig) -> Tuple[Optional[Dict[str, Any]], Optional[LeapResult]]:
+    """Download history and compute the parameter-independent features for a ticker.
+
+    Only ``cfg.period`` / ``cfg.interval`` influence this stage; every scoring
+    threshold is applied later by ``_score_features`` so the same features can be
+    re-scored under many configurations (parameter sweeps, backtests).
+
+    Returns ``(features, None)`` on success or ``(None, failure_result)``.
+    """
+    df, failure = _load_history(ticker, cfg)
+    if failure is not None:
+        return None, failure
+    return _prepare_history(ticker, df, cfg)
+
+
+def _load_history(ticker: str, cfg: LeapConfig) -> Tuple[Optional[Any], Optional[LeapResult]]:
+    """Download the OHLCV history used by ``_prepare_ticker``.
+
+    Returns ``(df, None)`` on success or ``(None, failure_result)``.
+    """
     try:
         pd, np, yf = _lazy()
     except Exception:
-        return LeapResult(ticker, 0, "error", False, {}, ["missing_dependencies"])
+        return None, LeapResult(ticker, 0, "error", False, {}, ["missing_dependencies"])
 
     df = _download_history(yf, pd, ticker, cfg.period, cfg.interval)
     if df is None or len(df) < 220:  # need enough for SMA200 slope
-        return LeapResult(ticker, 0, "insufficient", False, {}, ["insufficient_history"])
+        return None, LeapResult(ticker, 0, "insufficient", False, {}, ["insufficient_history"])
+    return df, None
 
+
+def _prepare_history(ticker: str, df, cfg: LeapConfig) -> Tuple[Optional[Dict[str, Any]], Optional[LeapResult]]:
+    """Compute the LEAP features of a downloaded history (adds indicator columns to ``df``)."""
+    pd, np, yf = _lazy()
+
+    # Relative strength vs SPY
+    spy_close = _benchmark_close(yf, pd, df.index, cfg)
+
+    features = _compute_features(pd, np, df, spy_close)
+    if features is None:
+        return None, LeapResult(ticker, 0, "insufficient", False, {}, ["insufficient_history"])
+    return features, None
+
+
+def _benchmark_close(yf, pd, index, cfg: LeapConfig):
+    """Benchmark closes aligned to ``index`` (shared array), or None if unavailable."""
+    if get_benchmark_provider is not None:
+        return get_benchmark_provider().aligned(index, BENCHMARK_TICKER, cfg.period, cfg.interval)
+    spy = _download_history(yf, pd, BENCHMARK_TICKER, cfg.period, cfg.interval)
+    return spy["close"] if spy is not None else None
+
+
+def _add_indicator_columns(pd, df, spy_close=None):
+    """Add the causal indicator columns (SMA, RSI, ATR, prior high, RS EMAs) to ``df`` in place."""
     # Moving averages
     df["sma50"] = df["close"].rolling(50).mean()
     df["sma150"] = df["close"].rolling(150).mean()
     df["sma200"] = df["close"].rolling(200).mean()
-    if pd.isna(df["sma200"].iloc[-1]):
-        return LeapResult(ticker, 0, "insufficient", False, {}, ["insufficient_history"])
 
     # RSI
     df["rsi14"] = _rsi(df["close"])
@@ -207,21 +255,113 @@ def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
     # Prior highs to anchor breakout determination
     df["high_126_prior"] = df["close"].shift(1).rolling(126).max()
 
-    # Relative strength vs SPY
-    try:
-        spy = yf.download("SPY", period=cfg.period, interval=cfg.interval, auto_adjust=True, progress=False, threads=False)
-        if not spy.empty:
-            rs = (df["close"] / spy["Close"]).dropna()
-            df.loc[rs.index, "rs"] = rs
+    # Relative strength vs benchmark (a Series is aligned to df's dates first;
+    # an array is already aligned, NaN where the benchmark has no bar)
+    if spy_close is not None:
+        try:
+            if hasattr(spy_close, "reindex"):
+                spy_close = spy_close.reindex(df.index).to_numpy(dtype=float)
+            df["rs"] = df["close"].to_numpy(dtype=float) / spy_close
             df["rs_ema10"] = _ema(df["rs"], 10)
             df["rs_ema20"] = _ema(df["rs"], 20)
-    except Exception:
-        pass
+        except Exception:
+            pass
+    return df
+
+
+def _compute_features(pd, np, df, spy_close=None) -> Optional[Dict[str, Any]]:
+    """Compute indicator columns on ``df`` and reduce them to the last-bar feature set."""
+    _add_indicator_columns(pd, df, spy_close)
+    if pd.isna(df["sma200"].iloc[-1]):
+        return None
 
     last = df.iloc[-1]
 
     # Trend health
     slope_200 = _slope(df["sma200"], 20)
+
+    # RSI (the turn itself depends on configurable bounds, see _score_features)
+    recent_rsi_min = float(df["rsi14"].iloc[-6:-1].min())
+
+    # Accumulation / volume balance
+    close = df["close"].to_numpy(dtype=float)
+    acc_days, vol_up, vol_down = _accumulation_stats(np, close, df["volume"].to_numpy(dtype=float))
+    acc_days = int(acc_days)
+
+    # Volatility contraction (HV20 vs previous 20)
+    ret = df["close"].pct_change()
+    hv1 = ret.tail(20).std()
+    hv2 = ret.tail(40).head(20).std() if len(ret) >= 40 else None
+
+    # Relative strength improvement
+    rs_ok = False
+    if "rs_ema10" in df.columns and "rs_ema20" in df.columns:
+        rs_ok = last.get("rs_ema10") and last.get("rs_ema20") and last["rs_ema10"] > last["rs_ema20"]
+
+    # AVWAP anchored at the first breakout, else 15 bars back (prefix-sum difference)
+    breakout = (df["close"] > df["high_126_prior"]).to_numpy()
+    if breakout.any():
+        anchor = int(np.argmax(breakout))
+    else:
+        anchor = len(df) - 15 if len(df) > 15 else 0
+    anchor_date = df.index[anchor]
+    cum_tpv, cum_vol = _vwap_prefix_sums(np, df)
+    span_vol = cum_vol[-1] - cum_vol[anchor]
+    anchored_vwap = (cum_tpv[-1] - cum_tpv[anchor]) / span_vol if span_vol != 0 else None
+
+    swing_low = df["close"].tail(8).min()
+
+    return _assemble_features(
+        last, slope_200, recent_rsi_min, acc_days, vol_up, vol_down,
+        hv1, hv2, rs_ok, anchored_vwap, anchor_date, swing_low,
+    )
+
+
+def _accumulation_stats(np, close, volume, bars: int = 10):
+    """
+    Accumulation days and up/down-day volume over the last ``bars`` bars.
+
+    ``close`` and ``volume`` are 1-D arrays, or 2-D (tickers x bars) arrays
+    aligned on their last column to evaluate many tickers at once; results are
+    then per row. An up day closes above the previous close; it counts as an
+    accumulation day when its volume also exceeds the previous bar's.
+
+    Returns:
+        Tuple ``(acc_days, vol_up, vol_down)``
+    """
+    c = np.asarray(close, dtype=float)[..., -(bars + 1):]
+    v = np.asarray(volume, dtype=float)[..., -(bars + 1):]
+    up = c[..., 1:] > c[..., :-1]
+    v1 = v[..., 1:]
+    acc_days = (up & (v1 > v[..., :-1])).sum(axis=-1)
+    vol_up = np.where(up, v1, 0.0).sum(axis=-1)
+    vol_down = np.where(up, 0.0, v1).sum(axis=-1)
+    return acc_days, vol_up, vol_down
+
+
+def _vwap_prefix_sums(np, df):
+    """
+    Prefix sums of typical-price*volume and volume (missing values count as 0).
+
+    Entry ``i`` covers the bars before position ``i``, so the VWAP anchored at
+    bar ``a`` through bar ``i`` is ``(tpv[i+1]-tpv[a]) / (vol[i+1]-vol[a])``.
+    """
+    volume = df["volume"].to_numpy(dtype=float)
+    tpv = (df["high"].to_numpy(dtype=float) + df["low"].to_numpy(dtype=float)
+           + df["close"].to_numpy(dtype=float)) / 3.0 * volume
+    cum_tpv = np.concatenate(([0.0], np.cumsum(np.nan_to_num(tpv, nan=0.0))))
+    cum_vol = np.concatenate(([0.0], np.cumsum(np.nan_to_num(volume, nan=0.0))))
+    return cum_tpv, cum_vol
+
+
+def _assemble_features(last, slope_200, recent_rsi_min, acc_days, vol_up, vol_down,
+                       hv1, hv2, rs_ok, anchored_vwap, anchor_date, swing_low) -> Dict[str, Any]:
+    """Combine last-bar indicator values and windowed statistics into the feature dict.
+
+    ``last`` is any mapping with close/sma50/sma150/sma200/rsi14/atr14 values, so the
+    single-bar path (``_compute_features``) and the replay path
+    (``_compute_feature_history``) derive identical features from the same inputs.
+    """
     trend_ok = slope_200 is not None and slope_200 >= 0
 
     # Distances
@@ -231,75 +371,19 @@ def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
     near_200 = dist_200_pct is not None and -4 <= dist_200_pct <= 4
     confluence = (last["sma50"] and last["sma200"] and abs((last["sma50"] - last["sma200"]) / last["sma200"]) <= 0.03)
 
-    # RSI turn
     rsi = float(last["rsi14"])
-    recent_rsi_slice = df["rsi14"].iloc[-6:-1]
-    rsi_turn = (rsi >= cfg.rsi_lower and rsi <= cfg.rsi_upper and (recent_rsi_slice.min() < cfg.rsi_lower))
-
-    # Bullish divergence (simplified)
-    divergence = False
-    if len(df) >= 40:
-        window = df.tail(35)
-        low1_idx = window["close"].idxmin()
-        prior_segment = window.loc[:low1_idx]
-        if len(prior_segment) > 5:
-            low2_idx = prior_segment["close"].idxmin()
-            if low2_idx != low1_idx:
-                if window.loc[low1_idx, "close"] < window.loc[low2_idx, "close"] and window.loc[low1_idx, "rsi14"] > window.loc[low2_idx, "rsi14"]:
-                    divergence = True
 
-    # Accumulation / volume balance
-    acc_days = 0
-    vol_up = 0
-    vol_down = 0
-    for i in range(1, 11):  # last 10 bars
-        c0 = df["close"].iloc[-(i+1)]
-        c1 = df["close"].iloc[-i]
-        v1 = df["volume"].iloc[-i]
-        if c1 > c0:
-            vol_up += v1
-            if v1 > df["volume"].iloc[-(i+1)]:
-                acc_days += 1
-        else:
-            vol_down += v1
     vol_balance_ok = (vol_up > 0 and vol_down <= 1.3 * vol_up)
     accumulation_ok = acc_days >= 2
-
-    # Volatility contraction (HV20 vs previous 20)
-    ret = df["close"].pct_change()
-    hv1 = ret.tail(20).std()
-    hv2 = ret.tail(40).head(20).std() if len(ret) >= 40 else None
     vol_contract = (hv1 is not None and hv2 is not None and hv1 < hv2)
 
     atr = float(last["atr14"]) if not math.isnan(last["atr14"]) else None
     atr_pct = (atr / last["close"] * 100) if atr else None
     atr_ok = atr_pct is not None and atr_pct <= 6
 
-    # Relative strength improvement
-    rs_ok = False
-    if "rs_ema10" in df.columns and "rs_ema20" in df.columns:
-        rs_ok = last.get("rs_ema10") and last.get("rs_ema20") and last["rs_ema10"] > last["rs_ema20"]
-
-    # Breakout anchor for AVWAP
-    pivot_series = df["high_126_prior"]
-    breakout_mask = df["close"] > pivot_series
-    bk_idx = df.index[breakout_mask.fillna(False)]
-    if len(bk_idx):
-        anchor_date = bk_idx[0]
-    else:
-        anchor_date = df.index[-15] if len(df) > 15 else df.index[0]
-
-    anchor_loc = df.index.get_loc(anchor_date)
-    sub = df.iloc[anchor_loc:].copy()
-    sub["typical_price"] = (sub["high"] + sub["low"] + sub["close"]) / 3.0
-    sub["tpv"] = sub["typical_price"] * sub["volume"]
-    cum_tpv = sub["tpv"].cumsum()
-    cum_vol = sub["volume"].cumsum()
-    anchored_vwap = (cum_tpv / cum_vol).iloc[-1] if cum_vol.iloc[-1] != 0 else None
     avwap_distance_pct = ((last["close"] - anchored_vwap) / anchored_vwap * 100.0) if anchored_vwap else None
 
     # Suggested stop (structure vs ATR)
-    swing_low = df["close"].tail(8).min()
     suggested_stop = None
     if atr and atr_ok:
         candidate = last["close"] - 1.8 * atr
@@ -309,17 +393,162 @@ def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
     else:
         suggested_stop = swing_low * 0.98
 
+    return {
+        "close": float(last["close"]),
+        "sma50": float(last["sma50"]),
+        "sma150": float(last["sma150"]),
+        "sma200": float(last["sma200"]),
+        "slope_200": slope_200,
+        "trend_ok": trend_ok,
+        "dist_50_pct": dist_50_pct,
+        "dist_200_pct": dist_200_pct,
+        "value_zone": value_zone,
+        "near_200": near_200,
+        "confluence": confluence,
+        "rsi": rsi,
+        "recent_rsi_min": recent_rsi_min,
+        "acc_days": acc_days,
+        "vol_balance_ok": vol_balance_ok,
+        "accumulation_ok": accumulation_ok,
+        "vol_contract": vol_contract,
+        "atr": atr,
+        "atr_pct": atr_pct,
+        "atr_ok": atr_ok,
+        "rs_ok": rs_ok,
+        "anchored_vwap": anchored_vwap,
+        "avwap_distance_pct": avwap_distance_pct,
+        "anchor_date": anchor_date,
+        "suggested_stop": suggested_stop,
+    }
+
+
+def _compute_feature_history(pd, np, df, spy_close=None, positions=None,
+                             period: Optional[str] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+    """Compute the ``_compute_features`` feature set for many bars of ``df`` in one pass.
+
+    Indicators are computed once over the full history and every windowed rule
+    (SMA200 slope, recent RSI low, accumulation, HV contraction, AVWAP, swing low)
+    is read from rolling or prefix-sum state, so replaying N bars costs O(N) rather
+    than rebuilding each window per date. All values depend only on bars up to
+    their own date, so the replay has no look-ahead.
+
+    Args:
+        pd, np: pandas and numpy modules
+        df: OHLCV DataFrame in date order
+        spy_close: Optional benchmark closes for relative strength (Series, or array aligned to df)
+        positions: Bar positions to evaluate (default: every bar past the 220-bar warmup)
+        period: Download period of the live screener (e.g. '2y'). The AVWAP
+            anchor of each bar is searched only inside that window ending at the
+            bar, as a screener run on that date would; None searches all of ``df``.
+
+    Returns:
+        List of ``(date, features)`` tuples in bar order
+    """
+    _add_indicator_columns(pd, df, spy_close)
+    n = len(df)
+    if positions is None:
+        positions = range(219, n)
+    positions = [i for i in positions if 219 <= i < n]
+    if not positions:
+        return []
+
+    close_s = df["close"]
+    volume_s = df["volume"]
+    close = close_s.to_numpy(dtype=float)
+    columns = {c: df[c].to_numpy(dtype=float) for c in ("sma50", "sma150", "sma200", "rsi14", "atr14")}
+
+    # Least-squares slope of the trailing 20 SMA200 values (same formula as _slope)
+    x = np.arange(20, dtype=float)
+    xc = x - x.mean()
+    windows = np.lib.stride_tricks.sliding_window_view(columns["sma200"], 20)
+    slope_200 = np.full(n, np.nan)
+    slope_200[19:] = (windows - windows.mean(axis=1, keepdims=True)) @ xc / (xc ** 2).sum()
+
+    recent_rsi_min = df["rsi14"].shift(1).rolling(5).min().to_numpy()
+
+    up = close_s > close_s.shift(1)
+    acc_days = (up & (volume_s > volume_s.shift(1))).astype(int).rolling(10).sum().to_numpy()
+    vol_up = volume_s.where(up, 0.0).rolling(10).sum().to_numpy()
+    vol_down = volume_s.where(~up, 0.0).rolling(10).sum().to_numpy()
+
+    hv1 = close_s.pct_change().rolling(20).std()
+    hv2 = hv1.shift(20).to_numpy()
+    hv1 = hv1.to_numpy()
+
+    swing_low = close_s.rolling(8).min().to_numpy()
+
+    has_rs = "rs_ema10" in df.columns and "rs_ema20" in df.columns
+    rs10 = df["rs_ema10"].to_numpy(dtype=float) if has_rs else None
+    rs20 = df["rs_ema20"].to_numpy(dtype=float) if has_rs else None
+
+    # AVWAP anchored at the first breakout inside the period window, else 15 bars
+    # back. A download starting at the window's first bar computes the prior
+    # 126-bar high from its own bars, so only breakouts whose whole lookback lies
+    # inside the window qualify.
+    breakouts = np.flatnonzero((close_s > df["high_126_prior"]).to_numpy())
+    offset = _period_offset(pd, period)
+    window_starts = (df.index.searchsorted(df.index - offset, side="left")
+                     if offset is not None else np.zeros(n, dtype=int))
+    cum_tpv, cum_vol = _vwap_prefix_sums(np, df)
+
+    history: List[Tuple[Any, Dict[str, Any]]] = []
+    for i in positions:
+        if math.isnan(columns["sma200"][i]):
+            continue
+        last = {name: values[i] for name, values in columns.items()}
+        last["close"] = close[i]
+
+        k = int(np.searchsorted(breakouts, window_starts[i] + 126))
+        if k < len(breakouts) and breakouts[k] <= i:
+            anchor = int(breakouts[k])
+        else:
+            anchor = i - 14 if i + 1 > 15 else 0
+        span_vol = cum_vol[i + 1] - cum_vol[anchor]
+        anchored_vwap = (cum_tpv[i + 1] - cum_tpv[anchor]) / span_vol if span_vol != 0 else None
+
+        rs_ok = False
+        if has_rs:
+            rs_ok = rs10[i] and rs20[i] and rs10[i] > rs20[i]
+
+        history.append((df.index[i], _assemble_features(
+            last, slope_200[i], float(recent_rsi_min[i]), int(acc_days[i]),
+            vol_up[i], vol_down[i], hv1[i], hv2[i], rs_ok, anchored_vwap,
+            df.index[anchor], swing_low[i],
+        )))
+    return history
+
+
+def _period_offset(pd, period: Optional[str]):
+    """DateOffset covered by a yfinance-style ``period`` ('2y', '6mo', ...), or None if unbounded."""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", (period or "").strip().lower())
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.DateOffset(days=count)
+    if unit == "wk":
+        return pd.DateOffset(weeks=count)
+    return pd.DateOffset(months=count * (12 if unit == "y" else 1))
+
+
+def _score_features(ticker: str, f: Dict[str, Any], cfg: LeapConfig) -> LeapResult:
+    """Apply the configurable scoring rules to a precomputed feature set."""
+    rsi = f["rsi"]
+    rsi_turn = (rsi >= cfg.rsi_lower and rsi <= cfg.rsi_upper and (f["recent_rsi_min"] < cfg.rsi_lower))
+    value_zone = f["value_zone"]
+    near_200 = f["near_200"]
+    avwap_distance_pct = f["avwap_distance_pct"]
+
     # Scoring components
     score = 0
-    if trend_ok: score += 15
+    if f["trend_ok"]: score += 15
     if value_zone or near_200: score += 12
-    if confluence: score += 8
+    if f["confluence"]: score += 8
     if rsi_turn: score += 15
-    if accumulation_ok and vol_balance_ok: score += 10
-    if vol_contract: score += 10
-    if rs_ok: score += 10
-    if divergence: score += 5
-    if atr_ok: score += 8
+    if f["accumulation_ok"] and f["vol_balance_ok"]: score += 10
+    if f["vol_contract"]: score += 10
+    if f["rs_ok"]: score += 10
+    if f["atr_ok"]: score += 8
     if value_zone and rsi_turn: score += 7
     # AVWAP distance scoring
     avwap_points = 0
@@ -340,31 +569,35 @@ def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
 
     reasons: List[str] = []
     if not passed:
-        if not trend_ok: reasons.append("trend_down")
+        if not f["trend_ok"]: reasons.append("trend_down")
         if not (value_zone or near_200): reasons.append("not_value_zone")
         if not rsi_turn: reasons.append("no_rsi_turn")
-        if not (accumulation_ok and vol_balance_ok): reasons.append("weak_accumulation")
+        if not (f["accumulation_ok"] and f["vol_balance_ok"]): reasons.append("weak_accumulation")
 
+    atr = f["atr"]
+    atr_pct = f["atr_pct"]
+    anchored_vwap = f["anchored_vwap"]
+    anchor_date = f["anchor_date"]
+    suggested_stop = f["suggested_stop"]
     metrics: Dict[str, Any] = {
-        "close": round(float(last["close"]),2),
-        "sma50": round(float(last["sma50"]),2) if not math.isnan(last["sma50"]) else None,
-        "sma150": round(float(last["sma150"]),2) if not math.isnan(last["sma150"]) else None,
-        "sma200": round(float(last["sma200"]) ,2) if not math.isnan(last["sma200"]) else None,
-        "dist_50_pct": round(dist_50_pct,2) if dist_50_pct is not None else None,
-        "dist_200_pct": round(dist_200_pct,2) if dist_200_pct is not None else None,
+        "close": round(f["close"],2),
+        "sma50": round(f["sma50"],2) if not math.isnan(f["sma50"]) else None,
+        "sma150": round(f["sma150"],2) if not math.isnan(f["sma150"]) else None,
+        "sma200": round(f["sma200"] ,2) if not math.isnan(f["sma200"]) else None,
+        "dist_50_pct": round(f["dist_50_pct"],2) if f["dist_50_pct"] is not None else None,
+        "dist_200_pct": round(f["dist_200_pct"],2) if f["dist_200_pct"] is not None else None,
         "value_zone": value_zone,
         "near_200": near_200,
-        "confluence": confluence,
+        "confluence": f["confluence"],
         "rsi14": round(rsi,2),
         "rsi_turn": rsi_turn,
-        "acc_days": acc_days,
-        "vol_balance_ok": vol_balance_ok,
-        "vol_contract": vol_contract,
-        "rs_ok": rs_ok,
-        "divergence": divergence,
+        "acc_days": f["acc_days"],
+        "vol_balance_ok": f["vol_balance_ok"],
+        "vol_contract": f["vol_contract"],
+        "rs_ok": f["rs_ok"],
         "atr14": round(atr,4) if atr else None,
         "atr_pct": round(atr_pct,2) if atr_pct else None,
-        "slope_200": slope_200,
+        "slope_200": f["slope_200"],
         "anchored_vwap": round(float(anchored_vwap),4) if anchored_vwap else None,
         "avwap_distance_pct": round(avwap_distance_pct,2) if avwap_distance_pct is not None else None,
         "anchor_date": anchor_date.strftime("%Y-%m-%d") if hasattr(anchor_date, "strftime") else None,
@@ -376,6 +609,13 @@ def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
 
     return LeapResult(ticker, score, classification, passed, metrics, reasons)
 
+
+def _evaluate_ticker(ticker: str, cfg: LeapConfig) -> LeapResult:
+    features, failure = _prepare_ticker(ticker, cfg)
+    if failure is not None:
+        return failure
+    return _score_features(ticker, features, cfg)
+
 # ---------------------------- I/O & Reporting -------------------------------
 
 def _read_tickers(path: Optional[str], tickers: Optional[List[str]]) -> List[str]:
@@ -422,7 +662,7 @@ def _write_text(results: List[LeapResult], path: str):
                 f"  MAs: SMA50:{fmt(m.get('sma50'),2,'$')}  SMA150:{fmt(m.get('sma150'),2,'$')}  SMA200:{fmt(m.get('sma200'),2,'$')}  Slope200:{m.get('slope_200')}\n"
             )
             f.write(
-                f"  Dist%: 50={fmt(m.get('dist_50_pct'))}%  200={fmt(m.get('dist_200_pct'))}%  Confluence:{m.get('confluence')}  RS_OK:{m.get('rs_ok')}  Divergence:{m.get('divergence')}\n"
+                f"  Dist%: 50={fmt(m.get('dist_50_pct'))}%  200={fmt(m.get('dist_200_pct'))}%  Confluence:{m.get('confluence')}  RS_OK:{m.get('rs_ok')}\n"
             )
             f.write(
                 f"  Acc:{m.get('acc_days')}  VolBal:{m.get('vol_balance_ok')}  VolContract:{m.get('vol_contract')}  ATR:{fmt(m.get('atr14'),4)}  ATR%:{fmt(m.get('atr_pct'))}\n"
@@ -437,7 +677,7 @@ def _write_text(results: List[LeapResult], path: str):
 def _write_csv(pd, results: List[LeapResult], path: str):
     if not results:
         cols = [
-            "ticker","score","classification","passed","reasons","close","sma50","sma150","sma200","dist_50_pct","dist_200_pct","value_zone","near_200","confluence","rsi14","rsi_turn","acc_days","vol_balance_ok","vol_contract","rs_ok","divergence","atr14","atr_pct","slope_200","anchored_vwap","avwap_distance_pct","anchor_date","suggested_stop","avwap_points"
+            "ticker","score","classification","passed","reasons","close","sma50","sma150","sma200","dist_50_pct","dist_200_pct","value_zone","near_200","confluence","rsi14","rsi_turn","acc_days","vol_balance_ok","vol_contract","rs_ok","atr14","atr_pct","slope_200","anchored_vwap","avwap_distance_pct","anchor_date","suggested_stop","avwap_points"
         ]
         pd.DataFrame(columns=cols).to_csv(path, index=False)
         return
@@ -0,0 +1,132 @@
+"""Pattern detector microbenchmark for the LEAP and bullish breakout screeners.
+
+Times, per ticker, the scalar ``.iloc`` loops the pattern detectors used to run
+against the vectorized versions that replaced them, on synthetic daily bars:
+
+  accumulation   LEAP accumulation days / up-down volume over the last 10 bars
+  golden cross   golden cross within the last 30 bars (rolling column over the history)
+  accum. batch   accumulation for all tickers in one 2-D call (tickers x bars)
+
+Every case checks that both versions return the same values before timing.
+
+Usage (examples):
+  python pattern_benchmark.py
+  python pattern_benchmark.py --tickers 500 --bars 400 --repeat 10
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+
+def legacy_accumulation(df):
+    """The per-bar loop previously used in leap_entry_strategy (reference only)."""
+    acc_days = 0
+    vol_up = 0
+    vol_down = 0
+    for i in range(1, 11):
+        c0 = df["close"].iloc[-(i+1)]
+        c1 = df["close"].iloc[-i]
+        v1 = df["volume"].iloc[-i]
+        if c1 > c0:
+            vol_up += v1
+            if v1 > df["volume"].iloc[-(i+1)]:
+                acc_days += 1
+        else:
+            vol_down += v1
+    return acc_days, vol_up, vol_down
+
+
+def legacy_golden_cross(df, lookback_days: int = 30) -> bool:
+    """The per-bar golden cross loop previously used (reference only)."""
+    if len(df) < max(50, 200, lookback_days + 1):
+        return False
+    for i in range(1, min(lookback_days + 1, len(df))):
+        prev_sma50 = df["sma50"].iloc[-(i + 1)]
+        prev_sma200 = df["sma200"].iloc[-(i + 1)]
+        curr_sma50 = df["sma50"].iloc[-i]
+        curr_sma200 = df["sma200"].iloc[-i]
+        if any(map(lambda x: x != x, [prev_sma50, prev_sma200, curr_sma50, curr_sma200])):
+            continue
+        if prev_sma50 <= prev_sma200 and curr_sma50 > curr_sma200:
+            return True
+    return False
+
+
+def _sample_bars(seed: int, bars: int):
+    """Random-walk daily bars with the columns the detectors read."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, bars)))
+    df = pd.DataFrame({
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, bars).astype(float),
+    }, index=pd.date_range("2021-01-04", periods=bars, freq="B"))
+    df["sma50"] = df["close"].rolling(50).mean()
+    df["sma200"] = df["close"].rolling(200).mean()
+    return df
+
+
+def _time_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LEAP / breakout pattern detectors")
+    parser.add_argument("--tickers", type=int, default=200, help="Synthetic tickers per measurement")
+    parser.add_argument("--bars", type=int, default=300, help="Daily bars per ticker (>= 201)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args(argv)
+
+    import numpy as np
+
+    import leap_entry_strategy as leap
+    from backend.services.bullish_breakout_service import BullishBreakoutService
+
+    n = max(1, args.tickers)
+    frames = [_sample_bars(seed, max(201, args.bars)) for seed in range(n)]
+    arrays = [(f["close"].to_numpy(dtype=float), f["volume"].to_numpy(dtype=float)) for f in frames]
+    closes = np.vstack([a[0] for a in arrays])
+    volumes = np.vstack([a[1] for a in arrays])
+    service = BullishBreakoutService()
+
+    def batched_accumulation():
+        acc_days, vol_up, vol_down = leap._accumulation_stats(np, closes, volumes)
+        return list(zip(acc_days.tolist(), vol_up.tolist(), vol_down.tolist()))
+
+    cases = [
+        ("accumulation",
+         lambda: [legacy_accumulation(f) for f in frames],
+         lambda: [tuple(float(x) for x in leap._accumulation_stats(np, c, v)) for c, v in arrays]),
+        ("golden cross",
+         lambda: [legacy_golden_cross(f) for f in frames],
+         lambda: [bool(service._golden_cross_within(f["sma50"], f["sma200"]).iloc[-1]) for f in frames]),
+        ("accum. batch",
+         lambda: [legacy_accumulation(f) for f in frames],
+         batched_accumulation),
+    ]
+
+    print(f"Pattern detector cost per ticker ({n} tickers x {max(201, args.bars)} bars, best of {args.repeat})")
+    print(f"  {'detector':<14}{'before us':>12}{'after us':>12}{'speedup':>10}")
+    scale = 1000.0 / n
+    for name, before, after in cases:
+        expected = [tuple(float(x) for x in r) if isinstance(r, tuple) else r for r in before()]
+        if expected != after():
+            print(f"  {name:<14}MISMATCH between legacy and vectorized results")
+            return 1
+        before_us = _time_ms(before, args.repeat) * scale
+        after_us = _time_ms(after, args.repeat) * scale
+        print(f"  {name:<14}{before_us:>12.1f}{after_us:>12.1f}{before_us / after_us:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+"""Portfolio snapshot backfill CLI.
+
+Rebuilds the portfolio_snapshot table (daily portfolio value per account) from
+the closes stored in price_bars, valuing current holdings from their opened_at
+date on. Served as equity curves through GET /api/holdings/history.
+
+Usage (examples):
+  python portfolio_backfill.py --start 2021-01-01
+  python portfolio_backfill.py --start 2024-01-01 --end 2024-12-31 --no-refresh --db-path at_data.sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill daily portfolio snapshots")
+    parser.add_argument("--start", help="First snapshot date (YYYY-MM-DD, default: earliest stored bar)")
+    parser.add_argument("--end", help="Last snapshot date (YYYY-MM-DD, default: today)")
+    parser.add_argument("--period", default="5y", help="History to download for tickers without stored bars")
+    parser.add_argument("--no-refresh", action="store_true", help="Use stored bars only (no downloads)")
+    parser.add_argument("--db-path", default="at_data.sqlite", help="Path to sqlite database")
+    args = parser.parse_args(argv)
+
+    from backend.services.portfolio_history_service import PortfolioHistoryService
+    from backend.services.price_bar_store import PriceBarStore
+
+    db_conn = sqlite3.connect(args.db_path, check_same_thread=False)
+    db_conn.execute("PRAGMA busy_timeout=5000")
+    started = time.time()
+    try:
+        service = PortfolioHistoryService(db_conn, PriceBarStore(db_conn))
+        written = service.backfill(args.start, args.end, refresh=not args.no_refresh, period=args.period)
+    finally:
+        db_conn.close()
+
+    print(f"Wrote {written} portfolio snapshot rows in {int((time.time() - started) * 1000)}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""JSON serialization benchmark for strategy results.
+
+Measures the cost per 1,000 results of the serialization paths touched by the
+orjson-based encoder in backend/services/serialization.py, before and after:
+
+  metrics_json   storing one result's metrics (numpy values from the screeners):
+                 recursive convert_numpy_types + json.dumps  vs  serialization.dumps
+  dict payload   encoding a plain-dict API payload (sweep/backtest reports):
+                 jsonable_encoder + json.dumps  vs  FastJSONResponse (orjson)
+
+Endpoints with a response_model (e.g. the results pages) are not listed: FastAPI
+already encodes them with Pydantic's compiled dump_json, which a custom response
+class would disable.
+
+Usage (examples):
+  python serialization_benchmark.py
+  python serialization_benchmark.py --results 5000 --repeat 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+
+def legacy_convert_numpy_types(obj):
+    """The recursive converter previously used before json.dumps (reference only)."""
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, dict):
+        return {k: legacy_convert_numpy_types(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_convert_numpy_types(v) for v in obj]
+    elif isinstance(obj, (np.bool_, np.bool)):
+        return bool(obj)
+    elif isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif pd.isna(obj):
+        return None
+    else:
+        return obj
+
+
+def _sample_metrics(i: int) -> Dict[str, Any]:
+    """Metrics shaped like the bullish breakout / LEAP screeners produce them."""
+    import numpy as np
+
+    close = np.float64(100.0 + i % 50)
+    return {
+        "close": close, "change_pct": np.float64(1.25), "score": np.int64(60 + i % 40),
+        "rsi14": np.float64(55.5), "macd": np.float64(0.42), "macd_signal": np.float64(0.31),
+        "macd_hist": np.float64(0.11), "sma10": close * 0.99, "sma50": close * 0.95,
+        "sma200": np.float64("nan") if i % 7 == 0 else close * 0.9,
+        "sma10_above": np.bool_(True), "sma50_above": np.bool_(True), "sma200_above": np.bool_(i % 3 == 0),
+        "volume": np.int64(1_250_000 + i), "vol_avg20": np.int64(900_000), "volume_multiple": np.float64(1.39),
+        "ref_high": close * 0.98, "breakout_pct": np.float64(2.1), "atr14": np.float64(2.7),
+        "risk": "medium", "recommendation": "BUY", "entry_quality": "good",
+        "suggested_stop": close * 0.93, "points_sma": 20, "points_macd": 15, "points_rsi": 10,
+        "points_volume": 15, "company_name": f"Company {i}", "sector": "Technology",
+    }
+
+
+def _time_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of strategy results")
+    parser.add_argument("--results", type=int, default=1000, help="Results per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args(argv)
+
+    from fastapi.encoders import jsonable_encoder
+
+    from backend.api.responses import FastJSONResponse
+    from backend.services import serialization
+
+    n = max(1, args.results)
+    metrics = [_sample_metrics(i) for i in range(n)]
+    stored = [serialization.dumps(m) for m in metrics]
+    payload = {
+        "sweep_id": "bench",
+        "combinations": [
+            {"ticker": f"T{i}", "metrics": json.loads(s), "parameters": {"min_score": 60}} for i, s in enumerate(stored)
+        ],
+    }
+    cases = [
+        ("metrics_json",
+         lambda: [json.dumps(legacy_convert_numpy_types(m)) for m in metrics],
+         lambda: [serialization.dumps(m) for m in metrics]),
+        ("dict payload",
+         lambda: json.dumps(jsonable_encoder(payload)).encode("utf-8"),
+         lambda: FastJSONResponse(payload).body),
+    ]
+
+    scale = 1000.0 / n
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"Serialization cost per 1,000 results ({n} results, best of {args.repeat}, encoder: {encoder})")
+    print(f"  {'path':<14}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        before_ms = _time_ms(before, args.repeat) * scale
+        after_ms = _time_ms(after, args.repeat) * scale
+        print(f"  {name:<14}{before_ms:>12.2f}{after_ms:>12.2f}{before_ms / after_ms:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
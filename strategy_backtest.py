@@ -0,0 +1,101 @@
+"""Historical backtest CLI for the in-process strategy services.
+
+Replays bullish_breakout or leap_entry over every date in a window using bars
+stored in the price_bars table (downloading only missing history) and reports
+hit rates and forward returns of signal dates versus all evaluated dates.
+
+Usage (examples):
+  python strategy_backtest.py --strategy leap_entry --tickers AAPL MSFT NVDA \
+      --start 2022-01-01 --end 2024-12-31
+  python strategy_backtest.py --strategy bullish_breakout --tickers-file portfolio_66.txt \
+      --horizons 5,20,60 --param min_score=6 --no-refresh --db-path at_data.sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from typing import List, Optional
+
+from strategy_sweep import _parse_grid, _read_tickers
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Historical backtest for strategy services")
+    parser.add_argument("--strategy", required=True, choices=["bullish_breakout", "leap_entry"])
+    parser.add_argument("--tickers", nargs="*", help="Tickers (space separated)")
+    parser.add_argument("--tickers-file", help="File with tickers (one per line)")
+    parser.add_argument("--start", help="First evaluated date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last evaluated date (YYYY-MM-DD)")
+    parser.add_argument("--horizons", default="5,20,60", help="Forward return horizons in bars (comma separated)")
+    parser.add_argument("--period", default="5y", help="History to download for tickers without stored bars")
+    parser.add_argument("--param", action="append", default=[], help="Strategy parameter, e.g. min_score=65 (repeatable)")
+    parser.add_argument("--no-refresh", action="store_true", help="Use stored bars only (no downloads)")
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--db-path", default="at_data.sqlite", help="Path to sqlite database holding price_bars")
+    parser.add_argument("--json", action="store_true", help="Print full report as JSON")
+    args = parser.parse_args(argv)
+
+    tickers = _read_tickers(args.tickers_file, args.tickers)
+    if not tickers:
+        print("No tickers supplied; use --tickers or --tickers-file.")
+        return 2
+    try:
+        parameters = {k: v[0] for k, v in _parse_grid(args.param).items() if v}
+        horizons = [int(h) for h in args.horizons.split(",") if h.strip()]
+    except ValueError as e:
+        print(str(e))
+        return 2
+
+    from backend.services.strategy_execution_service import StrategyExecutionService
+    from backend.services.backtest_service import BacktestConfig, BacktestService
+    from backend.services.price_bar_store import PriceBarStore
+
+    db_conn = sqlite3.connect(args.db_path, check_same_thread=False)
+    db_conn.execute("PRAGMA busy_timeout=5000")
+
+    # Registers the strategy services with the shared registry
+    StrategyExecutionService(None)
+    service = BacktestService(PriceBarStore(db_conn))
+    config = BacktestConfig(
+        strategy_code=args.strategy,
+        tickers=tickers,
+        parameters=parameters,
+        start_date=args.start,
+        end_date=args.end,
+        horizons=horizons,
+        history_period=args.period,
+        refresh=not args.no_refresh,
+        max_workers=max(1, args.max_workers),
+    )
+
+    try:
+        report = service.run_backtest(config)
+    except ValueError as e:
+        print(str(e))
+        return 2
+    finally:
+        db_conn.close()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, default=str))
+        return 0
+
+    print(f"Backtest {report.strategy_code}: {report.evaluated_tickers}/{report.total_tickers} tickers, "
+          f"{report.samples} dates, {report.signals} signals ({report.signal_rate_percent}%) "
+          f"in {report.execution_time_ms}ms")
+    for h in report.horizons:
+        sig = report.signal_returns[str(h)]
+        base = report.baseline_returns[str(h)]
+        print(f"  {h:>3} bars  signals: n={sig['count']} hit={sig['hit_rate_percent']}% avg={sig['avg_return_percent']}%  "
+              f"all: hit={base['hit_rate_percent']}% avg={base['avg_return_percent']}%  edge={sig['edge_percent']}%")
+    for label, stats in report.by_classification.items():
+        parts = "  ".join(f"{h}:{stats['returns'][str(h)]['avg_return_percent']}%" for h in report.horizons)
+        print(f"  [{label}] n={stats['count']}  avg {parts}")
+    if report.failed_tickers:
+        print(f"  skipped: {', '.join(f'{t}({r})' for t, r in report.failed_tickers.items())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""Parameter sweep CLI for the in-process strategy services.
+
+Evaluates every combination of a parameter grid for bullish_breakout or
+leap_entry. Price history and indicators are computed once per ticker and each
+combination is scored against that shared state, so sweeping many thresholds
+costs roughly the same network time as a single run.
+
+Usage (examples):
+  python strategy_sweep.py --strategy leap_entry --tickers AAPL MSFT NVDA \
+      --grid min_score=55,60,65 --grid rsi_lower=40,45
+  python strategy_sweep.py --strategy bullish_breakout --tickers-file portfolio_66.txt \
+      --grid volume_threshold_multiple=1.2,1.5,2.0 --db-path at_data.sqlite
+
+With --db-path each combination is stored as a child run (strategy_run.parent_run_id)
+of the sweep, viewable through GET /api/strategies/sweep/{sweep_id}.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+
+def _parse_value(raw: str) -> Any:
+    raw = raw.strip()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _parse_grid(items: List[str]) -> Dict[str, List[Any]]:
+    grid: Dict[str, List[Any]] = {}
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"Invalid --grid entry '{item}' (expected name=v1,v2,...)")
+        name, values = item.split("=", 1)
+        grid[name.strip()] = [_parse_value(v) for v in values.split(",") if v.strip()]
+    return grid
+
+
+def _read_tickers(path: Optional[str], tickers: Optional[List[str]]) -> List[str]:
+    if tickers:
+        return [t.strip().upper() for t in tickers if t.strip()]
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return [ln.strip().upper() for ln in f if ln.strip() and not ln.strip().startswith("#")]
+    return []
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parameter sweep for strategy services")
+    parser.add_argument("--strategy", required=True, choices=["bullish_breakout", "leap_entry"])
+    parser.add_argument("--tickers", nargs="*", help="Tickers (space separated)")
+    parser.add_argument("--tickers-file", help="File with tickers (one per line)")
+    parser.add_argument("--grid", action="append", default=[], help="Swept parameter, e.g. min_score=55,60,65 (repeatable)")
+    parser.add_argument("--param", action="append", default=[], help="Fixed parameter, e.g. period=1y (repeatable)")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--db-path", help="Path to sqlite database file for storing sweep runs")
+    parser.add_argument("--json", action="store_true", help="Print full summary as JSON")
+    args = parser.parse_args(argv)
+
+    tickers = _read_tickers(args.tickers_file, args.tickers)
+    if not tickers:
+        print("No tickers supplied; use --tickers or --tickers-file.")
+        return 2
+    try:
+        grid = _parse_grid(args.grid)
+        base_parameters = {k: v[0] for k, v in _parse_grid(args.param).items() if v}
+    except ValueError as e:
+        print(str(e))
+        return 2
+    base_parameters["max_workers"] = max(1, args.max_workers)
+
+    from backend.services.strategy_execution_service import StrategyExecutionService
+    from backend.services.parameter_sweep_service import ParameterSweepService
+
+    db_conn = None
+    if args.db_path:
+        from db import Database
+        from backend.database.connection import initialize_execution_tables
+
+        # Apply schema migrations (adds strategy_run.parent_run_id) before writing
+        schema_db = Database(args.db_path)
+        schema_db.connect()
+        schema_db.conn.close()
+        db_conn = sqlite3.connect(args.db_path)
+        db_conn.execute("PRAGMA busy_timeout=5000")
+        initialize_execution_tables(db_conn)
+
+    # Registers the strategy services with the shared registry
+    StrategyExecutionService(None)
+    sweep_service = ParameterSweepService(db_conn)
+
+    try:
+        summary = sweep_service.run_sweep(args.strategy, tickers, grid, base_parameters)
+    except ValueError as e:
+        print(str(e))
+        return 2
+    finally:
+        if db_conn is not None:
+            db_conn.close()
+
+    if args.json:
+        print(json.dumps({
+            "sweep_id": summary.sweep_id,
+            "strategy_code": summary.strategy_code,
+            "total_tickers": summary.total_tickers,
+            "prepared_tickers": summary.prepared_tickers,
+            "execution_time_ms": summary.execution_time_ms,
+            "combinations": summary.combinations,
+        }, indent=2, default=str))
+        return 0
+
+    print(f"Sweep {summary.sweep_id}: {summary.strategy_code} over {summary.prepared_tickers}/{summary.total_tickers} tickers "
+          f"in {summary.execution_time_ms}ms")
+    ranked = sorted(summary.combinations, key=lambda c: (c["qualifying_count"], c["average_score"]), reverse=True)
+    for combo in ranked:
+        swept = {k: combo["parameters"].get(k) for k in grid}
+        top = ", ".join(f"{t['ticker']}({t['score']})" for t in combo["top_scores"])
+        print(f"  {swept}  passed:{combo['qualifying_count']}  rate:{combo['pass_rate_percent']}%  "
+              f"avg:{combo['average_score']}  top:[{top}]")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())